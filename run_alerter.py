@@ -1,18 +1,36 @@
+import asyncio
 import concurrent.futures
+import os
+import signal
 import sys
-from typing import Tuple, List
+from datetime import timedelta
+from functools import partial
+from typing import Tuple, List, Type, Callable
 
 from src.alerters.proactive.periodic import PeriodicAliveReminder
 from src.alerters.reactive.blockchain import Blockchain
 from src.alerters.reactive.node import Node, NodeType
 from src.alerts.alerts import *
+from src.monitors.archive_scanner import ArchiveScanner, \
+    AsyncArchiveScanner
 from src.monitors.blockchain import BlockchainMonitor
+from src.monitors.blockchain_async import AsyncBlockchainMonitor
 from src.monitors.github import GitHubMonitor
+from src.monitors.github_async import AsyncGitHubMonitor
 from src.monitors.monitor_starters import start_node_monitor, \
-    start_github_monitor, start_blockchain_monitor
+    start_github_monitor, start_blockchain_monitor, run_node_monitor_round, \
+    run_blockchain_monitor_round, run_github_monitor_round
+from src.monitors.monitor_starters_async import start_node_monitor_async, \
+    start_github_monitor_async, start_blockchain_monitor_async
 from src.monitors.node import NodeMonitor
+from src.monitors.node_async import AsyncNodeMonitor
+from src.store.mongo.alerts_buckets import ALERT_BUCKETS_INDEXES
+from src.store.mongo.alerts_indexes import ALERTS_INDEXES, \
+    ensure_alerts_indexes
 from src.store.mongo.mongo_api import MongoApi
 from src.store.redis.redis_api import RedisApi
+from src.store.redis.write_behind import WriteBehindRedisApi
+from src.store.store_keys import Keys
 from src.utils.alert_utils.get_channel_set import get_full_channel_set
 from src.utils.alert_utils.get_channel_set import \
     get_periodic_alive_reminder_channel_set
@@ -21,10 +39,17 @@ from src.utils.config_parsers.internal_parsed import InternalConf, \
 from src.utils.config_parsers.user import NodeConfig, RepoConfig
 from src.utils.config_parsers.user_parsed import UserConf, \
     MISSING_USER_CONFIG_FILES
+from src.utils.data_wrapper.chain_query_cache import ChainQueryCache, \
+    AsyncChainQueryCache
+from src.utils.data_wrapper.data_source_resolver import DataSourceResolver, \
+    AsyncDataSourceResolver
 from src.utils.data_wrapper.polkadot_api import PolkadotApiWrapper
+from src.utils.data_wrapper.polkadot_api_async import AsyncPolkadotApiWrapper
 from src.utils.exceptions import *
 from src.utils.get_json import get_json
 from src.utils.logging import create_logger
+from src.utils.scheduler import Scheduler
+from src.utils.timing import TimedTaskLimiter
 from src.web.telegram.telegram import TelegramCommands
 
 
@@ -79,12 +104,24 @@ def node_from_node_config(node_config: NodeConfig):
     node = Node(node_config.node_name, node_config.node_ws_url, node_type,
                 node_config.stash_account_address, node_config.chain_name,
                 REDIS, node_config.is_archive_node, internal_conf=InternalConf)
-    node.load_state(logger_general)
 
     # Return node
     return node
 
 
+def load_node_states(nodes: List[Node]) -> None:
+    # The state of the nodes of a chain is kept in the chain's Redis hash, so
+    # the hashes of all chains are read in a single batch
+    if REDIS is None:
+        states = {}
+    else:
+        states = REDIS.hgetall_multiple(list({
+            Keys.get_hash_blockchain(node.chain) for node in nodes}))
+    for node in nodes:
+        node.load_state(logger_general,
+                        states.get(Keys.get_hash_blockchain(node.chain)))
+
+
 def test_connection_to_github_page(repo: RepoConfig):
     # Get releases page
     releases_page = InternalConf.github_releases_template.format(
@@ -104,7 +141,8 @@ def test_connection_to_github_page(repo: RepoConfig):
                                       ''.format(releases_page))
 
 
-def run_monitor_nodes(node: Node):
+def init_node_monitor(node: Node, node_monitor_type: Type[NodeMonitor]) \
+        -> NodeMonitor:
     # Monitor name based on node
     monitor_name = 'Node monitor ({})'.format(node.name)
     try:
@@ -130,16 +168,27 @@ def run_monitor_nodes(node: Node):
                 ''.format(node.name, node.chain))
 
         # Initialise monitor
-        node_monitor = NodeMonitor(
-            monitor_name, full_channel_set, logger_monitor_node,
-            InternalConf.node_monitor_max_catch_up_blocks, REDIS, node,
+        node_monitor = node_monitor_type(
+            monitor_name, full_channel_set, logger_monitor_node, REDIS, node,
             archive_alerts_disabled_by_chain[node.chain], data_sources,
-            UserConf.polkadot_api_endpoint)
+            UserConf.polkadot_api_endpoint,
+            data_source_resolver=data_source_resolvers_by_chain[node.chain],
+            chain_query_cache=chain_query_caches_by_chain[node.chain],
+            archive_scanner=archive_scanners_by_chain[node.chain],
+            query_executor=query_executor)
     except Exception as e:
         msg = '!!! Error when initialising {}: {} !!!'.format(monitor_name, e)
         log_and_print(msg)
         raise InitialisationException(msg)
 
+    return node_monitor
+
+
+def run_monitor_nodes(node: Node):
+    node_monitor = init_node_monitor(node, NodeMonitor)
+    monitor_name = node_monitor.monitor_name
+    logger_monitor_node = node_monitor.logger
+
     while True:
         # Start
         log_and_print('{} started.'.format(monitor_name))
@@ -160,7 +209,35 @@ def run_monitor_nodes(node: Node):
         log_and_print('{} stopped.'.format(monitor_name))
 
 
-def run_monitor_blockchain(blockchain_nodes_tuple: Tuple[str, List[Node]]):
+async def run_monitor_nodes_async(node: Node):
+    node_monitor = init_node_monitor(node, AsyncNodeMonitor)
+    monitor_name = node_monitor.monitor_name
+    logger_monitor_node = node_monitor.logger
+
+    while True:
+        # Start
+        log_and_print('{} started.'.format(monitor_name))
+        try:
+            await start_node_monitor_async(
+                node_monitor, InternalConf.node_monitor_period_seconds,
+                logger_monitor_node)
+        except (UnexpectedApiCallErrorException,
+                UnexpectedApiErrorWhenReadingDataException,
+                InvalidStashAccountAddressException) as e:
+            full_channel_set.alert_error(
+                TerminatedDueToFatalExceptionAlert(monitor_name, e))
+            log_and_print('{} stopped.'.format(monitor_name))
+            break
+        except Exception as e:
+            full_channel_set.alert_error(
+                TerminatedDueToExceptionAlert(monitor_name, e))
+        log_and_print('{} stopped.'.format(monitor_name))
+
+
+def init_blockchain_monitor(
+        blockchain_nodes_tuple: Tuple[str, List[Node]],
+        blockchain_monitor_type: Type[BlockchainMonitor]) \
+        -> BlockchainMonitor:
     # Get blockchain and nodes
     blockchain_name = blockchain_nodes_tuple[0]
     data_sources = blockchain_nodes_tuple[1]
@@ -180,15 +257,27 @@ def run_monitor_blockchain(blockchain_nodes_tuple: Tuple[str, List[Node]]):
         blockchain = Blockchain(blockchain_name, REDIS)
 
         # Initialise monitor
-        blockchain_monitor = BlockchainMonitor(
+        blockchain_monitor = blockchain_monitor_type(
             monitor_name, blockchain, full_channel_set,
             logger_monitor_blockchain, REDIS, data_sources,
-            UserConf.polkadot_api_endpoint)
+            UserConf.polkadot_api_endpoint,
+            data_source_resolver=data_source_resolvers_by_chain[
+                blockchain_name],
+            chain_query_cache=chain_query_caches_by_chain[blockchain_name])
     except Exception as e:
         msg = '!!! Error when initialising {}: {} !!!'.format(monitor_name, e)
         log_and_print(msg)
         raise InitialisationException(msg)
 
+    return blockchain_monitor
+
+
+def run_monitor_blockchain(blockchain_nodes_tuple: Tuple[str, List[Node]]):
+    blockchain_monitor = init_blockchain_monitor(blockchain_nodes_tuple,
+                                                 BlockchainMonitor)
+    monitor_name = blockchain_monitor.monitor_name
+    logger_monitor_blockchain = blockchain_monitor.logger
+
     while True:
         # Start
         log_and_print('{} started'.format(monitor_name))
@@ -209,6 +298,33 @@ def run_monitor_blockchain(blockchain_nodes_tuple: Tuple[str, List[Node]]):
         log_and_print('{} stopped.'.format(monitor_name))
 
 
+async def run_monitor_blockchain_async(
+        blockchain_nodes_tuple: Tuple[str, List[Node]]):
+    blockchain_monitor = init_blockchain_monitor(blockchain_nodes_tuple,
+                                                 AsyncBlockchainMonitor)
+    monitor_name = blockchain_monitor.monitor_name
+    logger_monitor_blockchain = blockchain_monitor.logger
+
+    while True:
+        # Start
+        log_and_print('{} started'.format(monitor_name))
+        try:
+            await start_blockchain_monitor_async(
+                blockchain_monitor,
+                InternalConf.blockchain_monitor_period_seconds,
+                logger_monitor_blockchain)
+        except (UnexpectedApiCallErrorException,
+                UnexpectedApiErrorWhenReadingDataException) as e:
+            full_channel_set.alert_error(
+                TerminatedDueToFatalExceptionAlert(monitor_name, e))
+            log_and_print('{} stopped.'.format(monitor_name))
+            break
+        except Exception as e:
+            full_channel_set.alert_error(
+                TerminatedDueToExceptionAlert(monitor_name, e))
+        log_and_print('{} stopped.'.format(monitor_name))
+
+
 def run_commands_telegram():
     # Fixed monitor name
     monitor_name = 'Telegram commands'
@@ -233,7 +349,9 @@ def run_commands_telegram():
         log_and_print('{} stopped.'.format(monitor_name))
 
 
-def run_monitor_github(repo_config: RepoConfig):
+def init_github_monitor(repo_config: RepoConfig,
+                        github_monitor_type: Type[GitHubMonitor]) \
+        -> GitHubMonitor:
     # Monitor name based on repository
     monitor_name = 'GitHub monitor ({})'.format(repo_config.repo_name)
 
@@ -250,7 +368,7 @@ def run_monitor_github(repo_config: RepoConfig):
             repo_config.repo_page)
 
         # Initialise monitor
-        github_monitor = GitHubMonitor(
+        github_monitor = github_monitor_type(
             monitor_name, full_channel_set, logger_monitor_github, REDIS,
             repo_config.repo_name, releases_page)
     except Exception as e:
@@ -258,6 +376,14 @@ def run_monitor_github(repo_config: RepoConfig):
         log_and_print(msg)
         raise InitialisationException(msg)
 
+    return github_monitor
+
+
+def run_monitor_github(repo_config: RepoConfig):
+    github_monitor = init_github_monitor(repo_config, GitHubMonitor)
+    monitor_name = github_monitor.monitor_name
+    logger_monitor_github = github_monitor.logger
+
     while True:
         # Start
         log_and_print('{} started.'.format(monitor_name))
@@ -271,6 +397,127 @@ def run_monitor_github(repo_config: RepoConfig):
         log_and_print('{} stopped.'.format(monitor_name))
 
 
+async def run_monitor_github_async(repo_config: RepoConfig):
+    github_monitor = init_github_monitor(repo_config, AsyncGitHubMonitor)
+    monitor_name = github_monitor.monitor_name
+    logger_monitor_github = github_monitor.logger
+
+    while True:
+        # Start
+        log_and_print('{} started.'.format(monitor_name))
+        try:
+            await start_github_monitor_async(
+                github_monitor, InternalConf.github_monitor_period_seconds,
+                logger_monitor_github)
+        except Exception as e:
+            full_channel_set.alert_error(
+                TerminatedDueToExceptionAlert(monitor_name, e))
+        log_and_print('{} stopped.'.format(monitor_name))
+
+
+def run_monitors_async():
+    # All node, blockchain and GitHub monitors run as coroutines on one event
+    # loop. As with the monitor threads, a monitor which fails to initialise
+    # does not stop the others.
+    async def run_all():
+        await asyncio.gather(
+            *[run_monitor_nodes_async(n) for n in node_monitor_nodes],
+            *[run_monitor_blockchain_async(c)
+              for c in data_sources_by_chain.items()],
+            *[run_monitor_github_async(r) for r in UserConf.filtered_repos],
+            return_exceptions=True)
+
+    asyncio.run(run_all())
+
+
+def scheduled_monitor_round(
+        monitor_name: str, run_monitor_round: Callable[[], None],
+        fatal_exceptions: Tuple = (),
+        run_again_now: Callable[[], bool] = lambda: False) \
+        -> Callable[[], bool]:
+    # Errors are handled as in the monitor threads. A fatal error stops the
+    # monitor, whereas any other error restarts it, i.e. the monitor carries on
+    # from its next round.
+    def run_round() -> bool:
+        try:
+            run_monitor_round()
+            return run_again_now()
+        except fatal_exceptions as e:
+            full_channel_set.alert_error(
+                TerminatedDueToFatalExceptionAlert(monitor_name, e))
+            log_and_print('{} stopped.'.format(monitor_name))
+            raise e
+        except Exception as e:
+            full_channel_set.alert_error(
+                TerminatedDueToExceptionAlert(monitor_name, e))
+            log_and_print('{} stopped.'.format(monitor_name))
+            log_and_print('{} started.'.format(monitor_name))
+            return False
+
+    return run_round
+
+
+def run_monitors_scheduled():
+    # The monitoring rounds of all node, blockchain and GitHub monitors are run
+    # by a central scheduler on a fixed number of threads.
+    scheduler = Scheduler(logger_general, InternalConf.scheduler_max_workers,
+                          InternalConf.scheduler_jitter_seconds)
+
+    for node in node_monitor_nodes:
+        try:
+            node_monitor = init_node_monitor(node, NodeMonitor)
+        except InitialisationException:
+            continue
+        # A node monitor which is catching up runs its next round immediately
+        scheduler.schedule(
+            node_monitor.monitor_name,
+            InternalConf.node_monitor_period_seconds,
+            scheduled_monitor_round(
+                node_monitor.monitor_name,
+                partial(run_node_monitor_round, node_monitor,
+                        node_monitor.logger),
+                (UnexpectedApiCallErrorException,
+                 UnexpectedApiErrorWhenReadingDataException,
+                 InvalidStashAccountAddressException),
+                node_monitor.is_catching_up))
+        log_and_print('{} started.'.format(node_monitor.monitor_name))
+
+    for blockchain_nodes_tuple in data_sources_by_chain.items():
+        try:
+            blockchain_monitor = init_blockchain_monitor(
+                blockchain_nodes_tuple, BlockchainMonitor)
+        except InitialisationException:
+            continue
+        scheduler.schedule(
+            blockchain_monitor.monitor_name,
+            InternalConf.blockchain_monitor_period_seconds,
+            scheduled_monitor_round(
+                blockchain_monitor.monitor_name,
+                partial(run_blockchain_monitor_round, blockchain_monitor,
+                        blockchain_monitor.logger),
+                (UnexpectedApiCallErrorException,
+                 UnexpectedApiErrorWhenReadingDataException)))
+        log_and_print('{} started'.format(blockchain_monitor.monitor_name))
+
+    for repo_config in UserConf.filtered_repos:
+        try:
+            github_monitor = init_github_monitor(repo_config, GitHubMonitor)
+        except InitialisationException:
+            continue
+        github_error_alert_limiter = TimedTaskLimiter(
+            InternalConf.github_error_interval_seconds)
+        scheduler.schedule(
+            github_monitor.monitor_name,
+            InternalConf.github_monitor_period_seconds,
+            scheduled_monitor_round(
+                github_monitor.monitor_name,
+                partial(run_github_monitor_round, github_monitor,
+                        github_error_alert_limiter, github_monitor.logger)))
+        log_and_print('{} started.'.format(github_monitor.monitor_name))
+
+    scheduler.start()
+
+
 def run_periodic_alive_reminder():
     if not UserConf.par_enabled:
         return
@@ -292,6 +539,13 @@ def run_periodic_alive_reminder():
         log_and_print('{} stopped.'.format(name))
 
 
+def stop_on_terminate(signum, _) -> None:
+    # docker stop sends SIGTERM. Exiting as on Ctrl+C unwinds the main thread
+    # so that the channels send the alerts they still buffer before stopping.
+    log_and_print('Stopping PANIC (signal {}).'.format(signum))
+    sys.exit(0)
+
+
 if __name__ == '__main__':
     if len(MISSING_INTERNAL_CONFIG_FILES) > 0:
         sys.exit('Internal config file {} is missing.'
@@ -315,24 +569,76 @@ if __name__ == '__main__':
         InternalConf.telegram_commands_general_log_file, 'commands_telegram',
         InternalConf.logging_level, rotating=True)
     log_file_alerts = InternalConf.alerts_log_file
-    polkadot_api_data_wrapper = \
-        PolkadotApiWrapper(logger_general, UserConf.polkadot_api_endpoint)
+    polkadot_api_data_wrapper = PolkadotApiWrapper(
+        logger_general, UserConf.polkadot_api_endpoint,
+        InternalConf.api_connection_pool_size,
+        InternalConf.direct_rpc_enabled)
 
     # Redis initialisation
-    if UserConf.redis_enabled:
+    redis_connection_options = {
+        'max_connections': UserConf.redis_max_connections or
+                           InternalConf.redis_max_connections,
+        'pool_timeout': InternalConf.redis_pool_timeout,
+        'socket_connect_timeout': InternalConf.redis_socket_connect_timeout,
+        'socket_timeout': InternalConf.redis_socket_timeout,
+        'socket_keepalive': InternalConf.redis_socket_keepalive,
+        'health_check_interval': InternalConf.redis_health_check_interval
+    }
+    if UserConf.redis_enabled and InternalConf.redis_write_behind_enabled:
+        REDIS = WriteBehindRedisApi(
+            logger_redis, InternalConf.redis_database, UserConf.redis_host,
+            UserConf.redis_port, password=UserConf.redis_password,
+            namespace=UserConf.unique_alerter_identifier,
+            flush_interval=InternalConf.redis_write_behind_flush_interval,
+            max_pending_writes=InternalConf
+            .redis_write_behind_max_pending_writes,
+            **redis_connection_options)
+        REDIS.start_flushing()
+    elif UserConf.redis_enabled:
         REDIS = RedisApi(
             logger_redis, InternalConf.redis_database, UserConf.redis_host,
             UserConf.redis_port, password=UserConf.redis_password,
-            namespace=UserConf.unique_alerter_identifier)
+            namespace=UserConf.unique_alerter_identifier,
+            **redis_connection_options)
     else:
         REDIS = None
 
+    # The snooze of calls is checked for every critical alert, and the mute of
+    # the alive reminder for every reminder, so these keys are cached
+    if REDIS is not None:
+        REDIS.cache_keys(
+            [Keys.get_twilio_snooze(), Keys.get_alive_reminder_mute()],
+            InternalConf.redis_cache_max_age,
+            InternalConf.redis_cache_keyspace_notifications_enabled)
+
     # Mongo DB initialisation
     if UserConf.mongo_enabled:
         MONGO = MongoApi(logger_mongo, UserConf.mongo_db_name,
                          UserConf.mongo_host, UserConf.mongo_port,
                          username=UserConf.mongo_user,
                          password=UserConf.mongo_pass)
+
+        # Ensure that the alerts collection is indexed and that alerts expire
+        # after the retention period, if any
+        if InternalConf.mongo_alerts_bucketed_storage_enabled:
+            mongo_coll_alerts = \
+                InternalConf.mongo_coll_alerts_buckets_prefix + \
+                UserConf.unique_alerter_identifier
+            mongo_alerts_indexes = ALERT_BUCKETS_INDEXES
+        else:
+            mongo_coll_alerts = InternalConf.mongo_coll_alerts_prefix + \
+                UserConf.unique_alerter_identifier
+            mongo_alerts_indexes = ALERTS_INDEXES
+        try:
+            if not ensure_alerts_indexes(MONGO, mongo_coll_alerts,
+                                         InternalConf.mongo_alerts_retention,
+                                         mongo_alerts_indexes):
+                log_and_print('Could not create the indexes of the Mongo '
+                              'alerts collection. They will be created the '
+                              'next time PANIC starts.')
+        except Exception as e:
+            log_and_print('Could not create the indexes of the Mongo alerts '
+                          'collection: {}'.format(e))
     else:
         MONGO = None
 
@@ -372,6 +678,9 @@ if __name__ == '__main__':
                 full_channel_set.alert_warning(
                     NodeInaccessibleDuringStartup(n.node_name))
 
+    # Load the state of the accessible nodes
+    load_node_states(nodes)
+
     # Remove the configs of inaccessible nodes
     for ni in nodes_inaccessible:
         UserConf.filtered_nodes.remove(ni)
@@ -429,6 +738,49 @@ if __name__ == '__main__':
                   .format(chain, chain))
         archive_alerts_disabled_by_chain[chain] = archive_alerts_disabled
 
+    # Create one data source resolver per chain, shared by all the monitors of
+    # that chain so that the data source is looked up once per cache time.
+    # Similarly, create one cache of chain-wide queries per chain.
+    # In the asyncio runtime, these are their coroutine versions.
+    monitors_run_as_coroutines = InternalConf.monitor_runtime == 'asyncio'
+    monitors_run_by_scheduler = InternalConf.monitor_runtime == 'scheduler'
+    if monitors_run_as_coroutines:
+        monitors_data_wrapper = AsyncPolkadotApiWrapper(
+            logger_general, UserConf.polkadot_api_endpoint,
+            InternalConf.api_connection_pool_size,
+            InternalConf.direct_rpc_enabled)
+        data_source_resolver_type = AsyncDataSourceResolver
+        chain_query_cache_type = AsyncChainQueryCache
+        archive_scanner_type = AsyncArchiveScanner
+        query_executor = None
+    else:
+        monitors_data_wrapper = polkadot_api_data_wrapper
+        data_source_resolver_type = DataSourceResolver
+        chain_query_cache_type = ChainQueryCache
+        archive_scanner_type = ArchiveScanner
+        # The concurrent queries of all node monitors and archive scanners
+        # are made on one pool of threads, whatever the number of nodes.
+        query_executor = concurrent.futures.ThreadPoolExecutor(
+            InternalConf.query_pool_max_workers, thread_name_prefix='query')
+    all_unique_chains = node_monitor_unique_chains | data_sources_unique_chains
+    data_source_cache_time = timedelta(
+        seconds=InternalConf.data_source_cache_seconds)
+    data_source_resolvers_by_chain = {
+        chain: data_source_resolver_type(
+            logger_general, monitors_data_wrapper, data_source_cache_time)
+        for chain in all_unique_chains}
+    chain_query_caches_by_chain = {
+        chain: chain_query_cache_type(logger_general, monitors_data_wrapper)
+        for chain in all_unique_chains}
+
+    # Create one archive scanner per chain, which checks each finalized block
+    # of the chain for slashing once for all validators of that chain.
+    archive_scanners_by_chain = {
+        chain: archive_scanner_type(
+            chain, logger_general, monitors_data_wrapper, REDIS,
+            query_executor=query_executor)
+        for chain in all_unique_chains}
+
     # Test connection to GitHub pages
     repos_inaccessible = []
     for r in UserConf.filtered_repos:
@@ -450,14 +802,43 @@ if __name__ == '__main__':
     monitor_github_count = len(UserConf.filtered_repos)
     commands_telegram_count = 1
     periodic_alive_reminder_count = 1
-    total_count = sum(
-        [monitor_node_count, monitor_github_count, monitor_blockchain_count,
-         commands_telegram_count, periodic_alive_reminder_count])
-    with concurrent.futures.ThreadPoolExecutor(max_workers=total_count) \
-            as executor:
-        executor.map(run_monitor_nodes, node_monitor_nodes)
-        executor.map(run_monitor_blockchain, data_sources_by_chain
-                     .items())
-        executor.map(run_monitor_github, UserConf.filtered_repos)
-        executor.submit(run_commands_telegram)
-        executor.submit(run_periodic_alive_reminder)
+    if monitors_run_as_coroutines or monitors_run_by_scheduler:
+        # The node, blockchain and GitHub monitors share a single thread, from
+        # which the scheduler, if used, runs its own worker threads
+        total_count = sum([1, commands_telegram_count,
+                           periodic_alive_reminder_count])
+    else:
+        total_count = sum(
+            [monitor_node_count, monitor_github_count,
+             monitor_blockchain_count, commands_telegram_count,
+             periodic_alive_reminder_count])
+    # Alerts still buffered by the channels are sent when the alerter stops,
+    # including when it is terminated
+    signal.signal(signal.SIGTERM, stop_on_terminate)
+    terminated = False
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=total_count) \
+                as executor:
+            if monitors_run_as_coroutines:
+                executor.submit(run_monitors_async)
+            elif monitors_run_by_scheduler:
+                executor.submit(run_monitors_scheduled)
+            else:
+                executor.map(run_monitor_nodes, node_monitor_nodes)
+                executor.map(run_monitor_blockchain, data_sources_by_chain
+                             .items())
+                executor.map(run_monitor_github, UserConf.filtered_repos)
+            executor.submit(run_commands_telegram)
+            executor.submit(run_periodic_alive_reminder)
+    except SystemExit:
+        terminated = True
+    finally:
+        full_channel_set.stop()
+        par_channel_set.stop()
+        # Writes still queued for Redis are sent as well, since the monitors
+        # consider them saved
+        if isinstance(REDIS, WriteBehindRedisApi):
+            REDIS.stop_flushing()
+    if terminated:
+        # The monitor threads never return, so exit without waiting for them
+        os._exit(0)
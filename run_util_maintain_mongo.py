@@ -0,0 +1,132 @@
+import json
+import sys
+from datetime import datetime, timedelta
+
+from pymongo import DESCENDING
+
+from src.store.mongo.alerts_buckets import ALERT_BUCKETS_INDEXES, \
+    BUCKETS_TO_ALERTS_STAGES, iterate_bucketed_alerts
+from src.store.mongo.alerts_indexes import ALERTS_INDEXES, \
+    ensure_alerts_indexes
+from src.store.mongo.alerts_stats import rebuild_alerts_rollup
+from src.store.mongo.mongo_api import MongoApi
+from src.utils.config_parsers.internal_parsed import InternalConf
+from src.utils.config_parsers.user_parsed import UserConf
+from src.utils.exceptions import InitialisationException
+from src.utils.logging import create_logger
+from src.utils.user_input import prompt, yn_prompt
+
+
+def _prompt_days() -> float:
+    while True:
+        days = prompt('Delete alerts older than how many days?\n')
+        try:
+            if float(days) > 0:
+                return float(days)
+        except ValueError:
+            pass
+        print('Invalid input. Please insert a number of days greater than 0.')
+
+
+def run() -> None:
+    # Check if Mongo enabled
+    if not UserConf.mongo_enabled:
+        raise InitialisationException('Mongo is not set up. Run the setup '
+                                      'script to configure Mongo.')
+
+    logger = create_logger(InternalConf.mongo_log_file, 'mongo',
+                           InternalConf.logging_level)
+
+    # With bucketed storage, the buckets collection is maintained instead
+    bucketed = InternalConf.mongo_alerts_bucketed_storage_enabled
+    bucket_length = InternalConf.mongo_alerts_bucket_length
+    if bucketed:
+        coll_alerts = InternalConf.mongo_coll_alerts_buckets_prefix + \
+            UserConf.unique_alerter_identifier
+    else:
+        coll_alerts = InternalConf.mongo_coll_alerts_prefix + \
+            UserConf.unique_alerter_identifier
+    retention = InternalConf.mongo_alerts_retention
+
+    try:
+        mongo = MongoApi(
+            logger, UserConf.mongo_db_name, UserConf.mongo_host,
+            UserConf.mongo_port, UserConf.mongo_user, UserConf.mongo_pass)
+
+        print('The "{}" collection has about {} {}.'.format(
+            coll_alerts, mongo.count(coll_alerts),
+            'buckets of alerts' if bucketed else 'alerts'))
+
+        # Create any missing indexes and update the retention of alerts
+        print('Creating the indexes of the "{}" collection.'.format(
+            coll_alerts))
+        ensure_alerts_indexes(
+            mongo, coll_alerts, retention,
+            ALERT_BUCKETS_INDEXES if bucketed else ALERTS_INDEXES)
+        for name, index in mongo.get_indexes(coll_alerts).items():
+            print('  {}: {}'.format(name, index['key']))
+        if retention is None:
+            print('Alerts are kept forever, since alerts_retention_days is 0.')
+        else:
+            print('Alerts expire after {:g} days.'.format(
+                retention / timedelta(days=1)))
+
+        # Alerts are read a batch at a time, so any number of them can be
+        # exported
+        if yn_prompt('Do you want to export the alerts to a file? (Y/n)\n'):
+            file_path = prompt('Please insert the path of the file.\n')
+            if bucketed:
+                alerts = iterate_bucketed_alerts(mongo, coll_alerts,
+                                                 bucket_length)
+            else:
+                alerts = mongo.iterate(
+                    coll_alerts, projection={'_id': 0, 'created_at': 0},
+                    sort=[('timestamp', DESCENDING)])
+            exported = 0
+            with open(file_path, 'w') as file:
+                for alert in alerts:
+                    file.write(json.dumps(alert) + '\n')
+                    exported += 1
+            print('Exported {} alerts to {}, newest first, one JSON object '
+                  'per line.'.format(exported, file_path))
+
+        # Alerts saved before the retention was set up have no date, so they
+        # can only be deleted by their timestamp
+        if yn_prompt('Do you want to delete old alerts? (Y/n)\n'):
+            days = _prompt_days()
+            min_timestamp = (datetime.now() - timedelta(days=days)).timestamp()
+            if bucketed:
+                # Only buckets which end before the time are deleted
+                deleted = mongo.delete_many(coll_alerts, {'start': {
+                    '$lt': min_timestamp - bucket_length.total_seconds()}})
+                print('Deleted {} buckets of alerts older than {} days.'
+                      ''.format(deleted, days))
+            else:
+                deleted = mongo.delete_many(
+                    coll_alerts, {'timestamp': {'$lt': min_timestamp}})
+                print('Deleted {} alerts older than {} days.'.format(
+                    deleted, days))
+
+        # The rollup keeps counting alerts after they are deleted, so a
+        # rebuilt rollup only counts the alerts which are still kept. Alerts
+        # inserted while the rollup is rebuilt may be counted twice.
+        if InternalConf.mongo_alerts_rollup_enabled and yn_prompt(
+                'Do you want to rebuild the alert counts of the rollup from '
+                'the alerts? Counts of deleted alerts will be lost. (Y/n)\n'):
+            coll_rollup = InternalConf.mongo_coll_alerts_rollup_prefix + \
+                UserConf.unique_alerter_identifier
+            rebuild_alerts_rollup(
+                mongo, coll_alerts, coll_rollup,
+                BUCKETS_TO_ALERTS_STAGES if bucketed else None)
+            print('Rebuilt the "{}" collection.'.format(coll_rollup))
+    except Exception as e:
+        sys.exit(e)
+
+    print('Done maintaining the "{}" collection.'.format(coll_alerts))
+
+
+if __name__ == '__main__':
+    try:
+        run()
+    except InitialisationException as ie:
+        sys.exit(ie)
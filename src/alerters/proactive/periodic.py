@@ -25,6 +25,6 @@ class PeriodicAliveReminder:
     def send_alive_alert(self) -> None:
         # If it is not the case that Redis is enabled and the reminder is muted,
         # inform the node operator that the alerter is still running.
-        if not (self._redis_enabled and
-                self._redis.exists(Keys.get_alive_reminder_mute())):
+        if not (self._redis_enabled and self._redis.get_cached(
+                Keys.get_alive_reminder_mute()) is not None):
             self._channel_set.alert_info(AlerterAliveAlert())
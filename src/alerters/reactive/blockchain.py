@@ -1,24 +1,30 @@
 import logging
-from typing import Optional
+from typing import Optional, Dict
 
 from src.alerts.alerts import NewReferendumAlert, \
     NewCouncilProposalAlert, NewPublicProposalAlert, \
     ValidatorSetSizeDecreasedAlert, ValidatorSetSizeIncreasedAlert
 from src.channels.channel import ChannelSet
-from src.store.redis.redis_api import RedisApi
+from src.store.redis.redis_api import RedisApi, RedisValues
+from src.store.redis.saved_state import SavedState
 from src.store.store_keys import Keys
+from src.utils.config_parsers.internal import InternalConfig
+from src.utils.config_parsers.internal_parsed import InternalConf
 from src.utils.parsing import parse_int_from_string
-from src.utils.types import PolkadotWrapperType
+from src.utils.types import PolkadotWrapperType, RedisType
 
 
 class Blockchain:
-    def __init__(self, name: str, redis: Optional[RedisApi]) -> None:
+    def __init__(self, name: str, redis: Optional[RedisApi],
+                 internal_conf: InternalConfig = InternalConf) -> None:
         super().__init__()
 
         self.name = name
         self._redis = redis
         self._redis_enabled = redis is not None
         self._redis_hash = Keys.get_hash_blockchain(name)
+        self._saved_state = SavedState(
+            internal_conf.redis_full_state_save_interval)
 
         self._referendum_count = None
         self._public_prop_count = None
@@ -28,6 +34,10 @@ class Blockchain:
     def __str__(self) -> str:
         return self.name
 
+    @property
+    def redis_hash(self) -> str:
+        return self._redis_hash
+
     @property
     def referendum_count(self) -> int:
         return self._referendum_count
@@ -50,20 +60,22 @@ class Blockchain:
                "".format(self._referendum_count, self._public_prop_count,
                          self._council_prop_count, self._validator_set_size)
 
-    def load_state(self, logger: logging.Logger) -> None:
-        # If Redis is enabled, load any previously stored state
+    def load_state(self, logger: logging.Logger,
+                   state: Optional[RedisValues] = None) -> None:
+        # If Redis is enabled, load any previously stored state, reading the
+        # blockchain's hash in one go unless it was already read
         if self._redis_enabled:
-            self._referendum_count = self._redis.hget_int(
-                self._redis_hash,
+            if state is None:
+                state = self._redis.hgetall(self._redis_hash)
+            self._saved_state.clear()
+
+            self._referendum_count = state.get_int(
                 Keys.get_blockchain_referendum_count(self.name), None)
-            self._public_prop_count = self._redis.hget_int(
-                self._redis_hash,
+            self._public_prop_count = state.get_int(
                 Keys.get_blockchain_public_prop_count(self.name), None)
-            self._council_prop_count = self._redis.hget_int(
-                self._redis_hash,
+            self._council_prop_count = state.get_int(
                 Keys.get_blockchain_council_prop_count(self.name), None)
-            self._validator_set_size = self._redis.hget_int(
-                self._redis_hash,
+            self._validator_set_size = state.get_int(
                 Keys.get_blockchain_validator_set_size(self.name), None)
 
             logger.debug(
@@ -74,7 +86,17 @@ class Blockchain:
                 self._council_prop_count, self._validator_set_size)
 
     def save_state(self, logger: logging.Logger) -> None:
-        # If Redis is enabled, store the current state
+        # If Redis is enabled, store the values which changed since they were
+        # last saved
+        changes = self.get_state_changes(logger)
+        if len(changes) > 0 and self._redis.hset_multiple(
+                self._redis_hash, changes) is not None:
+            self.set_state_changes_saved(changes)
+
+    def get_state_changes(self, logger: logging.Logger) \
+            -> Dict[str, RedisType]:
+        # As for nodes, the fields of the blockchain's hash (redis_hash) which
+        # changed since they were last saved
         if self._redis_enabled:
             logger.debug(
                 'Saving %s state: _referendum_count=%s, '
@@ -83,8 +105,7 @@ class Blockchain:
                 self.name, self._referendum_count, self._public_prop_count,
                 self._council_prop_count, self._validator_set_size)
 
-            # Set values
-            self._redis.hset_multiple(self._redis_hash, {
+            return self._saved_state.changes({
                 Keys.get_blockchain_referendum_count(self.name):
                     self._referendum_count,
                 Keys.get_blockchain_public_prop_count(self.name):
@@ -94,6 +115,10 @@ class Blockchain:
                 Keys.get_blockchain_validator_set_size(self.name):
                     self._validator_set_size
             })
+        return {}
+
+    def set_state_changes_saved(self, changes: Dict[str, RedisType]) -> None:
+        self._saved_state.saved(changes)
 
     def set_referendum_count(self, new_referendum_count: int,
                              channels: ChannelSet, logger: logging.Logger,
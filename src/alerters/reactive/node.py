@@ -1,17 +1,20 @@
 import logging
 from datetime import timedelta
-from typing import Optional
+from typing import Optional, Dict, Any, List, Tuple
 
 from src.alerts.alerts import *
 from src.channels.channel import ChannelSet
-from src.store.redis.redis_api import RedisApi
+from src.store.redis.compact_state import CompactStateCodec
+from src.store.redis.redis_api import RedisApi, RedisValues
+from src.store.redis.saved_state import SavedState
+from src.store.redis.time_series import TimeSeriesSamples
 from src.store.store_keys import *
 from src.utils.config_parsers.internal import InternalConfig
 from src.utils.config_parsers.internal_parsed import InternalConf
 from src.utils.datetime import strfdelta
 from src.utils.scaling import scale_to_tera, scale_to_pico
 from src.utils.timing import TimedTaskLimiter
-from src.utils.types import NONE
+from src.utils.types import NONE, RedisType
 
 
 class NodeType(Enum):
@@ -20,6 +23,28 @@ class NodeType(Enum):
 
 
 class Node:
+    # The state of a node in the compact layout, by the name of the attribute
+    # holding each value. A new codec version is needed to change the fields.
+    _state_codec = CompactStateCodec(1, [
+        ('_went_down_at', float),
+        ('_bonded_balance', int),
+        ('_is_syncing', bool),
+        ('_no_of_peers', int),
+        ('_active', bool),
+        ('_council_member', bool),
+        ('_elected', bool),
+        ('_disabled', bool),
+        ('_no_of_blocks_authored', int),
+        ('_time_of_last_block', float),
+        ('_is_authoring', bool),
+        ('_time_of_last_block_check_activity', float),
+        ('_time_of_last_height_check_activity', float),
+        ('_time_of_last_height_change', float),
+        ('_finalized_block_height', int),
+        ('_no_change_in_height_warning_sent', bool),
+        ('_auth_index', int),
+    ])
+
     def __init__(self, name: str, ws_url: Optional[str], node_type: NodeType,
                  stash_account_address: Optional[str], chain: str,
                  redis: Optional[RedisApi], is_archive_node: bool,
@@ -34,6 +59,18 @@ class Node:
         self._redis = redis
         self._redis_enabled = redis is not None
         self._redis_hash = Keys.get_hash_blockchain(self.chain)
+        self._saved_state = SavedState(
+            internal_conf.redis_full_state_save_interval)
+        self._compact_state_enabled = \
+            internal_conf.redis_compact_node_state_enabled
+
+        # Samples of some of the node's values, kept as time series. These
+        # are saved by the node monitor together with the node's state.
+        self._metrics_enabled = self._redis_enabled and \
+            internal_conf.redis_node_metrics_enabled
+        self._metric_samples = TimeSeriesSamples(
+            internal_conf.redis_node_metrics_retention,
+            internal_conf.redis_node_metrics_trim_interval)
         self._connected_to_api_server = True
 
         self._went_down_at = None
@@ -84,6 +121,10 @@ class Node:
     def __str__(self) -> str:
         return self.name
 
+    @property
+    def redis_hash(self) -> str:
+        return self._redis_hash
+
     @property
     def is_validator(self) -> bool:
         return self._node_type == NodeType.VALIDATOR_FULL_NODE
@@ -207,52 +248,107 @@ class Node:
                    self.is_disabled, self.no_of_blocks_authored,
                    self.finalized_block_height)
 
-    def load_state(self, logger: logging.Logger) -> None:
-        # If Redis is enabled, load any previously stored state
+    def _get_state(self) -> Dict[str, Any]:
+        return {name: getattr(self, name)
+                for name in self._state_codec.field_names}
+
+    def _set_state(self, values: Dict[str, Any]) -> None:
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def _load_legacy_state(self, state: RedisValues) -> None:
+        # Loads the state stored as one hash field per value
+        self._went_down_at = state.get_float(
+            Keys.get_node_went_down_at(self.name), None)
+        self._bonded_balance = state.get_int(
+            Keys.get_node_bonded_balance(self.name), None)
+        self._is_syncing = state.get_bool(
+            Keys.get_node_is_syncing(self.name), False)
+        self._no_of_peers = state.get_int(
+            Keys.get_node_no_of_peers(self.name), None)
+        self._active = state.get_bool(
+            Keys.get_node_active(self.name), None)
+        self._council_member = state.get_bool(
+            Keys.get_node_council_member(self.name), None)
+        self._elected = state.get_bool(
+            Keys.get_node_elected(self.name), None)
+        self._disabled = state.get_bool(
+            Keys.get_node_disabled(self.name), None)
+        self._no_of_blocks_authored = state.get_int(
+            Keys.get_node_blocks_authored(self.name), 0)
+        self._time_of_last_block = state.get_float(
+            Keys.get_node_time_of_last_block(self.name), NONE)
+        self._is_authoring = state.get_bool(
+            Keys.get_node_is_authoring(self.name), True)
+        self._time_of_last_block_check_activity = state.get_float(
+            Keys.get_node_time_of_last_block_check_activity(self.name),
+            NONE)
+        self._time_of_last_height_check_activity = state.get_float(
+            Keys.get_node_time_of_last_height_check_activity(self.name),
+            NONE)
+        self._time_of_last_height_change = state.get_float(
+            Keys.get_node_time_of_last_height_change(self.name), NONE)
+        self._finalized_block_height = state.get_int(
+            Keys.get_node_finalized_block_height(self.name), 0)
+        self._no_change_in_height_warning_sent = state.get_bool(
+            Keys.get_node_no_change_in_height_warning_sent(self.name),
+            False)
+        self._auth_index = state.get_int(
+            Keys.get_node_auth_index(self.name), NONE)
+
+    def _get_state_to_save(self) -> Dict[str, RedisType]:
+        # The state in the layout in use: one compact value for the node, or
+        # one hash field per value
+        if self._compact_state_enabled:
+            return {Keys.get_node_state(self.name):
+                        self._state_codec.encode(self._get_state())}
+        return self._get_legacy_state()
+
+    def _migrate_state(self, logger: logging.Logger,
+                       state: RedisValues) -> None:
+        # Moves the state to the layout in use if any of it was stored in the
+        # other layout, for example after enabling the compact node state
+        if self._compact_state_enabled:
+            other_layout_keys = [key for key in self._get_legacy_state()
+                                 if key in state]
+        else:
+            other_layout_keys = [key for key in [Keys.get_node_state(
+                self.name)] if key in state]
+        if len(other_layout_keys) == 0:
+            return
+
+        logger.info('Moving the Redis state of %s to the %s layout.',
+                    self.name,
+                    'compact' if self._compact_state_enabled else 'previous')
+        state_to_save = self._get_state_to_save()
+        if self._redis.replace_hash_fields(
+                self._redis_hash, state_to_save,
+                other_layout_keys) is not None:
+            self._saved_state.saved(state_to_save)
+
+    def load_state(self, logger: logging.Logger,
+                   state: Optional[RedisValues] = None) -> None:
+        # If Redis is enabled, load any previously stored state. The state of
+        # all nodes of a chain is kept in the chain's hash, which is read in
+        # one go unless it was already read for several nodes at once.
         if self._redis_enabled:
-            self._went_down_at = self._redis.hget(
-                self._redis_hash, Keys.get_node_went_down_at(self.name), None)
-            self._bonded_balance = self._redis.hget_int(
-                self._redis_hash, Keys.get_node_bonded_balance(self.name), None)
-            self._is_syncing = self._redis.hget_bool(
-                self._redis_hash, Keys.get_node_is_syncing(self.name), False)
-            self._no_of_peers = self._redis.hget_int(
-                self._redis_hash, Keys.get_node_no_of_peers(self.name), None)
-            self._active = self._redis.hget_bool(
-                self._redis_hash, Keys.get_node_active(self.name), None)
-            self._council_member = self._redis.hget_bool(
-                self._redis_hash, Keys.get_node_council_member(self.name), None)
-            self._elected = self._redis.hget_bool(
-                self._redis_hash, Keys.get_node_elected(self.name), None)
-            self._disabled = self._redis.hget_bool(
-                self._redis_hash, Keys.get_node_disabled(self.name), None)
-            self._no_of_blocks_authored = self._redis.hget_int(
-                self._redis_hash, Keys.get_node_blocks_authored(self.name), 0)
-            self._time_of_last_block = float(self._redis.hget(
-                self._redis_hash,
-                Keys.get_node_time_of_last_block(self.name), NONE))
-            self._is_authoring = self._redis.hget_bool(
-                self._redis_hash, Keys.get_node_is_authoring(self.name), True)
-            self._time_of_last_block_check_activity = float(self._redis.hget(
-                self._redis_hash,
-                Keys.get_node_time_of_last_block_check_activity(self.name),
-                NONE))
-            self._time_of_last_height_check_activity = float(self._redis.hget(
-                self._redis_hash,
-                Keys.get_node_time_of_last_height_check_activity(self.name),
-                NONE))
-            self._time_of_last_height_change = float(self._redis.hget(
-                self._redis_hash,
-                Keys.get_node_time_of_last_height_change(self.name), NONE))
-            self._finalized_block_height = self._redis.hget_int(
-                self._redis_hash,
-                Keys.get_node_finalized_block_height(self.name), 0)
-            self._no_change_in_height_warning_sent = self._redis.hget_bool(
-                self._redis_hash,
-                Keys.get_node_no_change_in_height_warning_sent(self.name),
-                False)
-            self._auth_index = self._redis.hget_int(
-                self._redis_hash, Keys.get_node_auth_index(self.name), NONE)
+            if state is None:
+                state = self._redis.hgetall(self._redis_hash)
+            self._saved_state.clear()
+
+            # The state is loaded from whichever layout it is stored in
+            compact_state = state.get(Keys.get_node_state(self.name))
+            loaded = False
+            if compact_state is not None:
+                try:
+                    self._set_state(self._state_codec.decode(compact_state))
+                    loaded = True
+                except ValueError as e:
+                    logger.error('Could not decode the compact state of %s: '
+                                 '%s. Loading the previous layout instead.',
+                                 self.name, e)
+            if not loaded:
+                self._load_legacy_state(state)
 
             if self._time_of_last_block_check_activity != NONE:
                 self.blocks_authored_alert_limiter. \
@@ -269,10 +365,6 @@ class Node:
                 self._finalized_height_alert_limiter.did_task()
                 self._time_of_last_height_change = datetime.now().timestamp()
 
-            # To avoid the return of byte hget values.
-            if self._went_down_at is not None:
-                self._went_down_at = float(self._went_down_at)
-
             logger.debug(
                 'Restored %s state: _went_down_at=%s,  _bonded_balance=%s, '
                 '_is_syncing=%s, _no_of_peers=%s, _active=%s, _council_member'
@@ -293,8 +385,21 @@ class Node:
                 self._finalized_block_height,
                 self._no_change_in_height_warning_sent, self._auth_index)
 
+            self._migrate_state(logger, state)
+
     def save_state(self, logger: logging.Logger) -> None:
-        # If Redis is enabled, store the current state
+        # If Redis is enabled, store the values which changed since they were
+        # last saved
+        changes = self.get_state_changes(logger)
+        if len(changes) > 0 and self._redis.hset_multiple(
+                self._redis_hash, changes) is not None:
+            self.set_state_changes_saved(changes)
+
+    def get_state_changes(self, logger: logging.Logger) \
+            -> Dict[str, RedisType]:
+        # The fields of the node's hash (redis_hash) which changed since they
+        # were last saved, for the node's state to be saved together with
+        # other state. Once saved, set_state_changes_saved should be called.
         if self._redis_enabled:
             logger.debug(
                 'Saving %s state: _went_down_at=%s,  _bonded_balance=%s, '
@@ -316,34 +421,62 @@ class Node:
                 self._finalized_block_height,
                 self._no_change_in_height_warning_sent, self._auth_index)
 
-            # Set values
-            self._redis.hset_multiple(self._redis_hash, {
-                Keys.get_node_went_down_at(self.name): str(self._went_down_at),
-                Keys.get_node_bonded_balance(self.name): self._bonded_balance,
-                Keys.get_node_is_syncing(self.name): str(self._is_syncing),
-                Keys.get_node_no_of_peers(self.name): self._no_of_peers,
-                Keys.get_node_active(self.name): str(self._active),
-                Keys.get_node_council_member(self.name):
-                    str(self._council_member),
-                Keys.get_node_elected(self.name): str(self._elected),
-                Keys.get_node_disabled(self.name): str(self._disabled),
-                Keys.get_node_blocks_authored(self.name):
-                    self._no_of_blocks_authored,
-                Keys.get_node_time_of_last_block(self.name):
-                    self._time_of_last_block,
-                Keys.get_node_is_authoring(self.name): str(self._is_authoring),
-                Keys.get_node_time_of_last_block_check_activity(self.name):
-                    self._time_of_last_block_check_activity,
-                Keys.get_node_time_of_last_height_check_activity(self.name):
-                    self._time_of_last_height_check_activity,
-                Keys.get_node_time_of_last_height_change(self.name):
-                    self._time_of_last_height_change,
-                Keys.get_node_finalized_block_height(self.name):
-                    self._finalized_block_height,
-                Keys.get_node_no_change_in_height_warning_sent(self.name):
-                    str(self._no_change_in_height_warning_sent),
-                Keys.get_node_auth_index(self.name): self._auth_index
-            })
+            return self._saved_state.changes(self._get_state_to_save())
+        return {}
+
+    def set_state_changes_saved(self, changes: Dict[str, RedisType]) -> None:
+        self._saved_state.saved(changes)
+
+    def _add_metric_sample(self, name: str, value: Optional[int]) -> None:
+        if self._metrics_enabled and value is not None:
+            self._metric_samples.add(name, value, datetime.now().timestamp())
+
+    def get_metric_samples(self) -> Dict[str, Dict[str, float]]:
+        # The samples of the node's values which were not saved yet, as the
+        # scores of the sorted sets holding the time series. Once saved,
+        # set_metric_samples_saved should be called.
+        return self._metric_samples.pending()
+
+    def set_metric_samples_saved(self, samples: Dict[str, Dict[str, float]]) \
+            -> None:
+        self._metric_samples.saved(samples)
+
+    def get_metric_series_to_trim(self) -> Optional[Tuple[List[str], float]]:
+        # The time series of the node and the time before which their samples
+        # should be removed, if they are due to be trimmed
+        if not self._metrics_enabled:
+            return None
+        return self._metric_samples.to_trim(datetime.now().timestamp())
+
+    def _get_legacy_state(self) -> Dict[str, RedisType]:
+        # The state stored as one hash field per value
+        return {
+            Keys.get_node_went_down_at(self.name): str(self._went_down_at),
+            Keys.get_node_bonded_balance(self.name): self._bonded_balance,
+            Keys.get_node_is_syncing(self.name): str(self._is_syncing),
+            Keys.get_node_no_of_peers(self.name): self._no_of_peers,
+            Keys.get_node_active(self.name): str(self._active),
+            Keys.get_node_council_member(self.name):
+                str(self._council_member),
+            Keys.get_node_elected(self.name): str(self._elected),
+            Keys.get_node_disabled(self.name): str(self._disabled),
+            Keys.get_node_blocks_authored(self.name):
+                self._no_of_blocks_authored,
+            Keys.get_node_time_of_last_block(self.name):
+                self._time_of_last_block,
+            Keys.get_node_is_authoring(self.name): str(self._is_authoring),
+            Keys.get_node_time_of_last_block_check_activity(self.name):
+                self._time_of_last_block_check_activity,
+            Keys.get_node_time_of_last_height_check_activity(self.name):
+                self._time_of_last_height_check_activity,
+            Keys.get_node_time_of_last_height_change(self.name):
+                self._time_of_last_height_change,
+            Keys.get_node_finalized_block_height(self.name):
+                self._finalized_block_height,
+            Keys.get_node_no_change_in_height_warning_sent(self.name):
+                str(self._no_change_in_height_warning_sent),
+            Keys.get_node_auth_index(self.name): self._auth_index
+        }
 
     def set_as_down(self, channels: ChannelSet, logger: logging.Logger) -> None:
 
@@ -427,6 +560,8 @@ class Node:
 
         # Update bonded balance
         self._bonded_balance = new_bonded_balance
+        self._add_metric_sample(Keys.get_zset_node_bonded_balance(self.name),
+                                new_bonded_balance)
 
     def set_is_syncing(self, now_is_syncing: bool, channels: ChannelSet,
                        logger: logging.Logger) -> None:
@@ -497,6 +632,8 @@ class Node:
 
         # Update number of peers
         self._no_of_peers = new_no_of_peers
+        self._add_metric_sample(Keys.get_zset_node_no_of_peers(self.name),
+                                new_no_of_peers)
 
     def set_active(self, now_is_active: bool, channels: ChannelSet,
                    logger: logging.Logger) -> None:
@@ -585,6 +722,10 @@ class Node:
                 self._time_of_last_block_check_activity = \
                     datetime.now().timestamp()
 
+        self._add_metric_sample(
+            Keys.get_zset_node_blocks_authored(self.name),
+            self._no_of_blocks_authored)
+
     def reset_no_of_blocks_authored(self, channels: ChannelSet,
                                     logger: logging.Logger):
         # NOTE: This function assumes that the node is a validator.
@@ -649,6 +790,10 @@ class Node:
                     set_last_time_that_did_task(
                     datetime.fromtimestamp(current_timestamp))
 
+        self._add_metric_sample(
+            Keys.get_zset_node_finalized_block_height(self.name),
+            new_finalized_height)
+
     def set_disabled(self, now_is_disabled: bool, session: int,
                      channels: ChannelSet, logger: logging.Logger):
         # NOTE: This function assumes that the node is a validator.
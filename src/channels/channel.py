@@ -27,6 +27,11 @@ class Channel:
     def alert_error(self, alert: Alert) -> None:
         pass
 
+    def stop(self) -> None:
+        # Called when the alerter stops, so that any alerts held by the
+        # channel are sent
+        pass
+
     @property
     def channel_name(self) -> str:
         return self._channel_name
@@ -130,3 +135,11 @@ class ChannelSet:
                 except Exception as e:
                     c.logger.error('Error in alert_error of %s (%s): %s',
                                    type(c).__name__, c.channel_name, e)
+
+    def stop(self) -> None:
+        for c in self._channels:
+            try:
+                c.stop()
+            except Exception as e:
+                c.logger.error('Error in stop of %s (%s): %s',
+                               type(c).__name__, c.channel_name, e)
@@ -1,11 +1,22 @@
 import logging
-from datetime import datetime
-from typing import Optional
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from src.alerts.alerts import Alert, ProblemWithMongo
 from src.channels.channel import Channel, ChannelSet
+from src.store.mongo.alerts_buckets import alert_bucket_updates
+from src.store.mongo.alerts_indexes import ALERTS_TTL_FIELD
+from src.store.mongo.alerts_stats import alerts_rollup_updates
 from src.store.mongo.mongo_api import MongoApi
 from src.store.redis.redis_api import RedisApi
+from src.utils.timing import TimedTaskLimiter
+
+DUPLICATE_KEY_ERROR = 11000
 
 
 class MongoChannel(Channel):
@@ -13,24 +24,89 @@ class MongoChannel(Channel):
     def __init__(self, channel_name: str, logger: logging.Logger,
                  redis: Optional[RedisApi], mongo: MongoApi,
                  mongo_collection_name: str,
-                 backup_channels: ChannelSet) -> None:
+                 backup_channels: ChannelSet,
+                 mongo_rollup_collection_name: Optional[str] = None,
+                 bucket_length: Optional[timedelta] = None,
+                 max_alerts_per_bucket: int = 1000) -> None:
+        # If a bucket length is given, the collection holds buckets of alerts
+        # rather than one document per alert
         super().__init__(channel_name, logger, redis)
 
         self._mongo = mongo
         self._mongo_coll = mongo_collection_name
+        self._mongo_rollup_coll = mongo_rollup_collection_name
+        self._bucket_length = bucket_length
+        self._max_alerts_per_bucket = max_alerts_per_bucket
         self._backup_channels = backup_channels
 
+    def _alert_document(self, alert: Alert, severity: str) -> Dict:
+        # The date is used to expire alerts after the retention period
+        now = datetime.now(timezone.utc)
+        return {
+            'origin': self.channel_name,
+            'severity': severity,
+            'message': alert.message,
+            'alert_code': alert.alert_code.name,
+            'timestamp': now.timestamp(),
+            ALERTS_TTL_FIELD: now
+        }
+
+    def _bucket_updates(self, documents: List[Dict]) \
+            -> List[Tuple[UpdateOne, List[Dict]]]:
+        return alert_bucket_updates(documents, self._bucket_length,
+                                    self._max_alerts_per_bucket)
+
+    def _insert(self, documents: List[Dict]):
+        # Inserts the alerts in one unordered write, as documents of their own
+        # or appended to the buckets of their origin. Returns None if Mongo is
+        # unusable.
+        if self._bucket_length is None:
+            return self._mongo.insert_many(self._mongo_coll, documents,
+                                           ordered=False)
+        return self._mongo.bulk_write(
+            self._mongo_coll,
+            [update for update, _ in self._bucket_updates(documents)],
+            ordered=False)
+
+    def _inserted(self, documents: List[Dict],
+                  error: BulkWriteError) -> List[Dict]:
+        # The alerts which were inserted by a write which partly failed. An
+        # alert which is a duplicate of one already inserted counts as
+        # inserted. When bucketed, the errors are those of the bucket updates.
+        failed = {write_error['index']
+                  for write_error in error.details.get('writeErrors', [])
+                  if write_error.get('code') != DUPLICATE_KEY_ERROR}
+        if self._bucket_length is None:
+            return [document for i, document in enumerate(documents)
+                    if i not in failed]
+        return [document for i, (_, bucket_documents)
+                in enumerate(self._bucket_updates(documents))
+                if i not in failed for document in bucket_documents]
+
+    def _update_rollup(self, documents: List[Dict]) -> None:
+        # Adds the inserted alerts to the alert counts of the rollup, if any
+        if self._mongo_rollup_coll is None or len(documents) == 0:
+            return
+        try:
+            self._mongo.bulk_write(self._mongo_rollup_coll,
+                                   alerts_rollup_updates(documents),
+                                   ordered=False)
+        except Exception as e:
+            self._logger.error('Could not add %s alerts to the rollup: %s',
+                               len(documents), e)
+
     def _alert(self, alert: Alert, severity: str) -> None:
+        document = self._alert_document(alert, severity)
         try:
-            ret = self._mongo.insert_one(self._mongo_coll, {
-                'origin': self.channel_name,
-                'severity': severity,
-                'message': alert.message,
-                'timestamp': datetime.now().timestamp()
-            })
-            # TODO: add checks around 'ret', if necessary
+            if self._bucket_length is None:
+                ret = self._mongo.insert_one(self._mongo_coll, document)
+            else:
+                ret = self._insert([document])
         except Exception as e:
             self._backup_channels.alert_error(ProblemWithMongo(e))
+            return
+        if ret is not None:
+            self._update_rollup([document])
 
     def alert_info(self, alert: Alert) -> None:
         self._alert(alert=alert, severity='INFO')
@@ -43,3 +119,137 @@ class MongoChannel(Channel):
 
     def alert_error(self, alert: Alert) -> None:
         self._alert(alert=alert, severity='ERROR')
+
+
+class BufferedMongoChannel(MongoChannel):
+    # Mongo channel whose alerts are buffered rather than inserted, so that
+    # alerting never waits for Mongo. A background thread inserts the buffered
+    # alerts with one unordered insert_many every flush interval, or as soon as
+    # batch_size alerts are buffered.
+    #
+    # The buffer holds up to max_pending_alerts alerts, after which the oldest
+    # alert is dropped for every new one. Alerts which are not inserted since
+    # Mongo is unusable are buffered again, ahead of newer alerts. If alerts
+    # are bucketed, those of a write which timed out after Mongo applied it
+    # are thus appended to their bucket twice.
+
+    def __init__(self, channel_name: str, logger: logging.Logger,
+                 redis: Optional[RedisApi], mongo: MongoApi,
+                 mongo_collection_name: str, backup_channels: ChannelSet,
+                 flush_interval: timedelta = timedelta(seconds=1),
+                 batch_size: int = 100,
+                 max_pending_alerts: int = 10000,
+                 mongo_rollup_collection_name: Optional[str] = None,
+                 bucket_length: Optional[timedelta] = None,
+                 max_alerts_per_bucket: int = 1000) -> None:
+        super().__init__(channel_name, logger, redis, mongo,
+                         mongo_collection_name, backup_channels,
+                         mongo_rollup_collection_name, bucket_length,
+                         max_alerts_per_bucket)
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._max_pending_alerts = max_pending_alerts
+
+        self._pending_lock = threading.Lock()
+        self._pending = deque(maxlen=max_pending_alerts)  # type: Deque[Dict]
+        self._buffer_full_warning_limiter = TimedTaskLimiter(
+            timedelta(seconds=60))
+
+        self._flush_lock = threading.Lock()
+        self._flush_now = threading.Event()
+        self._stop_flushing = threading.Event()
+        self._flusher = None  # type: Optional[threading.Thread]
+
+    @property
+    def no_of_pending_alerts(self) -> int:
+        return len(self._pending)
+
+    def _warn_buffer_full(self, no_of_alerts_dropped: int) -> None:
+        if self._buffer_full_warning_limiter.can_do_task():
+            self._buffer_full_warning_limiter.did_task()
+            self._logger.warning(
+                'Mongo alert buffer is full (%s alerts pending). The %s '
+                'oldest alerts were dropped.', self._max_pending_alerts,
+                no_of_alerts_dropped)
+
+    def _buffer(self, documents: List[Dict]) -> None:
+        # Buffers the documents ahead of the alerts already buffered
+        with self._pending_lock:
+            pending = documents + list(self._pending)
+            self._pending = deque(pending, maxlen=self._max_pending_alerts)
+        if len(pending) > self._max_pending_alerts:
+            self._warn_buffer_full(len(pending) - self._max_pending_alerts)
+
+    def _alert(self, alert: Alert, severity: str) -> None:
+        document = self._alert_document(alert, severity)
+        with self._pending_lock:
+            buffer_full = len(self._pending) == self._max_pending_alerts
+            self._pending.append(document)
+            # Only woken when the batch fills up, so that alerts buffered
+            # again while Mongo is unusable do not cause a flush per alert
+            batch_full = len(self._pending) == self._batch_size
+        if buffer_full:
+            self._warn_buffer_full(1)
+        if batch_full:
+            self._flush_now.set()
+
+    def flush(self) -> bool:
+        # Inserts all buffered alerts. Returns False if they could not be
+        # inserted, in which case they are buffered again.
+        with self._flush_lock:
+            with self._pending_lock:
+                documents = list(self._pending)
+                self._pending.clear()
+
+            if len(documents) == 0:
+                return True
+
+            try:
+                ret = self._insert(documents)
+            except BulkWriteError as e:
+                # The other alerts were inserted. Those which failed are not
+                # buffered again since they would fail again, for example if
+                # they were inserted by an earlier flush which timed out, as
+                # insert_many gives each document an _id before inserting it.
+                # Such alerts are only added to the rollup now.
+                self._update_rollup(self._inserted(documents, e))
+                self._backup_channels.alert_error(ProblemWithMongo(e))
+                return False
+            except Exception as e:
+                self._backup_channels.alert_error(ProblemWithMongo(e))
+                ret = None
+
+            if ret is None:
+                self._buffer(documents)
+                return False
+            self._update_rollup(documents)
+            return True
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flushing.is_set():
+            self._flush_now.wait(self._flush_interval.total_seconds())
+            self._flush_now.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self._logger.error('Error when flushing Mongo alerts: %s', e)
+
+    def start_flushing(self) -> None:
+        if self._flusher is None:
+            self._stop_flushing.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name='mongo_alert_buffer',
+                daemon=True)
+            self._flusher.start()
+
+    def stop_flushing(self) -> None:
+        # Stops the background flushes and inserts any alerts still buffered
+        if self._flusher is not None:
+            self._stop_flushing.set()
+            self._flush_now.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def stop(self) -> None:
+        self.stop_flushing()
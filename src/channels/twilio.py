@@ -27,9 +27,9 @@ class TwilioChannel(Channel):
     def _calls_snoozed(self, logger: logging.Logger) \
             -> bool:
         if self.redis_enabled:
-            key = Keys.get_twilio_snooze()
-            if self.redis.exists(key):
-                snooze_until = self.redis.get(key).decode("utf-8")
+            snooze_until = self.redis.get_cached(Keys.get_twilio_snooze())
+            if snooze_until is not None:
+                snooze_until = snooze_until.decode("utf-8")
                 logger.info('Tried to call but calls are snoozed until {}.'
                             ''.format(snooze_until))
                 return True
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, Future
+from datetime import timedelta
+from typing import Optional, Dict, Tuple, Callable, List, Awaitable
+
+from src.alerters.reactive.node import Node
+from src.store.redis.redis_api import RedisApi
+from src.store.redis.saved_state import SavedState
+from src.store.store_keys import Keys
+from src.utils.config_parsers.internal import InternalConfig
+from src.utils.config_parsers.internal_parsed import InternalConf
+from src.utils.data_wrapper.polkadot_api import PolkadotApiWrapper
+from src.utils.executors import InlineExecutor, BoundedExecutor
+from src.utils.types import NONE, PolkadotWrapperType, RedisType
+
+
+class ArchiveScanner:
+    # Checks the finalized blocks of a chain for slashing once for all of the
+    # validator monitors of the chain. Validator monitors drive the scanner
+    # from their monitoring rounds. Only one monitor scans at a time, and the
+    # slash amounts found in a block are handed over to all validators. The
+    # last height checked is shared by the chain and kept in Redis.
+    #
+    # Each scan checks a range of up to archive_scanner_blocks_per_scan
+    # blocks, looking up their block hashes and slash amounts in parallel.
+    # The results are handled in block order, so the last height checked only
+    # moves past blocks which have been checked completely.
+
+    def __init__(self, chain: str, logger: logging.Logger,
+                 data_wrapper: PolkadotApiWrapper, redis: Optional[RedisApi],
+                 internal_conf: InternalConfig = InternalConf,
+                 query_executor: Optional[Executor] = None) -> None:
+        self._chain = chain
+        self._logger = logger
+        self._data_wrapper = data_wrapper
+        self._redis = redis
+        self._redis_enabled = redis is not None
+        self._redis_last_height_key_timeout = \
+            internal_conf.redis_node_monitor_last_height_key_timeout
+        self._blocks_per_scan = internal_conf.archive_scanner_blocks_per_scan
+        self._max_concurrent_queries = \
+            internal_conf.archive_scanner_max_concurrent_queries
+
+        # The stash account address of each validator and the function which
+        # handles its slash amount, by the name of the validator's monitor
+        self._validators = {}  # type: Dict[str, Tuple[str, Callable]]
+
+        self._scan_lock = threading.Lock()
+        # The lookups are made on the query pool shared by all monitors, or
+        # one after the other if no query pool is given.
+        if query_executor is None:
+            self._query_executor = InlineExecutor()
+        else:
+            self._query_executor = BoundedExecutor(
+                query_executor, self._max_concurrent_queries)
+        self._last_height_checked = NONE
+        self._is_catching_up = False
+        self._saved_state = SavedState(
+            internal_conf.redis_full_state_save_interval)
+
+        self.load_state()
+
+    def __str__(self) -> str:
+        return 'Archive scanner ({})'.format(self._chain)
+
+    @property
+    def chain(self) -> str:
+        return self._chain
+
+    @property
+    def last_height_checked(self) -> int:
+        return self._last_height_checked
+
+    @property
+    def is_catching_up(self) -> bool:
+        return self._is_catching_up
+
+    @property
+    def validators(self) -> List[str]:
+        return list(self._validators)
+
+    def add_validator(self, monitor_name: str, stash_account_address: str,
+                      on_slash_amount: Callable[[int], None]) -> None:
+        self._validators[monitor_name] = \
+            (stash_account_address, on_slash_amount)
+
+    def load_state(self) -> None:
+        # If Redis is enabled, load the last height checked for slashing
+        if self._redis_enabled:
+            key_lh = Keys.get_archive_scanner_last_height_checked(
+                self._chain)
+            self._last_height_checked = self._redis.get_int(key_lh, NONE)
+            self._saved_state.clear()
+            self._logger.debug('Restored %s state: %s=%s', self, key_lh,
+                               self._last_height_checked)
+
+    def save_state(self) -> None:
+        # If Redis is enabled, save the last height checked if it changed
+        changes, expiries = self.get_state_changes()
+        if len(changes) > 0 and \
+                self._redis.set_multiple(changes, expiries) is not None:
+            self.set_state_changes_saved(changes)
+
+    def get_state_changes(self) \
+            -> Tuple[Dict[str, RedisType], Dict[str, timedelta]]:
+        # The keys which changed since they were last saved, and their expiry.
+        # The last height checked key expires so that blocks missed during long
+        # downtime are not checked.
+        if self._redis_enabled:
+            key_lh = Keys.get_archive_scanner_last_height_checked(
+                self._chain)
+            self._logger.debug('Saving %s state: %s=%s', self, key_lh,
+                               self._last_height_checked)
+            changes = self._saved_state.changes(
+                {key_lh: self._last_height_checked})
+            until = timedelta(seconds=self._redis_last_height_key_timeout)
+            return changes, {key: until for key in changes}
+        return {}, {}
+
+    def set_state_changes_saved(self, changes: Dict[str, RedisType]) -> None:
+        self._saved_state.saved(changes)
+
+    def _get_heights_to_check(self, last_height_to_check: int) -> range:
+        if self._last_height_checked == NONE:
+            self._last_height_checked = last_height_to_check - 1
+
+        # No block is skipped. A scanner which is behind checks the next
+        # archive_scanner_blocks_per_scan blocks in each scan until it catches
+        # up. If the data source node's finalized height is less than the
+        # height already checked, the range is empty.
+        first_height_to_check = self._last_height_checked + 1
+        return range(first_height_to_check,
+                     min(last_height_to_check + 1,
+                         first_height_to_check + self._blocks_per_scan))
+
+    def _update_progress(self, last_height_to_check: int) -> None:
+        self._is_catching_up = \
+            last_height_to_check - self._last_height_checked > 2
+
+    @staticmethod
+    def _handle_slash_amounts(validators: List[Tuple[str, Callable]],
+                              slash_amounts: List[int]) -> None:
+        for (_, on_slash_amount), slash_amount in zip(validators,
+                                                      slash_amounts):
+            on_slash_amount(slash_amount)
+
+    @staticmethod
+    def _cancel(futures: List) -> None:
+        for future in futures:
+            future.cancel()
+
+    def _check_for_slashing(self, heights_to_check: range,
+                            archive_node: Node) -> None:
+        # Each block hash is fetched once for all validators. The slash
+        # amounts at a block are looked up as soon as its hash is known, while
+        # the hashes of the next blocks are still being fetched.
+        validators = list(self._validators.values())
+        ws_url = archive_node.ws_url
+        block_hashes = [self._query_executor.submit(
+            self._data_wrapper.get_block_hash, ws_url, height)
+            for height in heights_to_check]
+        slash_amounts = []  # type: List[Tuple[int, List[Future]]]
+        block_hash_error = None
+        try:
+            for height, block_hash in zip(heights_to_check, block_hashes):
+                try:
+                    block_hash = block_hash.result()
+                except Exception as e:
+                    block_hash_error = e
+                    break
+                slash_amounts.append((height, [self._query_executor.submit(
+                    self._data_wrapper.get_slash_amount, ws_url, block_hash,
+                    stash_account_address)
+                    for stash_account_address, _ in validators]))
+
+            # If a lookup failed, the blocks before it are still committed
+            for height, futures in slash_amounts:
+                self._handle_slash_amounts(validators,
+                                           [f.result() for f in futures])
+                self._last_height_checked = height
+        finally:
+            self._cancel(block_hashes)
+            for _, futures in slash_amounts:
+                self._cancel(futures)
+
+        if block_hash_error is not None:
+            raise block_hash_error
+
+    def scan(self, archive_node: Node) -> bool:
+        # Checks the next block up to the archive node's finalized height.
+        # Returns False without checking if another monitor is scanning.
+        if not self._scan_lock.acquire(blocking=False):
+            return False
+        try:
+            # The height must be saved to avoid situations where
+            # last_height_to_check < finalized_block_height
+            last_height_to_check = archive_node.finalized_block_height
+            heights_to_check = self._get_heights_to_check(
+                last_height_to_check)
+            try:
+                if len(heights_to_check) > 0:
+                    self._check_for_slashing(heights_to_check, archive_node)
+            finally:
+                self._update_progress(last_height_to_check)
+            return True
+        finally:
+            self._scan_lock.release()
+
+
+class AsyncArchiveScanner(ArchiveScanner):
+    # Coroutine version of the scanner for the asyncio monitor runtime, to be
+    # used with an AsyncPolkadotApiWrapper.
+
+    def __init__(self, chain: str, logger: logging.Logger,
+                 data_wrapper: PolkadotApiWrapper, redis: Optional[RedisApi],
+                 internal_conf: InternalConfig = InternalConf,
+                 query_executor: Optional[Executor] = None) -> None:
+        super().__init__(chain, logger, data_wrapper, redis, internal_conf,
+                         query_executor)
+
+        # All the coroutines run in the same thread, so a flag is enough to
+        # let only one of them scan at a time. The semaphore is created on
+        # first use so that it belongs to the event loop of the runtime.
+        self._scanning = False
+        self._query_semaphore = None
+
+    async def _limited(self, query: Awaitable) -> PolkadotWrapperType:
+        async with self._query_semaphore:
+            return await query
+
+    async def _check_for_slashing(self, heights_to_check: range,
+                                  archive_node: Node) -> None:
+        if self._query_semaphore is None:
+            self._query_semaphore = asyncio.Semaphore(
+                self._max_concurrent_queries)
+
+        validators = list(self._validators.values())
+        ws_url = archive_node.ws_url
+        block_hashes = [asyncio.ensure_future(self._limited(
+            self._data_wrapper.get_block_hash(ws_url, height)))
+            for height in heights_to_check]
+        slash_amounts = []  # type: List[Tuple[int, asyncio.Future]]
+        block_hash_error = None
+        try:
+            for height, block_hash in zip(heights_to_check, block_hashes):
+                try:
+                    block_hash = await block_hash
+                except Exception as e:
+                    block_hash_error = e
+                    break
+                slash_amounts.append((height, asyncio.gather(*[
+                    self._limited(self._data_wrapper.get_slash_amount(
+                        ws_url, block_hash, stash_account_address))
+                    for stash_account_address, _ in validators])))
+
+            for height, amounts in slash_amounts:
+                self._handle_slash_amounts(validators, await amounts)
+                self._last_height_checked = height
+        finally:
+            self._cancel(block_hashes)
+            self._cancel([amounts for _, amounts in slash_amounts])
+
+        if block_hash_error is not None:
+            raise block_hash_error
+
+    async def scan(self, archive_node: Node) -> bool:
+        if self._scanning:
+            return False
+        self._scanning = True
+        try:
+            last_height_to_check = archive_node.finalized_block_height
+            heights_to_check = self._get_heights_to_check(
+                last_height_to_check)
+            try:
+                if len(heights_to_check) > 0:
+                    await self._check_for_slashing(heights_to_check,
+                                                   archive_node)
+            finally:
+                self._update_progress(last_height_to_check)
+            return True
+        finally:
+            self._scanning = False
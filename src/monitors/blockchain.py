@@ -10,23 +10,52 @@ from src.store.redis.redis_api import RedisApi
 from src.store.store_keys import Keys
 from src.utils.config_parsers.internal import InternalConfig
 from src.utils.config_parsers.internal_parsed import InternalConf
+from src.utils.data_wrapper.chain_query_cache import ChainQueryCache
+from src.utils.data_wrapper.data_source_resolver import DataSourceResolver
 from src.utils.data_wrapper.polkadot_api import PolkadotApiWrapper
 from src.utils.exceptions import NoLiveNodeConnectedWithAnApiServerException
 from src.utils.parsing import parse_int_from_string
 
 
 class BlockchainMonitor(Monitor):
+    # As in the node monitor, these are the types of the objects created by
+    # the monitor, replaced by their coroutine versions in the coroutine
+    # version of the monitor.
+    _data_wrapper_type = PolkadotApiWrapper
+    _data_source_resolver_type = DataSourceResolver
+    _chain_query_cache_type = ChainQueryCache
 
     def __init__(self, monitor_name: str, blockchain: Blockchain,
                  channels: ChannelSet, logger: logging.Logger,
                  redis: Optional[RedisApi], data_sources: List[Node],
                  polkadot_api_endpoint: str,
-                 internal_conf: InternalConfig = InternalConf):
+                 internal_conf: InternalConfig = InternalConf,
+                 data_source_resolver: Optional[DataSourceResolver] = None,
+                 chain_query_cache: Optional[ChainQueryCache] = None):
         super().__init__(monitor_name, channels, logger, redis, internal_conf)
 
         self._blockchain = blockchain
         self.data_sources = data_sources
-        self._data_wrapper = PolkadotApiWrapper(logger, polkadot_api_endpoint)
+        self._data_wrapper = self._data_wrapper_type(
+            logger, polkadot_api_endpoint,
+            self._internal_conf.api_connection_pool_size,
+            self._internal_conf.direct_rpc_enabled)
+
+        # The data source resolver is normally shared by all monitors of the
+        # same chain. If none is given, the monitor uses its own.
+        if data_source_resolver is None:
+            cache_time = timedelta(
+                seconds=self._internal_conf.data_source_cache_seconds)
+            data_source_resolver = self._data_source_resolver_type(
+                logger, self._data_wrapper, cache_time)
+        self._data_source_resolver = data_source_resolver
+
+        # Chain-wide queries are normally cached for all monitors of the same
+        # chain. If no cache is given, the monitor uses its own.
+        if chain_query_cache is None:
+            chain_query_cache = self._chain_query_cache_type(
+                logger, self._data_wrapper)
+        self._chain_query_cache = chain_query_cache
 
         self.last_data_source_used = None
 
@@ -37,37 +66,54 @@ class BlockchainMonitor(Monitor):
     def data_wrapper(self) -> PolkadotApiWrapper:
         return self._data_wrapper
 
+    @property
+    def data_source_resolver(self) -> DataSourceResolver:
+        return self._data_source_resolver
+
+    @property
+    def chain_query_cache(self) -> ChainQueryCache:
+        return self._chain_query_cache
+
     @property
     def blockchain(self) -> Blockchain:
         return self._blockchain
 
     def save_state(self) -> None:
         # If Redis is enabled save the current time, indicating that the monitor
-        # was alive at this time.
+        # was alive at this time, and the blockchain's state, in one atomic
+        # write.
         if self.redis_enabled:
             self.logger.debug('Saving %s state', self._monitor_name)
 
-            # Set alive key (to be able to query latest update from Telegram)
+            # Set alive key and the monitor's alive time in the registry of
+            # blockchain monitors (to be able to query latest update from
+            # Telegram), and the blockchain's values which changed
             key = Keys.get_blockchain_monitor_alive(self.monitor_name)
+            now = datetime.now().timestamp()
             until = timedelta(seconds=self._redis_alive_key_timeout)
-            self.redis.set_for(key, str(datetime.now().timestamp()), until)
+            blockchain_changes = self._blockchain.get_state_changes(
+                self.logger)
+            if self.redis.save_round(
+                    {key: str(now)}, {key: until},
+                    {self._blockchain.redis_hash: blockchain_changes},
+                    {Keys.get_zset_blockchain_monitors_alive():
+                         {self.monitor_name: now}}) is not None:
+                self._blockchain.set_state_changes_saved(blockchain_changes)
 
     @property
     def data_source(self) -> Node:
-        nodes_connected_to_an_api = \
-            self.data_wrapper.get_web_sockets_connected_to_an_api()
-        # Get one of the nodes to use as data source
-        for n in self.data_sources:
-            if n.ws_url in nodes_connected_to_an_api and not n.is_down:
-                self.last_data_source_used = n
-                self._data_wrapper.ping_node(n.ws_url)
-                return n
-        raise NoLiveNodeConnectedWithAnApiServerException()
+        n = self._data_source_resolver.select(self.data_sources)
+        if n is None:
+            raise NoLiveNodeConnectedWithAnApiServerException()
+        self.last_data_source_used = n
+        self._data_source_resolver.ping(n)
+        return n
 
     def status(self) -> str:
         return self.blockchain.status()
 
-    def _check_for_new_referendums(self, new_referendum_count: int) -> None:
+    def _check_for_new_referendums(self, new_referendum_count: int,
+                                   data_source_ws_url: str) -> None:
 
         if self.blockchain.referendum_count is None:
             self.blockchain.set_referendum_count(
@@ -76,30 +122,41 @@ class BlockchainMonitor(Monitor):
 
         while self.blockchain.referendum_count < new_referendum_count:
             referendum_info = self._data_wrapper.get_referendum_info_of(
-                self.data_source.ws_url, self.blockchain.referendum_count)
+                data_source_ws_url, self.blockchain.referendum_count)
             self.blockchain.set_referendum_count(
                 self.blockchain.referendum_count + 1, self.channels,
                 self.logger, referendum_info)
 
     def monitor(self) -> None:
+        # The data source is resolved once and used for all of the round's
+        # queries.
+        data_source_ws_url = self.data_source.ws_url
+
         # Get new data.
         new_referendum_count = parse_int_from_string(str(
-            self._data_wrapper.get_referendum_count(self.data_source.ws_url)))
+            self._data_wrapper.get_referendum_count(data_source_ws_url)))
         new_council_prop_count = parse_int_from_string(str(
-            self._data_wrapper.get_council_proposal_count(
-                self.data_source.ws_url)))
+            self._data_wrapper.get_council_proposal_count(data_source_ws_url)))
         new_public_prop_count = parse_int_from_string(str(
-            self._data_wrapper.get_public_proposal_count(
-                self.data_source.ws_url)))
-        session_validators = self._data_wrapper.get_session_validators(
-            self.data_source.ws_url)
+            self._data_wrapper.get_public_proposal_count(data_source_ws_url)))
+        finalized_head = self._data_wrapper.get_finalized_head(
+            data_source_ws_url)
+        session_validators = self._chain_query_cache.get_session_validators(
+            data_source_ws_url, finalized_head)
         new_validator_set_size = len(session_validators)
 
         # Check for referendums
         self._logger.debug('%s referendum_count: %s', self.blockchain,
                            new_referendum_count)
-        self._check_for_new_referendums(new_referendum_count)
+        self._check_for_new_referendums(new_referendum_count,
+                                        data_source_ws_url)
+
+        self._update_state(new_council_prop_count, new_public_prop_count,
+                           new_validator_set_size)
 
+    def _update_state(self, new_council_prop_count: int,
+                      new_public_prop_count: int,
+                      new_validator_set_size: int) -> None:
         # Set council prop count
         self._logger.debug('%s council_prop_count: %s', self.blockchain,
                            new_council_prop_count)
@@ -0,0 +1,68 @@
+from src.alerters.reactive.node import Node
+from src.monitors.blockchain import BlockchainMonitor
+from src.utils.data_wrapper.chain_query_cache import AsyncChainQueryCache
+from src.utils.data_wrapper.data_source_resolver import \
+    AsyncDataSourceResolver
+from src.utils.data_wrapper.polkadot_api_async import AsyncPolkadotApiWrapper
+from src.utils.exceptions import NoLiveNodeConnectedWithAnApiServerException
+from src.utils.parsing import parse_int_from_string
+
+
+class AsyncBlockchainMonitor(BlockchainMonitor):
+    # Coroutine version of the blockchain monitor for the asyncio monitor
+    # runtime, which updates the blockchain state as the blockchain monitor.
+    _data_wrapper_type = AsyncPolkadotApiWrapper
+    _data_source_resolver_type = AsyncDataSourceResolver
+    _chain_query_cache_type = AsyncChainQueryCache
+
+    async def get_data_source(self) -> Node:
+        n = await self._data_source_resolver.select(self.data_sources)
+        if n is None:
+            raise NoLiveNodeConnectedWithAnApiServerException()
+        self.last_data_source_used = n
+        await self._data_source_resolver.ping(n)
+        return n
+
+    async def _check_for_new_referendums(self, new_referendum_count: int,
+                                         data_source_ws_url: str) -> None:
+
+        if self.blockchain.referendum_count is None:
+            self.blockchain.set_referendum_count(
+                new_referendum_count, self.channels, self.logger)
+            return
+
+        while self.blockchain.referendum_count < new_referendum_count:
+            referendum_info = await self._data_wrapper.get_referendum_info_of(
+                data_source_ws_url, self.blockchain.referendum_count)
+            self.blockchain.set_referendum_count(
+                self.blockchain.referendum_count + 1, self.channels,
+                self.logger, referendum_info)
+
+    async def monitor(self) -> None:
+        data_source_ws_url = (await self.get_data_source()).ws_url
+
+        # Get new data.
+        new_referendum_count = parse_int_from_string(str(
+            await self._data_wrapper.get_referendum_count(
+                data_source_ws_url)))
+        new_council_prop_count = parse_int_from_string(str(
+            await self._data_wrapper.get_council_proposal_count(
+                data_source_ws_url)))
+        new_public_prop_count = parse_int_from_string(str(
+            await self._data_wrapper.get_public_proposal_count(
+                data_source_ws_url)))
+        finalized_head = await self._data_wrapper.get_finalized_head(
+            data_source_ws_url)
+        session_validators = \
+            await self._chain_query_cache.get_session_validators(
+                data_source_ws_url, finalized_head)
+        new_validator_set_size = len(session_validators)
+
+        # Check for referendums
+        self._logger.debug('%s referendum_count: %s', self.blockchain,
+                           new_referendum_count)
+        await self._check_for_new_referendums(new_referendum_count,
+                                              data_source_ws_url)
+
+        self._update_state(new_council_prop_count, new_public_prop_count,
+                           new_validator_set_size)
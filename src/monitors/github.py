@@ -45,12 +45,14 @@ class GitHubMonitor(Monitor):
             key = Keys.get_github_releases(self.repo_name)
             self.logger.debug('Saving github monitor state: %s=%s',
                               key, self._prev_no_of_releases)
-            self.redis.set(key, self._prev_no_of_releases)
+            self.redis.set_multiple({key: self._prev_no_of_releases})
 
     def monitor(self) -> None:
         # Get list of releases
         releases = get_json(self.releases_page, self._logger)
+        self._update_state(releases)
 
+    def _update_state(self, releases) -> None:
         # If response contains a message, skip monitoring this time round
         # since the presence of a message indicates an error in the API call
         if 'message' in releases:
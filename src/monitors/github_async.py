@@ -0,0 +1,11 @@
+from src.monitors.github import GitHubMonitor
+from src.utils.get_json_async import get_json_async
+
+
+class AsyncGitHubMonitor(GitHubMonitor):
+    # Coroutine version of the GitHub monitor for the asyncio monitor runtime
+
+    async def monitor(self) -> None:
+        # Get list of releases
+        releases = await get_json_async(self.releases_page, self._logger)
+        self._update_state(releases)
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+
+from src.monitors.blockchain_async import AsyncBlockchainMonitor
+from src.monitors.github_async import AsyncGitHubMonitor
+from src.monitors.monitor_starters import \
+    handle_node_monitor_direct_errors, handle_node_monitor_indirect_errors, \
+    handle_blockchain_monitor_errors, handle_github_monitor_errors
+from src.monitors.node_async import AsyncNodeMonitor
+from src.utils.config_parsers.internal import InternalConfig
+from src.utils.config_parsers.internal_parsed import InternalConf
+from src.utils.timing import TimedTaskLimiter
+
+
+# Coroutine versions of the monitor loops in monitor_starters, which handle
+# errors in the same way. State is saved to Redis from the default executor so
+# that the event loop is not blocked while saving.
+
+async def start_node_monitor_async(node_monitor: AsyncNodeMonitor,
+                                   monitor_period: int,
+                                   logger: logging.Logger):
+    loop = asyncio.get_event_loop()
+
+    # Start
+    while True:
+        # Read node data
+        with handle_node_monitor_direct_errors(node_monitor, logger):
+            logger.debug('Reading %s.', node_monitor.node)
+            await node_monitor.monitor_direct()
+            logger.debug('Done reading %s.', node_monitor.node)
+
+        if not node_monitor.indirect_monitoring_disabled:
+            with handle_node_monitor_indirect_errors(node_monitor, logger):
+                logger.debug('Reading %s data indirectly.', node_monitor.node)
+                await node_monitor.monitor_indirect()
+                logger.debug('Done reading %s data indirectly.',
+                             node_monitor.node)
+
+        node_monitor.logger.info('%s status: %s', node_monitor.node,
+                                 node_monitor.status())
+
+        # Save all state
+        await loop.run_in_executor(None, node_monitor.save_state)
+
+        # Sleep
+        if not node_monitor.is_catching_up():
+            logger.debug('Sleeping for %s seconds.', monitor_period)
+            await asyncio.sleep(monitor_period)
+        else:
+            # Let the other monitors run while catching up
+            await asyncio.sleep(0)
+
+
+async def start_blockchain_monitor_async(
+        blockchain_monitor: AsyncBlockchainMonitor, monitor_period: int,
+        logger: logging.Logger):
+    loop = asyncio.get_event_loop()
+
+    # Start
+    while True:
+        # Read blockchain data
+        with handle_blockchain_monitor_errors(blockchain_monitor, logger):
+            logger.debug('Reading blockchain data.')
+            await blockchain_monitor.monitor()
+            logger.debug('Done reading blockchain data.')
+
+        # Save all state
+        await loop.run_in_executor(None, blockchain_monitor.save_state)
+
+        # Sleep
+        logger.debug('Sleeping for %s seconds.', monitor_period)
+        await asyncio.sleep(monitor_period)
+
+
+async def start_github_monitor_async(
+        github_monitor: AsyncGitHubMonitor, monitor_period: int,
+        logger: logging.Logger,
+        internal_config: InternalConfig = InternalConf):
+    loop = asyncio.get_event_loop()
+
+    # Set up alert limiter
+    github_error_alert_limiter = TimedTaskLimiter(
+        internal_config.github_error_interval_seconds)
+
+    # Start
+    while True:
+        # Read GitHub releases page
+        with handle_github_monitor_errors(
+                github_monitor, github_error_alert_limiter, logger):
+            logger.debug('Reading %s.', github_monitor.releases_page)
+            await github_monitor.monitor()
+            logger.debug('Done reading %s.', github_monitor.releases_page)
+
+            # Save all state
+            await loop.run_in_executor(None, github_monitor.save_state)
+
+            # Reset alert limiter
+            github_error_alert_limiter.reset()
+
+        # Sleep
+        logger.debug('Sleeping for %s seconds.', monitor_period)
+        await asyncio.sleep(monitor_period)
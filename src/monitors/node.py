@@ -1,43 +1,115 @@
 import logging
+import threading
+from concurrent.futures import Executor
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Dict, Type
 
 from src.alerters.reactive.node import Node
 from src.alerts.alerts import FoundLiveArchiveNodeAgainAlert
 from src.channels.channel import ChannelSet
+from src.monitors.archive_scanner import ArchiveScanner
 from src.monitors.monitor import Monitor
 from src.store.redis.redis_api import RedisApi
+from src.store.redis.saved_state import SavedState
 from src.store.store_keys import Keys
 from src.utils.config_parsers.internal import InternalConfig
 from src.utils.config_parsers.internal_parsed import InternalConf
+from src.utils.data_wrapper.chain_query_cache import ChainQueryCache
+from src.utils.data_wrapper.data_source_resolver import DataSourceResolver
 from src.utils.data_wrapper.polkadot_api import PolkadotApiWrapper
 from src.utils.exceptions import \
     NoLiveNodeConnectedWithAnApiServerException, \
-    NoLiveArchiveNodeConnectedWithAnApiServerException
+    NoLiveArchiveNodeConnectedWithAnApiServerException, \
+    ConnectionWithNodeApiLostException, ApiCallFailedException
+from src.utils.executors import InlineExecutor, BoundedExecutor
 from src.utils.parsing import parse_int_from_string
 from src.utils.scaling import scale_to_pico
+from src.utils.substrate_rpc import RpcSubscription
 from src.utils.types import NONE
 
 
 class NodeMonitor(Monitor):
+    # The types of the data wrapper, data source resolver, chain query cache
+    # and archive scanner created by the monitor, so that the coroutine
+    # version of the monitor can create their coroutine versions instead.
+    _data_wrapper_type = PolkadotApiWrapper
+    _data_source_resolver_type = DataSourceResolver
+    _chain_query_cache_type = ChainQueryCache
+    _archive_scanner_type = ArchiveScanner
 
     def __init__(self, monitor_name: str, channels: ChannelSet,
-                 logger: logging.Logger, node_monitor_max_catch_up_blocks: int,
-                 redis: Optional[RedisApi], node: Node,
-                 archive_alerts_disabled: bool, data_sources: List[Node],
+                 logger: logging.Logger, redis: Optional[RedisApi],
+                 node: Node, archive_alerts_disabled: bool,
+                 data_sources: List[Node],
                  polkadot_api_endpoint: str,
-                 internal_conf: InternalConfig = InternalConf):
+                 internal_conf: InternalConfig = InternalConf,
+                 data_source_resolver: Optional[DataSourceResolver] = None,
+                 chain_query_cache: Optional[ChainQueryCache] = None,
+                 archive_scanner: Optional[ArchiveScanner] = None,
+                 query_executor: Optional[Executor] = None):
         super().__init__(monitor_name, channels, logger, redis, internal_conf)
 
         self._node = node
-        self._data_wrapper = PolkadotApiWrapper(logger, polkadot_api_endpoint)
-        self._node_monitor_max_catch_up_blocks = \
-            node_monitor_max_catch_up_blocks
+        self._data_wrapper = self._data_wrapper_type(
+            logger, polkadot_api_endpoint,
+            self._internal_conf.api_connection_pool_size,
+            self._internal_conf.direct_rpc_enabled)
+
+        # The data source resolver is normally shared by all monitors of the
+        # same chain. If none is given, the monitor uses its own.
+        if data_source_resolver is None:
+            cache_time = timedelta(
+                seconds=self._internal_conf.data_source_cache_seconds)
+            data_source_resolver = self._data_source_resolver_type(
+                logger, self._data_wrapper, cache_time)
+        self._data_source_resolver = data_source_resolver
+
+        # Chain-wide queries are normally cached for all monitors of the same
+        # chain. If no cache is given, the monitor uses its own.
+        if chain_query_cache is None:
+            chain_query_cache = self._chain_query_cache_type(
+                logger, self._data_wrapper)
+        self._chain_query_cache = chain_query_cache
+
+        # Blocks are checked for slashing by an archive scanner, normally
+        # shared by all monitors of the same chain. If none is given, the
+        # monitor uses its own.
+        if archive_scanner is None:
+            archive_scanner = self._archive_scanner_type(
+                node.chain, logger, self._data_wrapper, redis,
+                self._internal_conf, query_executor)
+        self._archive_scanner = archive_scanner
+        if node.is_validator and not archive_alerts_disabled:
+            archive_scanner.add_validator(monitor_name,
+                                          node.stash_account_address,
+                                          self._update_slash_amount)
+
+        # Independent queries of a monitoring round are made concurrently on
+        # the query pool shared by all monitors, with at most
+        # node_monitor_max_concurrent_queries in flight for this monitor. If
+        # no query pool is given, the queries are made one after the other.
+        if query_executor is None:
+            self._query_executor = InlineExecutor()
+        else:
+            self._query_executor = BoundedExecutor(
+                query_executor,
+                self._internal_conf.node_monitor_max_concurrent_queries)
+
+        # If enabled, the finalized height of the node is updated as soon as
+        # the node pushes a new finalized head. The finalized head is then
+        # only queried while the node is not subscribed to. The subscription
+        # callback runs in the thread of the RPC client, so updates of the
+        # finalized height are done while holding the lock.
+        self._finalized_head_subscription_enabled = \
+            self._internal_conf.finalized_head_subscription_enabled
+        self._finalized_head_subscription = None
+        self._subscribed_finalized_block_header = None
+        self._finalized_height_lock = threading.Lock()
 
         self._redis_alive_key_timeout = \
             self._internal_conf.redis_node_monitor_alive_key_timeout
-        self._redis_last_height_key_timeout = \
-            self._internal_conf.redis_node_monitor_last_height_key_timeout
+        self._saved_state = SavedState(
+            self._internal_conf.redis_full_state_save_interval)
 
         # The data sources for indirect monitoring are all nodes from the same
         # chain which have been set as a data source in the config.
@@ -48,7 +120,6 @@ class NodeMonitor(Monitor):
         self._archive_monitoring_data_sources = [node for node in data_sources
                                                  if node.is_archive_node]
         self.last_data_source_used = None
-        self._last_height_checked = NONE
         self._session_index = NONE
         self._era_index = NONE
         self._monitor_is_catching_up = False
@@ -69,6 +140,10 @@ class NodeMonitor(Monitor):
     def node(self) -> Node:
         return self._node
 
+    @property
+    def finalized_head_subscription(self) -> Optional[RpcSubscription]:
+        return self._finalized_head_subscription
+
     @property
     def session_index(self) -> int:
         return self._session_index
@@ -79,7 +154,11 @@ class NodeMonitor(Monitor):
 
     @property
     def last_height_checked(self) -> int:
-        return self._last_height_checked
+        return self._archive_scanner.last_height_checked
+
+    @property
+    def archive_scanner(self) -> ArchiveScanner:
+        return self._archive_scanner
 
     @property
     def no_live_archive_node_alert_sent(self) -> bool:
@@ -89,6 +168,14 @@ class NodeMonitor(Monitor):
     def data_wrapper(self) -> PolkadotApiWrapper:
         return self._data_wrapper
 
+    @property
+    def data_source_resolver(self) -> DataSourceResolver:
+        return self._data_source_resolver
+
+    @property
+    def chain_query_cache(self) -> ChainQueryCache:
+        return self._chain_query_cache
+
     @property
     def indirect_monitoring_data_sources(self) -> List[Node]:
         return self._indirect_monitoring_data_sources
@@ -103,85 +190,111 @@ class NodeMonitor(Monitor):
     # not an archive node.
     @property
     def data_source_indirect(self) -> Node:
-        nodes_connected_to_an_api = \
-            self.data_wrapper.get_web_sockets_connected_to_an_api()
-        # Get one of the nodes to use as data source
-        for n in self._indirect_monitoring_data_sources:
-            if n.ws_url in nodes_connected_to_an_api and not n.is_down:
-                self.last_data_source_used = n
-                self._data_wrapper.ping_node(n.ws_url)
-                return n
-        raise NoLiveNodeConnectedWithAnApiServerException()
+        n = self._use_data_source(
+            self._data_source_resolver.select(
+                self._indirect_monitoring_data_sources),
+            NoLiveNodeConnectedWithAnApiServerException)
+        self._data_source_resolver.ping(n)
+        return n
 
     # The data_source_archive function returns a node for archive monitoring.
     # Since archive monitoring requires data from past chain state, the
     # data_source_archive function returns only nodes which are archive nodes.
     @property
     def data_source_archive(self) -> Node:
-        nodes_connected_to_an_api = \
-            self.data_wrapper.get_web_sockets_connected_to_an_api()
-        # Get one of the archive nodes to use as data source
-        for n in self._archive_monitoring_data_sources:
-            if n.ws_url in nodes_connected_to_an_api and not n.is_down:
-                self.last_data_source_used = n
-                self._data_wrapper.ping_node(n.ws_url)
-                return n
-        raise NoLiveArchiveNodeConnectedWithAnApiServerException()
+        n = self._use_data_source(
+            self._data_source_resolver.select(
+                self._archive_monitoring_data_sources),
+            NoLiveArchiveNodeConnectedWithAnApiServerException)
+        self._data_source_resolver.ping(n)
+        return n
+
+    def _use_data_source(self, n: Optional[Node],
+                         no_data_source_exception: Type[Exception]) -> Node:
+        if n is None:
+            raise no_data_source_exception()
+        self.last_data_source_used = n
+        return n
 
     def load_state(self) -> None:
-        # If Redis is enabled, load the session index, era index, and last
-        # height checked for slashing if any.
+        # If Redis is enabled, load the session index and era index if any.
+        # The last height checked for slashing is loaded by the scanner.
         if self.redis_enabled:
             key_si = Keys.get_node_monitor_session_index(self.monitor_name)
             key_ei = Keys.get_node_monitor_era_index(self.monitor_name)
-            key_lh = Keys.get_node_monitor_last_height_checked(
-                self.monitor_name)
-            self._session_index = self.redis.get_int(key_si, NONE)
-            self._era_index = self.redis.get_int(key_ei, NONE)
-            self._last_height_checked = self.redis.get_int(key_lh, NONE)
+            state = self.redis.get_multiple([key_si, key_ei])
+            self._saved_state.clear()
+            self._session_index = state.get_int(key_si, NONE)
+            self._era_index = state.get_int(key_ei, NONE)
 
             self.logger.debug(
-                'Restored %s state: %s=%s, %s=%s, %s=%s', self._monitor_name,
-                key_si, self._session_index, key_lh, self._last_height_checked,
-                key_ei, self._era_index)
+                'Restored %s state: %s=%s, %s=%s', self._monitor_name,
+                key_si, self._session_index, key_ei, self._era_index)
 
     def save_state(self) -> None:
         # If Redis is enabled, save the current time indicating that the node
         # monitor was alive at this time, the current session index, era index,
-        # and the last height checked.
+        # the last height checked by the archive scanner, and the node's state
+        # and samples of its values, all in one atomic write.
         if self.redis_enabled:
             key_si = Keys.get_node_monitor_session_index(self.monitor_name)
             key_ei = Keys.get_node_monitor_era_index(self.monitor_name)
-            key_lh = Keys.get_node_monitor_last_height_checked(
-                self.monitor_name)
             key_alive = Keys.get_node_monitor_alive(self.monitor_name)
 
             self.logger.debug(
-                'Saving node monitor state: %s=%s, %s=%s, %s=%s',
-                self._monitor_name, key_si, self._session_index, key_lh,
-                self._last_height_checked, key_ei, self._era_index)
-
-            # Set session and era index keys
-            self.redis.set_multiple({
+                'Saving node monitor state: %s=%s, %s=%s',
+                self._monitor_name, key_si, self._session_index, key_ei,
+                self._era_index)
+
+            # Set the session and era index keys if they changed, together
+            # with the alive key and the monitor's alive time in the registry
+            # of node monitors (to be able to query latest update from
+            # Telegram)
+            changes = self._saved_state.changes({
                 key_si: self._session_index, key_ei: self._era_index
             })
-
-            # Set last height checked key
-            until = timedelta(seconds=self._redis_last_height_key_timeout)
-            self.redis.set_for(key_lh, self._last_height_checked, until)
-
-            # Set alive key (to be able to query latest update from Telegram)
-            until = timedelta(seconds=self._redis_alive_key_timeout)
-            self.redis.set_for(
-                key_alive, str(datetime.now().timestamp()), until
-            )
+            now = datetime.now().timestamp()
+            key_values = dict(changes)
+            key_values[key_alive] = str(now)
+            expiries = {key_alive: timedelta(
+                seconds=self._redis_alive_key_timeout)}
+
+            # Set last height checked key if it changed
+            scanner_changes = {}
+            if not self._archive_alerts_disabled:
+                scanner_changes, scanner_expiries = \
+                    self._archive_scanner.get_state_changes()
+                key_values.update(scanner_changes)
+                expiries.update(scanner_expiries)
+
+            # Set the node's values which changed, and add the samples of the
+            # node's values to their time series
+            node_changes = self._node.get_state_changes(self.logger)
+            samples = self._node.get_metric_samples()
+            sorted_set_scores = dict(samples)
+            sorted_set_scores[Keys.get_zset_node_monitors_alive()] = \
+                {self.monitor_name: now}
+
+            if self.redis.save_round(
+                    key_values, expiries,
+                    {self._node.redis_hash: node_changes},
+                    sorted_set_scores) is not None:
+                self._saved_state.saved(changes)
+                self._archive_scanner.set_state_changes_saved(scanner_changes)
+                self._node.set_state_changes_saved(node_changes)
+                self._node.set_metric_samples_saved(samples)
+
+            # Remove samples older than the retention from the time series
+            series_to_trim = self._node.get_metric_series_to_trim()
+            if series_to_trim is not None:
+                self.redis.trim_time_series(*series_to_trim)
 
     def status(self) -> str:
         if self._node.is_validator:
             return self._node.status() + \
                    ', session_index={}, era_index={}, last_height_checked={}' \
                        .format(self._session_index, self._era_index,
-                               self._last_height_checked)
+                               self.last_height_checked)
         else:
             return self._node.status()
 
@@ -194,11 +307,59 @@ class NodeMonitor(Monitor):
         # Get system_health
         system_health = self.data_wrapper.get_system_health(self._node.ws_url)
 
-        # Get finalized block header
-        finalized_head = self.data_wrapper.get_finalized_head(self.node.ws_url)
-        finalized_block_header = self.data_wrapper.get_header(self.node.ws_url,
-                                                              finalized_head)
+        # Get finalized block header, if it is not pushed by the node
+        if self._finalized_head_subscription_needed():
+            self._subscribe_to_finalized_heads()
+        finalized_block_header = self._subscribed_finalized_header()
+        if finalized_block_header is None:
+            finalized_head = self.data_wrapper.get_finalized_head(
+                self.node.ws_url)
+            finalized_block_header = self.data_wrapper.get_header(
+                self.node.ws_url, finalized_head)
+
+        self._update_direct_state(system_health, finalized_block_header)
+
+    def _finalized_head_subscription_needed(self) -> bool:
+        return self._finalized_head_subscription_enabled and (
+            self._finalized_head_subscription is None or
+            not self._finalized_head_subscription.active)
+
+    def _subscribe_to_finalized_heads(self) -> None:
+        self._subscribed_finalized_block_header = None
+        try:
+            self._finalized_head_subscription = \
+                self.data_wrapper.subscribe_finalized_heads(
+                    self.node.ws_url, self._on_finalized_header)
+        except (ConnectionWithNodeApiLostException,
+                ApiCallFailedException) as e:
+            self._finalized_head_subscription_failed(e)
+
+    def _finalized_head_subscription_failed(self, e: Exception) -> None:
+        self._logger.warning('Could not subscribe to the finalized heads of '
+                             '%s, querying them instead: %s', self._node, e)
+
+    def _subscribed_finalized_header(self) -> Optional[Dict]:
+        subscription = self._finalized_head_subscription
+        if subscription is None or not subscription.active:
+            return None
+        return self._subscribed_finalized_block_header
+
+    def _on_finalized_header(self, finalized_block_header: Dict) -> None:
+        with self._finalized_height_lock:
+            self._subscribed_finalized_block_header = finalized_block_header
+            self._update_finalized_block_height(finalized_block_header)
+
+    def _update_finalized_block_height(self,
+                                       finalized_block_header: Dict) -> None:
+        finalized_block_height = parse_int_from_string(
+            str(finalized_block_header['number']))
+        self._logger.debug('%s finalized_block_height: %s', self._node,
+                           finalized_block_height)
+        self._node.update_finalized_block_height(finalized_block_height,
+                                                 self.logger, self.channels)
 
+    def _update_direct_state(self, system_health: Dict,
+                             finalized_block_header: Dict) -> None:
         # Set is-syncing
         is_syncing = system_health['isSyncing']
         self._logger.debug('%s is syncing: %s', self._node, is_syncing)
@@ -209,25 +370,16 @@ class NodeMonitor(Monitor):
         self._logger.debug('%s no. of peers: %s', self._node, no_of_peers)
         self._node.set_no_of_peers(no_of_peers, self.channels, self.logger)
 
-        # Update finalized block
-        finalized_block_height = parse_int_from_string(
-            str(finalized_block_header['number']))
-        self._logger.debug('%s finalized_block_height: %s', self._node,
-                           finalized_block_height)
-        self._node.update_finalized_block_height(finalized_block_height,
-                                                 self.logger, self.channels)
+        # Update finalized block. If the header was pushed by the node, this
+        # checks that the finalized height is still changing.
+        with self._finalized_height_lock:
+            self._update_finalized_block_height(finalized_block_header)
 
         # Set API as up, and declare that the node was connected to the API
         self.data_wrapper.set_api_as_up(self.monitor_name, self.channels)
         self.node.connect_with_api(self.channels, self.logger)
 
-    def _check_for_slashing(self, height_to_check: int, archive_node: Node) \
-            -> None:
-        block_hash = self.data_wrapper.get_block_hash(archive_node.ws_url,
-                                                      height_to_check)
-        slash_amount = self.data_wrapper.get_slash_amount(
-            archive_node.ws_url, block_hash, self.node.stash_account_address)
-
+    def _update_slash_amount(self, slash_amount: int) -> None:
         if slash_amount > 0:
             scaled_slash_amount = round(scale_to_pico(slash_amount), 3)
             self.node.slash(scaled_slash_amount, self.channels, self.logger)
@@ -264,32 +416,15 @@ class NodeMonitor(Monitor):
 
     def _monitor_archive_state(self) -> None:
         # Check for slashing
-        # Data source must be saved to avoid situations where
-        # last_height_to_check < finalized_block_height
         archive_node = self.data_source_archive
-        last_height_to_check = archive_node.finalized_block_height
-        if self._last_height_checked == NONE:
-            self._last_height_checked = last_height_to_check - 1
-        height_to_check = self._last_height_checked + 1
-
-        # If the data source node's finalized height is less than the height
-        # already checked, there is no need to check that block.
-        if last_height_to_check < height_to_check:
-            pass
-        elif last_height_to_check - self._last_height_checked > \
-                self._node_monitor_max_catch_up_blocks:
-            height_to_check = last_height_to_check - \
-                              self._node_monitor_max_catch_up_blocks
-            self._check_for_slashing(height_to_check, archive_node)
-            self._last_height_checked = height_to_check
-        elif height_to_check <= last_height_to_check:
-            self._check_for_slashing(height_to_check, archive_node)
-            self._last_height_checked = height_to_check
-
-        if last_height_to_check - self._last_height_checked > 2:
-            self._monitor_is_catching_up = True
-        else:
-            self._monitor_is_catching_up = False
+        scanned = self._archive_scanner.scan(archive_node)
+        self._update_archive_state(scanned)
+
+    def _update_archive_state(self, scanned: bool) -> None:
+        # Only the monitor which scanned keeps on scanning while catching up,
+        # the other monitors of the chain continue as usual.
+        self._monitor_is_catching_up = \
+            scanned and self._archive_scanner.is_catching_up
 
         # Unset, so that if in the next monitoring round an archive node is not
         # found, the operator is informed accordingly.
@@ -299,27 +434,74 @@ class NodeMonitor(Monitor):
                 self.monitor_name))
 
     def _monitor_indirect_validator(self) -> None:
-        session_validators = self.data_wrapper.get_session_validators(
-            self.data_source_indirect.ws_url)
-        stakers_json = self.data_wrapper.get_eras_stakers(
-            self.data_source_indirect.ws_url, self._node.stash_account_address)
-        council_members = self.data_wrapper.get_council_members(
-            self.data_source_indirect.ws_url)
-        staking_validators = self.data_wrapper.get_derive_staking_validators(
-            self.data_source_indirect.ws_url)
-        new_session_index = parse_int_from_string(str(
-            self.data_wrapper.get_current_index(
-                self.data_source_indirect.ws_url)))
-        new_number_of_blocks_authored = parse_int_from_string(str(
-            self.data_wrapper.get_authored_blocks(
-                self.data_source_indirect.ws_url, new_session_index,
-                self.node.stash_account_address)))
-        disabled_validators = self.data_wrapper.get_disabled_validators(
-            self.data_source_indirect.ws_url)
-        active_era = self.data_wrapper.get_active_era(
-            self.data_source_indirect.ws_url)
+        # The data source is resolved once and used for all of the round's
+        # queries.
+        data_source_ws_url = self.data_source_indirect.ws_url
+
+        # Chain-wide queries are shared with the other monitors of the chain
+        # and are fetched once per finalized block.
+        finalized_head = self.data_wrapper.get_finalized_head(
+            data_source_ws_url)
+
+        def get_session_index_and_blocks_authored():
+            # The blocks authored are queried for the current session index
+            session_index = parse_int_from_string(str(
+                self.chain_query_cache.get_current_index(
+                    data_source_ws_url, finalized_head)))
+            blocks_authored = parse_int_from_string(str(
+                self.data_wrapper.get_authored_blocks(
+                    data_source_ws_url, session_index,
+                    self.node.stash_account_address)))
+            return session_index, blocks_authored
+
+        # Fetch stage: the independent queries are made concurrently, so that
+        # the round takes as long as the slowest query rather than their sum.
+        executor = self._query_executor
+        session_validators_future = executor.submit(
+            self.chain_query_cache.get_session_validators,
+            data_source_ws_url, finalized_head)
+        stakers_json_future = executor.submit(
+            self.data_wrapper.get_eras_stakers,
+            data_source_ws_url, self._node.stash_account_address)
+        council_members_future = executor.submit(
+            self.chain_query_cache.get_council_members,
+            data_source_ws_url, finalized_head)
+        staking_validators_future = executor.submit(
+            self.chain_query_cache.get_derive_staking_validators,
+            data_source_ws_url, finalized_head)
+        session_index_and_blocks_authored_future = executor.submit(
+            get_session_index_and_blocks_authored)
+        disabled_validators_future = executor.submit(
+            self.chain_query_cache.get_disabled_validators,
+            data_source_ws_url, finalized_head)
+        active_era_future = executor.submit(
+            self.chain_query_cache.get_active_era,
+            data_source_ws_url, finalized_head)
+
+        # Any exception raised by a query is re-raised here
+        session_validators = session_validators_future.result()
+        stakers_json = stakers_json_future.result()
+        council_members = council_members_future.result()
+        staking_validators = staking_validators_future.result()
+        new_session_index, new_number_of_blocks_authored = \
+            session_index_and_blocks_authored_future.result()
+        disabled_validators = disabled_validators_future.result()
+        active_era = active_era_future.result()
         new_era_index = parse_int_from_string(str(active_era['index']))
 
+        self._update_indirect_validator_state(
+            session_validators, stakers_json, council_members,
+            staking_validators, new_session_index,
+            new_number_of_blocks_authored, disabled_validators, new_era_index)
+
+        if not self._archive_alerts_disabled:
+            self._monitor_archive_state()
+
+    def _update_indirect_validator_state(
+            self, session_validators: List[str], stakers_json: Dict,
+            council_members: List[str], staking_validators: Dict,
+            new_session_index: int, new_number_of_blocks_authored: int,
+            disabled_validators: List[int], new_era_index: int) -> None:
         # Set active
         is_active = self._node.stash_account_address in session_validators
         self._logger.debug('%s active: %s', self._node, is_active)
@@ -372,9 +554,6 @@ class NodeMonitor(Monitor):
                                              new_number_of_blocks_authored,
                                              self._era_index)
 
-        if not self._archive_alerts_disabled:
-            self._monitor_archive_state()
-
     def _monitor_indirect_full_node(self) -> None:
         # These are not needed for full nodes, and thus must be given a
         # dummy value since NoneTypes cannot be saved in redis.
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+from typing import Optional, List, Awaitable
+
+from src.alerters.reactive.node import Node
+from src.channels.channel import ChannelSet
+from src.monitors.archive_scanner import AsyncArchiveScanner
+from src.monitors.node import NodeMonitor
+from src.store.redis.redis_api import RedisApi
+from src.utils.config_parsers.internal import InternalConfig
+from src.utils.config_parsers.internal_parsed import InternalConf
+from src.utils.data_wrapper.chain_query_cache import AsyncChainQueryCache
+from src.utils.data_wrapper.data_source_resolver import \
+    AsyncDataSourceResolver
+from src.utils.data_wrapper.polkadot_api_async import AsyncPolkadotApiWrapper
+from src.utils.exceptions import \
+    NoLiveNodeConnectedWithAnApiServerException, \
+    NoLiveArchiveNodeConnectedWithAnApiServerException, \
+    ConnectionWithNodeApiLostException, ApiCallFailedException
+from src.utils.parsing import parse_int_from_string
+from src.utils.types import PolkadotWrapperType
+
+
+class AsyncNodeMonitor(NodeMonitor):
+    # Coroutine version of the node monitor for the asyncio monitor runtime.
+    # The queries are awaited rather than made from a thread of their own,
+    # but the node state is updated by the same code as in the node monitor.
+    _data_wrapper_type = AsyncPolkadotApiWrapper
+    _data_source_resolver_type = AsyncDataSourceResolver
+    _chain_query_cache_type = AsyncChainQueryCache
+    _archive_scanner_type = AsyncArchiveScanner
+
+    def __init__(self, monitor_name: str, channels: ChannelSet,
+                 logger: logging.Logger, redis: Optional[RedisApi],
+                 node: Node, archive_alerts_disabled: bool,
+                 data_sources: List[Node],
+                 polkadot_api_endpoint: str,
+                 internal_conf: InternalConfig = InternalConf,
+                 data_source_resolver: Optional[
+                     AsyncDataSourceResolver] = None,
+                 chain_query_cache: Optional[AsyncChainQueryCache] = None,
+                 archive_scanner: Optional[AsyncArchiveScanner] = None):
+        super().__init__(monitor_name, channels, logger, redis, node,
+                         archive_alerts_disabled, data_sources,
+                         polkadot_api_endpoint, internal_conf,
+                         data_source_resolver, chain_query_cache,
+                         archive_scanner)
+
+        # The semaphore is created on first use so that it belongs to the
+        # event loop of the asyncio monitor runtime.
+        self._query_semaphore = None
+
+    async def _gather_queries(self, *queries: Awaitable) -> List:
+        # Independent queries of a monitoring round are made concurrently,
+        # with at most node_monitor_max_concurrent_queries in flight.
+        if self._query_semaphore is None:
+            self._query_semaphore = asyncio.Semaphore(
+                self._internal_conf.node_monitor_max_concurrent_queries)
+
+        async def limited(query: Awaitable) -> PolkadotWrapperType:
+            async with self._query_semaphore:
+                return await query
+
+        return await asyncio.gather(*[limited(q) for q in queries])
+
+    async def get_data_source_indirect(self) -> Node:
+        n = self._use_data_source(
+            await self._data_source_resolver.select(
+                self._indirect_monitoring_data_sources),
+            NoLiveNodeConnectedWithAnApiServerException)
+        await self._data_source_resolver.ping(n)
+        return n
+
+    async def get_data_source_archive(self) -> Node:
+        n = self._use_data_source(
+            await self._data_source_resolver.select(
+                self._archive_monitoring_data_sources),
+            NoLiveArchiveNodeConnectedWithAnApiServerException)
+        await self._data_source_resolver.ping(n)
+        return n
+
+    async def monitor_direct(self) -> None:
+        # Check if node is accessible
+        self._logger.debug('Checking if %s is alive', self._node)
+        await self._data_wrapper.ping_node(self._node.ws_url)
+        self._node.set_as_up(self.channels, self.logger)
+
+        # Get system_health and finalized block header, if the header is not
+        # pushed by the node
+        if self._finalized_head_subscription_needed():
+            await self._subscribe_to_finalized_heads()
+        finalized_block_header = self._subscribed_finalized_header()
+        if finalized_block_header is None:
+            system_health, finalized_head = await self._gather_queries(
+                self.data_wrapper.get_system_health(self._node.ws_url),
+                self.data_wrapper.get_finalized_head(self.node.ws_url))
+            finalized_block_header = await self.data_wrapper.get_header(
+                self.node.ws_url, finalized_head)
+        else:
+            system_health = await self.data_wrapper.get_system_health(
+                self._node.ws_url)
+
+        self._update_direct_state(system_health, finalized_block_header)
+
+    async def _subscribe_to_finalized_heads(self) -> None:
+        self._subscribed_finalized_block_header = None
+        try:
+            self._finalized_head_subscription = \
+                await self.data_wrapper.subscribe_finalized_heads(
+                    self.node.ws_url, self._on_finalized_header)
+        except (ConnectionWithNodeApiLostException,
+                ApiCallFailedException) as e:
+            self._finalized_head_subscription_failed(e)
+
+    async def _monitor_archive_state(self) -> None:
+        archive_node = await self.get_data_source_archive()
+        scanned = await self._archive_scanner.scan(archive_node)
+        self._update_archive_state(scanned)
+
+    async def _monitor_indirect_validator(self) -> None:
+        data_source_ws_url = (await self.get_data_source_indirect()).ws_url
+        finalized_head = await self.data_wrapper.get_finalized_head(
+            data_source_ws_url)
+
+        async def get_session_index_and_blocks_authored():
+            session_index = parse_int_from_string(str(
+                await self.chain_query_cache.get_current_index(
+                    data_source_ws_url, finalized_head)))
+            blocks_authored = parse_int_from_string(str(
+                await self.data_wrapper.get_authored_blocks(
+                    data_source_ws_url, session_index,
+                    self.node.stash_account_address)))
+            return session_index, blocks_authored
+
+        results = await self._gather_queries(
+            self.chain_query_cache.get_session_validators(
+                data_source_ws_url, finalized_head),
+            self.data_wrapper.get_eras_stakers(
+                data_source_ws_url, self._node.stash_account_address),
+            self.chain_query_cache.get_council_members(
+                data_source_ws_url, finalized_head),
+            self.chain_query_cache.get_derive_staking_validators(
+                data_source_ws_url, finalized_head),
+            get_session_index_and_blocks_authored(),
+            self.chain_query_cache.get_disabled_validators(
+                data_source_ws_url, finalized_head),
+            self.chain_query_cache.get_active_era(
+                data_source_ws_url, finalized_head))
+        session_validators, stakers_json, council_members, \
+            staking_validators, session_index_and_blocks_authored, \
+            disabled_validators, active_era = results
+        new_session_index, new_number_of_blocks_authored = \
+            session_index_and_blocks_authored
+        new_era_index = parse_int_from_string(str(active_era['index']))
+
+        self._update_indirect_validator_state(
+            session_validators, stakers_json, council_members,
+            staking_validators, new_session_index,
+            new_number_of_blocks_authored, disabled_validators, new_era_index)
+
+        if not self._archive_alerts_disabled:
+            await self._monitor_archive_state()
+
+    async def monitor_indirect(self) -> None:
+        if self._node.is_validator:
+            await self._monitor_indirect_validator()
+
+            # Set API as up and declare the used node as connected with the API
+            self.data_wrapper.set_api_as_up(self.monitor_name, self.channels)
+            self.last_data_source_used.connect_with_api(
+                self.channels, self.logger)
+        else:
+            self._monitor_indirect_full_node()
+
+    async def monitor(self) -> None:
+        # Monitor part of the node state by querying the node directly
+        await self.monitor_direct()
+        # Monitor part of the node state by querying the node indirectly if
+        # indirect monitoring is enabled.
+        if not self.indirect_monitoring_disabled:
+            await self.monitor_indirect()
+
+        # Output status
+        self._logger.info('%s status: %s', self._node, self.status())
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+
+from src.store.mongo.alerts_indexes import ALERTS_TTL_FIELD
+from src.store.mongo.mongo_api import MongoApi
+
+# In bucketed storage, the alerts of an origin raised within the same time
+# bucket are kept in one document, rather than one document per alert:
+#
+#   {'origin': ..., 'start': <bucket start timestamp>,
+#    'count': <no. of alerts>, 'created_at': <bucket start date>,
+#    'alerts': [<entry>, ...]}
+#
+# Each entry holds the timestamp (t), severity (s), alert code (c) and message
+# (m) of an alert, with the severity as a single letter. Once a bucket has the
+# maximum number of alerts, the next alerts of that origin and time bucket go
+# into a new document, so documents stay well within Mongo's size limit.
+ALERT_BUCKETS_INDEXES = [
+    IndexModel([('start', DESCENDING), ('_id', DESCENDING)], name='start'),
+    IndexModel([('origin', ASCENDING), ('start', DESCENDING),
+                ('count', ASCENDING)], name='origin_start_count')
+]
+
+_SEVERITY_LETTERS = {'INFO': 'I', 'WARNING': 'W', 'CRITICAL': 'C',
+                     'ERROR': 'E'}
+_SEVERITIES = {letter: severity
+               for severity, letter in _SEVERITY_LETTERS.items()}
+
+# Aggregation stages which turn buckets back into alert documents, for
+# pipelines which expect alerts
+BUCKETS_TO_ALERTS_STAGES = [
+    {'$unwind': '$alerts'},
+    {'$project': {
+        '_id': 0, 'origin': 1, 'timestamp': '$alerts.t',
+        'alert_code': '$alerts.c', 'message': '$alerts.m',
+        'severity': {'$switch': {
+            'branches': [{'case': {'$eq': ['$alerts.s', letter]},
+                          'then': severity}
+                         for severity, letter in _SEVERITY_LETTERS.items()],
+            'default': '$alerts.s'}}}}
+]
+
+
+def _bucket_start(timestamp: float, bucket_length: timedelta) -> float:
+    return timestamp - timestamp % bucket_length.total_seconds()
+
+
+def _alert_entry(document: Dict) -> Dict:
+    return {'t': document['timestamp'],
+            's': _SEVERITY_LETTERS.get(document['severity'],
+                                       document['severity']),
+            'c': document.get('alert_code'), 'm': document['message']}
+
+
+def _alert_document(origin: str, entry: Dict) -> Dict:
+    return {'origin': origin, 'severity': _SEVERITIES.get(entry['s'],
+                                                          entry['s']),
+            'alert_code': entry['c'], 'message': entry['m'],
+            'timestamp': entry['t']}
+
+
+def alert_bucket_updates(documents: List[Dict], bucket_length: timedelta,
+                         max_alerts_per_bucket: int) \
+        -> List[Tuple[UpdateOne, List[Dict]]]:
+    # Updates which append the given alert documents to the buckets of their
+    # origin, with the alert documents added by each update
+    buckets = {}  # type: Dict[Tuple[str, float], List[Dict]]
+    for document in documents:
+        start = _bucket_start(document['timestamp'], bucket_length)
+        buckets.setdefault((document['origin'], start), []).append(document)
+
+    updates = []
+    for (origin, start), bucket_documents in buckets.items():
+        update = UpdateOne(
+            {'origin': origin, 'start': start,
+             'count': {'$lt': max_alerts_per_bucket}},
+            {'$push': {'alerts': {'$each': [_alert_entry(document) for document
+                                            in bucket_documents]}},
+             '$inc': {'count': len(bucket_documents)},
+             '$setOnInsert': {ALERTS_TTL_FIELD: datetime.fromtimestamp(
+                 start, timezone.utc)}},
+            upsert=True)
+        updates.append((update, bucket_documents))
+    return updates
+
+
+def iterate_bucketed_alerts(mongo: MongoApi, collection: str,
+                            bucket_length: timedelta,
+                            start: Optional[datetime] = None,
+                            end: Optional[datetime] = None,
+                            severities: Optional[List[str]] = None,
+                            origins: Optional[List[str]] = None,
+                            batch_size: int = 100) -> Iterator[Dict]:
+    # Yields the alerts raised from start (inclusive) until end (exclusive),
+    # newest first, in the same format as alerts which are not bucketed. Only
+    # the alerts of one time bucket are held in memory at a time.
+    query = {}
+    if start is not None or end is not None:
+        query['start'] = {}
+        if start is not None:
+            query['start']['$gt'] = \
+                start.timestamp() - bucket_length.total_seconds()
+        if end is not None:
+            query['start']['$lt'] = end.timestamp()
+    if origins is not None:
+        query['origin'] = {'$in': origins}
+
+    def alert_matches(alert: Dict) -> bool:
+        return (start is None or alert['timestamp'] >= start.timestamp()) \
+            and (end is None or alert['timestamp'] < end.timestamp()) \
+            and (severities is None or alert['severity'] in severities)
+
+    bucket_start = None
+    bucket_alerts = []
+    for entry in mongo.iterate_unwound(
+            collection, 'alerts', query,
+            projection={'_id': 0, 'origin': 1, 'start': 1, 'alerts': 1},
+            sort=[('start', DESCENDING), ('_id', DESCENDING)],
+            batch_size=batch_size):
+        if entry['start'] != bucket_start:
+            yield from sorted(bucket_alerts, key=lambda a: a['timestamp'],
+                              reverse=True)
+            bucket_start = entry['start']
+            bucket_alerts = []
+        alert = _alert_document(entry['origin'], entry)
+        if alert_matches(alert):
+            bucket_alerts.append(alert)
+    yield from sorted(bucket_alerts, key=lambda a: a['timestamp'],
+                      reverse=True)
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from typing import List, Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from src.store.mongo.mongo_api import MongoApi
+
+# Indexes of the alerts collections. Alerts are read newest first, optionally
+# filtered by severity and by origin, so each index ends with the timestamp,
+# followed by the _id by which alerts with the same timestamp are paged.
+ALERTS_INDEXES = [
+    IndexModel([('timestamp', DESCENDING), ('_id', DESCENDING)],
+               name='timestamp'),
+    IndexModel([('severity', ASCENDING), ('timestamp', DESCENDING),
+                ('_id', DESCENDING)], name='severity_timestamp'),
+    IndexModel([('origin', ASCENDING), ('severity', ASCENDING),
+                ('timestamp', DESCENDING), ('_id', DESCENDING)],
+               name='origin_severity_timestamp')
+]
+
+# Mongo expires documents by a date field rather than by a number, so alerts
+# are expired by their created_at date rather than by their timestamp
+ALERTS_TTL_INDEX_NAME = 'created_at_ttl'
+ALERTS_TTL_FIELD = 'created_at'
+
+
+def ensure_alerts_indexes(mongo: MongoApi, collection: str,
+                          retention: Optional[timedelta],
+                          indexes: Optional[List[IndexModel]] = None) -> bool:
+    # Creates the indexes of an alerts collection which do not exist yet, by
+    # default the ALERTS_INDEXES. If a retention is given, alerts expire after
+    # it, otherwise they are kept. Returns False if Mongo could not be used.
+    if mongo.create_indexes(collection, indexes or ALERTS_INDEXES) is None:
+        return False
+    indexes = mongo.get_indexes(collection)
+    if indexes is None:
+        return False
+
+    ttl_index = indexes.get(ALERTS_TTL_INDEX_NAME)
+    if retention is None:
+        if ttl_index is not None:
+            mongo.drop_index(collection, ALERTS_TTL_INDEX_NAME)
+    elif ttl_index is None:
+        return mongo.create_indexes(collection, [IndexModel(
+            [(ALERTS_TTL_FIELD, ASCENDING)], name=ALERTS_TTL_INDEX_NAME,
+            expireAfterSeconds=int(retention.total_seconds()))]) is not None
+    elif ttl_index.get('expireAfterSeconds') != \
+            int(retention.total_seconds()):
+        return mongo.set_index_expiry(
+            collection, ALERTS_TTL_INDEX_NAME, retention) is not None
+    return True
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def alerts_query(start: Optional[datetime] = None,
+                 end: Optional[datetime] = None,
+                 severities: Optional[List[str]] = None,
+                 origins: Optional[List[str]] = None) -> Dict:
+    # Query for the alerts raised from start (inclusive) until end
+    # (exclusive), with any of the given severities and origins. Filters which
+    # are not given match all alerts.
+    query = {}
+    if start is not None or end is not None:
+        query['timestamp'] = {}
+        if start is not None:
+            query['timestamp']['$gte'] = start.timestamp()
+        if end is not None:
+            query['timestamp']['$lt'] = end.timestamp()
+    if severities is not None:
+        query['severity'] = {'$in': severities}
+    if origins is not None:
+        query['origin'] = {'$in': origins}
+    return query
@@ -0,0 +1,131 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from src.store.mongo.alerts_query import alerts_query
+from src.store.mongo.mongo_api import MongoApi
+
+# The fields by which alerts can be counted, other than their time bucket
+ALERTS_STATS_FIELDS = ['severity', 'origin', 'alert_code']
+
+# The rollup collection holds the number of alerts per hour for each severity,
+# origin and alert code, so that counts can be read without reading the alerts.
+# Each count has the hour and fields as its _id, in the order below.
+ALERTS_ROLLUP_BUCKET = timedelta(hours=1)
+
+
+def _bucket(timestamp: float, bucket: timedelta) -> float:
+    return timestamp - timestamp % bucket.total_seconds()
+
+
+def _rollup_id(document: Dict) -> Dict:
+    rollup_id = {'bucket': _bucket(document['timestamp'],
+                                   ALERTS_ROLLUP_BUCKET)}
+    for field in ALERTS_STATS_FIELDS:
+        rollup_id[field] = document.get(field)
+    return rollup_id
+
+
+def alerts_rollup_updates(documents: List[Dict]) -> List[UpdateOne]:
+    # Updates which add the given alerts to the counts of the rollup
+    counts = Counter()
+    rollup_ids = {}
+    for document in documents:
+        rollup_id = _rollup_id(document)
+        key = tuple(rollup_id.values())
+        counts[key] += 1
+        rollup_ids[key] = rollup_id
+    return [UpdateOne({'_id': rollup_ids[key]}, {'$inc': {'count': count}},
+                      upsert=True) for key, count in counts.items()]
+
+
+def _counts_pipeline(match: Dict, bucket: timedelta, group_by: List[str],
+                     field_prefix: str, count) -> List[Dict]:
+    # Groups the matching documents by time bucket and the given fields, and
+    # adds up the count of each group
+    for field in group_by:
+        if field not in ALERTS_STATS_FIELDS:
+            raise ValueError('Cannot count alerts by {}. Expected one of {}.'
+                             ''.format(field, ', '.join(ALERTS_STATS_FIELDS)))
+    time_field = '$' + field_prefix + \
+        ('bucket' if field_prefix else 'timestamp')
+    group_id = {'bucket': {'$subtract': [
+        time_field, {'$mod': [time_field, bucket.total_seconds()]}]}}
+    for field in group_by:
+        group_id[field] = '$' + field_prefix + field
+    return [
+        {'$match': match},
+        {'$group': {'_id': group_id, 'count': {'$sum': count}}},
+        {'$sort': {'_id.bucket': 1}}
+    ]
+
+
+def _counts(mongo: MongoApi, collection: str, pipeline: List[Dict],
+            bucket: timedelta) -> List[Dict]:
+    # Flattens each group into its bucket, fields, count and hourly rate
+    hours = bucket / timedelta(hours=1)
+    counts = []
+    for group in mongo.aggregate(collection, pipeline):
+        counts.append(dict(group['_id'], count=group['count'],
+                           rate_per_hour=group['count'] / hours))
+    return counts
+
+
+def alert_counts(mongo: MongoApi, collection: str, bucket: timedelta,
+                 group_by: Optional[List[str]] = None,
+                 start: Optional[datetime] = None,
+                 end: Optional[datetime] = None,
+                 severities: Optional[List[str]] = None,
+                 origins: Optional[List[str]] = None,
+                 source_stages: Optional[List[Dict]] = None) -> List[Dict]:
+    # Counts the alerts in the alerts collection per time bucket and per value
+    # of each of the group_by fields, oldest bucket first. The alerts are
+    # counted by Mongo rather than read, so only the counts are returned. The
+    # source stages turn the documents of the collection into alerts, if it
+    # does not hold one document per alert.
+    pipeline = (source_stages or []) + _counts_pipeline(
+        alerts_query(start, end, severities, origins), bucket,
+        group_by or [], '', 1)
+    return _counts(mongo, collection, pipeline, bucket)
+
+
+def rollup_alert_counts(mongo: MongoApi, rollup_collection: str,
+                        bucket: timedelta,
+                        group_by: Optional[List[str]] = None,
+                        start: Optional[datetime] = None,
+                        end: Optional[datetime] = None,
+                        severities: Optional[List[str]] = None,
+                        origins: Optional[List[str]] = None) -> List[Dict]:
+    # Same as alert_counts, but reads the hourly counts of the rollup
+    # collection, so the bucket must be a whole number of hours, and start and
+    # end are rounded down to the hour
+    if bucket % ALERTS_ROLLUP_BUCKET != timedelta(0) or \
+            bucket < ALERTS_ROLLUP_BUCKET:
+        raise ValueError('The bucket must be a whole number of hours.')
+    match = {'_id.' + field: value for field, value in alerts_query(
+        start, end, severities, origins).items() if field != 'timestamp'}
+    if start is not None or end is not None:
+        match['_id.bucket'] = {}
+        if start is not None:
+            match['_id.bucket']['$gte'] = _bucket(start.timestamp(),
+                                                  ALERTS_ROLLUP_BUCKET)
+        if end is not None:
+            match['_id.bucket']['$lt'] = _bucket(end.timestamp(),
+                                                 ALERTS_ROLLUP_BUCKET)
+    pipeline = _counts_pipeline(match, bucket, group_by or [], '_id.',
+                                '$count')
+    return _counts(mongo, rollup_collection, pipeline, bucket)
+
+
+def rebuild_alerts_rollup(mongo: MongoApi, collection: str,
+                          rollup_collection: str,
+                          source_stages: Optional[List[Dict]] = None) -> None:
+    # Replaces the rollup collection with the counts of the alerts collection,
+    # whose documents are turned into alerts by the source stages, if any
+    pipeline = (source_stages or []) + _counts_pipeline(
+        {}, ALERTS_ROLLUP_BUCKET, ALERTS_STATS_FIELDS, '', 1)[:-1] + \
+        [{'$out': rollup_collection}]
+    for _ in mongo.aggregate(collection, pipeline):
+        pass
@@ -1,9 +1,10 @@
 import logging
 from datetime import timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from pymongo import MongoClient
-from pymongo.results import InsertOneResult, InsertManyResult
+from pymongo import DESCENDING, IndexModel, MongoClient
+from pymongo.results import BulkWriteResult, InsertOneResult, \
+    InsertManyResult
 
 from src.utils.timing import TimedTaskLimiter
 
@@ -78,16 +79,48 @@ class MongoApi:
             self._set_as_down()
             raise e
 
+    def _safe_iterate(self, function, args: List) -> Iterator:
+        # Same as _safe, but for functions which return a cursor, which reads
+        # from Mongo as it is iterated rather than when it is returned. Nothing
+        # is yielded if mongo is running into difficulties.
+        if self._do_not_use_if_recently_went_down():
+            return
+        try:
+            for item in function(*args):
+                yield item
+            self._set_as_live()
+        except Exception as e:
+            self._logger.error('Mongo error in %s: %s', function.__name__, e)
+            self._set_as_down()
+            raise e
+
+    @staticmethod
+    def _keyset_projection(projection: Optional[Dict], sort_field: str) \
+            -> Optional[Dict]:
+        # The sort field and _id of each document are needed to get the next
+        # page, so they are never excluded
+        if projection is None:
+            return None
+        projection = {field: include for field, include in projection.items()
+                      if field not in [sort_field, '_id']}
+        if len(projection) == 0:
+            return None
+        if all(projection.values()):
+            projection[sort_field] = 1
+        return projection
+
     def insert_one(self, collection: str, document: Dict) \
             -> Optional[InsertOneResult]:
         return self._safe(
             lambda col, doc: self._db[col].insert_one(doc),
             [collection, document], None)
 
-    def insert_many(self, collection: str, documents: List[Dict]) \
-            -> Optional[InsertManyResult]:
+    def insert_many(self, collection: str, documents: List[Dict],
+                    ordered: bool = True) -> Optional[InsertManyResult]:
+        # If not ordered, the documents are inserted in any order, and the
+        # rest are still inserted if inserting one of them fails
         return self._safe(
-            lambda col, doc: self._db[col].insert_many(doc),
+            lambda col, doc: self._db[col].insert_many(doc, ordered=ordered),
             [collection, documents], None)
 
     def get_all(self, collection: str) -> Optional[List[Dict]]:
@@ -95,6 +128,116 @@ class MongoApi:
             lambda col: list(self._db[col].find({})),
             [collection], None)
 
+    def iterate(self, collection: str, query: Optional[Dict] = None,
+                projection: Optional[Dict] = None,
+                sort: Optional[List[Tuple[str, int]]] = None,
+                batch_size: int = 1000, limit: int = 0) -> Iterator[Dict]:
+        # Yields the documents matching the query, with only the fields of the
+        # projection. The documents are read from Mongo batch_size at a time,
+        # so any number of documents is read in constant memory.
+        return self._safe_iterate(
+            lambda col: self._db[col].find(
+                query or {}, projection, sort=sort, batch_size=batch_size,
+                limit=limit),
+            [collection])
+
+    def iterate_unwound(self, collection: str, array_field: str,
+                        query: Optional[Dict] = None,
+                        projection: Optional[Dict] = None,
+                        sort: Optional[List[Tuple[str, int]]] = None,
+                        batch_size: int = 100) -> Iterator[Dict]:
+        # Same as iterate, but yields each element of the array field of the
+        # documents instead, with the other fields of its document added to
+        # it. Elements are yielded in the order of the array.
+        for document in self.iterate(collection, query, projection, sort,
+                                     batch_size):
+            elements = document.pop(array_field, [])
+            for element in elements:
+                yield dict(document, **element)
+
+    def aggregate(self, collection: str, pipeline: List[Dict],
+                  batch_size: int = 1000) -> Iterator[Dict]:
+        # Yields the results of the aggregation pipeline, which is run by
+        # Mongo, batch_size results at a time
+        return self._safe_iterate(
+            lambda col: self._db[col].aggregate(pipeline,
+                                                batchSize=batch_size),
+            [collection])
+
+    def get_page(self, collection: str, page_size: int,
+                 query: Optional[Dict] = None,
+                 projection: Optional[Dict] = None,
+                 sort_field: str = 'timestamp',
+                 after: Optional[Tuple[Any, Any]] = None) \
+            -> Optional[Tuple[List[Dict], Optional[Tuple[Any, Any]]]]:
+        # Returns up to page_size documents matching the query, in descending
+        # order of the sort field and then of _id, and the key with which to
+        # get the next page (None if this is the last page). The page starts
+        # after the given key rather than skipping the previous pages, so every
+        # page is read equally quickly using an index on the sort field and _id
+        query = query or {}
+        if after is not None:
+            value, _id = after
+            query = {'$and': [query, {'$or': [
+                {sort_field: {'$lt': value}},
+                {sort_field: value, '_id': {'$lt': _id}}]}]}
+
+        def get_page_unsafe(col: str):
+            documents = list(self._db[col].find(
+                query, self._keyset_projection(projection, sort_field),
+                sort=[(sort_field, DESCENDING), ('_id', DESCENDING)],
+                limit=page_size))
+            if len(documents) < page_size:
+                return documents, None
+            return documents, (documents[-1][sort_field],
+                               documents[-1]['_id'])
+
+        return self._safe(get_page_unsafe, [collection], None)
+
+    def bulk_write(self, collection: str, operations: List,
+                   ordered: bool = True) -> Optional[BulkWriteResult]:
+        return self._safe(
+            lambda col, ops: self._db[col].bulk_write(ops, ordered=ordered),
+            [collection, operations], None)
+
+    def count(self, collection: str) -> Optional[int]:
+        # Estimated from the collection metadata, without scanning it
+        return self._safe(
+            lambda col: self._db[col].estimated_document_count(),
+            [collection], None)
+
+    def delete_many(self, collection: str, query: Dict) -> Optional[int]:
+        # Returns the number of documents deleted
+        return self._safe(
+            lambda col, q: self._db[col].delete_many(q).deleted_count,
+            [collection, query], None)
+
+    def create_indexes(self, collection: str, indexes: List[IndexModel]) \
+            -> Optional[List[str]]:
+        # Indexes which already exist with the same options are left as is
+        return self._safe(
+            lambda col, idx: self._db[col].create_indexes(idx),
+            [collection, indexes], None)
+
+    def get_indexes(self, collection: str) -> Optional[Dict[str, Dict]]:
+        return self._safe(
+            lambda col: self._db[col].index_information(),
+            [collection], None)
+
+    def drop_index(self, collection: str, index_name: str) -> None:
+        return self._safe(
+            lambda col, name: self._db[col].drop_index(name),
+            [collection, index_name], None)
+
+    def set_index_expiry(self, collection: str, index_name: str,
+                         expire_after: timedelta) -> Optional[Dict]:
+        # Changes after how long the documents of a TTL index expire
+        return self._safe(
+            lambda col, name, secs: self._db.command(
+                'collMod', col,
+                index={'name': name, 'expireAfterSeconds': secs}),
+            [collection, index_name, int(expire_after.total_seconds())], None)
+
     def drop_collection(self, collection: str) -> Optional[Dict]:
         return self._safe(
             lambda col: self._db.drop_collection(col),
@@ -0,0 +1,77 @@
+import struct
+from typing import Any, Dict, List, Tuple
+
+
+class CompactStateCodec:
+    # Encodes the state of an object into one compact binary value, rather
+    # than one string per field. The value starts with the codec version and
+    # a bitmap of the fields which are not None, followed by those fields in
+    # order: floats as 8-byte doubles, bools as one byte, and ints as a length
+    # byte followed by that many bytes, since bonded balances (for example) do
+    # not fit in 64 bits. Values written by another codec version are not
+    # decoded, so the fields of a version must never be changed.
+
+    def __init__(self, version: int, fields: List[Tuple[str, type]]) -> None:
+        self._version = version
+        self._fields = fields
+        self._bitmap_length = (len(fields) + 7) // 8
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def field_names(self) -> List[str]:
+        return [name for name, _ in self._fields]
+
+    def encode(self, values: Dict[str, Any]) -> bytes:
+        bitmap = 0
+        encoded = []
+        for i, (name, field_type) in enumerate(self._fields):
+            value = values[name]
+            if value is None:
+                continue
+            bitmap |= 1 << i
+            if field_type is float:
+                encoded.append(struct.pack('>d', value))
+            elif field_type is bool:
+                encoded.append(struct.pack('>?', value))
+            else:
+                length = (value.bit_length() + 8) // 8  # with the sign bit
+                encoded.append(struct.pack('>B', length) +
+                               value.to_bytes(length, 'big', signed=True))
+        return struct.pack('>B', self._version) + \
+            bitmap.to_bytes(self._bitmap_length, 'big') + b''.join(encoded)
+
+    def decode(self, encoded: bytes) -> Dict[str, Any]:
+        # Raises a ValueError if the value was not encoded by this codec
+        # version or is incomplete
+        if len(encoded) < 1 + self._bitmap_length or \
+                encoded[0] != self._version:
+            raise ValueError('Value is not encoded with version {} of the '
+                             'compact state encoding.'.format(self._version))
+        bitmap = int.from_bytes(encoded[1:1 + self._bitmap_length], 'big')
+        offset = 1 + self._bitmap_length
+
+        try:
+            values = {}
+            for i, (name, field_type) in enumerate(self._fields):
+                if not bitmap & (1 << i):
+                    values[name] = None
+                elif field_type is float:
+                    values[name], = struct.unpack_from('>d', encoded, offset)
+                    offset += 8
+                elif field_type is bool:
+                    values[name], = struct.unpack_from('>?', encoded, offset)
+                    offset += 1
+                else:
+                    length, = struct.unpack_from('>B', encoded, offset)
+                    offset += 1
+                    if offset + length > len(encoded):
+                        raise ValueError('Compact state value is incomplete.')
+                    values[name] = int.from_bytes(
+                        encoded[offset:offset + length], 'big', signed=True)
+                    offset += length
+        except struct.error as e:
+            raise ValueError('Compact state value is incomplete: {}'.format(e))
+        return values
@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Dict, Set
+
+import redis
+
+
+class MonitoredConnectionPool(redis.BlockingConnectionPool):
+    # Pool of at most max_connections connections to Redis, shared by all
+    # threads using the same Redis API. If all connections are in use, getting
+    # a connection waits for one to be released, for up to the pool timeout,
+    # after which a ConnectionError is raised. The pool keeps track of how many
+    # connections are in use and of how long getting a connection took, so
+    # that the usage of the pool can be monitored.
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._stats_lock = threading.Lock()
+        self._connections_in_use = set()  # type: Set[int]
+        self._max_no_of_connections_in_use = 0
+        self._no_of_connections_given = 0
+        self._no_of_connections_failed = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def get_connection(self, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            connection = super().get_connection(*args, **kwargs)
+        except Exception:
+            # No connection was released in time, or a new connection could
+            # not be opened
+            with self._stats_lock:
+                self._no_of_connections_failed += 1
+            raise
+        wait_seconds = time.monotonic() - start
+
+        with self._stats_lock:
+            self._connections_in_use.add(id(connection))
+            self._max_no_of_connections_in_use = max(
+                self._max_no_of_connections_in_use,
+                len(self._connections_in_use))
+            self._no_of_connections_given += 1
+            self._total_wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+        return connection
+
+    def release(self, connection) -> None:
+        with self._stats_lock:
+            self._connections_in_use.discard(id(connection))
+        super().release(connection)
+
+    def stats(self) -> Dict[str, float]:
+        # Usage of the pool since it was created, with wait times in seconds
+        with self._stats_lock:
+            average_wait_seconds = \
+                self._total_wait_seconds / self._no_of_connections_given \
+                if self._no_of_connections_given > 0 else 0.0
+            return {
+                'max_connections': self.max_connections,
+                'connections_in_use': len(self._connections_in_use),
+                'max_connections_in_use': self._max_no_of_connections_in_use,
+                'connections_given': self._no_of_connections_given,
+                'connections_failed': self._no_of_connections_failed,
+                'average_wait_seconds': average_wait_seconds,
+                'max_wait_seconds': self._max_wait_seconds
+            }
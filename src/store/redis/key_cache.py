@@ -0,0 +1,59 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class KeyCache:
+    # Values of a designated set of keys, each kept for up to max_age seconds
+    # after it was read. A missing key is cached as well, as the value None.
+    # A value read before the cache was last invalidated is not cached, since
+    # the key may have been changed after it was read.
+
+    def __init__(self, max_age: float) -> None:
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        self._keys = set()  # type: Set[str]
+        self._values = {}  # type: Dict[str, Tuple[Optional[bytes], float]]
+        self._generation = 0
+
+    @property
+    def keys(self) -> Set[str]:
+        return self._keys
+
+    def add_keys(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._keys.update(keys)
+
+    @property
+    def generation(self) -> int:
+        # Changes whenever the cache is invalidated
+        return self._generation
+
+    def get(self, key: str) -> Tuple[bool, Optional[bytes]]:
+        # Returns whether the key has a value which is not older than the
+        # maximum age, and that value
+        with self._lock:
+            if key in self._values:
+                value, cached_at = self._values[key]
+                if time.monotonic() - cached_at <= self._max_age:
+                    return True, value
+                del self._values[key]
+            return False, None
+
+    def put(self, key: str, value: Optional[bytes], generation: int) -> None:
+        # The generation is that of the cache before the value was read
+        with self._lock:
+            if key in self._keys and generation == self._generation:
+                self._values[key] = (value, time.monotonic())
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                if key in self._keys:
+                    self._generation += 1
+                    self._values.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._values.clear()
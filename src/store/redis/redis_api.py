@@ -1,28 +1,166 @@
 import logging
+import threading
 from datetime import timedelta
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Iterator, Tuple
 
 import redis
+from redis.client import PubSub
 
+from src.store.redis.connection_pool import MonitoredConnectionPool
+from src.store.redis.key_cache import KeyCache
+from src.store.redis.time_series import Number, decode_sample, downsample
 from src.utils.timing import TimedTaskLimiter
 from src.utils.types import RedisType
 
+# Values are stored as strings, with None stored as the string 'None'
+NONE_SENTINEL = b'None'
+TRUE_STRING = b'True'
+
+# Applies all state writes of a monitoring round atomically. The keys are the
+# keys set (with their value and the expiry in milliseconds, or an empty
+# string if the key does not expire, as arguments), followed by the hashes
+# and sorted sets written (each with its number of fields or members and then
+# field-value or score-member pairs as arguments). The first three arguments
+# are the number of keys, hashes and sorted sets.
+_SAVE_ROUND_SCRIPT = """
+local no_of_keys = tonumber(ARGV[1])
+local no_of_hashes = tonumber(ARGV[2])
+local no_of_sorted_sets = tonumber(ARGV[3])
+local k = 1
+local a = 4
+for _ = 1, no_of_keys do
+    if ARGV[a + 1] == '' then
+        redis.call('SET', KEYS[k], ARGV[a])
+    else
+        redis.call('SET', KEYS[k], ARGV[a], 'PX', ARGV[a + 1])
+    end
+    k = k + 1
+    a = a + 2
+end
+for i = 1, no_of_hashes + no_of_sorted_sets do
+    local command = i <= no_of_hashes and 'HSET' or 'ZADD'
+    local no_of_values = tonumber(ARGV[a])
+    a = a + 1
+    for _ = 1, no_of_values do
+        redis.call(command, KEYS[k], ARGV[a], ARGV[a + 1])
+        a = a + 2
+    end
+    k = k + 1
+end
+return k - 1
+"""
+
+
+def _decode(value: Optional[bytes], default=None) -> Optional[bytes]:
+    # A missing key or field is decoded into the default, and the 'None'
+    # sentinel stored in place of None values is decoded into None
+    if value is None:
+        return default
+    return None if value == NONE_SENTINEL else value
+
+
+def _decode_number(logger: logging.Logger, value: Optional[bytes], key: str,
+                   default, number_type: type, number_type_name: str):
+    value = _decode(value)
+    if value is None:
+        return default
+    try:
+        return number_type(value)
+    except ValueError:
+        logger.error('Could not convert value %s of key %s to %s. '
+                     'Defaulting to value %s.', value, key, number_type_name,
+                     default)
+        return default
+
+
+def _decode_int(logger: logging.Logger, value: Optional[bytes], key: str,
+                default=None) -> Optional[int]:
+    return _decode_number(logger, value, key, default, int, 'an integer')
+
+
+def _decode_float(logger: logging.Logger, value: Optional[bytes], key: str,
+                  default=None) -> Optional[float]:
+    return _decode_number(logger, value, key, default, float, 'a float')
+
+
+def _decode_bool(value: Optional[bytes], default=None) -> Optional[bool]:
+    value = _decode(value)
+    return (value == TRUE_STRING) if value is not None else default
+
+
+class RedisValues:
+    # Values read from Redis in bulk, by key or hash field. They are decoded
+    # on access in the same way as values read one at a time.
+
+    def __init__(self, logger: logging.Logger,
+                 values: Dict[str, Optional[bytes]]) -> None:
+        self._logger = logger
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: str) -> bool:
+        return self._values.get(key) is not None
+
+    def get(self, key: str, default=None) -> Optional[bytes]:
+        return _decode(self._values.get(key), default)
+
+    def get_int(self, key: str, default=None) -> Optional[int]:
+        return _decode_int(self._logger, self._values.get(key), key, default)
+
+    def get_float(self, key: str, default=None) -> Optional[float]:
+        return _decode_float(self._logger, self._values.get(key), key,
+                             default)
+
+    def get_bool(self, key: str, default=None) -> Optional[bool]:
+        return _decode_bool(self._values.get(key), default)
+
 
 class RedisApi:
 
     def __init__(self, logger: logging.Logger, db: int,
                  host: str = 'localhost', port: int = 6379,
                  password: str = '', namespace: str = '',
-                 live_check_time_interval: timedelta = timedelta(seconds=60)) \
+                 live_check_time_interval: timedelta = timedelta(seconds=60),
+                 max_connections: int = 50,
+                 pool_timeout: timedelta = timedelta(seconds=5),
+                 socket_connect_timeout: timedelta = timedelta(seconds=5),
+                 socket_timeout: timedelta = timedelta(seconds=10),
+                 socket_keepalive: bool = True,
+                 health_check_interval: timedelta = timedelta(seconds=30)) \
             -> None:
         self._logger = logger
-        if password == '':
-            self._redis = redis.Redis(host=host, port=port, db=db)
-        else:
-            self._redis = redis.Redis(host=host, port=port, db=db,
-                                      password=password)
+
+        # The connections are shared by all threads using this Redis API. The
+        # timeouts stop a slow or unreachable Redis from blocking the threads
+        # indefinitely, and connections which were not used for longer than
+        # the health check interval are checked before they are used again.
+        self._pool = MonitoredConnectionPool(
+            max_connections=max_connections,
+            timeout=pool_timeout.total_seconds(),
+            host=host, port=port, db=db,
+            password=password if password != '' else None,
+            socket_connect_timeout=socket_connect_timeout.total_seconds(),
+            socket_timeout=socket_timeout.total_seconds(),
+            socket_keepalive=socket_keepalive,
+            health_check_interval=int(health_check_interval.total_seconds()))
+        self._redis = redis.Redis(connection_pool=self._pool)
+        self._db = db
         self._namespace = namespace
 
+        # Hot keys can be cached in-process (see cache_keys), none by default
+        self._key_cache = KeyCache(0)
+        self._key_cache_pubsub = None  # type: Optional[PubSub]
+        self._key_cache_notifier = None  # type: Optional[threading.Thread]
+        self._key_cache_notifier_stopped = threading.Event()
+        self._key_cache_error_limiter = TimedTaskLimiter(timedelta(seconds=60))
+
+        # The script is sent by its SHA1 digest, and only loaded into Redis
+        # again if Redis does not have it cached (e.g. after a restart)
+        self._save_round_script = self._redis.register_script(
+            _SAVE_ROUND_SCRIPT)
+
         # The live check limiter means that we don't wait for connection
         # errors to occur to be able to continue, thus speeding everything up
         self._live_check_limiter = TimedTaskLimiter(live_check_time_interval)
@@ -35,6 +173,78 @@ class RedisApi:
     def is_live(self) -> bool:
         return self._is_live
 
+    @property
+    def pool_stats(self) -> Dict[str, float]:
+        return self._pool.stats()
+
+    def cache_keys(self, keys: List[str], max_age: timedelta,
+                   keyspace_notifications_enabled: bool = False) -> None:
+        # Values of these keys read with get_cached are cached in-process for
+        # up to the maximum age. Writes of the keys through this Redis API
+        # invalidate their cached values straight away, but writes by other
+        # processes are only seen once the cached values expire. Unless, that
+        # is, keyspace notifications are enabled both here and in Redis (with
+        # at least the 'K', 'g', '$' and 'x' notify-keyspace-events flags), in
+        # which case any change of a key invalidates its cached value.
+        self.stop_key_cache_notifications()
+        self._key_cache = KeyCache(max_age.total_seconds())
+        self._key_cache.add_keys([self._add_namespace(key) for key in keys])
+        if keyspace_notifications_enabled:
+            self._subscribe_to_cached_keys()
+
+    def _subscribe_to_cached_keys(self) -> None:
+        prefix = '__keyspace@{}__:'.format(self._db)
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        notifier = threading.Thread(
+            target=self._wait_for_cached_key_changes, args=(pubsub,),
+            name='redis_key_cache_notifier', daemon=True)
+        self._key_cache_notifier_stopped.clear()
+        try:
+            pubsub.subscribe(**{prefix + key: self._on_cached_key_changed
+                                for key in self._key_cache.keys})
+            notifier.start()
+        except Exception as e:
+            self._logger.warning(
+                'Could not subscribe to changes of cached Redis keys. Their '
+                'cached values will only be read again once they expire: %s',
+                e)
+            pubsub.close()
+            return
+        self._key_cache_pubsub = pubsub
+        self._key_cache_notifier = notifier
+
+    def _wait_for_cached_key_changes(self, pubsub: PubSub) -> None:
+        # Runs in the notifier thread until stopped. The subscription handlers
+        # are called by get_message, which waits up to a second for a message.
+        while not self._key_cache_notifier_stopped.is_set():
+            try:
+                pubsub.get_message(timeout=1)
+            except Exception as e:
+                self._on_key_cache_notifier_error(e)
+
+    def _on_cached_key_changed(self, message) -> None:
+        # The channel is the keyspace prefix followed by the key
+        channel = message['channel'].decode('utf-8')
+        self._key_cache.invalidate([channel.split(':', 1)[1]])
+
+    def _on_key_cache_notifier_error(self, e: Exception) -> None:
+        # Changes may be missed while not connected, so the cached values are
+        # cleared. The subscription is renewed once connected again.
+        self._key_cache.clear()
+        if self._key_cache_error_limiter.can_do_task():
+            self._key_cache_error_limiter.did_task()
+            self._logger.warning(
+                'Error when waiting for changes of cached Redis keys: %s', e)
+        self._key_cache_notifier_stopped.wait(1)
+
+    def stop_key_cache_notifications(self) -> None:
+        if self._key_cache_notifier is not None:
+            self._key_cache_notifier_stopped.set()
+            self._key_cache_notifier.join()
+            self._key_cache_pubsub.close()
+            self._key_cache_notifier = None
+            self._key_cache_pubsub = None
+
     def _add_namespace(self, key: str) -> str:
         if not key.startswith(self._namespace + ':'):
             return self._namespace + ':' + key
@@ -86,6 +296,7 @@ class RedisApi:
         key = self._add_namespace(key)
 
         set_ret = self._redis.set(key, value)
+        self._key_cache.invalidate([key])
         return set_ret
 
     def hset_unsafe(self, name: str, key: str, value: RedisType):
@@ -94,28 +305,101 @@ class RedisApi:
         set_ret = self._redis.hset(name, key, value)
         return set_ret
 
-    def set_multiple_unsafe(self, key_values: Dict[str, RedisType]):
-        # Add namespace to keys
-        keys = list(key_values.keys())
-        unique_keys = [self._add_namespace(k) for k in keys]
-        for k, uk in zip(keys, unique_keys):
-            key_values[uk] = key_values.pop(k)
+    def set_multiple_unsafe(self, key_values: Dict[str, RedisType],
+                            expiries: Optional[Dict[str, timedelta]] = None):
+        # Keys given an expiry time are set to expire, in the same pipeline
+        return self.write_multiple_unsafe(key_values, expiries)
+
+    def hset_multiple_unsafe(self, name: str, key_values: Dict[str, RedisType]):
+        # Add namespace to hash name
+        name = self._add_namespace(name)
 
-        # Set multiple
+        # Set multiple, with a single HSET
+        if len(key_values) == 0:
+            return 0
+        set_ret = self._redis.hset(name, mapping={
+            key: value if value is not None else 'None'
+            for key, value in key_values.items()})
+        return set_ret
+
+    def write_multiple_unsafe(
+            self, key_values: Dict[str, RedisType],
+            expiries: Optional[Dict[str, timedelta]] = None,
+            hash_key_values: Optional[Dict[str, Dict[str, RedisType]]] = None,
+            sorted_set_scores: Optional[Dict[str, Dict[str, float]]] = None):
+        # Sets keys (some of which expire), hash fields and the scores of
+        # sorted set members in one pipeline
+        expiries = expiries or {}
+        hash_key_values = hash_key_values or {}
+        sorted_set_scores = sorted_set_scores or {}
         pipe = self._redis.pipeline()
         for key, value in key_values.items():
-            pipe.set(key, value if value is not None else 'None')
+            unique_key = self._add_namespace(key)
+            pipe.set(unique_key, value if value is not None else 'None')
+            if key in expiries:
+                pipe.expire(unique_key, expiries[key])
+        for name, hash_values in hash_key_values.items():
+            if len(hash_values) > 0:
+                pipe.hset(self._add_namespace(name), mapping={
+                    key: value if value is not None else 'None'
+                    for key, value in hash_values.items()})
+        for name, scores in sorted_set_scores.items():
+            if len(scores) > 0:
+                pipe.zadd(self._add_namespace(name), scores)
         exec_ret = pipe.execute()
+        self._key_cache.invalidate(
+            [self._add_namespace(key) for key in key_values])
         return exec_ret
 
-    def hset_multiple_unsafe(self, name: str, key_values: Dict[str, RedisType]):
-        # Add namespace to hash name
+    def save_round_unsafe(
+            self, key_values: Dict[str, RedisType],
+            expiries: Optional[Dict[str, timedelta]] = None,
+            hash_key_values: Optional[Dict[str, Dict[str, RedisType]]] = None,
+            sorted_set_scores: Optional[Dict[str, Dict[str, float]]] = None):
+        # Sets keys (some of which expire), hash fields and the scores of
+        # sorted set members atomically, in one round trip, using a script run
+        # by Redis. Returns the number of keys, hashes and sorted sets written.
+        expiries = expiries or {}
+        hash_values = {name: values for name, values
+                       in (hash_key_values or {}).items() if len(values) > 0}
+        scores = {name: values for name, values
+                  in (sorted_set_scores or {}).items() if len(values) > 0}
+
+        keys = []
+        args = [len(key_values), len(hash_values), len(scores)]
+        for key, value in key_values.items():
+            keys.append(self._add_namespace(key))
+            args.append(value if value is not None else 'None')
+            args.append(int(expiries[key].total_seconds() * 1000)
+                        if key in expiries else '')
+        for name, values in hash_values.items():
+            keys.append(self._add_namespace(name))
+            args.append(len(values))
+            for key, value in values.items():
+                args.extend([key, value if value is not None else 'None'])
+        for name, values in scores.items():
+            keys.append(self._add_namespace(name))
+            args.append(len(values))
+            for member, score in values.items():
+                args.extend([score, member])
+
+        save_ret = self._save_round_script(keys=keys, args=args)
+        self._key_cache.invalidate(keys[:len(key_values)])
+        return save_ret
+
+    def replace_hash_fields_unsafe(self, name: str,
+                                   key_values: Dict[str, RedisType],
+                                   removed_keys: List[str]):
+        # Sets and removes hash fields in one transaction, such as to change
+        # the layout in which the fields are stored
         name = self._add_namespace(name)
-
-        # Set multiple
         pipe = self._redis.pipeline()
-        for key, value in key_values.items():
-            pipe.hset(name, key, value if value is not None else 'None')
+        if len(key_values) > 0:
+            pipe.hset(name, mapping={
+                key: value if value is not None else 'None'
+                for key, value in key_values.items()})
+        if len(removed_keys) > 0:
+            pipe.hdel(name, *removed_keys)
         exec_ret = pipe.execute()
         return exec_ret
 
@@ -126,6 +410,7 @@ class RedisApi:
         pipe.set(key, value)
         pipe.expire(key, time)
         exec_ret = pipe.execute()
+        self._key_cache.invalidate([key])
         return exec_ret
 
     def time_to_live_unsafe(self, key: str):
@@ -139,67 +424,74 @@ class RedisApi:
         else:
             return time_to_live
 
+    # Each read below is a single GET or HGET, with the value decoded locally
+
     def get_unsafe(self, key: str, default=None) -> Optional[bytes]:
         key = self._add_namespace(key)
+        return _decode(self._redis.get(key), default)
 
-        if self.exists_unsafe(key):
-            get_ret = self._redis.get(key)
-            if get_ret.decode('UTF-8') == 'None':
-                return None
-            else:
-                return get_ret
-        else:
-            return default
+    def get_cached_unsafe(self, key: str, default=None) -> Optional[bytes]:
+        # As get, but the value of a cached key is read from the in-process
+        # cache if it was read recently enough (see cache_keys)
+        key = self._add_namespace(key)
+        cached, value = self._key_cache.get(key)
+        if not cached:
+            generation = self._key_cache.generation
+            value = self._redis.get(key)
+            self._key_cache.put(key, value, generation)
+        return _decode(value, default)
 
     def hget_unsafe(self, name: str, key: str, default=None) -> Optional[bytes]:
         name = self._add_namespace(name)
-
-        if self.hexists_unsafe(name, key):
-            get_ret = self._redis.hget(name, key)
-            if get_ret.decode('UTF-8') == 'None':
-                return None
-            else:
-                return get_ret
-        else:
-            return default
+        return _decode(self._redis.hget(name, key), default)
 
     def get_int_unsafe(self, key: str, default=None) -> Optional[int]:
         key = self._add_namespace(key)
-
-        get_ret = self.get_unsafe(key, None)
-        try:
-            return int(get_ret) if get_ret is not None else default
-        except ValueError:
-            self._logger.error(
-                'Could not convert value %s of key %s to an integer. '
-                'Defaulting to value %s.', get_ret, key, default)
-            return default
+        return _decode_int(self._logger, self._redis.get(key), key, default)
 
     def hget_int_unsafe(self, name: str, key: str, default=None) \
             -> Optional[int]:
         name = self._add_namespace(name)
+        return _decode_int(self._logger, self._redis.hget(name, key), key,
+                           default)
 
-        get_ret = self.hget_unsafe(name, key, None)
-        try:
-            return int(get_ret) if get_ret is not None else default
-        except ValueError:
-            self._logger.error(
-                'Could not convert value %s of key %s to an integer. '
-                'Defaulting to value %s.', get_ret, key, default)
-            return default
+    def get_float_unsafe(self, key: str, default=None) -> Optional[float]:
+        key = self._add_namespace(key)
+        return _decode_float(self._logger, self._redis.get(key), key, default)
+
+    def hget_float_unsafe(self, name: str, key: str, default=None) \
+            -> Optional[float]:
+        name = self._add_namespace(name)
+        return _decode_float(self._logger, self._redis.hget(name, key), key,
+                             default)
 
     def get_bool_unsafe(self, key: str, default=None) -> Optional[bool]:
         key = self._add_namespace(key)
-
-        get_ret = self.get_unsafe(key, None)
-        return (get_ret.decode() == 'True') if get_ret is not None else default
+        return _decode_bool(self._redis.get(key), default)
 
     def hget_bool_unsafe(self, name: str, key: str, default=None) \
             -> Optional[bool]:
         name = self._add_namespace(name)
-
-        get_ret = self.hget_unsafe(name, key, None)
-        return (get_ret.decode() == 'True') if get_ret is not None else default
+        return _decode_bool(self._redis.hget(name, key), default)
+
+    def get_multiple_unsafe(self, keys: List[str]) -> RedisValues:
+        values = self._redis.mget([self._add_namespace(k) for k in keys]) \
+            if len(keys) > 0 else []
+        return RedisValues(self._logger, dict(zip(keys, values)))
+
+    def hgetall_unsafe(self, name: str) -> RedisValues:
+        return self.hgetall_multiple_unsafe([name])[name]
+
+    def hgetall_multiple_unsafe(self, names: List[str]) \
+            -> Dict[str, RedisValues]:
+        # All hashes are read in a single round trip
+        pipe = self._redis.pipeline(transaction=False)
+        for name in names:
+            pipe.hgetall(self._add_namespace(name))
+        exec_ret = pipe.execute()
+        return {name: RedisValues(self._logger, {
+            k.decode('utf8'): v for k, v in hash_values.items()})
+            for name, hash_values in zip(names, exec_ret)}
 
     def exists_unsafe(self, key: str) -> bool:
         key = self._add_namespace(key)
@@ -209,22 +501,59 @@ class RedisApi:
         name = self._add_namespace(name)
         return bool(self._redis.hexists(name, key))
 
-    def get_keys_unsafe(self, pattern: str = "*") -> List[str]:
+    def scan_keys_unsafe(self, pattern: str = "*", count: int = 1000) \
+            -> Iterator[str]:
+        # Iterates over the keys matching the pattern using SCAN, which
+        # unlike KEYS does not block Redis while going through all keys
         pattern = self._add_namespace(pattern)
+        for key in self._redis.scan_iter(match=pattern, count=count):
+            yield self._remove_namespace(key.decode('utf8'))
+
+    def get_keys_unsafe(self, pattern: str = "*") -> List[str]:
+        return list(self.scan_keys_unsafe(pattern))
 
-        # Decode and remove namespace
-        keys_list = self._redis.keys(pattern)
-        keys_list = [k.decode('utf8') for k in keys_list]
-        keys_list = [self._remove_namespace(k) for k in keys_list]
+    def get_sorted_set_scores_unsafe(self, name: str,
+                                     min_score: float = float('-inf')) \
+            -> Dict[str, float]:
+        # Returns the members of the sorted set having a score of at least
+        # min_score, by member, and removes the members below min_score
+        name = self._add_namespace(name)
+        pipe = self._redis.pipeline()
+        if min_score != float('-inf'):
+            pipe.zremrangebyscore(name, '-inf', '({}'.format(min_score))
+        pipe.zrangebyscore(name, min_score, '+inf', withscores=True)
+        members = pipe.execute()[-1]
+        return {member.decode('utf8'): score for member, score in members}
+
+    def get_time_series_unsafe(self, name: str,
+                               start: float = float('-inf'),
+                               end: float = float('inf')) \
+            -> List[Tuple[float, Number]]:
+        # Returns the samples of the time series (a sorted set of samples
+        # scored by their time) taken from the start to the end time, in order
+        name = self._add_namespace(name)
+        members = self._redis.zrangebyscore(name, start, end)
+        return [decode_sample(member) for member in members]
 
-        return keys_list
+    def trim_time_series_unsafe(self, names: List[str], min_time: float):
+        # Removes the samples taken before the minimum time
+        pipe = self._redis.pipeline()
+        for name in names:
+            pipe.zremrangebyscore(self._add_namespace(name), '-inf',
+                                  '({}'.format(min_time))
+        exec_ret = pipe.execute()
+        return exec_ret
 
     def remove_unsafe(self, *keys):
         keys = [self._add_namespace(k) for k in keys]
-        return self._redis.delete(*keys)
+        delete_ret = self._redis.delete(*keys)
+        self._key_cache.invalidate(keys)
+        return delete_ret
 
     def delete_all_unsafe(self):
-        return self._redis.flushdb()
+        delete_ret = self._redis.flushdb()
+        self._key_cache.clear()
+        return delete_ret
 
     def set(self, key: str, value: RedisType):
         return self._safe(self.set_unsafe, [key, value], None)
@@ -232,12 +561,37 @@ class RedisApi:
     def hset(self, name: str, key: str, value: RedisType):
         return self._safe(self.hset_unsafe, [name, key, value], None)
 
-    def set_multiple(self, key_values: Dict[str, RedisType]):
-        return self._safe(self.set_multiple_unsafe, [key_values], None)
+    def set_multiple(self, key_values: Dict[str, RedisType],
+                     expiries: Optional[Dict[str, timedelta]] = None):
+        return self._safe(self.set_multiple_unsafe, [key_values, expiries],
+                          None)
 
     def hset_multiple(self, name: str, key_values: Dict[str, RedisType]):
         return self._safe(self.hset_multiple_unsafe, [name, key_values], None)
 
+    def write_multiple(
+            self, key_values: Dict[str, RedisType],
+            expiries: Optional[Dict[str, timedelta]] = None,
+            hash_key_values: Optional[Dict[str, Dict[str, RedisType]]] = None,
+            sorted_set_scores: Optional[Dict[str, Dict[str, float]]] = None):
+        return self._safe(self.write_multiple_unsafe,
+                          [key_values, expiries, hash_key_values,
+                           sorted_set_scores], None)
+
+    def save_round(
+            self, key_values: Dict[str, RedisType],
+            expiries: Optional[Dict[str, timedelta]] = None,
+            hash_key_values: Optional[Dict[str, Dict[str, RedisType]]] = None,
+            sorted_set_scores: Optional[Dict[str, Dict[str, float]]] = None):
+        return self._safe(self.save_round_unsafe,
+                          [key_values, expiries, hash_key_values,
+                           sorted_set_scores], None)
+
+    def replace_hash_fields(self, name: str, key_values: Dict[str, RedisType],
+                            removed_keys: List[str]):
+        return self._safe(self.replace_hash_fields_unsafe,
+                          [name, key_values, removed_keys], None)
+
     def set_for(self, key: str, value: RedisType, time: timedelta):
         return self._safe(self.set_for_unsafe, [key, value, time], None)
 
@@ -247,6 +601,13 @@ class RedisApi:
     def get(self, key: str, default=None) -> Optional[bytes]:
         return self._safe(self.get_unsafe, [key, default], default)
 
+    def get_cached(self, key: str, default=None) -> Optional[bytes]:
+        # A recently cached value is returned even if Redis went down since
+        cached, value = self._key_cache.get(self._add_namespace(key))
+        if cached:
+            return _decode(value, default)
+        return self._safe(self.get_cached_unsafe, [key, default], default)
+
     def hget(self, name: str, key: str, default=None) -> Optional[bytes]:
         return self._safe(self.hget_unsafe, [name, key, default], default)
 
@@ -256,12 +617,33 @@ class RedisApi:
     def hget_int(self, name: str, key: str, default=None) -> Optional[int]:
         return self._safe(self.hget_int_unsafe, [name, key, default], default)
 
+    def get_float(self, key: str, default=None) -> Optional[float]:
+        return self._safe(self.get_float_unsafe, [key, default], default)
+
+    def hget_float(self, name: str, key: str, default=None) \
+            -> Optional[float]:
+        return self._safe(self.hget_float_unsafe, [name, key, default],
+                          default)
+
     def get_bool(self, key: str, default=None) -> Optional[bool]:
         return self._safe(self.get_bool_unsafe, [key, default], default)
 
     def hget_bool(self, name: str, key: str, default=None) -> Optional[bool]:
         return self._safe(self.hget_bool_unsafe, [name, key, default], default)
 
+    def get_multiple(self, keys: List[str]) -> RedisValues:
+        return self._safe(self.get_multiple_unsafe, [keys],
+                          RedisValues(self._logger, {}))
+
+    def hgetall(self, name: str) -> RedisValues:
+        return self._safe(self.hgetall_unsafe, [name],
+                          RedisValues(self._logger, {}))
+
+    def hgetall_multiple(self, names: List[str]) -> Dict[str, RedisValues]:
+        return self._safe(self.hgetall_multiple_unsafe, [names],
+                          {name: RedisValues(self._logger, {})
+                           for name in names})
+
     def exists(self, key: str) -> bool:
         return self._safe(self.exists_unsafe, [key], False)
 
@@ -271,6 +653,30 @@ class RedisApi:
     def get_keys(self, pattern: str = "*") -> List[str]:
         return self._safe(self.get_keys_unsafe, [pattern], [])
 
+    def get_sorted_set_scores(self, name: str,
+                              min_score: float = float('-inf')) \
+            -> Dict[str, float]:
+        return self._safe(self.get_sorted_set_scores_unsafe,
+                          [name, min_score], {})
+
+    def get_time_series(self, name: str, start: float = float('-inf'),
+                        end: float = float('inf')) \
+            -> List[Tuple[float, Number]]:
+        return self._safe(self.get_time_series_unsafe, [name, start, end], [])
+
+    def get_time_series_aggregates(
+            self, name: str, bucket: timedelta, aggregation: str = 'avg',
+            start: float = float('-inf'), end: float = float('inf')) \
+            -> List[Tuple[float, Number]]:
+        # Aggregates of the samples taken from the start to the end time, in
+        # buckets of the given length (see downsample for the aggregations)
+        return downsample(self.get_time_series(name, start, end), bucket,
+                          aggregation)
+
+    def trim_time_series(self, names: List[str], min_time: float):
+        return self._safe(self.trim_time_series_unsafe, [names, min_time],
+                          None)
+
     def remove(self, *keys):
         return self._safe(self.remove_unsafe, [keys], None)
 
@@ -0,0 +1,34 @@
+from datetime import timedelta
+from typing import Dict
+
+from src.utils.timing import TimedTaskLimiter
+from src.utils.types import RedisType
+
+
+class SavedState:
+    # Keeps the values last saved to Redis by an object, so that the object
+    # only saves the values which changed since. All values are saved again
+    # once every full save interval, in case Redis lost any of them.
+
+    def __init__(self, full_save_interval: timedelta) -> None:
+        self._values = {}  # type: Dict[str, RedisType]
+        self._full_save_limiter = TimedTaskLimiter(full_save_interval)
+        self._full_save_pending = False
+
+    def changes(self, values: Dict[str, RedisType]) -> Dict[str, RedisType]:
+        self._full_save_pending = self._full_save_limiter.can_do_task()
+        if self._full_save_pending:
+            return dict(values)
+        return {key: value for key, value in values.items()
+                if key not in self._values or self._values[key] != value}
+
+    def saved(self, values: Dict[str, RedisType]) -> None:
+        # To be called with the changes once they are saved successfully
+        self._values.update(values)
+        if self._full_save_pending:
+            self._full_save_limiter.did_task()
+            self._full_save_pending = False
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._full_save_limiter.reset()
@@ -0,0 +1,106 @@
+import threading
+from datetime import timedelta
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from src.utils.timing import TimedTaskLimiter
+
+Number = Union[int, float]
+
+# A time series is stored as a sorted set of samples scored by their time. The
+# time is also part of each member, since members are unique and the same value
+# can be sampled more than once.
+AGGREGATIONS = {
+    'min': min,
+    'max': max,
+    'avg': lambda values: sum(values) / len(values),
+    'last': lambda values: values[-1],
+    'count': len
+}
+
+
+def encode_sample(timestamp: float, value: Number) -> str:
+    return '{}:{}'.format(timestamp, value)
+
+
+def decode_sample(member: Union[bytes, str]) -> Tuple[float, Number]:
+    if isinstance(member, bytes):
+        member = member.decode('utf-8')
+    timestamp, value = member.split(':', 1)
+    try:
+        return float(timestamp), int(value)
+    except ValueError:
+        return float(timestamp), float(value)
+
+
+def downsample(samples: List[Tuple[float, Number]], bucket: timedelta,
+               aggregation: str = 'avg') -> List[Tuple[float, Number]]:
+    # Aggregates samples (ordered by time) into buckets of the given length,
+    # starting at multiples of the bucket length. Returns the start time and
+    # aggregate of each bucket which has samples.
+    if aggregation not in AGGREGATIONS:
+        raise ValueError('Unknown aggregation {}. Expected one of {}.'.format(
+            aggregation, ', '.join(AGGREGATIONS)))
+    aggregate = AGGREGATIONS[aggregation]
+    bucket_seconds = bucket.total_seconds()
+
+    buckets = []  # type: List[Tuple[float, List[Number]]]
+    for timestamp, value in samples:
+        start = timestamp - timestamp % bucket_seconds
+        if len(buckets) == 0 or buckets[-1][0] != start:
+            buckets.append((start, []))
+        buckets[-1][1].append(value)
+    return [(start, aggregate(values)) for start, values in buckets]
+
+
+class TimeSeriesSamples:
+    # Samples of time series waiting to be saved, in the format of the sorted
+    # set scores written by the Redis API. Samples older than the retention
+    # are dropped rather than saved, and the time series saved are trimmed to
+    # the retention once every trim interval.
+
+    def __init__(self, retention: timedelta, trim_interval: timedelta) -> None:
+        self._retention = retention
+        self._lock = threading.Lock()
+        self._pending = {}  # type: Dict[str, Dict[str, float]]
+        self._names = set()  # type: Set[str]
+        self._trim_limiter = TimedTaskLimiter(trim_interval)
+
+    @property
+    def retention(self) -> timedelta:
+        return self._retention
+
+    def add(self, name: str, value: Number, timestamp: float) -> None:
+        with self._lock:
+            samples = self._pending.setdefault(name, {})
+            samples[encode_sample(timestamp, value)] = timestamp
+            self._names.add(name)
+
+            # Drop samples which were not saved before the retention passed
+            min_timestamp = timestamp - self._retention.total_seconds()
+            if min(samples.values()) < min_timestamp:
+                self._pending[name] = {
+                    member: t for member, t in samples.items()
+                    if t >= min_timestamp}
+
+    def pending(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: dict(samples)
+                    for name, samples in self._pending.items()}
+
+    def saved(self, samples: Dict[str, Dict[str, float]]) -> None:
+        with self._lock:
+            for name, saved_samples in samples.items():
+                pending = self._pending.get(name, {})
+                for member in saved_samples:
+                    pending.pop(member, None)
+                if len(pending) == 0:
+                    self._pending.pop(name, None)
+
+    def to_trim(self, now: float) -> Optional[Tuple[List[str], float]]:
+        # The names of the time series to trim and the time before which
+        # samples are removed, if the time series are due to be trimmed
+        if not self._trim_limiter.can_do_task():
+            return None
+        self._trim_limiter.did_task()
+        with self._lock:
+            return sorted(self._names), now - self._retention.total_seconds()
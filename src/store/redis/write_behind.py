@@ -0,0 +1,189 @@
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+from src.store.redis.redis_api import RedisApi
+from src.utils.timing import TimedTaskLimiter
+from src.utils.types import RedisType
+
+
+class WriteBehindRedisApi(RedisApi):
+    # Redis API whose set_multiple, hset_multiple, write_multiple and
+    # save_round writes are queued rather than sent, so that monitors saving
+    # their state never wait for Redis. A background thread flushes the queued
+    # writes every flush interval with one run of the save_round script, so
+    # each flush is applied atomically. Repeated writes to the same key or hash
+    # field replace each other in the queue, so only the latest value is sent.
+    #
+    # The queue holds up to max_pending_writes keys, hash fields and sorted set
+    # members. Writes of those which are not queued yet are rejected once the
+    # queue is full, and the write returns None as if Redis were down. Writes
+    # which fail to flush are queued again, unless newer values were queued
+    # since. They are queued again even if the queue is full, since the
+    # monitors which wrote them consider them saved.
+
+    def __init__(self, logger: logging.Logger, db: int,
+                 host: str = 'localhost', port: int = 6379,
+                 password: str = '', namespace: str = '',
+                 live_check_time_interval: timedelta = timedelta(seconds=60),
+                 max_connections: int = 50,
+                 pool_timeout: timedelta = timedelta(seconds=5),
+                 socket_connect_timeout: timedelta = timedelta(seconds=5),
+                 socket_timeout: timedelta = timedelta(seconds=10),
+                 socket_keepalive: bool = True,
+                 health_check_interval: timedelta = timedelta(seconds=30),
+                 flush_interval: timedelta = timedelta(seconds=1),
+                 max_pending_writes: int = 10000) -> None:
+        super().__init__(logger, db, host, port, password, namespace,
+                         live_check_time_interval, max_connections,
+                         pool_timeout, socket_connect_timeout, socket_timeout,
+                         socket_keepalive, health_check_interval)
+        self._flush_interval = flush_interval
+        self._max_pending_writes = max_pending_writes
+
+        self._pending_lock = threading.Lock()
+        self._pending_key_values = \
+            {}  # type: Dict[str, Tuple[RedisType, Optional[timedelta]]]
+        self._pending_hash_key_values = \
+            {}  # type: Dict[str, Dict[str, RedisType]]
+        self._pending_sorted_set_scores = \
+            {}  # type: Dict[str, Dict[str, float]]
+        self._no_of_pending_writes = 0
+        self._queue_full_warning_limiter = TimedTaskLimiter(
+            timedelta(seconds=60))
+
+        self._flush_lock = threading.Lock()
+        self._stop_flushing = threading.Event()
+        self._flusher = None  # type: Optional[threading.Thread]
+
+    @property
+    def no_of_pending_writes(self) -> int:
+        return self._no_of_pending_writes
+
+    def _warn_queue_full(self, no_of_writes: int) -> None:
+        if self._queue_full_warning_limiter.can_do_task():
+            self._queue_full_warning_limiter.did_task()
+            self._logger.warning(
+                'Redis write queue is full (%s writes pending). %s writes '
+                'were not queued and will be retried by their monitors.',
+                self._max_pending_writes, no_of_writes)
+
+    def _queue(self, key_values: Dict[str, Tuple[RedisType,
+                                                 Optional[timedelta]]],
+               hash_key_values: Dict[str, Dict[str, RedisType]],
+               sorted_set_scores: Dict[str, Dict[str, float]],
+               requeue: bool = False) -> bool:
+        # Queues the writes if there is space for all of them. Writes which
+        # are queued again after a failed flush are always queued, but do not
+        # replace the values queued since.
+        with self._pending_lock:
+            members = [(self._pending_hash_key_values, hash_key_values),
+                       (self._pending_sorted_set_scores, sorted_set_scores)]
+            no_of_new_writes = len(
+                [k for k in key_values if k not in self._pending_key_values])
+            for pending, values in members:
+                no_of_new_writes += len(
+                    [(n, k) for n, name_values in values.items()
+                     for k in name_values if k not in pending.get(n, {})])
+            if not requeue and self._no_of_pending_writes + \
+                    no_of_new_writes > self._max_pending_writes:
+                self._warn_queue_full(len(key_values) + sum(
+                    len(name_values) for _, values in members
+                    for name_values in values.values()))
+                return False
+
+            for key, value in key_values.items():
+                if not requeue or key not in self._pending_key_values:
+                    self._pending_key_values[key] = value
+            for pending, values in members:
+                for name, name_values in values.items():
+                    pending_name_values = pending.setdefault(name, {})
+                    for key, value in name_values.items():
+                        if not requeue or key not in pending_name_values:
+                            pending_name_values[key] = value
+            self._no_of_pending_writes += no_of_new_writes
+            return True
+
+    def set_multiple(self, key_values: Dict[str, RedisType],
+                     expiries: Optional[Dict[str, timedelta]] = None):
+        return self.write_multiple(key_values, expiries)
+
+    def hset_multiple(self, name: str, key_values: Dict[str, RedisType]):
+        return self.write_multiple({}, hash_key_values={name: key_values})
+
+    def write_multiple(
+            self, key_values: Dict[str, RedisType],
+            expiries: Optional[Dict[str, timedelta]] = None,
+            hash_key_values: Optional[Dict[str, Dict[str, RedisType]]] = None,
+            sorted_set_scores: Optional[Dict[str, Dict[str, float]]] = None):
+        expiries = expiries or {}
+        hash_key_values = hash_key_values or {}
+        sorted_set_scores = sorted_set_scores or {}
+        queued = self._queue(
+            {key: (value, expiries.get(key))
+             for key, value in key_values.items()},
+            {name: dict(values) for name, values in hash_key_values.items()},
+            {name: dict(scores) for name, scores in sorted_set_scores.items()})
+        return True if queued else None
+
+    def save_round(
+            self, key_values: Dict[str, RedisType],
+            expiries: Optional[Dict[str, timedelta]] = None,
+            hash_key_values: Optional[Dict[str, Dict[str, RedisType]]] = None,
+            sorted_set_scores: Optional[Dict[str, Dict[str, float]]] = None):
+        # The writes of a round are queued together, so they are always
+        # flushed by the same run of the script
+        return self.write_multiple(key_values, expiries, hash_key_values,
+                                   sorted_set_scores)
+
+    def flush(self) -> bool:
+        # Sends all queued writes with the save_round script. Returns False if
+        # they could not be sent, in which case they are queued again.
+        with self._flush_lock:
+            with self._pending_lock:
+                key_values = self._pending_key_values
+                hash_key_values = self._pending_hash_key_values
+                sorted_set_scores = self._pending_sorted_set_scores
+                self._pending_key_values = {}
+                self._pending_hash_key_values = {}
+                self._pending_sorted_set_scores = {}
+                self._no_of_pending_writes = 0
+
+            if len(key_values) == 0 and len(hash_key_values) == 0 and \
+                    len(sorted_set_scores) == 0:
+                return True
+
+            flushed = self._safe(self.save_round_unsafe, [
+                {key: value for key, (value, _) in key_values.items()},
+                {key: expiry for key, (_, expiry) in key_values.items()
+                 if expiry is not None},
+                hash_key_values, sorted_set_scores], None) is not None
+            if not flushed:
+                self._queue(key_values, hash_key_values, sorted_set_scores,
+                            requeue=True)
+            return flushed
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flushing.wait(
+                self._flush_interval.total_seconds()):
+            try:
+                self.flush()
+            except Exception as e:
+                self._logger.error('Error when flushing Redis writes: %s', e)
+
+    def start_flushing(self) -> None:
+        if self._flusher is None:
+            self._stop_flushing.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name='redis_write_behind',
+                daemon=True)
+            self._flusher.start()
+
+    def stop_flushing(self) -> None:
+        # Stops the background flushes and sends any writes still queued
+        if self._flusher is not None:
+            self._stop_flushing.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
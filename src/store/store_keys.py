@@ -1,11 +1,20 @@
 # Hashes
 _hash_blockchain = "hash_bc1"
 
+# Sorted sets of monitor names, scored by the time the monitor was last alive
+_zset_node_monitors_alive = "zset_nm1"
+_zset_blockchain_monitors_alive = "zset_bcm1"
+
+# Sorted sets of samples of node values, scored by time: zset_nX_<node_name>,
+# where nX is the key of the node value
+_zset_prefix = "zset"
+
 # Unique keys
 _key_twilio_snooze = "tw1"
 _key_alive_reminder_mute = "ar1"
 
 # nX_<node_name>
+_key_node_state = "n0"
 _key_node_went_down_at = "n1"
 _key_node_bonded_balance = "n2"
 _key_node_is_syncing = "n3"
@@ -27,7 +36,6 @@ _key_node_auth_index = "n17"
 # nmX_<monitor_name>
 _key_node_monitor_alive = "nm1"
 _key_node_monitor_session_index = "nm2"
-_key_node_monitor_last_height_checked = "nm3"
 _key_node_monitor_era_index = "nm4"
 
 # bcX_<chain_name>
@@ -36,6 +44,9 @@ _key_blockchain_get_public_prop_count = "bc2"
 _key_blockchain_get_council_prop_count = "bc3"
 _key_blockchain_get_validator_set_size = "bc4"
 
+# asX_<chain_name>
+_key_archive_scanner_last_height_checked = "as1"
+
 # bcmX_<monitor_name>
 _key_blockchain_monitor_alive = "bcm1"
 
@@ -53,6 +64,14 @@ class Keys:
     def get_hash_blockchain(chain_name: str) -> str:
         return _as_prefix(_hash_blockchain) + chain_name
 
+    @staticmethod
+    def get_zset_node_monitors_alive() -> str:
+        return _zset_node_monitors_alive
+
+    @staticmethod
+    def get_zset_blockchain_monitors_alive() -> str:
+        return _zset_blockchain_monitors_alive
+
     @staticmethod
     def get_twilio_snooze() -> str:
         return _key_twilio_snooze
@@ -61,6 +80,30 @@ class Keys:
     def get_alive_reminder_mute() -> str:
         return _key_alive_reminder_mute
 
+    @staticmethod
+    def get_zset_node_bonded_balance(node_name: str) -> str:
+        return _as_prefix(_zset_prefix) + _as_prefix(
+            _key_node_bonded_balance) + node_name
+
+    @staticmethod
+    def get_zset_node_no_of_peers(node_name: str) -> str:
+        return _as_prefix(_zset_prefix) + _as_prefix(
+            _key_node_no_of_peers) + node_name
+
+    @staticmethod
+    def get_zset_node_blocks_authored(node_name: str) -> str:
+        return _as_prefix(_zset_prefix) + _as_prefix(
+            _key_node_no_of_blocks_authored) + node_name
+
+    @staticmethod
+    def get_zset_node_finalized_block_height(node_name: str) -> str:
+        return _as_prefix(_zset_prefix) + _as_prefix(
+            _key_node_finalized_block_height) + node_name
+
+    @staticmethod
+    def get_node_state(node_name: str) -> str:
+        return _as_prefix(_key_node_state) + node_name
+
     @staticmethod
     def get_node_went_down_at(node_name: str) -> str:
         return _as_prefix(_key_node_went_down_at) + node_name
@@ -145,8 +188,9 @@ class Keys:
         return _as_prefix(_key_node_monitor_era_index) + monitor_name
 
     @staticmethod
-    def get_node_monitor_last_height_checked(monitor_name: str) -> str:
-        return _as_prefix(_key_node_monitor_last_height_checked) + monitor_name
+    def get_archive_scanner_last_height_checked(chain_name: str) -> str:
+        return _as_prefix(_key_archive_scanner_last_height_checked) + \
+               chain_name
 
     @staticmethod
     def get_blockchain_referendum_count(chain_name: str) -> str:
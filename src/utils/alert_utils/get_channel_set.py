@@ -5,7 +5,7 @@ from src.channels.channel import ChannelSet
 from src.channels.console import ConsoleChannel
 from src.channels.email import EmailChannel
 from src.channels.log import LogChannel
-from src.channels.mongo import MongoChannel
+from src.channels.mongo import BufferedMongoChannel, MongoChannel
 from src.channels.telegram import TelegramChannel
 from src.channels.twilio import TwilioChannel
 from src.store.mongo.mongo_api import MongoApi
@@ -77,10 +77,34 @@ def _get_twilio_channel(channel_name: str, logger_general: logging.Logger,
 def _get_mongo_channel(channel_name: str, logger_general: logging.Logger,
                        redis: Optional[RedisApi], mongo: MongoApi,
                        backup_channels_for_mongo: ChannelSet) -> MongoChannel:
-    collection_name = InternalConf.mongo_coll_alerts_prefix + \
-                      UserConf.unique_alerter_identifier
-    mongo_channel = MongoChannel(channel_name, logger_general, redis, mongo,
-                                 collection_name, backup_channels_for_mongo)
+    if InternalConf.mongo_alerts_bucketed_storage_enabled:
+        collection_name = InternalConf.mongo_coll_alerts_buckets_prefix + \
+            UserConf.unique_alerter_identifier
+        bucket_length = InternalConf.mongo_alerts_bucket_length
+    else:
+        collection_name = InternalConf.mongo_coll_alerts_prefix + \
+            UserConf.unique_alerter_identifier
+        bucket_length = None
+    if InternalConf.mongo_alerts_rollup_enabled:
+        rollup_collection_name = \
+            InternalConf.mongo_coll_alerts_rollup_prefix + \
+            UserConf.unique_alerter_identifier
+    else:
+        rollup_collection_name = None
+    if InternalConf.mongo_alerts_buffer_enabled:
+        mongo_channel = BufferedMongoChannel(
+            channel_name, logger_general, redis, mongo, collection_name,
+            backup_channels_for_mongo,
+            InternalConf.mongo_alerts_flush_interval,
+            InternalConf.mongo_alerts_batch_size,
+            InternalConf.mongo_alerts_max_pending, rollup_collection_name,
+            bucket_length, InternalConf.mongo_alerts_bucket_max_alerts)
+        mongo_channel.start_flushing()
+    else:
+        mongo_channel = MongoChannel(
+            channel_name, logger_general, redis, mongo, collection_name,
+            backup_channels_for_mongo, rollup_collection_name, bucket_length,
+            InternalConf.mongo_alerts_bucket_max_alerts)
     return mongo_channel
 
 
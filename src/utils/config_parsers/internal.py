@@ -51,6 +51,27 @@ class InternalConfig(ConfigParser):
         # [mongo]
         section = cp['mongo']
         self.mongo_coll_alerts_prefix = section['coll_alerts_prefix']
+        self.mongo_alerts_buffer_enabled = to_bool(
+            section['alerts_buffer_enabled'])
+        self.mongo_alerts_flush_interval = timedelta(seconds=float(
+            section['alerts_flush_interval_seconds']))
+        self.mongo_alerts_batch_size = int(section['alerts_batch_size'])
+        self.mongo_alerts_max_pending = int(section['alerts_max_pending'])
+        alerts_retention_days = float(section['alerts_retention_days'])
+        self.mongo_alerts_retention = timedelta(days=alerts_retention_days) \
+            if alerts_retention_days > 0 else None
+        self.mongo_alerts_rollup_enabled = to_bool(
+            section['alerts_rollup_enabled'])
+        self.mongo_coll_alerts_rollup_prefix = \
+            section['coll_alerts_rollup_prefix']
+        self.mongo_alerts_bucketed_storage_enabled = to_bool(
+            section['alerts_bucketed_storage_enabled'])
+        self.mongo_coll_alerts_buckets_prefix = \
+            section['coll_alerts_buckets_prefix']
+        self.mongo_alerts_bucket_length = timedelta(minutes=float(
+            section['alerts_bucket_minutes']))
+        self.mongo_alerts_bucket_max_alerts = int(
+            section['alerts_bucket_max_alerts'])
 
         # [redis]
         section = cp['redis']
@@ -69,13 +90,66 @@ class InternalConfig(ConfigParser):
             section['redis_node_monitor_last_height_key_timeout'])
         self.redis_blockchain_monitor_alive_key_timeout = int(
             section['redis_blockchain_monitor_alive_key_timeout'])
+        self.redis_full_state_save_interval = timedelta(seconds=int(
+            section['redis_full_state_save_interval_seconds']))
+        self.redis_compact_node_state_enabled = to_bool(
+            section['redis_compact_node_state_enabled'])
+        self.redis_write_behind_enabled = to_bool(
+            section['redis_write_behind_enabled'])
+        self.redis_write_behind_flush_interval = timedelta(seconds=float(
+            section['redis_write_behind_flush_interval_seconds']))
+        self.redis_write_behind_max_pending_writes = int(
+            section['redis_write_behind_max_pending_writes'])
+        self.redis_max_connections = int(section['redis_max_connections'])
+        self.redis_pool_timeout = timedelta(seconds=float(
+            section['redis_pool_timeout_seconds']))
+        self.redis_socket_connect_timeout = timedelta(seconds=float(
+            section['redis_socket_connect_timeout_seconds']))
+        self.redis_socket_timeout = timedelta(seconds=float(
+            section['redis_socket_timeout_seconds']))
+        self.redis_socket_keepalive = to_bool(
+            section['redis_socket_keepalive'])
+        self.redis_health_check_interval = timedelta(seconds=int(
+            section['redis_health_check_interval_seconds']))
+        self.redis_cache_max_age = timedelta(seconds=float(
+            section['redis_cache_max_age_seconds']))
+        self.redis_cache_keyspace_notifications_enabled = to_bool(
+            section['redis_cache_keyspace_notifications_enabled'])
+        self.redis_node_metrics_enabled = to_bool(
+            section['redis_node_metrics_enabled'])
+        self.redis_node_metrics_retention = timedelta(hours=float(
+            section['redis_node_metrics_retention_hours']))
+        self.redis_node_metrics_trim_interval = timedelta(seconds=int(
+            section['redis_node_metrics_trim_interval_seconds']))
+
+        # [api]
+        section = cp['api']
+        self.api_connection_pool_size = int(
+            section['api_connection_pool_size'])
+        self.data_source_cache_seconds = int(
+            section['data_source_cache_seconds'])
+        self.direct_rpc_enabled = to_bool(section['direct_rpc_enabled'])
+        self.finalized_head_subscription_enabled = to_bool(
+            section['finalized_head_subscription_enabled'])
+
+        # [runtime]
+        section = cp['runtime']
+        self.monitor_runtime = section['monitor_runtime']
+        self.scheduler_max_workers = int(section['scheduler_max_workers'])
+        self.scheduler_jitter_seconds = float(
+            section['scheduler_jitter_seconds'])
+        self.query_pool_max_workers = int(section['query_pool_max_workers'])
 
         # [monitoring_periods]
         section = cp['monitoring_periods']
         self.node_monitor_period_seconds = int(
             section['node_monitor_period_seconds'])
-        self.node_monitor_max_catch_up_blocks = int(
-            section['node_monitor_max_catch_up_blocks'])
+        self.node_monitor_max_concurrent_queries = int(
+            section['node_monitor_max_concurrent_queries'])
+        self.archive_scanner_blocks_per_scan = int(
+            section['archive_scanner_blocks_per_scan'])
+        self.archive_scanner_max_concurrent_queries = int(
+            section['archive_scanner_max_concurrent_queries'])
         self.blockchain_monitor_period_seconds = int(
             section['blockchain_monitor_period_seconds'])
         self.github_monitor_period_seconds = int(
@@ -115,6 +115,11 @@ class UserConfig(ConfigParser):
         self.redis_host = cp['redis']['host']
         self.redis_port = cp['redis']['port']
         self.redis_password = cp['redis']['password']
+        # The number of connections to Redis is optional, overriding the
+        # internal config if set
+        self.redis_max_connections = \
+            int(cp['redis']['max_connections']) \
+            if cp['redis'].get('max_connections', '') != '' else None
 
         # [periodic_alive_reminder]
         self.par_enabled = to_bool(cp['periodic_alive_reminder']['enabled'])
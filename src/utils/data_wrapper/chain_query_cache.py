@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, Tuple, Awaitable
+
+from src.utils.data_wrapper.polkadot_api import PolkadotApiWrapper
+from src.utils.types import PolkadotWrapperType
+
+
+class _Query:
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class ChainQueryCache:
+
+    def __init__(self, logger: logging.Logger,
+                 data_wrapper: PolkadotApiWrapper) -> None:
+        self._logger = logger
+        self._data_wrapper = data_wrapper
+
+        # For each API call, only the query at the latest block hash seen is
+        # kept. Queries at an older block hash are replaced rather than stored
+        # alongside, so the cache size is bounded by the number of API calls.
+        self._lock = threading.Lock()
+        self._queries = {}  # type: Dict[str, Tuple[str, _Query]]
+
+    def _get(self, api_call: str, block_hash: str,
+             fetch: Callable[[], PolkadotWrapperType]) -> PolkadotWrapperType:
+        with self._lock:
+            entry = self._queries.get(api_call)
+            if entry is not None and entry[0] == block_hash:
+                query = entry[1]
+                is_first = False
+            else:
+                query = _Query()
+                self._queries[api_call] = (block_hash, query)
+                is_first = True
+
+        # Only the first thread asking for the query at this block hash
+        # fetches it. The other threads wait for its result.
+        if is_first:
+            self._logger.debug('%s fetching %s at block %s', self, api_call,
+                               block_hash)
+            try:
+                query.result = fetch()
+            except Exception as e:
+                query.exception = e
+                # Failed queries are not cached so that they are retried
+                with self._lock:
+                    if self._queries.get(api_call, (None, None))[1] is query:
+                        del self._queries[api_call]
+            finally:
+                query.done.set()
+        else:
+            query.done.wait()
+
+        if query.exception is not None:
+            raise query.exception
+        return query.result
+
+    def get_session_validators(self, ws_url: str, block_hash: str) \
+            -> PolkadotWrapperType:
+        return self._get(
+            'session/validators', block_hash,
+            lambda: self._data_wrapper.get_session_validators(ws_url))
+
+    def get_council_members(self, ws_url: str, block_hash: str) \
+            -> PolkadotWrapperType:
+        return self._get(
+            'council/members', block_hash,
+            lambda: self._data_wrapper.get_council_members(ws_url))
+
+    def get_derive_staking_validators(self, ws_url: str, block_hash: str) \
+            -> PolkadotWrapperType:
+        return self._get(
+            'staking/validators', block_hash,
+            lambda: self._data_wrapper.get_derive_staking_validators(ws_url))
+
+    def get_disabled_validators(self, ws_url: str, block_hash: str) \
+            -> PolkadotWrapperType:
+        return self._get(
+            'session/disabledValidators', block_hash,
+            lambda: self._data_wrapper.get_disabled_validators(ws_url))
+
+    def get_current_index(self, ws_url: str, block_hash: str) \
+            -> PolkadotWrapperType:
+        return self._get(
+            'session/currentIndex', block_hash,
+            lambda: self._data_wrapper.get_current_index(ws_url))
+
+    def get_active_era(self, ws_url: str, block_hash: str) \
+            -> PolkadotWrapperType:
+        return self._get(
+            'staking/activeEra', block_hash,
+            lambda: self._data_wrapper.get_active_era(ws_url))
+
+
+class AsyncChainQueryCache(ChainQueryCache):
+    # Coroutine version of the cache for the asyncio monitor runtime, to be
+    # used with an AsyncPolkadotApiWrapper. Every query method inherited from
+    # ChainQueryCache returns a coroutine in this cache.
+
+    async def _get(self, api_call: str, block_hash: str,
+                   fetch: Callable[[], Awaitable[PolkadotWrapperType]]) \
+            -> PolkadotWrapperType:
+        # All the coroutines run in the same thread, so no lock is needed to
+        # share a query. The query is shielded so that a coroutine which is
+        # cancelled while waiting does not cancel it for the others.
+        entry = self._queries.get(api_call)
+        if entry is not None and entry[0] == block_hash:
+            return await asyncio.shield(entry[1])
+
+        self._logger.debug('%s fetching %s at block %s', self, api_call,
+                           block_hash)
+        query = asyncio.ensure_future(fetch())
+        self._queries[api_call] = (block_hash, query)
+        try:
+            return await asyncio.shield(query)
+        except Exception:
+            # Failed queries are not cached so that they are retried
+            if self._queries.get(api_call, (None, None))[1] is query:
+                del self._queries[api_call]
+            raise
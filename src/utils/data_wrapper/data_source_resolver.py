@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import threading
+from datetime import timedelta
+from typing import List, Optional, Dict
+
+from src.alerters.reactive.node import Node
+from src.utils.data_wrapper.polkadot_api import PolkadotApiWrapper
+from src.utils.timing import TimedTaskLimiter
+
+
+class DataSourceResolver:
+
+    def __init__(self, logger: logging.Logger,
+                 data_wrapper: PolkadotApiWrapper, cache_time: timedelta) \
+            -> None:
+        self._logger = logger
+        self._data_wrapper = data_wrapper
+        self._cache_time = cache_time
+
+        # The list of web sockets connected to the API server and the nodes
+        # that were recently pinged are re-used until the cache time passes,
+        # so that all monitors sharing this resolver query them once per
+        # cache time rather than once per data source access.
+        self._connections_lock = threading.Lock()
+        self._connections = None
+        self._connections_limiter = TimedTaskLimiter(cache_time)
+        self._ping_limiters = {}  # type: Dict[str, TimedTaskLimiter]
+
+    @property
+    def cache_time(self) -> timedelta:
+        return self._cache_time
+
+    def _web_sockets_connected_to_an_api(self) -> List[str]:
+        # Only one thread refreshes the connections list, the others wait and
+        # use the refreshed list.
+        with self._connections_lock:
+            if self._connections is None or \
+                    self._connections_limiter.can_do_task():
+                self._connections = \
+                    self._data_wrapper.get_web_sockets_connected_to_an_api()
+                self._connections_limiter.did_task()
+            return self._connections
+
+    def select(self, data_sources: List[Node]) -> Optional[Node]:
+        # Get one of the nodes to use as data source, or None if none of them
+        # is up and connected to the API server
+        nodes_connected_to_an_api = self._web_sockets_connected_to_an_api()
+        for n in data_sources:
+            if n.ws_url in nodes_connected_to_an_api and not n.is_down:
+                return n
+        return None
+
+    def ping(self, node: Node) -> None:
+        limiter = self._ping_limiters.get(node.ws_url)
+        if limiter is None or limiter.can_do_task():
+            self._data_wrapper.ping_node(node.ws_url)
+            limiter = TimedTaskLimiter(self._cache_time)
+            limiter.did_task()
+            self._ping_limiters[node.ws_url] = limiter
+
+    def invalidate(self) -> None:
+        self._logger.debug('%s invalidate: clearing cached data source '
+                           'selection', self)
+
+        with self._connections_lock:
+            self._connections = None
+        self._ping_limiters.clear()
+
+
+class AsyncDataSourceResolver(DataSourceResolver):
+    # Coroutine version of the resolver for the asyncio monitor runtime, to be
+    # used with an AsyncPolkadotApiWrapper.
+
+    def __init__(self, logger: logging.Logger,
+                 data_wrapper: PolkadotApiWrapper, cache_time: timedelta) \
+            -> None:
+        super().__init__(logger, data_wrapper, cache_time)
+
+        # The lock is created on first use so that it belongs to the event
+        # loop of the asyncio monitor runtime.
+        self._connections_lock_async = None
+
+    async def _web_sockets_connected_to_an_api(self) -> List[str]:
+        if self._connections_lock_async is None:
+            self._connections_lock_async = asyncio.Lock()
+
+        async with self._connections_lock_async:
+            if self._connections is None or \
+                    self._connections_limiter.can_do_task():
+                self._connections = await \
+                    self._data_wrapper.get_web_sockets_connected_to_an_api()
+                self._connections_limiter.did_task()
+            return self._connections
+
+    async def select(self, data_sources: List[Node]) -> Optional[Node]:
+        nodes_connected_to_an_api = \
+            await self._web_sockets_connected_to_an_api()
+        for n in data_sources:
+            if n.ws_url in nodes_connected_to_an_api and not n.is_down:
+                return n
+        return None
+
+    async def ping(self, node: Node) -> None:
+        limiter = self._ping_limiters.get(node.ws_url)
+        if limiter is None or limiter.can_do_task():
+            await self._data_wrapper.ping_node(node.ws_url)
+            limiter = TimedTaskLimiter(self._cache_time)
+            limiter.did_task()
+            self._ping_limiters[node.ws_url] = limiter
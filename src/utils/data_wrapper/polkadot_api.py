@@ -1,19 +1,35 @@
 import logging
 from datetime import timedelta
-from typing import Optional
+from typing import Optional, Dict, Callable, Any
 
 from src.alerts.alerts import ApiIsDownAlert, ApiIsUpAgainAlert
 from src.channels.channel import ChannelSet
-from src.utils.get_json import get_polkadot_json
+from src.utils.get_json import get_polkadot_json, get_session, \
+    DEFAULT_POOL_SIZE
+from src.utils.substrate_rpc import RPC_METHODS, RpcSubscription, \
+    get_rpc_client, header_from_rpc
 from src.utils.timing import TimedTaskLimiter
 from src.utils.types import PolkadotWrapperType
 
 
 class PolkadotApiWrapper:
 
-    def __init__(self, logger: logging.Logger, api_endpoint: str):
+    def __init__(self, logger: logging.Logger, api_endpoint: str,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 direct_rpc_enabled: bool = False):
         self._logger = logger
         self._api_endpoint = api_endpoint
+        self._pool_size = pool_size
+
+        # If enabled, calls which are plain JSON-RPC methods of the node are
+        # made directly to the node over a persistent web socket rather than
+        # through the API server.
+        self._direct_rpc_enabled = direct_rpc_enabled
+
+        # All wrappers of the same API server share one pool of keep-alive
+        # connections, sized according to the given pool size.
+        self._set_up_connection_pool()
+
         self._api_down = False
         self._critical_alert_sent = False
 
@@ -21,10 +37,32 @@ class PolkadotApiWrapper:
         # API server, the user is informed via critical alert once
         self._api_down_limiter = TimedTaskLimiter(timedelta(seconds=int(15)))
 
+    def _set_up_connection_pool(self) -> None:
+        get_session(self._api_endpoint, self._pool_size)
+
+    def _query(self, endpoint: str, params: Dict, api_call: str = '') \
+            -> PolkadotWrapperType:
+        if self._direct_rpc_enabled and api_call in RPC_METHODS:
+            return get_rpc_client(self._logger).query(api_call, params)
+        return get_polkadot_json(endpoint, params, self._logger, api_call)
+
+    def _subscribe(self, ws_url: str, method: str,
+                   callback: Callable[[Any], None]) -> RpcSubscription:
+        return get_rpc_client(self._logger).subscribe(ws_url, method, [],
+                                                      callback)
+
     @property
     def api_endpoint(self) -> str:
         return self._api_endpoint
 
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    @property
+    def direct_rpc_enabled(self) -> bool:
+        return self._direct_rpc_enabled
+
     @property
     def is_api_down(self) -> bool:
         return self._api_down
@@ -34,62 +72,72 @@ class PolkadotApiWrapper:
         api_call = 'chain/getBlockHash'
         endpoint = self._api_endpoint + '/api/rpc/' + api_call
         params = {'websocket': ws_url, 'block_number': block_number}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_finalized_head(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'chain/getFinalizedHead'
         endpoint = self._api_endpoint + '/api/rpc/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_header(self, ws_url: str, block_hash: str) -> PolkadotWrapperType:
         api_call = 'chain/getHeader'
         endpoint = self._api_endpoint + '/api/rpc/' + api_call
         params = {'websocket': ws_url, 'hash': block_hash}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
+
+    def subscribe_finalized_heads(self, ws_url: str,
+                                  callback: Callable[[Dict], None]) \
+            -> RpcSubscription:
+        # The API server does not support subscriptions, so they are always
+        # made directly to the node. The callback is called with the header of
+        # each new finalized block, in the same format as get_header.
+        return self._subscribe(
+            ws_url, 'chain_subscribeFinalizedHeads',
+            lambda header: callback(header_from_rpc(header)))
 
     def get_system_chain(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'system/chain'
         endpoint = self._api_endpoint + '/api/rpc/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_system_health(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'system/health'
         endpoint = self._api_endpoint + '/api/rpc/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_council_members(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'council/members'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_council_proposal_count(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'council/proposalCount'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_public_proposal_count(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'democracy/publicPropCount'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_referendum_count(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'democracy/referendumCount'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_referendum_info_of(self, ws_url: str, referendum_index: int) \
             -> PolkadotWrapperType:
         api_call = 'democracy/referendumInfoOf'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url, 'referendum_index': referendum_index}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_authored_blocks(self, ws_url: str, session_index: int,
                             validator_id: str) -> PolkadotWrapperType:
@@ -98,7 +146,7 @@ class PolkadotApiWrapper:
         params = {'websocket': ws_url,
                   'validator_id': validator_id,
                   'session_index': session_index}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_received_heartbeats(self, ws_url: str, session_index: int,
                                 auth_index: int) -> PolkadotWrapperType:
@@ -107,52 +155,52 @@ class PolkadotApiWrapper:
         params = {'websocket': ws_url,
                   'auth_index': auth_index,
                   'session_index': session_index}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_current_index(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'session/currentIndex'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_disabled_validators(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'session/disabledValidators'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_session_validators(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'session/validators'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_derive_staking_validators(self, ws_url: str) \
             -> PolkadotWrapperType:
         api_call = 'staking/validators'
         endpoint = self._api_endpoint + '/api/derive/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_eras_stakers(self, ws_url: str, stash_account_address: str) \
             -> PolkadotWrapperType:
         api_call = 'staking/erasStakers'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url, 'account_id': stash_account_address}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_active_era(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'staking/activeEra'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_events(self, ws_url: str, block_hash: Optional[str]) \
             -> PolkadotWrapperType:
         api_call = 'system/events'
         endpoint = self._api_endpoint + '/api/query/' + api_call
         params = {'websocket': ws_url, 'block_hash': block_hash}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_slash_amount(self, ws_url: str, block_hash: Optional[str],
                          stash_account_address: str) -> PolkadotWrapperType:
@@ -160,23 +208,23 @@ class PolkadotApiWrapper:
         endpoint = self._api_endpoint + '/api/' + api_call
         params = {'websocket': ws_url, 'block_hash': block_hash,
                   'account_address': stash_account_address}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def get_web_sockets_connected_to_an_api(self) -> PolkadotWrapperType:
         endpoint = self._api_endpoint + '/api/getConnectionsList'
         params = {}
-        return get_polkadot_json(endpoint, params, self._logger)
+        return self._query(endpoint, params)
 
     def ping_api(self) -> PolkadotWrapperType:
         endpoint = self._api_endpoint + '/api/pingApi'
         params = {}
-        return get_polkadot_json(endpoint, params, self._logger)
+        return self._query(endpoint, params)
 
     def ping_node(self, ws_url: str) -> PolkadotWrapperType:
         api_call = 'pingNode'
         endpoint = self._api_endpoint + '/api/' + api_call
         params = {'websocket': ws_url}
-        return get_polkadot_json(endpoint, params, self._logger, api_call)
+        return self._query(endpoint, params, api_call)
 
     def set_api_as_down(self, monitor: str, is_validator_monitor,
                         channels: ChannelSet) -> None:
@@ -0,0 +1,29 @@
+from typing import Dict, Callable, Any
+
+from src.utils.data_wrapper.polkadot_api import PolkadotApiWrapper
+from src.utils.get_json_async import get_polkadot_json_async, \
+    set_async_pool_size
+from src.utils.substrate_rpc import RPC_METHODS, RpcSubscription, \
+    get_async_rpc_client
+
+
+class AsyncPolkadotApiWrapper(PolkadotApiWrapper):
+    # Every query method inherited from PolkadotApiWrapper returns a coroutine
+    # in this wrapper, which must be awaited from the event loop of the asyncio
+    # monitor runtime. For example:
+    #     system_health = await wrapper.get_system_health(ws_url)
+
+    def _set_up_connection_pool(self) -> None:
+        set_async_pool_size(self._api_endpoint, self._pool_size)
+
+    async def _query(self, endpoint: str, params: Dict, api_call: str = ''):
+        if self._direct_rpc_enabled and api_call in RPC_METHODS:
+            return await get_async_rpc_client(self._logger).query(
+                api_call, params)
+        return await get_polkadot_json_async(endpoint, params, self._logger,
+                                             api_call)
+
+    async def _subscribe(self, ws_url: str, method: str,
+                         callback: Callable[[Any], None]) -> RpcSubscription:
+        return await get_async_rpc_client(self._logger).subscribe(
+            ws_url, method, [], callback)
@@ -0,0 +1,37 @@
+import threading
+from concurrent.futures import Executor, Future
+from typing import Callable
+
+
+class InlineExecutor(Executor):
+    # Runs each call as soon as it is submitted, in the submitting thread.
+    # Used where no query pool is given, so that no threads are created.
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class BoundedExecutor(Executor):
+    # Submits calls to an executor which is shared with others, with at most
+    # max_in_flight of them queued or running at a time. Submitting blocks
+    # until one of the calls in flight is done. The shared executor is not
+    # shut down by this one.
+
+    def __init__(self, executor: Executor, max_in_flight: int) -> None:
+        self._executor = executor
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        self._in_flight.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._in_flight.release()
+            raise
+        future.add_done_callback(lambda _: self._in_flight.release())
+        return future
@@ -1,8 +1,11 @@
 import json
 import logging
-from typing import Dict
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.utils.exceptions import (ApiCallFailedException,
                                   UnexpectedApiCallErrorException,
@@ -13,20 +16,59 @@ from src.utils.exceptions import (ApiCallFailedException,
                                   NodeIsNotAnArchiveNodeException)
 
 
-def get_json(endpoint: str, logger: logging.Logger, params=None):
+DEFAULT_POOL_SIZE = 10
+
+# Sessions are shared by every thread querying the same server (scheme and
+# host), so that connections to that server are pooled and kept alive rather
+# than opened and torn down for each request.
+_sessions = {}
+_sessions_pool_size = {}
+_sessions_lock = threading.Lock()
+
+
+def server_of(endpoint: str) -> str:
+    split_endpoint = urlsplit(endpoint)
+    return '{}://{}'.format(split_endpoint.scheme, split_endpoint.netloc)
+
+
+def get_session(endpoint: str, pool_size: Optional[int] = None) \
+        -> requests.Session:
+    server = server_of(endpoint)
+    with _sessions_lock:
+        session = _sessions.get(server)
+        if session is None:
+            session = requests.Session()
+            _sessions[server] = session
+        elif pool_size is None or pool_size == _sessions_pool_size[server]:
+            return session
+
+        # (Re)mount the adapter holding the connection pool of the server
+        if pool_size is None:
+            pool_size = DEFAULT_POOL_SIZE
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount(server, adapter)
+        _sessions_pool_size[server] = pool_size
+        return session
+
+
+def get_json(endpoint: str, logger: logging.Logger, params=None,
+             session: Optional[requests.Session] = None):
     if params is None:
         params = {}
     # The timeout must be slightly greater than the API timeout so that errors
     # could be received from the API.
-    get_ret = requests.get(url=endpoint, params=params, timeout=15)
-    get_ret.close()
+    if session is None:
+        get_ret = requests.get(url=endpoint, params=params, timeout=15)
+        get_ret.close()
+    else:
+        # The response is not closed so that, once its content is read, the
+        # connection is returned to the session's pool and kept alive.
+        get_ret = session.get(url=endpoint, params=params, timeout=15)
     logger.debug('get_json: get_ret: %s', get_ret)
     return json.loads(get_ret.content.decode('UTF-8'))
 
 
-def get_polkadot_json(endpoint: str, params: Dict, logger: logging.Logger,
-                      api_call: str = ''):
-    data = get_json(endpoint, logger, params)
+def parse_polkadot_json(data: Dict, params: Dict, api_call: str = ''):
     if 'result' in data:
         return data['result']
     elif 'error' in data:
@@ -49,3 +91,9 @@ def get_polkadot_json(endpoint: str, params: Dict, logger: logging.Logger,
             raise UnexpectedApiCallErrorException(data['error'])
     else:
         raise UnexpectedApiErrorWhenReadingDataException(data)
+
+
+def get_polkadot_json(endpoint: str, params: Dict, logger: logging.Logger,
+                      api_call: str = ''):
+    data = get_json(endpoint, logger, params, session=get_session(endpoint))
+    return parse_polkadot_json(data, params, api_call)
@@ -0,0 +1,70 @@
+import asyncio
+import http.client
+import json
+import logging
+from typing import Dict, Optional
+
+import aiohttp
+from requests.exceptions import ConnectionError as ReqConnectionError, \
+    ReadTimeout
+
+from src.utils.get_json import DEFAULT_POOL_SIZE, parse_polkadot_json, \
+    server_of
+
+# As with the sessions in get_json, one session is shared by every coroutine
+# querying the same server. Since these sessions must be created from within
+# the event loop of the asyncio monitor runtime, they are created on first use
+# with the pool size previously set for the server, if any.
+_async_sessions = {}
+_async_sessions_pool_size = {}
+
+
+def set_async_pool_size(endpoint: str, pool_size: int) -> None:
+    _async_sessions_pool_size[server_of(endpoint)] = pool_size
+
+
+def get_async_session(endpoint: str) -> aiohttp.ClientSession:
+    server = server_of(endpoint)
+    session = _async_sessions.get(server)
+    if session is None or session.closed:
+        pool_size = _async_sessions_pool_size.get(server, DEFAULT_POOL_SIZE)
+        connector = aiohttp.TCPConnector(limit_per_host=pool_size)
+        session = aiohttp.ClientSession(connector=connector)
+        _async_sessions[server] = session
+    return session
+
+
+async def get_json_async(endpoint: str, logger: logging.Logger, params=None,
+                         session: Optional[aiohttp.ClientSession] = None):
+    if params is None:
+        params = {}
+    if session is None:
+        session = get_async_session(endpoint)
+
+    # Like requests, parameters set to None are left out of the query
+    params = {k: str(v) for k, v in params.items() if v is not None}
+
+    # The timeout must be slightly greater than the API timeout so that errors
+    # could be received from the API. Errors are raised as their requests
+    # counterparts so that the monitors handle them the same way in both
+    # runtimes.
+    try:
+        async with session.get(endpoint, params=params,
+                               timeout=aiohttp.ClientTimeout(total=15)) \
+                as get_ret:
+            logger.debug('get_json_async: get_ret: %s', get_ret)
+            content = await get_ret.read()
+    except aiohttp.ClientPayloadError as e:
+        raise http.client.IncompleteRead(b'', str(e))
+    except aiohttp.ClientConnectionError as e:
+        raise ReqConnectionError(e)
+    except asyncio.TimeoutError as e:
+        raise ReadTimeout(e)
+    return json.loads(content.decode('UTF-8'))
+
+
+async def get_polkadot_json_async(endpoint: str, params: Dict,
+                                  logger: logging.Logger, api_call: str = ''):
+    data = await get_json_async(endpoint, logger, params,
+                                session=get_async_session(endpoint))
+    return parse_polkadot_json(data, params, api_call)
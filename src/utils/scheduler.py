@@ -0,0 +1,143 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+
+class ScheduledTask:
+
+    def __init__(self, name: str, period: float,
+                 run_round: Callable[[], bool]) -> None:
+        # The run_round function runs one round of the task. It returns True
+        # if the next round should start immediately rather than after the
+        # period, for example if a monitor is catching up.
+        self._name = name
+        self._period = period
+        self._run_round = run_round
+
+        self._rounds = 0
+        self._overruns = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def period(self) -> float:
+        return self._period
+
+    @property
+    def rounds(self) -> int:
+        return self._rounds
+
+    @property
+    def overruns(self) -> int:
+        return self._overruns
+
+    def run_round(self) -> bool:
+        run_again_now = self._run_round()
+        self._rounds += 1
+        return run_again_now
+
+    def overran(self) -> None:
+        self._overruns += 1
+
+
+class Scheduler:
+
+    def __init__(self, logger: logging.Logger, max_workers: int,
+                 jitter_seconds: float = 0.0) -> None:
+        self._logger = logger
+        self._max_workers = max_workers
+        self._jitter_seconds = jitter_seconds
+
+        # Rounds which are due are kept in a heap ordered by due time. A single
+        # timer thread waits for the earliest one and hands it over to the
+        # worker pool, so the number of threads does not grow with the number
+        # of tasks. Each task has at most one round due or running at a time.
+        self._cond = threading.Condition()
+        self._due = []  # type: List[Tuple[float, int, ScheduledTask]]
+        self._counter = itertools.count()
+        self._tasks = []  # type: List[ScheduledTask]
+        self._stopped = False
+
+    @property
+    def tasks(self) -> List[ScheduledTask]:
+        return self._tasks
+
+    def _jitter(self) -> float:
+        return random.uniform(0, self._jitter_seconds)
+
+    def _push(self, due_time: float, task: ScheduledTask) -> None:
+        with self._cond:
+            heapq.heappush(self._due, (due_time, next(self._counter), task))
+            self._cond.notify()
+
+    def schedule(self, name: str, period: float,
+                 run_round: Callable[[], bool]) -> ScheduledTask:
+        task = ScheduledTask(name, period, run_round)
+        self._tasks.append(task)
+
+        # The first rounds are spread out so that tasks with the same period
+        # do not all run at the same time.
+        self._push(time.monotonic() + self._jitter(), task)
+        return task
+
+    def _run_round(self, task: ScheduledTask, due_time: float) -> None:
+        start_time = time.monotonic()
+        lateness = start_time - due_time
+        if lateness > task.period:
+            self._logger.warning(
+                'Round of %s started %.1f seconds late, more than its period '
+                'of %s seconds. Consider increasing the number of scheduler '
+                'workers.', task.name, lateness, task.period)
+
+        try:
+            run_again_now = task.run_round()
+        except Exception as e:
+            # The task is not scheduled again
+            self._logger.error('%s stopped: %s', task.name, e)
+            return
+
+        end_time = time.monotonic()
+        if run_again_now:
+            next_due_time = end_time
+        else:
+            next_due_time = start_time + task.period + self._jitter()
+            if end_time > next_due_time:
+                # The round took longer than the period. The next round starts
+                # immediately rather than trying to catch up on missed rounds.
+                task.overran()
+                self._logger.warning(
+                    'Round of %s took %.1f seconds, more than its period of '
+                    '%s seconds (overrun %s).', task.name,
+                    end_time - start_time, task.period, task.overruns)
+                next_due_time = end_time
+
+        self._push(next_due_time, task)
+
+    def start(self) -> None:
+        # Runs the scheduler until stop() is called
+        with ThreadPoolExecutor(self._max_workers,
+                                thread_name_prefix='scheduler') as executor:
+            while True:
+                with self._cond:
+                    while not self._stopped and (
+                            len(self._due) == 0 or
+                            self._due[0][0] > time.monotonic()):
+                        timeout = None if len(self._due) == 0 \
+                            else self._due[0][0] - time.monotonic()
+                        self._cond.wait(timeout)
+                    if self._stopped:
+                        return
+                    due_time, _, task = heapq.heappop(self._due)
+                executor.submit(self._run_round, task, due_time)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
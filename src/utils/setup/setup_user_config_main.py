@@ -311,6 +311,7 @@ def setup_redis(cp: ConfigParser) -> None:
     cp['redis']['host'] = ''
     cp['redis']['port'] = ''
     cp['redis']['password'] = ''
+    cp['redis']['max_connections'] = ''
 
     if not yn_prompt('Do you wish to set up Redis? (Y/n)\n'):
         return
@@ -0,0 +1,292 @@
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Callable
+
+import aiohttp
+
+from src.utils.exceptions import ApiCallFailedException, \
+    ConnectionWithNodeApiLostException, NodeIsNotAnArchiveNodeException, \
+    UnexpectedApiErrorWhenReadingDataException
+
+# As with the API server, the timeout is slightly greater than the node's own
+RPC_TIMEOUT_SECONDS = 15
+
+# The API server calls which are plain JSON-RPC methods of the node, with the
+# names of the API server parameters which are passed to the method, in order.
+# The other API server calls decode runtime storage, so they are always made
+# through the API server.
+RPC_METHODS = {
+    'chain/getBlockHash': ('chain_getBlockHash', ['block_number']),
+    'chain/getFinalizedHead': ('chain_getFinalizedHead', []),
+    'chain/getHeader': ('chain_getHeader', ['hash']),
+    'system/chain': ('system_chain', []),
+    'system/health': ('system_health', []),
+}
+
+
+def ws_endpoint_of(ws_url: str) -> str:
+    # Node web sockets may be given without a scheme in the nodes config
+    if '://' in ws_url:
+        return ws_url
+    return 'ws://' + ws_url
+
+
+def parse_rpc_json(data: Dict, method: str):
+    if 'result' in data:
+        return data['result']
+    elif 'error' in data:
+        error = json.dumps(data['error'])
+        if 'UnknownBlock' in error or 'State already discarded' in error:
+            raise NodeIsNotAnArchiveNodeException(error)
+        else:
+            raise ApiCallFailedException(
+                'API call {} failed. {}'.format(method, error))
+    else:
+        raise UnexpectedApiErrorWhenReadingDataException(data)
+
+
+def header_from_rpc(header: Dict) -> Dict:
+    # The API server returns block numbers as integers, whereas the node
+    # returns them as hex strings.
+    return dict(header, number=int(header['number'], 16))
+
+
+def _from_rpc_result(api_call: str, result):
+    if api_call == 'chain/getHeader' and result is not None:
+        result = header_from_rpc(result)
+    return result
+
+
+class _RpcConnection:
+
+    def __init__(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        self.ws = ws
+        self.closed = False
+        self.pending = {}  # type: Dict[int, asyncio.Future]
+
+        # The callbacks of the subscriptions over this connection, by
+        # subscription id, and of the subscribe requests awaiting their id.
+        self.subscriptions = {}  # type: Dict[Any, Callable[[Any], None]]
+        self.subscribing = {}  # type: Dict[int, Callable[[Any], None]]
+
+
+class RpcSubscription:
+    # A subscription ends when the connection with the node is lost, after
+    # which the node has to be subscribed to again.
+
+    def __init__(self, connection: _RpcConnection,
+                 subscription_id) -> None:
+        self._connection = connection
+        self._subscription_id = subscription_id
+
+    @property
+    def subscription_id(self):
+        return self._subscription_id
+
+    @property
+    def active(self) -> bool:
+        return not self._connection.closed
+
+
+class SubstrateRpcClient:
+    # Queries nodes over JSON-RPC, keeping one persistent web socket per node.
+    # Concurrent requests to the same node share its web socket and are
+    # matched with their responses by their JSON-RPC id. The client must only
+    # be used from the event loop which first uses it.
+
+    def __init__(self, logger: logging.Logger,
+                 timeout: float = RPC_TIMEOUT_SECONDS) -> None:
+        self._logger = logger
+        self._timeout = timeout
+
+        self._session = None
+        self._connections = {}  # type: Dict[str, _RpcConnection]
+        self._connect_locks = {}  # type: Dict[str, asyncio.Lock]
+        self._ids = itertools.count(1)
+
+    async def _connection(self, ws_url: str) -> _RpcConnection:
+        connection = self._connections.get(ws_url)
+        if connection is not None and not connection.ws.closed:
+            return connection
+
+        # Only one coroutine connects to a node, the others use its connection
+        lock = self._connect_locks.setdefault(ws_url, asyncio.Lock())
+        async with lock:
+            connection = self._connections.get(ws_url)
+            if connection is not None and not connection.ws.closed:
+                return connection
+
+            if self._session is None:
+                self._session = aiohttp.ClientSession()
+            self._logger.debug('Connecting to %s', ws_url)
+            try:
+                ws = await asyncio.wait_for(
+                    self._session.ws_connect(ws_endpoint_of(ws_url)),
+                    self._timeout)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                raise ConnectionWithNodeApiLostException(
+                    'Could not connect with node {}: {}'.format(ws_url, e))
+
+            connection = _RpcConnection(ws)
+            self._connections[ws_url] = connection
+            asyncio.ensure_future(self._read(ws_url, connection))
+            return connection
+
+    async def _read(self, ws_url: str, connection: _RpcConnection) -> None:
+        try:
+            async for msg in connection.ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                if 'id' not in data:
+                    self._notify(ws_url, connection, data)
+                    continue
+
+                # The subscription is registered before the subscribe request
+                # gets its response, so that no notification is missed.
+                callback = connection.subscribing.pop(data['id'], None)
+                if callback is not None and 'result' in data:
+                    connection.subscriptions[data['result']] = callback
+
+                response = connection.pending.pop(data['id'], None)
+                if response is not None and not response.done():
+                    response.set_result(data)
+        except Exception as e:
+            self._logger.error('Error reading from %s: %s', ws_url, e)
+        finally:
+            connection.closed = True
+            # Requests still waiting for a response will not get one
+            for response in connection.pending.values():
+                if not response.done():
+                    response.set_exception(ConnectionWithNodeApiLostException(
+                        'Lost connection with node.'))
+            connection.pending.clear()
+            connection.subscribing.clear()
+            connection.subscriptions.clear()
+            if self._connections.get(ws_url) is connection:
+                del self._connections[ws_url]
+
+    def _notify(self, ws_url: str, connection: _RpcConnection,
+                data: Dict) -> None:
+        params = data.get('params', {})
+        callback = connection.subscriptions.get(params.get('subscription'))
+        if callback is None:
+            return
+        try:
+            callback(params.get('result'))
+        except Exception as e:
+            # An error in a callback does not end the other subscriptions
+            self._logger.error('Error handling %s from %s: %s',
+                               data.get('method'), ws_url, e)
+
+    async def request(self, ws_url: str, method: str, params: List) -> Any:
+        connection = await self._connection(ws_url)
+        return await self._request(ws_url, connection, method, params)
+
+    async def _request(self, ws_url: str, connection: _RpcConnection,
+                       method: str, params: List,
+                       callback: Optional[Callable[[Any], None]] = None) \
+            -> Any:
+        request_id = next(self._ids)
+        response = asyncio.get_event_loop().create_future()
+        connection.pending[request_id] = response
+        if callback is not None:
+            connection.subscribing[request_id] = callback
+        try:
+            await connection.ws.send_str(json.dumps({
+                'jsonrpc': '2.0', 'id': request_id, 'method': method,
+                'params': params}))
+            data = await asyncio.wait_for(response, self._timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionWithNodeApiLostException(
+                'Lost connection with node.')
+        except (aiohttp.ClientError, ConnectionResetError):
+            raise ConnectionWithNodeApiLostException(
+                'Lost connection with node.')
+        finally:
+            connection.pending.pop(request_id, None)
+            connection.subscribing.pop(request_id, None)
+
+        self._logger.debug('request: %s %s: %s', ws_url, method, data)
+        return parse_rpc_json(data, method)
+
+    async def query(self, api_call: str, params: Dict) -> Any:
+        # Makes the API server call api_call directly to the node. The
+        # parameters and result are those of the API server call.
+        method, param_names = RPC_METHODS[api_call]
+        result = await self.request(params['websocket'], method,
+                                    [params[name] for name in param_names])
+        return _from_rpc_result(api_call, result)
+
+    async def subscribe(self, ws_url: str, method: str, params: List,
+                        callback: Callable[[Any], None]) -> RpcSubscription:
+        # The callback is called with the result of each notification of the
+        # subscription, from the event loop of the client.
+        connection = await self._connection(ws_url)
+        subscription_id = await self._request(ws_url, connection, method,
+                                              params, callback)
+        return RpcSubscription(connection, subscription_id)
+
+    async def close(self) -> None:
+        for connection in list(self._connections.values()):
+            await connection.ws.close()
+        if self._session is not None:
+            await self._session.close()
+
+
+class BlockingSubstrateRpcClient:
+    # Runs a SubstrateRpcClient on an event loop of its own in a background
+    # thread, so that threads share its web sockets.
+
+    def __init__(self, logger: logging.Logger,
+                 timeout: float = RPC_TIMEOUT_SECONDS) -> None:
+        self._client = SubstrateRpcClient(logger, timeout)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name='substrate_rpc', daemon=True)
+        self._thread.start()
+
+    def _run(self, coroutine) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def request(self, ws_url: str, method: str, params: List) -> Any:
+        return self._run(self._client.request(ws_url, method, params))
+
+    def query(self, api_call: str, params: Dict) -> Any:
+        return self._run(self._client.query(api_call, params))
+
+    def subscribe(self, ws_url: str, method: str, params: List,
+                  callback: Callable[[Any], None]) -> RpcSubscription:
+        # The callback is called from the thread of the client
+        return self._run(self._client.subscribe(ws_url, method, params,
+                                                callback))
+
+    def close(self) -> None:
+        self._run(self._client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+# As with the HTTP sessions, a single client is shared by all wrappers, one
+# for threads and one for the event loop of the asyncio monitor runtime.
+_blocking_client = None  # type: Optional[BlockingSubstrateRpcClient]
+_blocking_client_lock = threading.Lock()
+_async_client = None  # type: Optional[SubstrateRpcClient]
+
+
+def get_rpc_client(logger: logging.Logger) -> BlockingSubstrateRpcClient:
+    global _blocking_client
+    with _blocking_client_lock:
+        if _blocking_client is None:
+            _blocking_client = BlockingSubstrateRpcClient(logger)
+        return _blocking_client
+
+
+def get_async_rpc_client(logger: logging.Logger) -> SubstrateRpcClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = SubstrateRpcClient(logger)
+    return _async_client
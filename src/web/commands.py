@@ -25,12 +25,9 @@ class Commands:
 
         self._redis_enabled = redis is not None
 
-        # Whether archive alerts disabled for the chain that a node is running
-        self._archive_alerts_disabled_for_chain_by_node = {}
-        for c, ns in node_monitor_nodes_by_chain.items():
-            for n in ns:
-                self._archive_alerts_disabled_for_chain_by_node[n.name] = \
-                    archive_alerts_disabled_by_chain[c]
+        # Whether archive alerts disabled for each chain
+        self._archive_alerts_disabled_by_chain = \
+            archive_alerts_disabled_by_chain
 
         self._internal_conf = internal_conf
         self._user_conf = user_conf
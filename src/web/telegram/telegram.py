@@ -1,6 +1,6 @@
 import logging
 from datetime import timedelta, datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable
 
 from pymongo.errors import PyMongoError
 from redis import RedisError
@@ -266,13 +266,31 @@ class TelegramCommands(Commands):
         self._redis.remove(Keys.get_alive_reminder_mute())
         update.message.reply_text('Periodic alive reminder has been unmuted.')
 
-    def _get_monitor_last_update(self, key: str, name: str):
-        last_upd = self._redis.get(key).decode('utf-8')
-        last_upd = last_upd.split('.')[0]  # remove milliseconds
-        last_upd = float(last_upd)
-        last_upd = datetime.fromtimestamp(last_upd)
+    @staticmethod
+    def _get_monitor_last_update(name: str, last_update: float):
+        last_upd = datetime.fromtimestamp(int(last_update))  # no milliseconds
         return '- Last update from *{}*: `{}`.\n'.format(name, last_upd)
 
+    def _get_monitor_last_updates(self, registry_key: str,
+                                  get_alive_key: Callable[[str], str],
+                                  alive_key_timeout: int) -> Dict[str, float]:
+        # The monitors are found in their registry, in which they are scored
+        # by the time they were last alive. If the registry is empty, such as
+        # when monitors have not saved their state since an upgrade, the
+        # alive keys of the monitors are scanned for instead.
+        since = datetime.now().timestamp() - alive_key_timeout
+        last_updates = self._redis.get_sorted_set_scores(registry_key, since)
+        if len(last_updates) > 0:
+            return last_updates
+
+        alive_keys = self._redis.get_keys(get_alive_key('*'))
+        names = [k.replace(get_alive_key(''), '', 1) for k in alive_keys]
+        for key, name in zip(alive_keys, names):
+            last_update = self._redis.get(key)
+            if last_update is not None:
+                last_updates[name] = float(last_update)
+        return last_updates
+
     def _get_redis_based_status(self):
         status = ""
 
@@ -285,64 +303,71 @@ class TelegramCommands(Commands):
                       'available until the monitors detect Redis as alive. ' \
                       'Snoozing and muting might not work as expected.\n'
 
+        # Add the usage of the connections to Redis
+        pool_stats = self._redis.pool_stats
+        status += '- {} of {} Redis connections are in use (at most {} so ' \
+                  'far). Getting a connection took {:.1f}ms on average and ' \
+                  'at most {:.1f}ms.\n'.format(
+                      pool_stats['connections_in_use'],
+                      pool_stats['max_connections'],
+                      pool_stats['max_connections_in_use'],
+                      pool_stats['average_wait_seconds'] * 1000,
+                      pool_stats['max_wait_seconds'] * 1000)
+        if pool_stats['connections_failed'] > 0:
+            status += '- {} Redis connections could not be made or were not ' \
+                      'available in time.\n'.format(
+                          pool_stats['connections_failed'])
+
         # Add Twilio calls snooze state to status if Twilio enabled
         if self._user_conf.twilio_alerts_enabled:
-            if self._redis.exists(Keys.get_twilio_snooze()):
-                until = self._redis.get(Keys.get_twilio_snooze()).decode(
-                    "utf-8")
-                status += '- Twilio calls are snoozed until {}.\n'.format(until)
+            until = self._redis.get_cached(Keys.get_twilio_snooze())
+            if until is not None:
+                status += '- Twilio calls are snoozed until {}.\n'.format(
+                    until.decode("utf-8"))
             else:
                 status += '- Twilio calls are not snoozed.\n'
 
         # Add periodic alive reminder mute state to status if reminder enabled
         if self._user_conf.par_enabled:
-            if self._redis.exists(Keys.get_alive_reminder_mute()):
-                until = self._redis.get(Keys.get_alive_reminder_mute()).decode(
-                    "utf-8")
-                status += '- The periodic alive reminder has ' \
-                          'been muted until {}.\n'.format(until)
+            until = self._redis.get_cached(Keys.get_alive_reminder_mute())
+            if until is not None:
+                status += '- The periodic alive reminder has been muted ' \
+                          'until {}.\n'.format(until.decode("utf-8"))
             else:
                 status += '- The periodic alive reminder is not muted.\n'
 
         # Add node monitor latest updates to status
-        # TODO: consider getting nodes from config
-        node_monitor_keys_list = self._redis.get_keys(
-            Keys.get_node_monitor_alive("*"))
-        node_monitor_names = [
-            k.replace(Keys.get_node_monitor_alive(""), '')
-            for k in node_monitor_keys_list]
-        node_names = [self.trim_monitor_name(n) for n in node_monitor_names]
-        for key, name in zip(node_monitor_keys_list, node_monitor_names):
-            status += self._get_monitor_last_update(key, name)
+        node_monitor_last_updates = self._get_monitor_last_updates(
+            Keys.get_zset_node_monitors_alive(), Keys.get_node_monitor_alive,
+            self._internal_conf.redis_node_monitor_alive_key_timeout)
+        for name, last_update in sorted(node_monitor_last_updates.items()):
+            status += self._get_monitor_last_update(name, last_update)
 
         # Add note if no latest node monitor updates
-        if len(node_monitor_keys_list) == 0:
+        if len(node_monitor_last_updates) == 0:
             status += '- No recent update from node monitors.\n'
 
         # Print the current block height if archive alerts enabled for chain
-        for nn, nmn in zip(node_names, node_monitor_names):
-            if nn in self._archive_alerts_disabled_for_chain_by_node and \
-                    not self._archive_alerts_disabled_for_chain_by_node[nn]:
-                key_lh = Keys.get_node_monitor_last_height_checked(nmn)
+        for chain, disabled in self._archive_alerts_disabled_by_chain.items():
+            if not disabled:
+                key_lh = Keys.get_archive_scanner_last_height_checked(chain)
                 last_height_checked = self._redis.get_int(key_lh)
                 if last_height_checked != NONE:
-                    status += '- *{}* is currently in block height {}.\n' \
-                        .format(nmn, last_height_checked)
+                    status += '- The archive scanner of *{}* is currently ' \
+                              'in block height {}.\n' \
+                        .format(chain, last_height_checked)
 
         # Add blockchain monitor latest updates to status
-        # TODO: consider getting blockchains from config
-        blockchain_monitor_keys_list = self._redis.get_keys(
-            Keys.get_blockchain_monitor_alive("*"))
-        blockchain_monitor_names = [
-            k.replace(Keys.get_blockchain_monitor_alive(""), '')
-            for k in blockchain_monitor_keys_list
-        ]
-        for key, name in zip(blockchain_monitor_keys_list,
-                             blockchain_monitor_names):
-            status += self._get_monitor_last_update(key, name)
+        blockchain_monitor_last_updates = self._get_monitor_last_updates(
+            Keys.get_zset_blockchain_monitors_alive(),
+            Keys.get_blockchain_monitor_alive,
+            self._internal_conf.redis_blockchain_monitor_alive_key_timeout)
+        for name, last_update in sorted(
+                blockchain_monitor_last_updates.items()):
+            status += self._get_monitor_last_update(name, last_update)
 
         # Add note if no latest blockchain monitor updates
-        if len(blockchain_monitor_keys_list) == 0:
+        if len(blockchain_monitor_last_updates) == 0:
             status += '- No recent update from blockchain monitors.\n'
 
         return status
@@ -38,6 +38,8 @@ app.use(express.static(path.join(__dirname, 'build')));
 
 let alerterID;
 let redisDB;
+let alertsBucketed = false;
+let alertsBucketsPrefix = 'alerts_buckets_';
 let polkadotApiEndpoint;
 let chainNodesMap = {};
 let repoNameList = [];
@@ -67,6 +69,8 @@ function resetInfoFromUserReposConfig() {
 
 function resetInfoFromInternalMainConfig() {
   redisDB = undefined;
+  alertsBucketed = false;
+  alertsBucketsPrefix = 'alerts_buckets_';
   console.debug('Set main internal config values to default.');
 }
 
@@ -192,6 +196,17 @@ function loadInfoFromInternalMainConfig() {
       console.error('Missing redis.redis_database from %s. Using %s',
         configName, redisDB);
     }
+
+    // Get whether alerts are saved in buckets, and the buckets collection
+    if (config.mongo && config.mongo.alerts_bucketed_storage_enabled) {
+      alertsBucketed = utils.toBool(
+        config.mongo.alerts_bucketed_storage_enabled,
+      );
+      if (config.mongo.coll_alerts_buckets_prefix) {
+        alertsBucketsPrefix = config.mongo.coll_alerts_buckets_prefix;
+      }
+      console.debug('Set alerts bucketed to %s', alertsBucketed);
+    }
   } catch (err) {
     if (err.code === 'ENOENT') {
       console.error('Config %s not found. Using Redis DB "%s".',
@@ -458,7 +473,8 @@ app.get('/server/alerts', async (req, res) => {
   const query = {};
   query.skip = parsedSize * (parsedPageNo - 1);
   query.limit = parsedSize;
-  query.sort = { $natural: -1 };
+  // Sorted by the timestamp index of the alerts collection, newest first
+  query.sort = { timestamp: -1 };
 
   const authPass = mongoInfo.pass ? `:${mongoInfo.pass}` : '';
   const authFull = mongoInfo.user ? `${mongoInfo.user}${authPass}@` : '';
@@ -471,8 +487,11 @@ app.get('/server/alerts', async (req, res) => {
     }
 
     const db = client.db(mongoInfo.db_name);
-    const colName = `alerts_${alerterID}`;
-    mongo.findDocuments(db, colName, query, (totalCount, alerts) => {
+    const colName = alertsBucketed
+      ? `${alertsBucketsPrefix}${alerterID}` : `alerts_${alerterID}`;
+    const find = alertsBucketed
+      ? mongo.findBucketedAlerts : mongo.findDocuments;
+    find(db, colName, query, (totalCount, alerts) => {
       client.close();
       const totalPages = (
         parsedSize > 0 ? Math.ceil(totalCount / parsedSize) : 1);
@@ -581,6 +600,7 @@ app.get('/server/all_chain_info', async (req, res) => {
   // List of values to get from Redis
   const valuesToGetNormally = []; // mget to be used
   const valuesToGetFromHash = []; // hmget to be used
+  const compactValuesToGetFromHash = []; // hmget of binary values to be used
 
   // ----------------------------- Blockchain
 
@@ -635,6 +655,10 @@ app.get('/server/all_chain_info', async (req, res) => {
           valuesToGetFromHash.push(keysNode[k]);
         });
 
+      // The node's state may instead be saved as one compact value
+      const keyNodeCompact = `${redis.getKeysNodeCompact().state}_${n}`;
+      compactValuesToGetFromHash.push(keyNodeCompact);
+
       // Create Redis keys for node monitor
       let keysNodeMonitor = redis.getKeysNodeMonitor();
       keysNodeMonitor = redis.addPrefixToDictValues(keysNodeMonitor,
@@ -642,6 +666,15 @@ app.get('/server/all_chain_info', async (req, res) => {
       keysNodeMonitor = redis.addPostfixToDictValues(keysNodeMonitor,
         `_Node monitor (${n})`); // Add postfix
 
+      // The last height checked for slashing is kept per chain by the
+      // chain's archive scanner, and is shown for each of its node monitors
+      let keysArchiveScanner = redis.getKeysArchiveScanner();
+      keysArchiveScanner = redis.addPrefixToDictValues(keysArchiveScanner,
+        getRedisKeyPrefix()); // Add prefix
+      keysArchiveScanner = redis.addPostfixToDictValues(keysArchiveScanner,
+        `_${chainName}`); // Add postfix
+      Object.assign(keysNodeMonitor, keysArchiveScanner);
+
       // Add keys to the values-to-get list
       Object.keys(keysNodeMonitor)
         .forEach((k) => {
@@ -690,9 +723,16 @@ app.get('/server/all_chain_info', async (req, res) => {
           valuesDict[key] = values[i];
         });
       })
+      .hmget(Buffer.from(hash),
+        compactValuesToGetFromHash.map(key => Buffer.from(key)),
+        (err3, values) => {
+          compactValuesToGetFromHash.forEach((key, i) => {
+            valuesDict[key] = values ? values[i] : null;
+          });
+        })
       // eslint-disable-next-line no-unused-vars
-      .exec((err3, replies) => {
-        if (err3 != null) {
+      .exec((err4, replies) => {
+        if (err4 != null) {
           res.status(utils.ERR_STATUS)
             .send(utils.errorJson(msg.MSG_REDIS_ERROR));
           return;
@@ -713,12 +753,16 @@ app.get('/server/all_chain_info', async (req, res) => {
             });
         }
 
-        // Replace keys in node sections with value in valuesDict
+        // Replace keys in node sections with value in valuesDict. As when
+        // the alerter loads it, the compact state of a node is used if saved.
         Object.keys(allInfo.nodes)
           .forEach((n) => {
+            const compactState = redis.decodeCompactNodeState(valuesDict[
+              `${redis.getKeysNodeCompact().state}_${n}`]);
             Object.keys(allInfo.nodes[n])
               .forEach((k) => {
-                allInfo.nodes[n][k] = valuesDict[allInfo.nodes[n][k]];
+                allInfo.nodes[n][k] = compactState
+                  ? compactState[k] : valuesDict[allInfo.nodes[n][k]];
               });
           });
 
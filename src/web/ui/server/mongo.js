@@ -3,7 +3,8 @@ const assert = require('assert');
 module.exports = {
   findDocuments: (db, colName, query, callback) => {
     const collection = db.collection(colName);
-    collection.countDocuments({}, (err, totalCount) => {
+    // Estimated from the collection metadata, to avoid scanning all alerts
+    collection.estimatedDocumentCount({}, (err, totalCount) => {
       assert.equal(err, null);
       collection.find({}, query)
         .toArray((err, docs) => {
@@ -13,6 +14,36 @@ module.exports = {
     });
   },
 
+  // Alerts saved in buckets are unwound into alerts, newest first
+  findBucketedAlerts: (db, colName, query, callback) => {
+    const collection = db.collection(colName);
+    const severities = {
+      I: 'INFO', W: 'WARNING', C: 'CRITICAL', E: 'ERROR',
+    };
+    collection.aggregate([
+      { $group: { _id: null, total: { $sum: '$count' } } },
+    ]).toArray((err, totals) => {
+      assert.equal(err, null);
+      const totalCount = totals.length > 0 ? totals[0].total : 0;
+      collection.aggregate([
+        { $unwind: '$alerts' },
+        { $sort: { start: -1, 'alerts.t': -1 } },
+        { $skip: query.skip },
+        { $limit: query.limit },
+      ], { allowDiskUse: true })
+        .toArray((err, buckets) => {
+          assert.equal(err, null);
+          callback(totalCount, buckets.map((bucket) => ({
+            origin: bucket.origin,
+            severity: severities[bucket.alerts.s] || bucket.alerts.s,
+            message: bucket.alerts.m,
+            alert_code: bucket.alerts.c,
+            timestamp: bucket.alerts.t,
+          })));
+        });
+    });
+  },
+
   options: {
     useNewUrlParser: true,
     useUnifiedTopology: true,
@@ -27,14 +27,103 @@ const getKeysNode = () => ({
   auth_index: 'n17',
 });
 
+// n0_<node_name>: the values of the nX_<node_name> keys above saved as one
+// compact binary value, if redis_compact_node_state_enabled is set. The fields
+// are in the order of the CompactStateCodec of src/alerters/reactive/node.py.
+const COMPACT_NODE_STATE_VERSION = 1;
+const getKeysNodeCompact = () => ({
+  state: 'n0',
+});
+const getCompactNodeStateFields = () => ([
+  ['went_down_at', 'float'],
+  ['bonded_balance', 'int'],
+  ['is_syncing', 'bool'],
+  ['no_of_peers', 'int'],
+  ['active', 'bool'],
+  ['council_member', 'bool'],
+  ['elected', 'bool'],
+  ['disabled', 'bool'],
+  ['no_of_blocks_authored', 'int'],
+  ['time_of_last_block', 'float'],
+  ['is_authoring', 'bool'],
+  ['time_of_last_block_check_activity', 'float'],
+  ['time_of_last_height_check_activity', 'float'],
+  ['time_of_last_height_change', 'float'],
+  ['finalized_block_height', 'int'],
+  ['no_change_in_height_warning_sent', 'bool'],
+  ['auth_index', 'int'],
+]);
+
+// Ints are saved big-endian in two's complement, in as many bytes as needed,
+// since bonded balances (for example) do not fit in 64 bits
+const decodeSignedInt = (bytes) => {
+  let value = BigInt(0);
+  bytes.forEach((byte) => {
+    value = value * BigInt(256) + BigInt(byte);
+  });
+  if (bytes.length > 0 && bytes[0] >= 128) {
+    value -= BigInt(2) ** BigInt(8 * bytes.length);
+  }
+  return value.toString();
+};
+
+// Decodes a compact node state into the values as they are saved in the nX
+// keys (None, True and False as in Python), or returns null if the value was
+// not saved with this version of the compact state encoding or is incomplete
+const decodeCompactNodeState = (encoded) => {
+  const fields = getCompactNodeStateFields();
+  const bitmapLength = Math.ceil(fields.length / 8);
+  if (!Buffer.isBuffer(encoded) || encoded.length < 1 + bitmapLength
+    || encoded[0] !== COMPACT_NODE_STATE_VERSION) {
+    return null;
+  }
+  let bitmap = 0;
+  for (let i = 1; i <= bitmapLength; i += 1) {
+    bitmap = bitmap * 256 + encoded[i];
+  }
+
+  let offset = 1 + bitmapLength;
+  const values = {};
+  try {
+    fields.forEach(([name, type], i) => {
+      if (Math.floor(bitmap / (2 ** i)) % 2 === 0) {
+        values[name] = 'None';
+      } else if (type === 'float') {
+        values[name] = encoded.readDoubleBE(offset).toString();
+        offset += 8;
+      } else if (type === 'bool') {
+        values[name] = encoded.readUInt8(offset) ? 'True' : 'False';
+        offset += 1;
+      } else {
+        const length = encoded.readUInt8(offset);
+        offset += 1;
+        if (offset + length > encoded.length) {
+          throw new RangeError('Compact node state is incomplete.');
+        }
+        values[name] = decodeSignedInt(
+          encoded.slice(offset, offset + length),
+        );
+        offset += length;
+      }
+    });
+  } catch (err) {
+    return null;
+  }
+  return values;
+};
+
 // nmX_<monitor_name>
 const getKeysNodeMonitor = () => ({
   alive: 'nm1',
   session_index: 'nm2',
-  last_height_checked: 'nm3',
   era_index: 'nm4',
 });
 
+// asX_<chain_name>
+const getKeysArchiveScanner = () => ({
+  last_height_checked: 'as1',
+});
+
 // bcX_<chain_name>
 const getKeysBlockchain = () => ({
   referendum_count: 'bc1',
@@ -55,6 +144,9 @@ module.exports = {
       port,
       password: password || undefined,
       no_ready_check: true,
+      // Replies are Buffers for commands given Buffer arguments, so that
+      // compact binary values are read as they are
+      detect_buffers: true,
       retry_strategy: (options) => {
         if (options.error && options.error.code === 'ECONNREFUSED') {
           // End reconnecting on a specific error and flush all commands with
@@ -109,7 +201,10 @@ module.exports = {
 
   getHashes,
   getKeysNode,
+  getKeysNodeCompact,
+  decodeCompactNodeState,
   getKeysNodeMonitor,
+  getKeysArchiveScanner,
   getKeysBlockchain,
   getKeysBlockchainMonitor,
 };
@@ -1,5 +1,6 @@
 import logging
 import unittest
+from unittest.mock import patch
 from datetime import timedelta
 from time import sleep
 
@@ -2139,6 +2140,25 @@ class TestNodeWithRedis(unittest.TestCase):
         self.assertTrue(self.validator.is_no_change_in_height_warning_sent)
         self.assertEqual(self.validator.auth_index, 45)
 
+    def test_load_state_uses_state_read_in_bulk_if_given(self):
+        hash_name = Keys.get_hash_blockchain(self.validator.chain)
+        node = self.validator.name
+        self.redis.hset_multiple_unsafe(hash_name, {
+            Keys.get_node_bonded_balance(node): 456,
+            Keys.get_node_active(node): str(True),
+            Keys.get_node_time_of_last_block(node): 12.4,
+        })
+        state = self.redis.hgetall_multiple_unsafe([hash_name])[hash_name]
+
+        with patch.object(self.redis, 'hgetall') as hgetall:
+            self.validator.load_state(self.logger, state)
+
+        hgetall.assert_not_called()
+        self.assertEqual(self.validator.bonded_balance, 456)
+        self.assertTrue(self.validator.is_active)
+        self.assertEqual(self.validator._time_of_last_block, 12.4)
+        self.assertIsNone(self.validator.no_of_peers)
+
     def test_load_state_sets_blocks_authored_timer_to_last_activity_if_not_NONE(
             self) -> None:
         hash_name = Keys.get_hash_blockchain(self.chain)
@@ -2249,3 +2269,140 @@ class TestNodeWithRedis(unittest.TestCase):
                 self.validator.name)))
         self.assertEqual(self.redis.hget_int_unsafe(
             hash_name, Keys.get_node_auth_index(self.validator.name)), 45)
+
+    def test_save_state_only_sets_values_which_changed_since_last_save(self):
+        self.validator.save_state(self.logger)
+
+        self.validator._bonded_balance = 456
+        self.validator._finalized_block_height = 34
+        with patch.object(self.redis, 'hset_multiple',
+                          wraps=self.redis.hset_multiple) as hset_multiple:
+            self.validator.save_state(self.logger)
+            self.validator.save_state(self.logger)
+
+        hash_name = Keys.get_hash_blockchain(self.validator.chain)
+        hset_multiple.assert_called_once_with(hash_name, {
+            Keys.get_node_bonded_balance(self.validator.name): 456,
+            Keys.get_node_finalized_block_height(self.validator.name): 34})
+        self.assertEqual(self.redis.hget_int_unsafe(
+            hash_name, Keys.get_node_bonded_balance(self.validator.name)), 456)
+
+    def test_save_state_sets_values_again_if_last_save_failed(self):
+        self.validator.save_state(self.logger)
+
+        self.validator._bonded_balance = 456
+        with patch.object(self.redis, 'hset_multiple', return_value=None):
+            self.validator.save_state(self.logger)
+        self.validator.save_state(self.logger)
+
+        hash_name = Keys.get_hash_blockchain(self.validator.chain)
+        self.assertEqual(self.redis.hget_int_unsafe(
+            hash_name, Keys.get_node_bonded_balance(self.validator.name)), 456)
+
+    def _compact_validator(self) -> Node:
+        with patch.object(TestInternalConf,
+                          'redis_compact_node_state_enabled', True):
+            return Node(name=self.node_name, ws_url=None,
+                        node_type=NodeType.VALIDATOR_FULL_NODE,
+                        stash_account_address='', chain=self.chain,
+                        redis=self.redis, is_archive_node=True,
+                        internal_conf=TestInternalConf)
+
+    def test_save_state_saves_one_compact_value_if_compact_state_enabled(
+            self):
+        validator = self._compact_validator()
+        validator._bonded_balance = 12345678901234567890123
+        validator._active = True
+        validator._time_of_last_block = 1234.4
+        validator.save_state(self.logger)
+
+        hash_name = Keys.get_hash_blockchain(self.chain)
+        self.assertEqual(self.redis.get_keys_unsafe(), [hash_name])
+        self.assertEqual(list(self.redis.hgetall_unsafe(hash_name)._values),
+                         [Keys.get_node_state(self.node_name)])
+
+        loaded = self._compact_validator()
+        loaded.load_state(self.logger)
+        self.assertEqual(loaded.bonded_balance, 12345678901234567890123)
+        self.assertTrue(loaded.is_active)
+        self.assertIsNone(loaded.no_of_peers)
+        self.assertEqual(loaded._time_of_last_block, 1234.4)
+        self.assertEqual(loaded.auth_index, NONE)
+
+    def test_load_state_moves_state_to_compact_layout_if_enabled(self):
+        self.validator._bonded_balance = 456
+        self.validator._no_of_peers = 789
+        self.validator.save_state(self.logger)
+
+        validator = self._compact_validator()
+        validator.load_state(self.logger)
+
+        hash_name = Keys.get_hash_blockchain(self.chain)
+        self.assertEqual(list(self.redis.hgetall_unsafe(hash_name)._values),
+                         [Keys.get_node_state(self.node_name)])
+        loaded = self._compact_validator()
+        loaded.load_state(self.logger)
+        self.assertEqual(loaded.bonded_balance, 456)
+        self.assertEqual(loaded.no_of_peers, 789)
+
+    def test_load_state_moves_compact_state_back_if_disabled(self):
+        validator = self._compact_validator()
+        validator._bonded_balance = 456
+        validator.save_state(self.logger)
+
+        self.validator.load_state(self.logger)
+
+        hash_name = Keys.get_hash_blockchain(self.chain)
+        self.assertFalse(self.redis.hexists_unsafe(
+            hash_name, Keys.get_node_state(self.node_name)))
+        self.assertEqual(self.redis.hget_int_unsafe(
+            hash_name, Keys.get_node_bonded_balance(self.node_name)), 456)
+        self.assertEqual(self.validator.bonded_balance, 456)
+
+    def test_load_state_loads_previous_layout_if_compact_value_invalid(self):
+        self.validator._bonded_balance = 456
+        self.validator.save_state(self.logger)
+        hash_name = Keys.get_hash_blockchain(self.chain)
+        self.redis.hset_unsafe(hash_name, Keys.get_node_state(self.node_name),
+                               'invalid')
+
+        validator = self._compact_validator()
+        validator.load_state(self.logger)
+
+        self.assertEqual(validator.bonded_balance, 456)
+
+    def test_get_state_changes_returns_changes_until_set_as_saved(self):
+        self.validator.save_state(self.logger)
+        self.validator._no_of_peers = 10
+
+        changes = self.validator.get_state_changes(self.logger)
+        self.assertEqual(changes, self.validator.get_state_changes(
+            self.logger))
+        self.validator.set_state_changes_saved(changes)
+
+        self.assertEqual(changes,
+                         {Keys.get_node_no_of_peers(self.node_name): 10})
+        self.assertEqual(self.validator.get_state_changes(self.logger), {})
+
+    def test_set_no_of_peers_adds_metric_sample_until_set_as_saved(self):
+        channel_set = ChannelSet([CounterChannel(self.logger)],
+                                 TestInternalConf)
+        self.validator.set_no_of_peers(10, channel_set, self.logger)
+
+        samples = self.validator.get_metric_samples()
+        series = samples[Keys.get_zset_node_no_of_peers(self.node_name)]
+        self.assertEqual(len(series), 1)
+        self.assertTrue(list(series)[0].endswith(':10'))
+
+        self.validator.set_metric_samples_saved(samples)
+        self.assertEqual(self.validator.get_metric_samples(), {})
+
+    def test_node_without_redis_adds_no_metric_samples(self):
+        node = Node(name=self.node_name, ws_url=None,
+                    node_type=NodeType.VALIDATOR_FULL_NODE,
+                    stash_account_address='', chain=self.chain, redis=None,
+                    is_archive_node=True, internal_conf=TestInternalConf)
+        node.set_no_of_peers(10, ChannelSet([CounterChannel(self.logger)],
+                                            TestInternalConf), self.logger)
+
+        self.assertEqual(node.get_metric_samples(), {})
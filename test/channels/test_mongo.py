@@ -0,0 +1,176 @@
+import logging
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from pymongo.errors import BulkWriteError
+
+from src.alerts.alerts import ExperiencingDelaysAlert
+from src.channels.channel import ChannelSet
+from src.channels.mongo import BufferedMongoChannel
+from src.store.mongo.alerts_buckets import alert_bucket_updates
+from src.store.mongo.alerts_stats import alerts_rollup_updates
+from test import TestInternalConf
+from test.test_helpers import CounterChannel, DummyException
+
+
+class TestBufferedMongoChannel(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.mongo = MagicMock()
+        self.collection = 'testcollection'
+        self.counter_channel = CounterChannel(self.logger)
+        self.channel = BufferedMongoChannel(
+            'testchannel', self.logger, None, self.mongo, self.collection,
+            ChannelSet([self.counter_channel], TestInternalConf),
+            flush_interval=timedelta(seconds=60), batch_size=3,
+            max_pending_alerts=5)
+        self.alert = ExperiencingDelaysAlert('testnode')
+
+    def tearDown(self) -> None:
+        self.channel.stop_flushing()
+
+    def _inserted_severities(self):
+        return [[document['severity'] for document in args[1]]
+                for args, _ in self.mongo.insert_many.call_args_list]
+
+    def test_alert_buffers_alert_until_flushed(self):
+        self.channel.alert_warning(self.alert)
+
+        self.mongo.insert_many.assert_not_called()
+        self.assertEqual(self.channel.no_of_pending_alerts, 1)
+
+        self.assertTrue(self.channel.flush())
+        self.mongo.insert_many.assert_called_once()
+        args, kwargs = self.mongo.insert_many.call_args
+        self.assertEqual(args[0], self.collection)
+        self.assertEqual(args[1][0]['origin'], 'testchannel')
+        self.assertEqual(args[1][0]['severity'], 'WARNING')
+        self.assertEqual(args[1][0]['message'], self.alert.message)
+        self.assertEqual(args[1][0]['alert_code'],
+                         'ExperiencingDelaysAlert')
+        self.assertEqual(args[1][0]['created_at'].timestamp(),
+                         args[1][0]['timestamp'])
+        self.assertFalse(kwargs['ordered'])
+        self.assertEqual(self.channel.no_of_pending_alerts, 0)
+
+    def test_alerts_flushed_in_one_batch_in_order(self):
+        self.channel.alert_info(self.alert)
+        self.channel.alert_critical(self.alert)
+
+        self.channel.flush()
+
+        self.assertEqual(self._inserted_severities(), [['INFO', 'CRITICAL']])
+
+    def test_buffer_drops_oldest_alerts_once_full(self):
+        self.channel.alert_info(self.alert)
+        for _ in range(5):
+            self.channel.alert_warning(self.alert)
+
+        self.channel.flush()
+
+        self.assertEqual(self._inserted_severities(), [['WARNING'] * 5])
+
+    def test_flush_buffers_alerts_again_if_mongo_unusable(self):
+        self.mongo.insert_many.return_value = None
+        self.channel.alert_info(self.alert)
+
+        self.assertFalse(self.channel.flush())
+        self.channel.alert_warning(self.alert)
+        self.mongo.insert_many.return_value = MagicMock()
+        self.assertTrue(self.channel.flush())
+
+        self.assertEqual(self._inserted_severities()[-1], ['INFO', 'WARNING'])
+
+    def test_flush_alerts_backup_channels_if_insert_fails(self):
+        self.mongo.insert_many.side_effect = DummyException()
+        self.channel.alert_info(self.alert)
+
+        self.assertFalse(self.channel.flush())
+
+        self.assertEqual(self.counter_channel.error_count, 1)
+        self.assertEqual(self.channel.no_of_pending_alerts, 1)
+
+    def test_flush_does_not_buffer_alerts_again_if_bulk_write_fails(self):
+        self.mongo.insert_many.side_effect = BulkWriteError({})
+        self.channel.alert_info(self.alert)
+
+        self.assertFalse(self.channel.flush())
+
+        self.assertEqual(self.counter_channel.error_count, 1)
+        self.assertEqual(self.channel.no_of_pending_alerts, 0)
+
+    def test_flush_adds_inserted_alerts_to_rollup(self):
+        self.channel._mongo_rollup_coll = 'testrollup'
+        self.channel.alert_info(self.alert)
+        self.channel.alert_info(self.alert)
+
+        self.channel.flush()
+
+        self.mongo.bulk_write.assert_called_once()
+        args, _ = self.mongo.bulk_write.call_args
+        self.assertEqual(args[0], 'testrollup')
+        self.assertEqual(args[1], alerts_rollup_updates(
+            self.mongo.insert_many.call_args[0][1]))
+
+    def test_flush_adds_only_inserted_alerts_to_rollup_if_bulk_write_fails(
+            self):
+        self.channel._mongo_rollup_coll = 'testrollup'
+        self.mongo.insert_many.side_effect = BulkWriteError({'writeErrors': [
+            {'index': 0, 'code': 121}, {'index': 1, 'code': 11000}]})
+        for _ in range(3):
+            self.channel.alert_info(self.alert)
+
+        self.channel.flush()
+
+        # The alert which was already inserted is counted as well
+        args, _ = self.mongo.bulk_write.call_args
+        self.assertEqual(args[1], alerts_rollup_updates(
+            self.mongo.insert_many.call_args[0][1][1:]))
+
+    def test_flush_does_not_update_rollup_if_mongo_unusable(self):
+        self.channel._mongo_rollup_coll = 'testrollup'
+        self.mongo.insert_many.return_value = None
+        self.channel.alert_info(self.alert)
+
+        self.channel.flush()
+
+        self.mongo.bulk_write.assert_not_called()
+
+    def test_flush_appends_alerts_to_buckets_if_bucketed(self):
+        self.channel._bucket_length = timedelta(hours=1)
+        self.channel.alert_info(self.alert)
+        self.channel.alert_warning(self.alert)
+        documents = list(self.channel._pending)
+
+        self.assertTrue(self.channel.flush())
+
+        self.mongo.insert_many.assert_not_called()
+        args, kwargs = self.mongo.bulk_write.call_args
+        self.assertEqual(args[0], self.collection)
+        self.assertEqual(args[1], [
+            update for update, _ in alert_bucket_updates(
+                documents, timedelta(hours=1), 1000)])
+        self.assertFalse(kwargs['ordered'])
+
+    def test_flusher_flushes_as_soon_as_batch_is_full(self):
+        self.channel.start_flushing()
+        for _ in range(3):
+            self.channel.alert_info(self.alert)
+
+        for _ in range(100):
+            if self.mongo.insert_many.called:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(self._inserted_severities(), [['INFO'] * 3])
+
+    def test_stop_flushing_inserts_alerts_still_buffered(self):
+        self.channel.start_flushing()
+        self.channel.alert_info(self.alert)
+
+        self.channel.stop_flushing()
+
+        self.assertEqual(self._inserted_severities(), [['INFO']])
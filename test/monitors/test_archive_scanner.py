@@ -0,0 +1,335 @@
+import asyncio
+import logging
+import time
+import unittest
+from unittest.mock import patch, call, MagicMock, PropertyMock
+
+from redis import ConnectionError as RedisConnectionError
+
+from src.alerters.reactive.node import Node, NodeType
+from src.channels.channel import ChannelSet
+from src.monitors.archive_scanner import ArchiveScanner, \
+    AsyncArchiveScanner
+from src.monitors.node import NodeMonitor
+from src.store.redis.redis_api import RedisApi
+from src.store.store_keys import Keys
+from src.utils.data_wrapper.polkadot_api import PolkadotApiWrapper
+from src.utils.data_wrapper.polkadot_api_async import AsyncPolkadotApiWrapper
+from src.utils.exceptions import NodeIsNotAnArchiveNodeException
+from src.utils.types import NONE
+from test import TestInternalConf, TestUserConf
+from test.test_helpers import CounterChannel
+
+GET_BLOCK_HASH_FUNCTION = \
+    'src.monitors.archive_scanner.PolkadotApiWrapper.get_block_hash'
+
+GET_SLASH_AMOUNT_FUNCTION = \
+    'src.monitors.archive_scanner.PolkadotApiWrapper.get_slash_amount'
+
+DATA_SOURCE_ARCHIVE_PATH = \
+    'src.monitors.node.NodeMonitor.data_source_archive'
+
+GET_POLKADOT_JSON_ASYNC_FUNCTION = \
+    'src.utils.data_wrapper.polkadot_api_async.get_polkadot_json_async'
+
+
+class TestArchiveScannerWithoutRedis(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.counter_channel = CounterChannel(self.logger)
+        self.channel_set = ChannelSet([self.counter_channel], TestInternalConf)
+        self.chain = 'testchain'
+        self.data_wrapper = PolkadotApiWrapper(self.logger, 'api_endpoint')
+        self.scanner = ArchiveScanner(
+            self.chain, self.logger, self.data_wrapper, None,
+            TestInternalConf)
+
+        self.archive_node = Node('testarchivenode', '11.22.33.11:9944',
+                                 NodeType.NON_VALIDATOR_FULL_NODE, '',
+                                 self.chain, None, True, TestInternalConf)
+        self.archive_node_height = 34535
+        self.archive_node.update_finalized_block_height(
+            self.archive_node_height, self.logger, self.channel_set)
+
+        self.validators = []
+        self.validator_monitors = []
+        for i in range(3):
+            validator = Node('testvalidator{}'.format(i),
+                             '13.13.14.1{}:9944'.format(i),
+                             NodeType.VALIDATOR_FULL_NODE,
+                             'stash_account_{}'.format(i), self.chain,
+                             None, True, TestInternalConf)
+            self.validators.append(validator)
+            self.validator_monitors.append(NodeMonitor(
+                'testnodemonitor{}'.format(i), self.channel_set, self.logger,
+                None, validator, False, [self.archive_node], 'api_endpoint',
+                TestInternalConf, archive_scanner=self.scanner))
+
+    def test_validator_monitors_added_to_scanner(self) -> None:
+        self.assertEqual(['testnodemonitor0', 'testnodemonitor1',
+                          'testnodemonitor2'], self.scanner.validators)
+
+    def test_validator_monitor_not_added_if_archive_alerts_disabled(
+            self) -> None:
+        validator = Node('testvalidator', '13.13.14.20:9944',
+                         NodeType.VALIDATOR_FULL_NODE, 'stash_account',
+                         self.chain, None, True, TestInternalConf)
+        NodeMonitor('testnodemonitor', self.channel_set, self.logger,
+                    None, validator, True, [self.archive_node], 'api_endpoint',
+                    TestInternalConf, archive_scanner=self.scanner)
+
+        self.assertNotIn('testnodemonitor', self.scanner.validators)
+
+    @patch(GET_SLASH_AMOUNT_FUNCTION)
+    @patch(GET_BLOCK_HASH_FUNCTION, return_value='0x_hash')
+    def test_check_for_slashing_gets_block_hash_once_for_all_validators(
+            self, mock_get_block_hash, mock_get_slash_amount) -> None:
+        mock_get_slash_amount.side_effect = \
+            lambda ws_url, block_hash, stash: 50 \
+            if stash == 'stash_account_1' else 0
+        for validator in self.validators:
+            validator.slash = MagicMock()
+
+        self.scanner._check_for_slashing(
+            range(self.archive_node_height, self.archive_node_height + 1),
+            self.archive_node)
+
+        mock_get_block_hash.assert_called_once_with(
+            self.archive_node.ws_url, self.archive_node_height)
+        self.assertEqual(3, mock_get_slash_amount.call_count)
+        self.validators[0].slash.assert_not_called()
+        self.validators[1].slash.assert_called_once()
+        self.validators[2].slash.assert_not_called()
+
+    @patch(DATA_SOURCE_ARCHIVE_PATH, new_callable=PropertyMock)
+    @patch(GET_SLASH_AMOUNT_FUNCTION, return_value=0)
+    @patch(GET_BLOCK_HASH_FUNCTION, return_value='0x_hash')
+    def test_scan_checks_each_block_once_for_all_monitors(
+            self, mock_get_block_hash, _, mock_data_source_archive) -> None:
+        mock_data_source_archive.return_value = self.archive_node
+        self.scanner._blocks_per_scan = 1
+        self.scanner._last_height_checked = self.archive_node_height - 3
+        for validator_monitor in self.validator_monitors:
+            validator_monitor._monitor_archive_state()
+
+        self.assertEqual(3, mock_get_block_hash.call_count)
+        self.assertEqual(self.archive_node_height,
+                         self.scanner.last_height_checked)
+        for validator_monitor in self.validator_monitors:
+            self.assertEqual(self.archive_node_height,
+                             validator_monitor.last_height_checked)
+
+    @patch(GET_SLASH_AMOUNT_FUNCTION, return_value=0)
+    @patch(GET_BLOCK_HASH_FUNCTION,
+           side_effect=lambda ws_url, height: '0x_{}'.format(height))
+    def test_scan_checks_range_of_blocks_up_to_blocks_per_scan(
+            self, mock_get_block_hash, mock_get_slash_amount) -> None:
+        blocks_per_scan = TestInternalConf.archive_scanner_blocks_per_scan
+        self.scanner._last_height_checked = \
+            self.archive_node_height - blocks_per_scan - 5
+
+        self.assertTrue(self.scanner.scan(self.archive_node))
+
+        self.assertEqual(blocks_per_scan, mock_get_block_hash.call_count)
+        self.assertEqual(3 * blocks_per_scan,
+                         mock_get_slash_amount.call_count)
+        self.assertEqual(self.archive_node_height - 5,
+                         self.scanner.last_height_checked)
+        self.assertTrue(self.scanner.is_catching_up)
+
+    @patch(GET_BLOCK_HASH_FUNCTION,
+           side_effect=lambda ws_url, height: '0x_{}'.format(height))
+    def test_scan_handles_slash_amounts_in_block_order(self, _) -> None:
+        slashed_heights = []
+
+        def get_slash_amount(ws_url, block_hash, stash):
+            # Make the lookups of earlier blocks complete later
+            time.sleep(0.001 * (self.archive_node_height -
+                                int(block_hash[3:])))
+            return int(block_hash[3:])
+
+        self.scanner._validators = {
+            'testnodemonitor': ('stash', slashed_heights.append)}
+        self.scanner._last_height_checked = self.archive_node_height - 20
+        with patch(GET_SLASH_AMOUNT_FUNCTION, side_effect=get_slash_amount):
+            self.scanner.scan(self.archive_node)
+
+        self.assertEqual(list(range(self.archive_node_height - 19,
+                                    self.archive_node_height + 1)),
+                         slashed_heights)
+
+    @patch(GET_SLASH_AMOUNT_FUNCTION, return_value=0)
+    def test_scan_commits_blocks_before_failed_lookup(self, _) -> None:
+        failed_height = self.archive_node_height - 5
+
+        def get_block_hash(ws_url, height):
+            if height == failed_height:
+                raise NodeIsNotAnArchiveNodeException('State discarded')
+            return '0x_{}'.format(height)
+
+        self.scanner._last_height_checked = self.archive_node_height - 20
+        with patch(GET_BLOCK_HASH_FUNCTION, side_effect=get_block_hash):
+            self.assertRaises(NodeIsNotAnArchiveNodeException,
+                              self.scanner.scan, self.archive_node)
+
+        self.assertEqual(failed_height - 1, self.scanner.last_height_checked)
+
+    @patch(GET_SLASH_AMOUNT_FUNCTION, return_value=0)
+    @patch(GET_BLOCK_HASH_FUNCTION, return_value='0x_hash')
+    def test_scan_does_not_skip_blocks_far_behind_archive_node(
+            self, mock_get_block_hash, _) -> None:
+        blocks_per_scan = TestInternalConf.archive_scanner_blocks_per_scan
+        last_height_checked = self.archive_node_height - \
+            5 * blocks_per_scan - 50
+        self.scanner._last_height_checked = last_height_checked
+
+        self.scanner.scan(self.archive_node)
+
+        self.assertEqual(
+            [call(self.archive_node.ws_url, last_height_checked + i)
+             for i in range(1, blocks_per_scan + 1)],
+            mock_get_block_hash.call_args_list)
+        self.assertEqual(last_height_checked + blocks_per_scan,
+                         self.scanner.last_height_checked)
+        self.assertTrue(self.scanner.is_catching_up)
+
+    @patch(GET_SLASH_AMOUNT_FUNCTION, return_value=0)
+    @patch(GET_BLOCK_HASH_FUNCTION, return_value='0x_hash')
+    def test_scan_does_nothing_if_another_monitor_is_scanning(
+            self, mock_get_block_hash, _) -> None:
+        self.scanner._last_height_checked = self.archive_node_height - 1
+        with self.scanner._scan_lock:
+            self.assertFalse(self.scanner.scan(self.archive_node))
+
+        mock_get_block_hash.assert_not_called()
+        self.assertEqual(self.archive_node_height - 1,
+                         self.scanner.last_height_checked)
+
+    @patch(DATA_SOURCE_ARCHIVE_PATH, new_callable=PropertyMock)
+    @patch(GET_SLASH_AMOUNT_FUNCTION, return_value=0)
+    @patch(GET_BLOCK_HASH_FUNCTION, return_value='0x_hash')
+    def test_only_monitor_which_scanned_is_catching_up(
+            self, _1, _2, mock_data_source_archive) -> None:
+        mock_data_source_archive.return_value = self.archive_node
+        self.scanner._last_height_checked = self.archive_node_height - \
+            TestInternalConf.archive_scanner_blocks_per_scan - 10
+        self.validator_monitors[0]._monitor_archive_state()
+        with self.scanner._scan_lock:
+            self.validator_monitors[1]._monitor_archive_state()
+
+        self.assertTrue(self.scanner.is_catching_up)
+        self.assertTrue(self.validator_monitors[0].is_catching_up())
+        self.assertFalse(self.validator_monitors[1].is_catching_up())
+
+
+class TestAsyncArchiveScanner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.channel_set = ChannelSet([CounterChannel(self.logger)],
+                                      TestInternalConf)
+        self.data_wrapper = AsyncPolkadotApiWrapper(self.logger,
+                                                    'api_endpoint')
+        self.scanner = AsyncArchiveScanner(
+            'testchain', self.logger, self.data_wrapper, None,
+            TestInternalConf)
+        self.archive_node = Node('testarchivenode', '11.22.33.11:9944',
+                                 NodeType.NON_VALIDATOR_FULL_NODE, '',
+                                 'testchain', None, True, TestInternalConf)
+        self.archive_node_height = 34535
+        self.archive_node.update_finalized_block_height(
+            self.archive_node_height, self.logger, self.channel_set)
+
+    @staticmethod
+    async def get_polkadot_json_async(endpoint, params, logger, api_call=''):
+        # Lookups of earlier blocks complete later
+        if api_call == 'chain/getBlockHash':
+            await asyncio.sleep(0.001 * (34535 - params['block_number']))
+            return '0x_{}'.format(params['block_number'])
+        elif api_call == 'custom/getSlashAmount':
+            return int(params['block_hash'][3:])
+        raise AssertionError('Unexpected API call {}'.format(api_call))
+
+    def test_scan_handles_slash_amounts_of_range_in_block_order(self) -> None:
+        slashed_heights = []
+        self.scanner.add_validator('testnodemonitor', 'stash',
+                                   slashed_heights.append)
+        self.scanner._last_height_checked = self.archive_node_height - 20
+
+        with patch(GET_POLKADOT_JSON_ASYNC_FUNCTION,
+                   self.get_polkadot_json_async):
+            self.assertTrue(asyncio.run(self.scanner.scan(self.archive_node)))
+
+        self.assertEqual(list(range(self.archive_node_height - 19,
+                                    self.archive_node_height + 1)),
+                         slashed_heights)
+        self.assertEqual(self.archive_node_height,
+                         self.scanner.last_height_checked)
+
+
+class TestArchiveScannerWithRedis(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Same as in setUp(), to avoid running all tests if Redis is offline
+
+        logger = logging.getLogger('dummy')
+        db = TestInternalConf.redis_test_database
+        host = TestUserConf.redis_host
+        port = TestUserConf.redis_port
+        password = TestUserConf.redis_password
+        redis = RedisApi(logger, db, host, port, password)
+
+        try:
+            redis.ping_unsafe()
+        except RedisConnectionError:
+            raise Exception('Redis is not online.')
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.chain = 'testchain'
+
+        self.db = TestInternalConf.redis_test_database
+        self.host = TestUserConf.redis_host
+        self.port = TestUserConf.redis_port
+        self.password = TestUserConf.redis_password
+        self.redis = RedisApi(self.logger, self.db, self.host,
+                              self.port, self.password)
+        self.redis.delete_all_unsafe()
+
+        try:
+            self.redis.ping_unsafe()
+        except RedisConnectionError:
+            self.fail('Redis is not online.')
+
+        self.data_wrapper = PolkadotApiWrapper(self.logger, 'api_endpoint')
+        self.scanner = ArchiveScanner(
+            self.chain, self.logger, self.data_wrapper, self.redis,
+            TestInternalConf)
+        self.dummy_last_height_checked = 1000
+        self.redis_last_height_key_timeout = \
+            TestInternalConf.redis_node_monitor_last_height_key_timeout
+
+    def test_load_state_changes_nothing_if_nothing_saved(self) -> None:
+        self.scanner.load_state()
+
+        self.assertEqual(NONE, self.scanner.last_height_checked)
+
+    def test_load_state_sets_last_height_checked_of_chain(self) -> None:
+        key_lh = Keys.get_archive_scanner_last_height_checked(self.chain)
+        self.redis.set_unsafe(key_lh, self.dummy_last_height_checked)
+
+        self.scanner.load_state()
+
+        self.assertEqual(self.dummy_last_height_checked,
+                         self.scanner.last_height_checked)
+
+    def test_save_state_sets_last_height_checked_of_chain_temporarily(
+            self) -> None:
+        self.scanner._last_height_checked = self.dummy_last_height_checked
+
+        self.scanner.save_state()
+
+        key_lh = Keys.get_archive_scanner_last_height_checked(self.chain)
+        self.assertEqual(self.dummy_last_height_checked,
+                         self.redis.get_int(key_lh))
+        self.assertEqual(self.redis_last_height_key_timeout,
+                         self.redis.time_to_live(key_lh))
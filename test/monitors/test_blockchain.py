@@ -39,6 +39,9 @@ GET_PUBLIC_PROPOSAL_COUNT_FUNCTION = \
 GET_SESSION_VALIDATORS_FUNCTION = \
     'src.monitors.blockchain.PolkadotApiWrapper.get_session_validators'
 
+GET_FINALIZED_HEAD_FUNCTION = \
+    'src.monitors.blockchain.PolkadotApiWrapper.get_finalized_head'
+
 DATA_SOURCE_PATH = \
     'src.monitors.blockchain.BlockchainMonitor.data_source'
 
@@ -175,7 +178,8 @@ class TestBlockchainMonitorWithoutRedis(unittest.TestCase):
             self) -> None:
         self.dummy_blockchain.set_referendum_count = MagicMock(
             side_effect=self.dummy_blockchain.set_referendum_count)
-        self.monitor._check_for_new_referendums(self.dummy_referendum_count)
+        self.monitor._check_for_new_referendums(
+            self.dummy_referendum_count, self.dummy_full_node_1.ws_url)
 
         self.assertEqual(
             self.dummy_blockchain.set_referendum_count.call_count, 1)
@@ -195,7 +199,8 @@ class TestBlockchainMonitorWithoutRedis(unittest.TestCase):
 
             self.dummy_blockchain.set_referendum_count = MagicMock(
                 side_effect=self.dummy_blockchain.set_referendum_count)
-            self.monitor._check_for_new_referendums(new_referendum_count)
+            self.monitor._check_for_new_referendums(
+                new_referendum_count, self.dummy_full_node_1.ws_url)
 
             self.assertEqual(
                 self.dummy_blockchain.set_referendum_count.call_count, 5)
@@ -209,18 +214,20 @@ class TestBlockchainMonitorWithoutRedis(unittest.TestCase):
 
         self.dummy_blockchain.set_referendum_count = MagicMock(
             side_effect=self.dummy_blockchain.set_referendum_count)
-        self.monitor._check_for_new_referendums(new_referendum_count)
+        self.monitor._check_for_new_referendums(
+            new_referendum_count, self.dummy_full_node_1.ws_url)
 
         self.assertEqual(
             self.dummy_blockchain.set_referendum_count.call_count, 0)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_REFERENDUM_COUNT_FUNCTION)
     @patch(GET_COUNCIL_PROPOSAL_COUNT_FUNCTION)
     @patch(GET_PUBLIC_PROPOSAL_COUNT_FUNCTION)
     @patch(GET_SESSION_VALIDATORS_FUNCTION)
     def test_monitor_sets_blockchain_state_to_retrieved_data(
             self, mock_session_val, mock_public_prop, mock_council_prop,
-            mock_ref_count) -> None:
+            mock_ref_count, _) -> None:
         with mock.patch(DATA_SOURCE_PATH, new_callable=PropertyMock) \
                 as mock_data_source:
             mock_data_source.return_value = self.dummy_full_node_1
@@ -240,12 +247,13 @@ class TestBlockchainMonitorWithoutRedis(unittest.TestCase):
             self.assertEqual(self.dummy_blockchain.validator_set_size,
                              2)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_REFERENDUM_COUNT_FUNCTION, return_value=0)
     @patch(GET_COUNCIL_PROPOSAL_COUNT_FUNCTION, return_value=0)
     @patch(GET_PUBLIC_PROPOSAL_COUNT_FUNCTION, return_value=0)
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     def test_monitor_sets_API_as_up_if_entire_data_obtained_successfully(
-            self, _1, _2, _3, _4) -> None:
+            self, _1, _2, _3, _4, _5) -> None:
         with mock.patch(DATA_SOURCE_PATH, new_callable=PropertyMock) \
                 as mock_data_source:
             mock_data_source.return_value = self.dummy_full_node_1
@@ -254,12 +262,13 @@ class TestBlockchainMonitorWithoutRedis(unittest.TestCase):
             self.monitor.monitor()
             self.assertFalse(self.monitor.data_wrapper.is_api_down)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_REFERENDUM_COUNT_FUNCTION, return_value=0)
     @patch(GET_COUNCIL_PROPOSAL_COUNT_FUNCTION, return_value=0)
     @patch(GET_PUBLIC_PROPOSAL_COUNT_FUNCTION, return_value=0)
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     def test_monitor_connects_data_source_with_api_if_entire_data_obtained_successfully(
-            self, _1, _2, _3, _4) -> None:
+            self, _1, _2, _3, _4, _5) -> None:
         with mock.patch(DATA_SOURCE_PATH, new_callable=PropertyMock) \
                 as mock_data_source:
             mock_data_source.return_value = self.dummy_full_node_1
@@ -331,3 +340,24 @@ class TestBlockchainMonitorWithRedis(unittest.TestCase):
 
         self.assertIsNotNone(last_update)
         self.assertEqual(timeout, self.alive_key_timeout)
+
+    def test_save_state_registers_monitor_with_its_alive_time(self):
+        self.monitor.save_state()
+
+        key = Keys.get_blockchain_monitor_alive(self.monitor_name)
+        self.assertEqual(
+            self.redis.get_sorted_set_scores(
+                Keys.get_zset_blockchain_monitors_alive()),
+            {self.monitor_name: float(self.redis.get(key))})
+
+    def test_save_state_saves_blockchain_state_in_the_same_round(self):
+        self.blockchain._referendum_count = 10
+
+        with patch.object(self.redis, 'save_round',
+                          wraps=self.redis.save_round) as save_round:
+            self.monitor.save_state()
+
+        save_round.assert_called_once()
+        self.assertEqual(10, self.redis.hget_int(
+            self.blockchain.redis_hash,
+            Keys.get_blockchain_referendum_count(self.blockchain_name)))
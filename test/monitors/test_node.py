@@ -13,7 +13,8 @@ from src.store.redis.redis_api import RedisApi
 from src.store.store_keys import Keys
 from src.utils.exceptions import \
     NoLiveNodeConnectedWithAnApiServerException, \
-    NoLiveArchiveNodeConnectedWithAnApiServerException
+    NoLiveArchiveNodeConnectedWithAnApiServerException, \
+    ConnectionWithNodeApiLostException
 from src.utils.scaling import scale_to_tera
 from src.utils.types import NONE
 from test import TestInternalConf, TestUserConf
@@ -35,6 +36,9 @@ GET_FINALIZED_HEAD_FUNCTION = \
 GET_HEADER_FUNCTION = \
     'src.monitors.node.PolkadotApiWrapper.get_header'
 
+SUBSCRIBE_FINALIZED_HEADS_FUNCTION = \
+    'src.monitors.node.PolkadotApiWrapper.subscribe_finalized_heads'
+
 GET_BLOCK_HASH_FUNCTION = \
     'src.monitors.node.PolkadotApiWrapper.get_block_hash'
 
@@ -79,8 +83,6 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
         self.monitor_name = 'testnodemonitor'
         self.counter_channel = CounterChannel(self.logger)
         self.channel_set = ChannelSet([self.counter_channel], TestInternalConf)
-        self.node_monitor_max_catch_up_blocks = \
-            TestInternalConf.node_monitor_max_catch_up_blocks
         self.redis = None
         self.archive_alerts_disabled = False
         self.data_sources = []
@@ -93,9 +95,8 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
                               NodeType.NON_VALIDATOR_FULL_NODE, '', self.chain,
                               None, True, TestInternalConf)
         self.full_node_monitor = NodeMonitor(
-            self.monitor_name, self.channel_set, self.logger,
-            self.node_monitor_max_catch_up_blocks, self.redis, self.full_node,
-            self.archive_alerts_disabled, self.data_sources,
+            self.monitor_name, self.channel_set, self.logger, self.redis,
+            self.full_node, self.archive_alerts_disabled, self.data_sources,
             self.polkadot_api_endpoint, TestInternalConf)
 
         self.validator_name = 'testvalidator'
@@ -106,9 +107,8 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
                               self.validator_stash_account_address, self.chain,
                               None, True, TestInternalConf)
         self.validator_monitor = NodeMonitor(
-            self.monitor_name, self.channel_set, self.logger,
-            self.node_monitor_max_catch_up_blocks, self.redis, self.validator,
-            self.archive_alerts_disabled, self.data_sources,
+            self.monitor_name, self.channel_set, self.logger, self.redis,
+            self.validator, self.archive_alerts_disabled, self.data_sources,
             self.polkadot_api_endpoint, TestInternalConf)
 
         self.dummy_session_index = 60
@@ -176,9 +176,8 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.dummy_validator_node_1
         ]
         test_monitor = NodeMonitor(
-            self.monitor_name, self.channel_set, self.logger,
-            self.node_monitor_max_catch_up_blocks, self.redis, self.validator,
-            self.archive_alerts_disabled, self.data_sources,
+            self.monitor_name, self.channel_set, self.logger, self.redis,
+            self.validator, self.archive_alerts_disabled, self.data_sources,
             self.polkadot_api_endpoint, TestInternalConf)
 
         self.assertEqual(test_monitor.indirect_monitoring_data_sources,
@@ -191,9 +190,8 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.dummy_validator_node_1
         ]
         test_monitor = NodeMonitor(
-            self.monitor_name, self.channel_set, self.logger,
-            self.node_monitor_max_catch_up_blocks, self.redis, self.validator,
-            self.archive_alerts_disabled, self.data_sources,
+            self.monitor_name, self.channel_set, self.logger, self.redis,
+            self.validator, self.archive_alerts_disabled, self.data_sources,
             self.polkadot_api_endpoint, TestInternalConf)
         expected_result = [self.dummy_full_node_1, self.dummy_full_node_2,
                            self.dummy_full_node_3, self.dummy_validator_node_1]
@@ -214,9 +212,8 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.dummy_full_node_1, self.dummy_full_node_2
         ]
         test_monitor = NodeMonitor(
-            self.monitor_name, self.channel_set, self.logger,
-            self.node_monitor_max_catch_up_blocks, self.redis, self.validator,
-            self.archive_alerts_disabled, self.data_sources,
+            self.monitor_name, self.channel_set, self.logger, self.redis,
+            self.validator, self.archive_alerts_disabled, self.data_sources,
             self.polkadot_api_endpoint, TestInternalConf)
 
         self.assertFalse(test_monitor.indirect_monitoring_disabled)
@@ -339,7 +336,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     def test_status_returns_as_expected_for_validator_monitor(self) -> None:
         self.validator_monitor._session_index = self.dummy_session_index
         self.validator_monitor._era_index = self.dummy_era_index
-        self.validator_monitor._last_height_checked = \
+        self.validator_monitor.archive_scanner._last_height_checked = \
             self.dummy_last_height_checked
         self.validator._bonded_balance = self.dummy_bonded_balance
         self.validator._no_of_peers = self.dummy_no_of_peers
@@ -445,14 +442,80 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
 
         self.assertTrue(self.validator.is_connected_to_api_server)
 
+    @patch(PING_NODE_FUNCTION, return_value=None)
+    @patch(GET_SYSTEM_HEALTH_FUNCTION,
+           return_value={"isSyncing": True, "peers": 92,
+                         "shouldHavePeers": True})
+    @patch(GET_FINALIZED_HEAD_FUNCTION)
+    @patch(GET_HEADER_FUNCTION)
+    @patch(SUBSCRIBE_FINALIZED_HEADS_FUNCTION)
+    def test_monitor_direct_uses_pushed_finalized_head_if_subscribed(
+            self, mock_subscribe, mock_get_header, mock_get_finalized_head,
+            _1, _2) -> None:
+        # The node pushes its current finalized head as soon as subscribed
+        def subscribe(ws_url, on_finalized_header):
+            on_finalized_header({"number": 523686})
+            return mock_subscribe.return_value
+
+        mock_subscribe.side_effect = subscribe
+        mock_subscribe.return_value.active = True
+        self.validator_monitor._finalized_head_subscription_enabled = True
+
+        self.validator_monitor.monitor_direct()
+        self.assertEqual(self.validator.finalized_block_height, 523686)
+        on_finalized_header = mock_subscribe.call_args[0][1]
+        on_finalized_header({"number": 523687})
+        self.assertEqual(self.validator.finalized_block_height, 523687)
+
+        self.validator_monitor.monitor_direct()
+        self.assertEqual(self.validator.finalized_block_height, 523687)
+        mock_subscribe.assert_called_once()
+        mock_get_finalized_head.assert_not_called()
+        mock_get_header.assert_not_called()
+
+    @patch(PING_NODE_FUNCTION, return_value=None)
+    @patch(GET_SYSTEM_HEALTH_FUNCTION,
+           return_value={"isSyncing": True, "peers": 92,
+                         "shouldHavePeers": True})
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
+    @patch(GET_HEADER_FUNCTION, return_value={"number": "523686"})
+    @patch(SUBSCRIBE_FINALIZED_HEADS_FUNCTION)
+    def test_monitor_direct_queries_finalized_head_and_subscribes_again_if_subscription_ended(
+            self, mock_subscribe, _1, _2, _3, _4) -> None:
+        mock_subscribe.return_value.active = False
+        self.validator_monitor._finalized_head_subscription_enabled = True
+
+        self.validator_monitor.monitor_direct()
+        self.validator_monitor.monitor_direct()
+
+        self.assertEqual(self.validator.finalized_block_height, 523686)
+        self.assertEqual(2, mock_subscribe.call_count)
+
+    @patch(PING_NODE_FUNCTION, return_value=None)
+    @patch(GET_SYSTEM_HEALTH_FUNCTION,
+           return_value={"isSyncing": True, "peers": 92,
+                         "shouldHavePeers": True})
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
+    @patch(GET_HEADER_FUNCTION, return_value={"number": "523686"})
+    @patch(SUBSCRIBE_FINALIZED_HEADS_FUNCTION,
+           side_effect=ConnectionWithNodeApiLostException('Lost connection'))
+    def test_monitor_direct_queries_finalized_head_if_subscribing_fails(
+            self, _1, _2, _3, _4, _5) -> None:
+        self.validator_monitor._finalized_head_subscription_enabled = True
+        self.validator_monitor.monitor_direct()
+
+        self.assertEqual(self.validator.finalized_block_height, 523686)
+        self.assertIsNone(self.validator_monitor.finalized_head_subscription)
+
     @patch(GET_BLOCK_HASH_FUNCTION, return_value=None)
     @patch(GET_SLASH_AMOUNT_FUNCITON, return_value=50)
     def test_check_for_slashing_calls_node_slash_function_amount_greater_than_0(
             self, _1, _2) -> None:
         self.validator_monitor.node.slash = MagicMock(
             side_effect=self.validator_monitor.node.slash)
-        self.validator_monitor._check_for_slashing(self.dummy_height_to_check,
-                                                   self.dummy_full_node_1)
+        self.validator_monitor.archive_scanner._check_for_slashing(
+            range(self.dummy_height_to_check, self.dummy_height_to_check + 1),
+            self.dummy_full_node_1)
 
         self.assertEqual(self.validator_monitor.node.slash.call_count, 1)
 
@@ -462,8 +525,9 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self, _1, _2) -> None:
         self.validator_monitor.node.slash = MagicMock(
             side_effect=self.validator_monitor.node.slash)
-        self.validator_monitor._check_for_slashing(self.dummy_height_to_check,
-                                                   self.dummy_full_node_1)
+        self.validator_monitor.archive_scanner._check_for_slashing(
+            range(self.dummy_height_to_check, self.dummy_height_to_check + 1),
+            self.dummy_full_node_1)
 
         self.assertEqual(self.validator_monitor.node.slash.call_count, 0)
 
@@ -590,6 +654,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
         self.assertEqual(34.4, self.validator_monitor.node.
                          _time_of_last_block_check_activity)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -603,7 +668,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     def test_monitor_indirect_sets_API_up_when_validator_indirect_monitoring_successful(
-            self, _1, _2, _3, _4, _5, _6, _7, _8) -> None:
+            self, _1, _2, _3, _4, _5, _6, _7, _8, _9) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -614,6 +679,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor.monitor_indirect()
             self.assertFalse(self.validator_monitor.data_wrapper.is_api_down)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -627,7 +693,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     def test_monitor_indirect_connects_data_source_with_api_if_monitoring_successful(
-            self, _1, _2, _3, _4, _5, _6, _7, _8) -> None:
+            self, _1, _2, _3, _4, _5, _6, _7, _8, _9) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -652,6 +718,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
         self.assertFalse(self.full_node_monitor.node.is_elected)
         self.assertFalse(self.full_node_monitor.node.is_council_member)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -665,7 +732,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 45, "start": 20})
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     def test_monitor_indirect_validator_sets_active_true_if_validator_stash_in_set(
-            self, _1, _2, _3, _4, _5, _6, _7, _8) -> None:
+            self, _1, _2, _3, _4, _5, _6, _7, _8, _9) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -673,6 +740,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertEqual(self.validator_monitor.era_index, 45)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -686,7 +754,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION)
     def test_monitor_indirect_validator_sets_active_true_if_validator_stash_in_set(
-            self, mock_session_val, _1, _2, _3, _4, _5, _6, _7) -> None:
+            self, mock_session_val, _1, _2, _3, _4, _5, _6, _7, _8) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -697,6 +765,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertTrue(self.validator_monitor.node.is_active)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -710,7 +779,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION)
     def test_monitor_indirect_validator_sets_active_false_if_validator_stash_not_in_set(
-            self, mock_session_val, _1, _2, _3, _4, _5, _6, _7) -> None:
+            self, mock_session_val, _1, _2, _3, _4, _5, _6, _7, _8) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -720,6 +789,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertFalse(self.validator_monitor.node.is_active)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -733,7 +803,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION)
     def test_monitor_indirect_validator_sets_auth_index_correctly_if_validator_active(
-            self, mock_session_val, _1, _2, _3, _4, _5, _6, _7) -> None:
+            self, mock_session_val, _1, _2, _3, _4, _5, _6, _7, _8) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -745,6 +815,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertEqual(self.validator.auth_index, 1)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -758,7 +829,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION)
     def test_monitor_indirect_validator_does_not_set_auth_index_if_validator_inactive(
-            self, mock_session_val, _1, _2, _3, _4, _5, _6, _7) -> None:
+            self, mock_session_val, _1, _2, _3, _4, _5, _6, _7, _8) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -773,6 +844,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.assertEqual(self.dummy_auth_index,
                              self.validator_monitor.node.auth_index)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION)
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -786,8 +858,8 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION)
     def test_monitor_indirect_validator_sets_disabled_true_if_validator_in_disabled_list(
-            self, mock_session_val, _1, _2, _3, _4, _5, _6, mock_disabled_val) \
-            -> None:
+            self, mock_session_val, _1, _2, _3, _4, _5, _6, mock_disabled_val,
+            _7) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -800,6 +872,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertTrue(self.validator_monitor.node.is_disabled)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION)
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -813,8 +886,8 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION)
     def test_monitor_indirect_validator_sets_disabled_false_if_validator_in_disabled_list(
-            self, mock_session_val, _1, _2, _3, _4, _5, _6, mock_disabled_val) \
-            -> None:
+            self, mock_session_val, _1, _2, _3, _4, _5, _6, mock_disabled_val,
+            _7) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -827,6 +900,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertFalse(self.validator_monitor.node.is_disabled)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -837,7 +911,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     def test_monitor_indirect_validator_sets_elected_true_if_validator_in_elected_list(
-            self, _1, _2, _3, _4, mock_elected, _5, _6, _7) -> None:
+            self, _1, _2, _3, _4, mock_elected, _5, _6, _7, _8) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -851,6 +925,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertTrue(self.validator_monitor.node.is_elected)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -861,7 +936,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     def test_monitor_indirect_validator_sets_elected_false_if_validator_not_in_elected_list(
-            self, _1, _2, _3, mock_elected, _4, _5, _6, _7) -> None:
+            self, _1, _2, _3, mock_elected, _4, _5, _6, _7, _8) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -873,6 +948,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertFalse(self.validator_monitor.node.is_elected)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -886,7 +962,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     def test_monitor_indirect_validator_sets_council_member_true_if_validator_in_council_list(
-            self, _1, _2, _3, mock_council_mem, _4, _5, _6, _7) -> None:
+            self, _1, _2, _3, mock_council_mem, _4, _5, _6, _7, _8) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -898,6 +974,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertTrue(self.validator_monitor.node.is_council_member)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -911,7 +988,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     def test_monitor_indirect_validator_sets_council_member_false_if_validator_not_in_council_list(
-            self, _1, _2, _3, mock_council_mem, _4, _5, _6, _7) -> None:
+            self, _1, _2, _3, mock_council_mem, _4, _5, _6, _7, _8) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -921,6 +998,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.validator_monitor._monitor_indirect_validator()
             self.assertFalse(self.validator_monitor.node.is_council_member)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -935,7 +1013,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_SESSION_VALIDATORS_FUNCTION)
     def test_monitor_indirect_validator_sets_validator_blocks_authored_to_retrieved_if_validator_active(
             self, mock_session_val, _1, _2, _3, _4, _5, mock_authored_blocks,
-            _6) -> None:
+            _6, _7) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -949,6 +1027,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.assertEqual(self.validator_monitor.node.no_of_blocks_authored,
                              self.dummy_no_of_blocks_authored)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -962,7 +1041,8 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION)
     def test_monitor_indirect_validator_does_not_set_validator_blocks_authored_if_validator_not_active(
-            self, _1, _2, _3, _4, _5, _6, mock_authored_blocks, _7) -> None:
+            self, _1, _2, _3, _4, _5, _6, mock_authored_blocks, _7, _8) \
+            -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -974,6 +1054,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.assertEqual(self.validator_monitor.node.no_of_blocks_authored,
                              0)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -987,7 +1068,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     def test_monitor_indirect_validator_calls_monitor_archive_if_not_disabled(
-            self, _1, _2, _3, _4, _5, _6, _7, _8) -> None:
+            self, _1, _2, _3, _4, _5, _6, _7, _8, _9) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -997,6 +1078,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.assertEqual(
                 self.validator_monitor._monitor_archive_state.call_count, 1)
 
+    @patch(GET_FINALIZED_HEAD_FUNCTION, return_value='0x_head')
     @patch(GET_DISABLED_VALIDATORS_FUNCTION, return_value=[])
     @patch(GET_AUTHORED_BLOCKS_FUNCTION, return_value=0)
     @patch(GET_CURRENT_INDEX_FUNCTION, return_value=45)
@@ -1010,7 +1092,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
     @patch(GET_ACTIVE_ERA_FUNCTION, return_value={"index": 0, "start": 0})
     @patch(GET_SESSION_VALIDATORS_FUNCTION, return_value=[])
     def test_monitor_indirect_validator_does_not_call_monitor_archive_if_disabled(
-            self, _1, _2, _3, _4, _5, _6, _7, _8) -> None:
+            self, _1, _2, _3, _4, _5, _6, _7, _8, _9) -> None:
         with mock.patch(DATA_SOURCE_INDIRECT_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
@@ -1034,14 +1116,14 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.dummy_full_node_1.update_finalized_block_height(
                 self.dummy_finalized_block_height, self.logger,
                 self.channel_set)
-            self.validator_monitor._last_height_checked = \
+            self.validator_monitor.archive_scanner._last_height_checked = \
                 self.dummy_finalized_block_height
-            self.validator_monitor._check_for_slashing = MagicMock(
-                side_effect=self.validator_monitor._check_for_slashing)
+            self.validator_monitor.archive_scanner._check_for_slashing = MagicMock(
+                side_effect=self.validator_monitor.archive_scanner._check_for_slashing)
 
             self.validator_monitor._monitor_archive_state()
             self.assertEqual(
-                self.validator_monitor._check_for_slashing.call_count, 0)
+                self.validator_monitor.archive_scanner._check_for_slashing.call_count, 0)
             self.assertEqual(self.validator_monitor.last_height_checked,
                              self.dummy_finalized_block_height)
 
@@ -1058,15 +1140,20 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
 
             self.dummy_full_node_1.update_finalized_block_height(
                 archive_node_height, self.logger, self.channel_set)
-            self.validator_monitor._last_height_checked = \
+            self.validator_monitor.archive_scanner._last_height_checked = \
                 self.dummy_finalized_block_height
-            self.validator_monitor._check_for_slashing = MagicMock(
-                side_effect=self.validator_monitor._check_for_slashing)
+            self.validator_monitor.archive_scanner._check_for_slashing = MagicMock(
+                side_effect=self.validator_monitor.archive_scanner._check_for_slashing)
 
             self.validator_monitor._monitor_archive_state()
             self.assertEqual(
-                self.validator_monitor._check_for_slashing.call_count, 1)
-            self.assertEqual(self.validator_monitor.last_height_checked, 34635)
+                self.validator_monitor.archive_scanner._check_for_slashing.call_count, 1)
+            # No block is skipped, and the next blocks are checked in one
+            # range
+            self.assertEqual(
+                self.validator_monitor.last_height_checked,
+                self.dummy_finalized_block_height +
+                TestInternalConf.archive_scanner_blocks_per_scan)
 
     @patch(GET_SLASH_AMOUNT_FUNCITON, return_value=0)
     @patch(GET_BLOCK_HASH_FUNCTION, return_value=None)
@@ -1078,29 +1165,30 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.dummy_full_node_1.update_finalized_block_height(
                 self.dummy_finalized_block_height, self.logger,
                 self.channel_set)
-            self.validator_monitor._check_for_slashing = MagicMock(
-                side_effect=self.validator_monitor._check_for_slashing)
+            self.validator_monitor.archive_scanner._check_for_slashing = MagicMock(
+                side_effect=self.validator_monitor.archive_scanner._check_for_slashing)
 
             self.validator_monitor._monitor_archive_state()
             self.assertEqual(
-                self.validator_monitor._check_for_slashing.call_count, 1)
+                self.validator_monitor.archive_scanner._check_for_slashing.call_count, 1)
             self.assertEqual(self.validator_monitor.last_height_checked,
                              self.dummy_finalized_block_height)
 
     @patch(GET_SLASH_AMOUNT_FUNCITON, return_value=0)
     @patch(GET_BLOCK_HASH_FUNCTION, return_value=None)
-    def test_monitor_archive_sets_catching_up_true_if_more_than_2_blocks_late(
+    def test_monitor_archive_sets_catching_up_true_if_more_than_2_blocks_late_after_scan(
             self, _1, _2) -> None:
         with mock.patch(DATA_SOURCE_ARCHIVE_PATH, new_callable=PropertyMock) \
                 as mock_data_source_indirect:
             mock_data_source_indirect.return_value = self.dummy_full_node_1
 
             # To make the monitor catch up
-            archive_node_height = self.dummy_finalized_block_height + 4
+            archive_node_height = self.dummy_finalized_block_height + \
+                TestInternalConf.archive_scanner_blocks_per_scan + 3
 
             self.dummy_full_node_1.update_finalized_block_height(
                 archive_node_height, self.logger, self.channel_set)
-            self.validator_monitor._last_height_checked = \
+            self.validator_monitor.archive_scanner._last_height_checked = \
                 self.dummy_finalized_block_height
             self.validator_monitor._monitor_archive_state()
 
@@ -1130,7 +1218,7 @@ class TestNodeMonitorWithoutRedis(unittest.TestCase):
             self.dummy_full_node_1.update_finalized_block_height(
                 self.dummy_finalized_block_height, self.logger,
                 self.channel_set)
-            self.validator_monitor._last_height_checked = \
+            self.validator_monitor.archive_scanner._last_height_checked = \
                 self.dummy_finalized_block_height - 3
             self.validator_monitor._monitor_archive_state()
 
@@ -1204,16 +1292,17 @@ class TestNodeMonitorWithRedis(unittest.TestCase):
         except RedisConnectionError:
             self.fail('Redis is not online.')
 
-        self.node_monitor_max_catch_up_blocks = \
-            TestInternalConf.node_monitor_max_catch_up_blocks
-        self.node = None
+        self.chain = 'testchain'
+        self.node = Node('testvalidator', '13.13.14.11:9944',
+                         NodeType.VALIDATOR_FULL_NODE,
+                         'DFJGDF8G898fdghb98dg9wetg9we00w', self.chain, None,
+                         True, TestInternalConf)
         self.archive_alerts_disabled = False
         self.data_sources = []
         self.polkadot_api_endpoint = 'api_endpoint'
         self.monitor = NodeMonitor(
-            self.monitor_name, self.channel_set, self.logger,
-            self.node_monitor_max_catch_up_blocks, self.redis, self.node,
-            self.archive_alerts_disabled, self.data_sources,
+            self.monitor_name, self.channel_set, self.logger, self.redis,
+            self.node, self.archive_alerts_disabled, self.data_sources,
             self.polkadot_api_endpoint, TestInternalConf)
 
         self.dummy_session_index = 60
@@ -1228,16 +1317,14 @@ class TestNodeMonitorWithRedis(unittest.TestCase):
 
         self.assertEqual(NONE, self.monitor._session_index)
         self.assertEqual(NONE, self.monitor._era_index)
-        self.assertEqual(NONE, self.monitor._last_height_checked)
+        self.assertEqual(NONE, self.monitor.last_height_checked)
 
     def test_load_state_sets_values_to_saved_values(self) -> None:
         # Set Redis values manually
         key_si = Keys.get_node_monitor_session_index(self.monitor_name)
         key_ei = Keys.get_node_monitor_era_index(self.monitor_name)
-        key_lh = Keys.get_node_monitor_last_height_checked(self.monitor_name)
         self.redis.set_unsafe(key_si, self.dummy_session_index)
         self.redis.set_unsafe(key_ei, self.dummy_era_index)
-        self.redis.set_unsafe(key_lh, self.dummy_last_height_checked)
 
         # Load the values from Redis
         self.monitor.load_state()
@@ -1245,22 +1332,21 @@ class TestNodeMonitorWithRedis(unittest.TestCase):
         # Assert
         self.assertEqual(self.dummy_session_index, self.monitor.session_index)
         self.assertEqual(self.dummy_era_index, self.monitor.era_index)
-        self.assertEqual(self.dummy_last_height_checked,
-                         self.monitor.last_height_checked)
 
     def test_save_state_sets_values_to_current_values_and_stores_alive_key_temp(
             self) -> None:
         # Set monitor values manually
         self.monitor._session_index = self.dummy_session_index
         self.monitor._era_index = self.dummy_era_index
-        self.monitor._last_height_checked = self.dummy_last_height_checked
+        self.monitor.archive_scanner._last_height_checked = \
+            self.dummy_last_height_checked
 
         # Save the values to Redis
         self.monitor.save_state()
 
         key_si = Keys.get_node_monitor_session_index(self.monitor_name)
         key_ei = Keys.get_node_monitor_era_index(self.monitor_name)
-        key_lh = Keys.get_node_monitor_last_height_checked(self.monitor_name)
+        key_lh = Keys.get_archive_scanner_last_height_checked(self.chain)
 
         # Get last update, and its timeout in Redis
         last_update = self.redis.get(key_lh)
@@ -1273,3 +1359,86 @@ class TestNodeMonitorWithRedis(unittest.TestCase):
                          self.redis.get_int(key_lh))
         self.assertIsNotNone(last_update)
         self.assertEqual(timeout, self.redis_alive_key_timeout)
+
+    def test_save_state_only_sets_alive_key_if_nothing_else_changed(
+            self) -> None:
+        self.monitor._session_index = self.dummy_session_index
+        self.monitor._era_index = self.dummy_era_index
+        self.monitor.save_state()
+
+        key_alive = Keys.get_node_monitor_alive(self.monitor_name)
+        with patch.object(self.redis, 'save_round',
+                          wraps=self.redis.save_round) as save_round, \
+                patch.object(self.redis, 'set_multiple') as set_multiple:
+            self.monitor.save_state()
+
+        save_round.assert_called_once()
+        key_values, expiries = save_round.call_args[0][:2]
+        self.assertEqual(list(key_values), [key_alive])
+        self.assertEqual(list(expiries), [key_alive])
+        set_multiple.assert_not_called()
+        self.assertEqual(self.redis_alive_key_timeout,
+                         self.redis.time_to_live(key_alive))
+
+    def test_save_state_saves_node_state_in_the_same_round(self) -> None:
+        node = Node('testvalidator', '13.13.14.11:9944',
+                    NodeType.VALIDATOR_FULL_NODE,
+                    'DFJGDF8G898fdghb98dg9wetg9we00w', self.chain, self.redis,
+                    True, TestInternalConf)
+        monitor = NodeMonitor(
+            self.monitor_name, self.channel_set, self.logger, self.redis,
+            node, self.archive_alerts_disabled, self.data_sources,
+            self.polkadot_api_endpoint, TestInternalConf)
+        monitor._session_index = self.dummy_session_index
+        node._no_of_peers = 10
+
+        with patch.object(self.redis, 'save_round',
+                          wraps=self.redis.save_round) as save_round, \
+                patch.object(self.redis, 'hset_multiple') as hset_multiple:
+            monitor.save_state()
+            node.save_state(self.logger)
+
+        save_round.assert_called_once()
+        hset_multiple.assert_not_called()
+        key_si = Keys.get_node_monitor_session_index(self.monitor_name)
+        self.assertEqual(self.dummy_session_index, self.redis.get_int(key_si))
+        self.assertEqual(10, self.redis.hget_int(
+            node.redis_hash, Keys.get_node_no_of_peers(node.name)))
+
+    def test_save_state_saves_changes_again_if_round_not_saved(self) -> None:
+        self.monitor._session_index = self.dummy_session_index
+        key_si = Keys.get_node_monitor_session_index(self.monitor_name)
+
+        with patch.object(self.redis, 'save_round', return_value=None):
+            self.monitor.save_state()
+        self.monitor.save_state()
+
+        self.assertEqual(self.dummy_session_index, self.redis.get_int(key_si))
+
+    def test_save_state_saves_node_metric_samples_as_time_series(
+            self) -> None:
+        node = Node('testvalidator', '13.13.14.11:9944',
+                    NodeType.VALIDATOR_FULL_NODE,
+                    'DFJGDF8G898fdghb98dg9wetg9we00w', self.chain, self.redis,
+                    True, TestInternalConf)
+        monitor = NodeMonitor(
+            self.monitor_name, self.channel_set, self.logger, self.redis,
+            node, self.archive_alerts_disabled, self.data_sources,
+            self.polkadot_api_endpoint, TestInternalConf)
+        node.set_no_of_peers(10, self.channel_set, self.logger)
+
+        monitor.save_state()
+
+        series = self.redis.get_time_series(
+            Keys.get_zset_node_no_of_peers(node.name))
+        self.assertEqual([value for _, value in series], [10])
+        self.assertEqual(node.get_metric_samples(), {})
+
+    def test_save_state_registers_monitor_with_its_alive_time(self) -> None:
+        self.monitor.save_state()
+
+        key_alive = Keys.get_node_monitor_alive(self.monitor_name)
+        self.assertEqual(
+            self.redis.get_sorted_set_scores(
+                Keys.get_zset_node_monitors_alive()),
+            {self.monitor_name: float(self.redis.get(key_alive))})
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import unittest
+from unittest.mock import patch
+
+from src.alerters.reactive.node import Node, NodeType
+from src.channels.channel import ChannelSet
+from src.monitors.node_async import AsyncNodeMonitor
+from src.utils.exceptions import NoLiveNodeConnectedWithAnApiServerException
+from test import TestInternalConf
+from test.test_helpers import CounterChannel
+
+GET_POLKADOT_JSON_ASYNC_FUNCTION = \
+    'src.utils.data_wrapper.polkadot_api_async.get_polkadot_json_async'
+
+
+class TestAsyncNodeMonitorWithoutRedis(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.monitor_name = 'testnodemonitor'
+        self.counter_channel = CounterChannel(self.logger)
+        self.channel_set = ChannelSet([self.counter_channel], TestInternalConf)
+        self.chain = 'testchain'
+
+        self.data_source_ws_url = '11.22.33.11:9944'
+        self.data_source = Node('testnode1', self.data_source_ws_url,
+                                NodeType.NON_VALIDATOR_FULL_NODE, '',
+                                self.chain, None, True, TestInternalConf)
+
+        self.validator_ws_url = '13.13.14.11:9944'
+        self.validator_stash_account_address = "DFJGDF8G898fdghb98dg9wetg9we00w"
+        self.validator = Node('testvalidator', self.validator_ws_url,
+                              NodeType.VALIDATOR_FULL_NODE,
+                              self.validator_stash_account_address, self.chain,
+                              None, True, TestInternalConf)
+        self.validator_monitor = AsyncNodeMonitor(
+            self.monitor_name, self.channel_set, self.logger, None,
+            self.validator, True, [self.data_source], 'api_endpoint',
+            TestInternalConf)
+
+        # The responses of the API server, by API call
+        self.api_responses = {
+            '/api/getConnectionsList': [self.data_source_ws_url],
+            'pingNode': 'pong',
+            'system/health': {"isSyncing": True, "peers": 92,
+                              "shouldHavePeers": True},
+            'chain/getFinalizedHead': '0x42ebf471c67fe6dd8a5b',
+            'chain/getHeader': {"number": "523686"},
+            'session/validators': [self.validator_stash_account_address],
+            'staking/erasStakers': {"total": 5, "own": 5, "others": []},
+            'council/members': [],
+            'staking/validators': {
+                'validators': [],
+                'nextElected': [self.validator_stash_account_address]},
+            'session/currentIndex': 45,
+            'imOnline/authoredBlocks': 3,
+            'session/disabledValidators': [],
+            'staking/activeEra': {"index": 12, "start": 0},
+        }
+        self.api_calls = []
+
+    async def get_polkadot_json_async(self, endpoint, params, logger,
+                                      api_call=''):
+        for key, response in self.api_responses.items():
+            if endpoint.endswith(key):
+                self.api_calls.append(key)
+                return response
+        raise AssertionError('Unexpected API call {}'.format(endpoint))
+
+    def test_monitor_direct_sets_node_state_to_retrieved_data(self) -> None:
+        with patch(GET_POLKADOT_JSON_ASYNC_FUNCTION,
+                   self.get_polkadot_json_async):
+            asyncio.run(self.validator_monitor.monitor_direct())
+
+        self.assertFalse(self.validator.is_down)
+        self.assertTrue(self.validator.is_syncing)
+        self.assertEqual(self.validator.no_of_peers, 92)
+        self.assertEqual(self.validator.finalized_block_height, 523686)
+        self.assertFalse(self.validator_monitor.data_wrapper.is_api_down)
+
+    def test_monitor_indirect_sets_validator_state_to_retrieved_data(
+            self) -> None:
+        with patch(GET_POLKADOT_JSON_ASYNC_FUNCTION,
+                   self.get_polkadot_json_async):
+            asyncio.run(self.validator_monitor.monitor_indirect())
+
+        self.assertTrue(self.validator.is_active)
+        self.assertEqual(self.validator.auth_index, 0)
+        self.assertTrue(self.validator.is_elected)
+        self.assertFalse(self.validator.is_council_member)
+        self.assertEqual(self.validator.bonded_balance, 5)
+        self.assertEqual(self.validator.no_of_blocks_authored, 3)
+        self.assertEqual(self.validator_monitor.session_index, 45)
+        self.assertEqual(self.validator_monitor.era_index, 12)
+        self.assertEqual(self.validator_monitor.last_data_source_used,
+                         self.data_source)
+        self.assertTrue(self.data_source.is_connected_to_api_server)
+
+    def test_monitor_indirect_raises_exception_if_no_data_source_connected(
+            self) -> None:
+        self.api_responses['/api/getConnectionsList'] = []
+        with patch(GET_POLKADOT_JSON_ASYNC_FUNCTION,
+                   self.get_polkadot_json_async):
+            self.assertRaises(NoLiveNodeConnectedWithAnApiServerException,
+                              asyncio.run,
+                              self.validator_monitor.monitor_indirect())
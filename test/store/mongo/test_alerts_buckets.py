@@ -0,0 +1,79 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from pymongo import UpdateOne
+
+from src.store.mongo.alerts_buckets import alert_bucket_updates, \
+    iterate_bucketed_alerts
+
+
+class TestAlertBucketUpdates(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.bucket_length = timedelta(hours=1)
+        self.max_alerts = 100
+
+    def _document(self, origin: str, timestamp: float) -> dict:
+        return {'origin': origin, 'severity': 'WARNING', 'message': 'm',
+                'alert_code': 'A', 'timestamp': timestamp}
+
+    def test_updates_append_alerts_to_bucket_of_origin_and_time(self):
+        documents = [self._document('PANIC', 3600.0),
+                     self._document('PANIC', 7199.0),
+                     self._document('OTHER', 3601.0)]
+
+        updates = alert_bucket_updates(documents, self.bucket_length,
+                                       self.max_alerts)
+
+        self.assertEqual([docs for _, docs in updates],
+                         [documents[:2], documents[2:]])
+        self.assertEqual(updates[0][0], UpdateOne(
+            {'origin': 'PANIC', 'start': 3600.0,
+             'count': {'$lt': self.max_alerts}},
+            {'$push': {'alerts': {'$each': [
+                {'t': 3600.0, 's': 'W', 'c': 'A', 'm': 'm'},
+                {'t': 7199.0, 's': 'W', 'c': 'A', 'm': 'm'}]}},
+             '$inc': {'count': 2},
+             '$setOnInsert': {'created_at': datetime.fromtimestamp(
+                 3600.0, timezone.utc)}},
+            upsert=True))
+
+
+class TestIterateBucketedAlerts(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mongo = MagicMock()
+        self.bucket_length = timedelta(hours=1)
+        # As yielded by iterate_unwound, newest bucket first
+        self.mongo.iterate_unwound.return_value = iter([
+            {'origin': 'A', 'start': 7200.0, 't': 7300.0, 's': 'I', 'c': 'X',
+             'm': 'a1'},
+            {'origin': 'B', 'start': 7200.0, 't': 7400.0, 's': 'C', 'c': 'X',
+             'm': 'b1'},
+            {'origin': 'A', 'start': 3600.0, 't': 3700.0, 's': 'W', 'c': 'X',
+             'm': 'a0'}
+        ])
+
+    def test_alerts_are_flattened_newest_first(self):
+        alerts = list(iterate_bucketed_alerts(self.mongo, 'buckets',
+                                              self.bucket_length))
+
+        self.assertEqual([alert['message'] for alert in alerts],
+                         ['b1', 'a1', 'a0'])
+        self.assertEqual(alerts[0], {
+            'origin': 'B', 'severity': 'CRITICAL', 'alert_code': 'X',
+            'message': 'b1', 'timestamp': 7400.0})
+
+    def test_alerts_are_filtered_by_time_and_severity(self):
+        start = datetime.fromtimestamp(3650.0)
+        end = datetime.fromtimestamp(7350.0)
+
+        alerts = list(iterate_bucketed_alerts(
+            self.mongo, 'buckets', self.bucket_length, start, end,
+            severities=['INFO', 'WARNING']))
+
+        self.assertEqual([alert['message'] for alert in alerts],
+                         ['a1', 'a0'])
+        query = self.mongo.iterate_unwound.call_args[0][2]
+        self.assertEqual(query, {'start': {'$gt': 50.0, '$lt': 7350.0}})
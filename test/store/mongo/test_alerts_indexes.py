@@ -0,0 +1,64 @@
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from src.store.mongo.alerts_indexes import ALERTS_INDEXES, \
+    ALERTS_TTL_INDEX_NAME, ensure_alerts_indexes
+
+
+class TestEnsureAlertsIndexes(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mongo = MagicMock()
+        self.mongo.get_indexes.return_value = {'_id_': {}}
+        self.collection = 'testcollection'
+        self.retention = timedelta(days=30)
+
+    def test_creates_alerts_indexes(self):
+        self.assertTrue(ensure_alerts_indexes(self.mongo, self.collection,
+                                              None))
+
+        self.mongo.create_indexes.assert_called_once_with(
+            self.collection, ALERTS_INDEXES)
+
+    def test_creates_ttl_index_if_retention_given(self):
+        ensure_alerts_indexes(self.mongo, self.collection, self.retention)
+
+        ttl_index = self.mongo.create_indexes.call_args[0][1][0].document
+        self.assertEqual(ttl_index['name'], ALERTS_TTL_INDEX_NAME)
+        self.assertEqual(ttl_index['expireAfterSeconds'], 30 * 24 * 60 * 60)
+
+    def test_changes_expiry_of_ttl_index_if_retention_changed(self):
+        self.mongo.get_indexes.return_value = {
+            ALERTS_TTL_INDEX_NAME: {'expireAfterSeconds': 60}}
+
+        ensure_alerts_indexes(self.mongo, self.collection, self.retention)
+
+        self.mongo.set_index_expiry.assert_called_once_with(
+            self.collection, ALERTS_TTL_INDEX_NAME, self.retention)
+        self.mongo.create_indexes.assert_called_once()
+
+    def test_leaves_ttl_index_if_retention_unchanged(self):
+        self.mongo.get_indexes.return_value = {ALERTS_TTL_INDEX_NAME: {
+            'expireAfterSeconds': int(self.retention.total_seconds())}}
+
+        ensure_alerts_indexes(self.mongo, self.collection, self.retention)
+
+        self.mongo.set_index_expiry.assert_not_called()
+        self.mongo.create_indexes.assert_called_once()
+
+    def test_drops_ttl_index_if_no_retention(self):
+        self.mongo.get_indexes.return_value = {
+            ALERTS_TTL_INDEX_NAME: {'expireAfterSeconds': 60}}
+
+        ensure_alerts_indexes(self.mongo, self.collection, None)
+
+        self.mongo.drop_index.assert_called_once_with(
+            self.collection, ALERTS_TTL_INDEX_NAME)
+
+    def test_returns_false_if_mongo_unusable(self):
+        self.mongo.create_indexes.return_value = None
+
+        self.assertFalse(ensure_alerts_indexes(self.mongo, self.collection,
+                                               self.retention))
+        self.mongo.get_indexes.assert_not_called()
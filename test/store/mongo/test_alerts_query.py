@@ -0,0 +1,30 @@
+import unittest
+from datetime import datetime
+
+from src.store.mongo.alerts_query import alerts_query
+
+
+class TestAlertsQuery(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.start = datetime(2020, 1, 1)
+        self.end = datetime(2020, 1, 2)
+
+    def test_query_matches_all_alerts_if_no_filters(self):
+        self.assertEqual(alerts_query(), {})
+
+    def test_query_filters_by_time_window(self):
+        self.assertEqual(alerts_query(self.start, self.end), {
+            'timestamp': {'$gte': self.start.timestamp(),
+                          '$lt': self.end.timestamp()}})
+
+    def test_query_filters_from_start_only(self):
+        self.assertEqual(alerts_query(start=self.start), {
+            'timestamp': {'$gte': self.start.timestamp()}})
+
+    def test_query_filters_by_severities_and_origins(self):
+        self.assertEqual(
+            alerts_query(severities=['WARNING', 'CRITICAL'],
+                         origins=['PANIC']),
+            {'severity': {'$in': ['WARNING', 'CRITICAL']},
+             'origin': {'$in': ['PANIC']}})
@@ -0,0 +1,92 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from pymongo import UpdateOne
+
+from src.store.mongo.alerts_buckets import BUCKETS_TO_ALERTS_STAGES
+from src.store.mongo.alerts_stats import alerts_rollup_updates, \
+    alert_counts, rollup_alert_counts
+
+
+class TestAlertsRollupUpdates(unittest.TestCase):
+
+    def test_updates_add_up_alerts_per_hour_and_fields(self):
+        documents = [
+            {'timestamp': 7200.5, 'severity': 'INFO', 'origin': 'PANIC',
+             'alert_code': 'A'},
+            {'timestamp': 10799.0, 'severity': 'INFO', 'origin': 'PANIC',
+             'alert_code': 'A'},
+            {'timestamp': 10800.0, 'severity': 'INFO', 'origin': 'PANIC',
+             'alert_code': 'A'}
+        ]
+
+        self.assertEqual(alerts_rollup_updates(documents), [
+            UpdateOne({'_id': {'bucket': 7200.0, 'severity': 'INFO',
+                               'origin': 'PANIC', 'alert_code': 'A'}},
+                      {'$inc': {'count': 2}}, upsert=True),
+            UpdateOne({'_id': {'bucket': 10800.0, 'severity': 'INFO',
+                               'origin': 'PANIC', 'alert_code': 'A'}},
+                      {'$inc': {'count': 1}}, upsert=True)])
+
+    def test_updates_count_alerts_without_alert_code(self):
+        updates = alerts_rollup_updates(
+            [{'timestamp': 0.0, 'severity': 'INFO', 'origin': 'PANIC'}])
+
+        self.assertEqual(updates, [UpdateOne(
+            {'_id': {'bucket': 0.0, 'severity': 'INFO', 'origin': 'PANIC',
+                     'alert_code': None}},
+            {'$inc': {'count': 1}}, upsert=True)])
+
+
+class TestAlertCounts(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mongo = MagicMock()
+        self.mongo.aggregate.return_value = iter([
+            {'_id': {'bucket': 0.0, 'severity': 'CRITICAL'}, 'count': 6}])
+        self.start = datetime(2020, 1, 1)
+
+    def test_alert_counts_groups_by_bucket_and_fields(self):
+        counts = alert_counts(self.mongo, 'alerts', timedelta(hours=2),
+                              ['severity'], start=self.start,
+                              severities=['CRITICAL'])
+
+        pipeline = self.mongo.aggregate.call_args[0][1]
+        self.assertEqual(pipeline[0], {'$match': {
+            'timestamp': {'$gte': self.start.timestamp()},
+            'severity': {'$in': ['CRITICAL']}}})
+        self.assertEqual(pipeline[1]['$group']['_id']['severity'],
+                         '$severity')
+        self.assertEqual(pipeline[1]['$group']['count'], {'$sum': 1})
+        self.assertEqual(counts, [{'bucket': 0.0, 'severity': 'CRITICAL',
+                                   'count': 6, 'rate_per_hour': 3.0}])
+
+    def test_alert_counts_of_buckets_unwinds_buckets_first(self):
+        alert_counts(self.mongo, 'buckets', timedelta(hours=1),
+                     source_stages=BUCKETS_TO_ALERTS_STAGES)
+
+        pipeline = self.mongo.aggregate.call_args[0][1]
+        self.assertEqual(pipeline[:2], BUCKETS_TO_ALERTS_STAGES)
+        self.assertIn('$match', pipeline[2])
+
+    def test_alert_counts_rejects_unknown_field(self):
+        self.assertRaises(ValueError, alert_counts, self.mongo, 'alerts',
+                          timedelta(hours=1), ['message'])
+
+    def test_rollup_alert_counts_adds_up_hourly_counts(self):
+        rollup_alert_counts(self.mongo, 'rollup', timedelta(days=1),
+                            ['severity'], start=self.start,
+                            origins=['PANIC'])
+
+        pipeline = self.mongo.aggregate.call_args[0][1]
+        self.assertEqual(pipeline[0], {'$match': {
+            '_id.origin': {'$in': ['PANIC']},
+            '_id.bucket': {'$gte': self.start.timestamp()}}})
+        self.assertEqual(pipeline[1]['$group']['_id']['severity'],
+                         '$_id.severity')
+        self.assertEqual(pipeline[1]['$group']['count'], {'$sum': '$count'})
+
+    def test_rollup_alert_counts_rejects_bucket_not_in_whole_hours(self):
+        self.assertRaises(ValueError, rollup_alert_counts, self.mongo,
+                          'rollup', timedelta(minutes=90))
@@ -3,8 +3,9 @@ import unittest
 from datetime import timedelta
 from time import sleep
 
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
 from pymongo.errors import PyMongoError, OperationFailure, \
-    ServerSelectionTimeoutError
+    ServerSelectionTimeoutError, BulkWriteError
 
 from src.store.mongo.mongo_api import MongoApi
 from test import TestUserConf
@@ -109,6 +110,20 @@ class TestMongoApiWithMongoOnline(unittest.TestCase):
         self.assertEqual(dict(get_result[1]), self.val2)
         self.assertEqual(dict(get_result[2]), self.val3)
 
+    def test_insert_many_unordered_inserts_rest_if_one_fails(self):
+        self.mongo.insert_one(self.col1, self.val1)
+
+        # val1 already has an _id in col1, so inserting it again fails
+        try:
+            self.mongo.insert_many(self.col1, [self.val1, self.val2],
+                                   ordered=False)
+            self.fail('Expected BulkWriteError to be thrown.')
+        except BulkWriteError:
+            pass
+
+        get_result = list(self.mongo._db[self.col1].find({}))
+        self.assertEqual(len(get_result), 2)
+
     def test_get_all_returns_inserted_values_in_order_of_insert(self):
         # Check that col1 is empty
         get_result = self.mongo.get_all(self.col1)
@@ -124,6 +139,107 @@ class TestMongoApiWithMongoOnline(unittest.TestCase):
         self.assertEqual(dict(get_result[1]), self.val2)
         self.assertEqual(dict(get_result[2]), self.val3)
 
+    def test_iterate_yields_matching_documents_with_projection(self):
+        self.mongo.insert_many(self.col1, [{'t': i, 'x': i} for i in range(5)])
+
+        documents = list(self.mongo.iterate(
+            self.col1, {'t': {'$gte': 2}}, projection={'_id': 0, 't': 1},
+            sort=[('t', DESCENDING)], batch_size=2))
+
+        self.assertEqual(documents, [{'t': 4}, {'t': 3}, {'t': 2}])
+
+    def test_iterate_unwound_yields_array_elements_with_document_fields(
+            self):
+        self.mongo.insert_many(self.col1, [
+            {'s': 2, 'e': [{'x': 3}, {'x': 4}]}, {'s': 1, 'e': [{'x': 1}]}])
+
+        elements = list(self.mongo.iterate_unwound(
+            self.col1, 'e', projection={'_id': 0}, sort=[('s', ASCENDING)]))
+
+        self.assertEqual(elements, [{'s': 1, 'x': 1}, {'s': 2, 'x': 3},
+                                    {'s': 2, 'x': 4}])
+
+    def test_aggregate_yields_results_of_pipeline(self):
+        self.mongo.insert_many(self.col1, [{'s': 'a'}, {'s': 'b'}, {'s': 'a'}])
+
+        results = list(self.mongo.aggregate(self.col1, [
+            {'$group': {'_id': '$s', 'count': {'$sum': 1}}},
+            {'$sort': {'_id': 1}}]))
+
+        self.assertEqual(results, [{'_id': 'a', 'count': 2},
+                                   {'_id': 'b', 'count': 1}])
+
+    def test_bulk_write_applies_all_operations(self):
+        self.mongo.bulk_write(self.col1, [
+            UpdateOne({'_id': 1}, {'$inc': {'count': 1}}, upsert=True),
+            UpdateOne({'_id': 1}, {'$inc': {'count': 2}}, upsert=True)])
+
+        self.assertEqual(self.mongo.get_all(self.col1),
+                         [{'_id': 1, 'count': 3}])
+
+    def test_get_page_returns_pages_newest_first_until_last_page(self):
+        # Two documents have the same timestamp, so pages are split by _id
+        self.mongo.insert_many(self.col1, [
+            {'timestamp': t, 'x': i} for i, t in enumerate([1, 2, 2, 3])])
+
+        page1, key1 = self.mongo.get_page(self.col1, 2)
+        page2, key2 = self.mongo.get_page(self.col1, 2, after=key1)
+        page3, key3 = self.mongo.get_page(self.col1, 2, after=key2)
+
+        self.assertEqual([doc['x'] for doc in page1], [3, 2])
+        self.assertEqual([doc['x'] for doc in page2], [1, 0])
+        self.assertEqual(page3, [])
+        self.assertIsNone(key3)
+
+    def test_get_page_keeps_sort_field_and_id_in_projection(self):
+        self.mongo.insert_many(self.col1, [{'timestamp': 1, 'x': 1, 'y': 1}])
+
+        page, _ = self.mongo.get_page(self.col1, 2, projection={'x': 1})
+
+        self.assertEqual(set(page[0]), {'_id', 'timestamp', 'x'})
+
+    def test_count_returns_number_of_documents_in_collection(self):
+        self.mongo.insert_many(self.col1, [self.val1, self.val2, self.val3])
+
+        self.assertEqual(self.mongo.count(self.col1), 3)
+
+    def test_delete_many_deletes_matching_documents(self):
+        self.mongo.insert_many(self.col1, [{'t': 1}, {'t': 2}, {'t': 3}])
+
+        deleted = self.mongo.delete_many(self.col1, {'t': {'$lt': 3}})
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual([doc['t'] for doc in self.mongo.get_all(self.col1)],
+                         [3])
+
+    def test_create_indexes_creates_indexes_once(self):
+        index = IndexModel([('a', ASCENDING)], name='a_index')
+
+        self.mongo.create_indexes(self.col1, [index])
+        self.mongo.create_indexes(self.col1, [index])
+
+        indexes = self.mongo.get_indexes(self.col1)
+        self.assertEqual(indexes['a_index']['key'], [('a', ASCENDING)])
+        self.assertEqual(len(indexes), 2)  # with the _id index
+
+    def test_drop_index_drops_the_specified_index(self):
+        self.mongo.create_indexes(
+            self.col1, [IndexModel([('a', ASCENDING)], name='a_index')])
+
+        self.mongo.drop_index(self.col1, 'a_index')
+
+        self.assertNotIn('a_index', self.mongo.get_indexes(self.col1))
+
+    def test_set_index_expiry_changes_expiry_of_ttl_index(self):
+        self.mongo.create_indexes(self.col1, [IndexModel(
+            [('date', ASCENDING)], name='date_ttl', expireAfterSeconds=60)])
+
+        self.mongo.set_index_expiry(self.col1, 'date_ttl',
+                                    timedelta(seconds=120))
+
+        self.assertEqual(self.mongo.get_indexes(self.col1)['date_ttl']
+                         ['expireAfterSeconds'], 120)
+
     def test_drop_collection_deletes_the_specified_collection(self):
         # Check that col1 and col2 are empty
         get_result1 = list(self.mongo._db[self.col1].find({}))
@@ -282,6 +398,42 @@ class TestMongoApiWithMongoOffline(unittest.TestCase):
         self.mongo._set_as_down()
         self.assertIsNone(self.mongo.drop_db())
 
+    def test_iterate_throws_exception_first_time_round(self):
+        try:
+            list(self.mongo.iterate(self.col1))
+            self.fail('Expected ServerSelectionTimeoutError to be thrown.')
+        except ServerSelectionTimeoutError:
+            pass
+
+    def test_iterate_yields_nothing_if_mongo_already_down(self):
+        self.mongo._set_as_down()
+        self.assertEqual(list(self.mongo.iterate(self.col1)), [])
+
+    def test_iterate_unwound_yields_nothing_if_mongo_already_down(self):
+        self.mongo._set_as_down()
+        self.assertEqual(list(self.mongo.iterate_unwound(self.col1, 'e')), [])
+
+    def test_aggregate_yields_nothing_if_mongo_already_down(self):
+        self.mongo._set_as_down()
+        self.assertEqual(list(self.mongo.aggregate(self.col1, [])), [])
+
+    def test_get_page_returns_none_if_mongo_already_down(self):
+        self.mongo._set_as_down()
+        self.assertIsNone(self.mongo.get_page(self.col1, 10))
+
+    def test_count_returns_none_if_mongo_already_down(self):
+        self.mongo._set_as_down()
+        self.assertIsNone(self.mongo.count(self.col1))
+
+    def test_create_indexes_returns_none_if_mongo_already_down(self):
+        self.mongo._set_as_down()
+        self.assertIsNone(self.mongo.create_indexes(
+            self.col1, [IndexModel([('a', ASCENDING)])]))
+
+    def test_get_indexes_returns_none_if_mongo_already_down(self):
+        self.mongo._set_as_down()
+        self.assertIsNone(self.mongo.get_indexes(self.col1))
+
     def test_ping_unsafe_throws_exception_if_mongo_already_down(self):
         self.mongo._set_as_down()
         try:
@@ -0,0 +1,55 @@
+import unittest
+
+from src.store.redis.compact_state import CompactStateCodec
+
+
+class TestCompactStateCodec(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.codec = CompactStateCodec(1, [
+            ('a_float', float), ('an_int', int), ('a_bool', bool),
+            ('another_int', int), ('another_bool', bool),
+            ('another_float', float), ('a_third_int', int),
+            ('a_third_bool', bool), ('a_ninth_field', int)])
+        self.values = {
+            'a_float': 1600000000.123, 'an_int': 12345678901234567890123,
+            'a_bool': True, 'another_int': -1, 'another_bool': False,
+            'another_float': -1, 'a_third_int': 0, 'a_third_bool': None,
+            'a_ninth_field': None}
+
+    def test_decode_returns_encoded_values(self):
+        self.assertEqual(self.codec.decode(self.codec.encode(self.values)),
+                         self.values)
+
+    def test_decode_returns_encoded_none_values(self):
+        values = {name: None for name in self.codec.field_names}
+        self.assertEqual(self.codec.decode(self.codec.encode(values)), values)
+
+    def test_decode_returns_encoded_int_boundaries(self):
+        for value in [127, 128, -128, -129, 2 ** 63, -2 ** 63 - 1]:
+            self.values['an_int'] = value
+            self.assertEqual(
+                self.codec.decode(self.codec.encode(self.values))['an_int'],
+                value)
+
+    def test_encode_is_smaller_than_values_as_text(self):
+        encoded = self.codec.encode(self.values)
+        self.assertLess(len(encoded), sum(
+            len(str(value)) for value in self.values.values()))
+
+    def test_encode_starts_with_version(self):
+        self.assertEqual(self.codec.encode(self.values)[0], 1)
+
+    def test_decode_raises_value_error_if_other_version(self):
+        encoded = CompactStateCodec(2, [('a_float', float)]).encode(
+            {'a_float': 1.0})
+        self.assertRaises(ValueError, self.codec.decode, encoded)
+
+    def test_decode_raises_value_error_if_incomplete(self):
+        encoded = self.codec.encode(self.values)
+        for length in [0, 1, 2, 10, len(encoded) - 1]:
+            self.assertRaises(ValueError, self.codec.decode,
+                              encoded[:length])
+
+    def test_decode_raises_value_error_if_text(self):
+        self.assertRaises(ValueError, self.codec.decode, b'None')
@@ -0,0 +1,98 @@
+import logging
+import unittest
+from datetime import timedelta
+
+from redis import ConnectionError as RedisConnectionError
+
+from src.store.redis.connection_pool import MonitoredConnectionPool
+from src.store.redis.redis_api import RedisApi
+from test import TestInternalConf, TestUserConf
+
+
+class TestMonitoredConnectionPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.max_connections = 2
+        self.pool = MonitoredConnectionPool(
+            max_connections=self.max_connections, timeout=0.1,
+            host=TestUserConf.redis_host, port=TestUserConf.redis_port,
+            db=TestInternalConf.redis_test_database,
+            password=TestUserConf.redis_password or None)
+
+        try:
+            self.pool.release(self.pool.get_connection('PING'))
+        except RedisConnectionError:
+            self.fail('Redis is not online.')
+
+    def tearDown(self) -> None:
+        self.pool.disconnect()
+
+    def test_stats_count_connections_in_use(self):
+        connection1 = self.pool.get_connection('PING')
+        connection2 = self.pool.get_connection('PING')
+        self.pool.release(connection1)
+
+        stats = self.pool.stats()
+        self.assertEqual(stats['max_connections'], self.max_connections)
+        self.assertEqual(stats['connections_in_use'], 1)
+        self.assertEqual(stats['max_connections_in_use'], 2)
+        self.assertEqual(stats['connections_given'], 3)
+        self.assertEqual(stats['connections_failed'], 0)
+
+        self.pool.release(connection2)
+        self.assertEqual(self.pool.stats()['connections_in_use'], 0)
+
+    def test_get_connection_fails_after_timeout_if_all_in_use(self):
+        connections = [self.pool.get_connection('PING')
+                       for _ in range(self.max_connections)]
+
+        self.assertRaises(RedisConnectionError, self.pool.get_connection,
+                          'PING')
+
+        stats = self.pool.stats()
+        self.assertEqual(stats['connections_in_use'], self.max_connections)
+        self.assertEqual(stats['connections_failed'], 1)
+        for connection in connections:
+            self.pool.release(connection)
+
+    def test_stats_record_wait_times(self):
+        self.pool.release(self.pool.get_connection('PING'))
+
+        stats = self.pool.stats()
+        self.assertGreater(stats['average_wait_seconds'], 0)
+        self.assertGreaterEqual(stats['max_wait_seconds'],
+                                stats['average_wait_seconds'])
+
+
+class TestRedisApiConnectionPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.redis = RedisApi(
+            self.logger, TestInternalConf.redis_test_database,
+            TestUserConf.redis_host, TestUserConf.redis_port,
+            password=TestUserConf.redis_password, namespace='testnamespace',
+            max_connections=3, pool_timeout=timedelta(seconds=1),
+            socket_connect_timeout=timedelta(seconds=2),
+            socket_timeout=timedelta(seconds=3), socket_keepalive=True,
+            health_check_interval=timedelta(seconds=4))
+
+    def test_connections_use_the_given_options(self):
+        pool = self.redis._redis.connection_pool
+        self.assertEqual(pool.max_connections, 3)
+        self.assertEqual(pool.timeout, 1)
+        self.assertEqual(pool.connection_kwargs['socket_connect_timeout'], 2)
+        self.assertEqual(pool.connection_kwargs['socket_timeout'], 3)
+        self.assertTrue(pool.connection_kwargs['socket_keepalive'])
+        self.assertEqual(pool.connection_kwargs['health_check_interval'], 4)
+
+    def test_pool_stats_returns_usage_of_connections(self):
+        try:
+            self.redis.ping_unsafe()
+        except RedisConnectionError:
+            self.fail('Redis is not online.')
+
+        stats = self.redis.pool_stats
+        self.assertEqual(stats['max_connections'], 3)
+        self.assertEqual(stats['connections_in_use'], 0)
+        self.assertEqual(stats['connections_given'], 1)
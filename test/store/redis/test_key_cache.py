@@ -0,0 +1,57 @@
+import time
+import unittest
+
+from src.store.redis.key_cache import KeyCache
+
+
+class TestKeyCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.max_age = 0.2
+        self.cache = KeyCache(self.max_age)
+        self.key = 'key'
+        self.other_key = 'other_key'
+        self.cache.add_keys([self.key])
+
+    def test_get_returns_value_put(self):
+        self.cache.put(self.key, b'value', self.cache.generation)
+        self.assertEqual(self.cache.get(self.key), (True, b'value'))
+
+    def test_get_returns_missing_key_put_as_none(self):
+        self.cache.put(self.key, None, self.cache.generation)
+        self.assertEqual(self.cache.get(self.key), (True, None))
+
+    def test_get_returns_nothing_if_nothing_put(self):
+        self.assertEqual(self.cache.get(self.key), (False, None))
+
+    def test_get_returns_nothing_once_value_older_than_max_age(self):
+        self.cache.put(self.key, b'value', self.cache.generation)
+        time.sleep(self.max_age * 1.5)
+        self.assertEqual(self.cache.get(self.key), (False, None))
+
+    def test_put_does_not_cache_keys_not_added(self):
+        self.cache.put(self.other_key, b'value', self.cache.generation)
+        self.assertEqual(self.cache.get(self.other_key), (False, None))
+
+    def test_invalidate_removes_value(self):
+        self.cache.put(self.key, b'value', self.cache.generation)
+        self.cache.invalidate([self.key])
+        self.assertEqual(self.cache.get(self.key), (False, None))
+
+    def test_put_does_not_cache_value_read_before_invalidation(self):
+        generation = self.cache.generation
+        self.cache.invalidate([self.key])
+        self.cache.put(self.key, b'value', generation)
+        self.assertEqual(self.cache.get(self.key), (False, None))
+
+    def test_invalidating_keys_not_added_changes_nothing(self):
+        generation = self.cache.generation
+        self.cache.put(self.key, b'value', generation)
+        self.cache.invalidate([self.other_key])
+        self.assertEqual(self.cache.generation, generation)
+        self.assertEqual(self.cache.get(self.key), (True, b'value'))
+
+    def test_clear_removes_all_values(self):
+        self.cache.put(self.key, b'value', self.cache.generation)
+        self.cache.clear()
+        self.assertEqual(self.cache.get(self.key), (False, None))
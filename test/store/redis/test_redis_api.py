@@ -9,6 +9,7 @@ from redis import ConnectionError as RedisConnectionError, DataError,\
     AuthenticationError, ResponseError
 
 from src.store.redis.redis_api import RedisApi
+from src.store.redis.time_series import encode_sample
 from test import TestInternalConf, TestUserConf
 
 REDIS_RECENTLY_DOWN_FUNCTION = \
@@ -65,6 +66,7 @@ class TestRedisApiWithRedisOnline(unittest.TestCase):
         self.val3_int = 123
         self.val4 = str(True)
         self.val4_bool = True
+        self.val5_float = 12.5
 
         self.time = timedelta(seconds=3)
         self.time_with_error_margin = timedelta(seconds=4)
@@ -72,6 +74,7 @@ class TestRedisApiWithRedisOnline(unittest.TestCase):
         self.default_str = 'DEFAULT'
         self.default_int = 789
         self.default_bool = False
+        self.default_float = 7.25
 
     def tearDown(self) -> None:
         self.redis.delete_all_unsafe()
@@ -149,6 +152,15 @@ class TestRedisApiWithRedisOnline(unittest.TestCase):
         self.assertEqual(self.redis.hget_unsafe(hash_name, self.key2),
                          self.val2_bytes)
 
+    def test_replace_hash_fields_unsafe_sets_and_removes_fields(self):
+        hash_name = "dummy_hash"
+        self.redis.hset_unsafe(hash_name, self.key1, self.val1)
+        self.redis.replace_hash_fields_unsafe(
+            hash_name, {self.key2: self.val2}, [self.key1])
+        self.assertFalse(self.redis.hexists_unsafe(hash_name, self.key1))
+        self.assertEqual(self.redis.hget_unsafe(hash_name, self.key2),
+                         self.val2_bytes)
+
     def test_set_for_unsafe_temporarily_sets_specified_key_value_pair(self):
         self.redis.set_for_unsafe(self.key1, self.val1, self.time)
         self.assertEqual(self.redis.get_unsafe(self.key1), self.val1_bytes)
@@ -249,6 +261,52 @@ class TestRedisApiWithRedisOnline(unittest.TestCase):
                                        default=self.default_int),
             self.default_int)
 
+    def test_get_int_unsafe_returns_default_for_none_string(self):
+        self.redis.set_unsafe(self.key3, 'None')
+        self.assertEqual(
+            self.redis.get_int_unsafe(self.key3, default=self.default_int),
+            self.default_int)
+
+    def test_get_float_unsafe_returns_set_float(self):
+        self.redis.set_unsafe(self.key3, self.val5_float)
+        self.assertEqual(
+            self.redis.get_float_unsafe(self.key3, default=self.default_float),
+            self.val5_float)
+
+    def test_get_float_unsafe_returns_default_for_unset_key(self):
+        self.assertEqual(
+            self.redis.get_float_unsafe(self.key3, default=self.default_float),
+            self.default_float)
+
+    def test_get_float_unsafe_returns_default_for_non_float_value(self):
+        self.redis.set_unsafe(self.key2, self.val2)
+        self.assertEqual(
+            self.redis.get_float_unsafe(self.key2, default=self.default_float),
+            self.default_float)
+
+    def test_hget_float_unsafe_returns_set_float(self):
+        hash_name = "dummy_hash"
+        self.redis.hset_unsafe(hash_name, self.key3, self.val5_float)
+        self.assertEqual(
+            self.redis.hget_float_unsafe(hash_name, self.key3,
+                                         default=self.default_float),
+            self.val5_float)
+
+    def test_hget_float_unsafe_returns_default_for_unset_key(self):
+        hash_name = "dummy_hash"
+        self.assertEqual(
+            self.redis.hget_float_unsafe(hash_name, self.key3,
+                                         default=self.default_float),
+            self.default_float)
+
+    def test_hget_float_unsafe_returns_default_for_non_float_value(self):
+        hash_name = "dummy_hash"
+        self.redis.hset_unsafe(hash_name, self.key2, self.val2)
+        self.assertEqual(
+            self.redis.hget_float_unsafe(hash_name, self.key2,
+                                         default=self.default_float),
+            self.default_float)
+
     def test_get_bool_unsafe_returns_set_boolean(self):
         self.redis.set_unsafe(self.key4, self.val4)
         self.assertEqual(
@@ -287,6 +345,301 @@ class TestRedisApiWithRedisOnline(unittest.TestCase):
             self.redis.hget_bool_unsafe(hash_name, self.key1,
                                         default=self.default_bool))
 
+    def test_get_bool_unsafe_returns_default_for_none_string(self):
+        self.redis.set_unsafe(self.key4, 'None')
+        self.assertEqual(
+            self.redis.get_bool_unsafe(self.key4, default=self.default_bool),
+            self.default_bool)
+
+    def test_reads_unsafe_use_a_single_command_per_read(self):
+        hash_name = "dummy_hash"
+        self.redis.set_unsafe(self.key3, self.val3_int)
+        self.redis.hset_unsafe(hash_name, self.key3, self.val3_int)
+
+        with patch.object(self.redis._redis, 'execute_command',
+                          wraps=self.redis._redis.execute_command) as command:
+            self.redis.get_unsafe(self.key3)
+            self.redis.hget_unsafe(hash_name, self.key3)
+            self.redis.get_int_unsafe(self.key3)
+            self.redis.hget_int_unsafe(hash_name, self.key3)
+            self.redis.get_float_unsafe(self.key3)
+            self.redis.hget_float_unsafe(hash_name, self.key3)
+            self.redis.get_bool_unsafe(self.key3)
+            self.redis.hget_bool_unsafe(hash_name, self.key3)
+
+        self.assertEqual(
+            [c[0][0] for c in command.call_args_list],
+            ['GET', 'HGET', 'GET', 'HGET', 'GET', 'HGET', 'GET', 'HGET'])
+        self.assertTrue(all(c[0][1] == self.namespace + ':' + self.key3 or
+                            c[0][1] == self.namespace + ':' + hash_name
+                            for c in command.call_args_list))
+
+    def test_get_multiple_unsafe_returns_decodable_values_by_key(self):
+        self.redis.set_multiple_unsafe({
+            self.key1: self.val1, self.key3: self.val3_int, self.key4: None})
+
+        values = self.redis.get_multiple_unsafe(
+            [self.key1, self.key2, self.key3, self.key4])
+
+        self.assertEqual(values.get(self.key1, self.default_str),
+                         self.val1_bytes)
+        self.assertEqual(values.get(self.key2, self.default_str),
+                         self.default_str)
+        self.assertEqual(values.get_int(self.key3, self.default_int),
+                         self.val3_int)
+        self.assertIsNone(values.get(self.key4, self.default_str))
+        self.assertEqual(values.get_bool(self.key4, self.default_bool),
+                         self.default_bool)
+
+    def test_get_multiple_unsafe_returns_no_values_for_no_keys(self):
+        self.assertEqual(len(self.redis.get_multiple_unsafe([])), 0)
+
+    def test_hgetall_unsafe_returns_decodable_values_by_field(self):
+        hash_name = "dummy_hash"
+        self.redis.hset_multiple_unsafe(hash_name, {
+            self.key1: self.val1, self.key3: self.val3_int,
+            self.key4: self.val4, self.key2: self.val5_float})
+
+        values = self.redis.hgetall_unsafe(hash_name)
+
+        self.assertEqual(len(values), 4)
+        self.assertEqual(values.get(self.key1), self.val1_bytes)
+        self.assertEqual(values.get_int(self.key3), self.val3_int)
+        self.assertEqual(values.get_bool(self.key4), self.val4_bool)
+        self.assertEqual(values.get_float(self.key2), self.val5_float)
+        self.assertEqual(values.get_int(self.key1, self.default_int),
+                         self.default_int)
+
+    def test_hgetall_unsafe_returns_no_values_for_unset_hash(self):
+        values = self.redis.hgetall_unsafe("dummy_hash")
+
+        self.assertEqual(len(values), 0)
+        self.assertNotIn(self.key1, values)
+        self.assertEqual(values.get_int(self.key1, self.default_int),
+                         self.default_int)
+
+    def test_hgetall_multiple_unsafe_reads_all_hashes_in_one_round_trip(self):
+        self.redis.hset_unsafe("hash1", self.key1, self.val1)
+        self.redis.hset_unsafe("hash2", self.key3, self.val3_int)
+
+        with patch.object(self.redis._redis, 'execute_command',
+                          wraps=self.redis._redis.execute_command) as command:
+            values = self.redis.hgetall_multiple_unsafe(
+                ["hash1", "hash2", "hash3"])
+
+        command.assert_not_called()  # pipelined, not sent one by one
+        self.assertEqual(values["hash1"].get(self.key1), self.val1_bytes)
+        self.assertEqual(values["hash2"].get_int(self.key3), self.val3_int)
+        self.assertEqual(len(values["hash3"]), 0)
+
+    def test_write_multiple_unsafe_sets_keys_hash_fields_and_scores(self):
+        hash_name = "dummy_hash"
+        sorted_set_name = "dummy_sorted_set"
+        self.redis.write_multiple_unsafe(
+            {self.key1: self.val1, self.key3: self.val3_int},
+            {self.key1: self.time}, {hash_name: {self.key2: self.val2}},
+            {sorted_set_name: {self.key4: 12.5}})
+
+        self.assertEqual(self.redis.get_unsafe(self.key1), self.val1_bytes)
+        self.assertEqual(self.redis.time_to_live_unsafe(self.key1),
+                         self.time.seconds)
+        self.assertIsNone(self.redis.time_to_live_unsafe(self.key3))
+        self.assertEqual(self.redis.hget_unsafe(hash_name, self.key2),
+                         self.val2_bytes)
+        self.assertEqual(
+            self.redis.get_sorted_set_scores_unsafe(sorted_set_name),
+            {self.key4: 12.5})
+
+    def test_save_round_unsafe_sets_keys_hash_fields_and_scores(self):
+        hash_name = "dummy_hash"
+        sorted_set_name = "dummy_sorted_set"
+        self.redis.save_round_unsafe(
+            {self.key1: self.val1, self.key3: None},
+            {self.key1: self.time}, {hash_name: {self.key2: self.val2}},
+            {sorted_set_name: {self.key4: 12.5}})
+
+        self.assertEqual(self.redis.get_unsafe(self.key1), self.val1_bytes)
+        self.assertEqual(self.redis.time_to_live_unsafe(self.key1),
+                         self.time.seconds)
+        self.assertTrue(self.redis.exists_unsafe(self.key3))
+        self.assertIsNone(self.redis.get_unsafe(self.key3))
+        self.assertIsNone(self.redis.time_to_live_unsafe(self.key3))
+        self.assertEqual(self.redis.hget_unsafe(hash_name, self.key2),
+                         self.val2_bytes)
+        self.assertEqual(
+            self.redis.get_sorted_set_scores_unsafe(sorted_set_name),
+            {self.key4: 12.5})
+
+    def test_save_round_unsafe_runs_cached_script_in_one_command(self):
+        self.redis.save_round_unsafe({self.key1: self.val1})
+
+        with patch.object(self.redis._redis, 'execute_command',
+                          wraps=self.redis._redis.execute_command) as command:
+            self.redis.save_round_unsafe(
+                {self.key1: self.val2}, hash_key_values={
+                    "dummy_hash": {self.key2: self.val2}})
+
+        self.assertEqual([c[0][0] for c in command.call_args_list],
+                         ['EVALSHA'])
+        self.assertEqual(self.redis.get_unsafe(self.key1), self.val2_bytes)
+
+    def test_save_round_unsafe_loads_script_again_if_flushed(self):
+        self.redis.save_round_unsafe({self.key1: self.val1})
+        self.redis._redis.script_flush()
+
+        self.redis.save_round_unsafe({self.key1: self.val2})
+
+        self.assertEqual(self.redis.get_unsafe(self.key1), self.val2_bytes)
+
+    def test_get_cached_unsafe_reads_cached_key_once(self):
+        self.redis.cache_keys([self.key1], timedelta(seconds=10))
+        self.redis.set_unsafe(self.key1, self.val1)
+
+        with patch.object(self.redis._redis, 'execute_command',
+                          wraps=self.redis._redis.execute_command) as command:
+            self.assertEqual(self.redis.get_cached_unsafe(self.key1),
+                             self.val1_bytes)
+            self.assertEqual(self.redis.get_cached_unsafe(self.key1),
+                             self.val1_bytes)
+            self.assertIsNone(self.redis.get_cached_unsafe(self.key2))
+            self.assertIsNone(self.redis.get_cached_unsafe(self.key2))
+
+        self.assertEqual([c[0][0] for c in command.call_args_list],
+                         ['GET', 'GET', 'GET'])
+
+    def test_get_cached_unsafe_reads_again_once_max_age_passed(self):
+        self.redis.cache_keys([self.key1], timedelta(seconds=0.1))
+        self.redis.get_cached_unsafe(self.key1)
+        self.redis._redis.set(self.redis._add_namespace(self.key1), self.val1)
+
+        sleep(0.2)
+
+        self.assertEqual(self.redis.get_cached_unsafe(self.key1),
+                         self.val1_bytes)
+
+    def test_writes_invalidate_cached_keys(self):
+        self.redis.cache_keys([self.key1], timedelta(seconds=10))
+
+        self.redis.get_cached_unsafe(self.key1)
+        self.redis.set_for_unsafe(self.key1, self.val1, self.time)
+        self.assertEqual(self.redis.get_cached_unsafe(self.key1),
+                         self.val1_bytes)
+
+        self.redis.set_multiple_unsafe({self.key1: self.val2})
+        self.assertEqual(self.redis.get_cached_unsafe(self.key1),
+                         self.val2_bytes)
+
+        self.redis.remove_unsafe(self.key1)
+        self.assertIsNone(self.redis.get_cached_unsafe(self.key1))
+
+    def test_keyspace_notifications_invalidate_cached_keys(self):
+        notify_keyspace_events = self.redis._redis.config_get(
+            'notify-keyspace-events')['notify-keyspace-events']
+        self.redis._redis.config_set('notify-keyspace-events', 'Kg$x')
+        try:
+            self.redis.cache_keys([self.key1], timedelta(seconds=10), True)
+            self.redis.get_cached_unsafe(self.key1)
+
+            # Set the key as another process would
+            self.redis._redis.set(self.redis._add_namespace(self.key1),
+                                  self.val1)
+            sleep(0.5)
+
+            self.assertEqual(self.redis.get_cached_unsafe(self.key1),
+                             self.val1_bytes)
+        finally:
+            self.redis.stop_key_cache_notifications()
+            self.redis._redis.config_set('notify-keyspace-events',
+                                         notify_keyspace_events)
+
+    def test_keyspace_notifier_clears_cached_keys_on_error(self):
+        self.redis.cache_keys([self.key1], timedelta(seconds=10), True)
+        try:
+            self.redis.set_unsafe(self.key1, self.val1)
+            self.redis.get_cached_unsafe(self.key1)
+
+            with patch.object(self.redis._key_cache_pubsub, 'get_message',
+                              side_effect=RedisConnectionError):
+                # The notifier waits up to a second for the current message
+                sleep(1.5)
+                self.assertTrue(self.redis._key_cache_notifier.is_alive())
+
+                # Set the key while notifications could be missed
+                self.redis._redis.set(self.redis._add_namespace(self.key1),
+                                      self.val2)
+                self.assertEqual(self.redis.get_cached_unsafe(self.key1),
+                                 self.val2_bytes)
+        finally:
+            self.redis.stop_key_cache_notifications()
+        self.assertIsNone(self.redis._key_cache_notifier)
+
+    @patch(REDIS_RECENTLY_DOWN_FUNCTION, return_value=True)
+    def test_get_cached_returns_cached_value_if_redis_down(self, _):
+        self.redis.cache_keys([self.key1], timedelta(seconds=10))
+        self.redis.set_unsafe(self.key1, self.val1)
+        self.redis.get_cached_unsafe(self.key1)
+
+        self.assertEqual(self.redis.get_cached(self.key1), self.val1_bytes)
+        self.assertIsNone(self.redis.get_cached(self.key2))
+
+    def test_get_time_series_unsafe_returns_samples_in_time_range(self):
+        series_name = "dummy_series"
+        self.redis.write_multiple_unsafe({}, sorted_set_scores={series_name: {
+            encode_sample(10.0, 1): 10.0, encode_sample(20.0, 1): 20.0,
+            encode_sample(30.0, 2): 30.0}})
+
+        self.assertEqual(self.redis.get_time_series_unsafe(series_name),
+                         [(10.0, 1), (20.0, 1), (30.0, 2)])
+        self.assertEqual(
+            self.redis.get_time_series_unsafe(series_name, 15.0, 30.0),
+            [(20.0, 1), (30.0, 2)])
+        self.assertEqual(self.redis.get_time_series_aggregates(
+            series_name, timedelta(seconds=20), 'max'), [(0.0, 1), (20.0, 2)])
+
+    def test_trim_time_series_unsafe_removes_samples_before_min_time(self):
+        series_names = ["dummy_series_1", "dummy_series_2"]
+        for name in series_names:
+            self.redis.write_multiple_unsafe({}, sorted_set_scores={name: {
+                encode_sample(10.0, 1): 10.0, encode_sample(20.0, 2): 20.0}})
+
+        self.redis.trim_time_series_unsafe(series_names, 20.0)
+
+        for name in series_names:
+            self.assertEqual(self.redis.get_time_series_unsafe(name),
+                             [(20.0, 2)])
+
+    def test_get_sorted_set_scores_unsafe_returns_and_keeps_recent_members(
+            self):
+        sorted_set_name = "dummy_sorted_set"
+        self.redis.write_multiple_unsafe({}, sorted_set_scores={
+            sorted_set_name: {self.key1: 10, self.key2: 20, self.key3: 30}})
+
+        self.assertEqual(
+            self.redis.get_sorted_set_scores_unsafe(sorted_set_name, 20),
+            {self.key2: 20, self.key3: 30})
+        self.assertEqual(
+            self.redis.get_sorted_set_scores_unsafe(sorted_set_name),
+            {self.key2: 20, self.key3: 30})
+
+    def test_get_sorted_set_scores_unsafe_returns_empty_dict_if_unset(self):
+        self.assertEqual(
+            self.redis.get_sorted_set_scores_unsafe("dummy_sorted_set"), {})
+
+    def test_scan_keys_unsafe_iterates_over_keys_matching_pattern(self):
+        keys = ['prefix_{}'.format(i) for i in range(50)]
+        self.redis.set_multiple_unsafe({k: self.val1 for k in keys})
+        self.redis.set_unsafe(self.key1, self.val1)
+
+        self.assertEqual(
+            sorted(self.redis.scan_keys_unsafe('prefix_*', count=10)),
+            sorted(keys))
+
+    def test_get_keys_unsafe_does_not_use_keys_command(self):
+        self.redis.set_unsafe(self.key1, self.val1)
+        with patch.object(self.redis._redis, 'keys') as keys:
+            self.assertEqual(self.redis.get_keys_unsafe(), [self.key1])
+        keys.assert_not_called()
+
     def test_exists_unsafe_returns_true_if_exists(self):
         self.redis.set_unsafe(self.key1, self.val1)
         self.assertTrue(self.redis.exists_unsafe(self.key1))
@@ -546,6 +899,41 @@ class TestRedisApiWithRedisOnline(unittest.TestCase):
             self.redis.hget_int(hash_name, self.key3, default=self.default_int),
             self.default_int)
 
+    def test_get_float_returns_set_float(self):
+        self.redis.set(self.key3, self.val5_float)
+        self.assertEqual(
+            self.redis.get_float(self.key3, default=self.default_float),
+            self.val5_float)
+
+    def test_get_float_returns_default_for_unset_key(self):
+        self.assertEqual(
+            self.redis.get_float(self.key3, default=self.default_float),
+            self.default_float)
+
+    @patch(REDIS_RECENTLY_DOWN_FUNCTION, return_value=True)
+    def test_get_float_returns_default_if_redis_down(self, _):
+        self.redis.set_unsafe(self.key3, self.val5_float)
+        self.assertEqual(
+            self.redis.get_float(self.key3, default=self.default_float),
+            self.default_float)
+
+    def test_hget_float_returns_set_float(self):
+        hash_name = "dummy_hash"
+        self.redis.hset(hash_name, self.key3, self.val5_float)
+        self.assertEqual(
+            self.redis.hget_float(hash_name, self.key3,
+                                  default=self.default_float),
+            self.val5_float)
+
+    @patch(REDIS_RECENTLY_DOWN_FUNCTION, return_value=True)
+    def test_hget_float_returns_default_if_redis_down(self, _):
+        hash_name = "dummy_hash"
+        self.redis.hset_unsafe(hash_name, self.key3, self.val5_float)
+        self.assertEqual(
+            self.redis.hget_float(hash_name, self.key3,
+                                  default=self.default_float),
+            self.default_float)
+
     def test_get_bool_returns_set_boolean(self):
         self.redis.set(self.key4, self.val4)
         self.assertEqual(
@@ -596,6 +984,33 @@ class TestRedisApiWithRedisOnline(unittest.TestCase):
                                               default=self.default_bool),
                          self.default_bool)
 
+    @patch(REDIS_RECENTLY_DOWN_FUNCTION, return_value=True)
+    def test_get_multiple_returns_no_values_if_redis_down(self, _):
+        self.redis.set_unsafe(self.key1, self.val1)
+        self.assertEqual(len(self.redis.get_multiple([self.key1])), 0)
+
+    @patch(REDIS_RECENTLY_DOWN_FUNCTION, return_value=True)
+    def test_hgetall_returns_no_values_if_redis_down(self, _):
+        hash_name = "dummy_hash"
+        self.redis.hset_unsafe(hash_name, self.key1, self.val1)
+        self.assertEqual(len(self.redis.hgetall(hash_name)), 0)
+
+    @patch(REDIS_RECENTLY_DOWN_FUNCTION, return_value=True)
+    def test_hgetall_multiple_returns_no_values_per_hash_if_redis_down(
+            self, _):
+        self.redis.hset_unsafe("hash1", self.key1, self.val1)
+        values = self.redis.hgetall_multiple(["hash1", "hash2"])
+        self.assertEqual(len(values["hash1"]), 0)
+        self.assertEqual(len(values["hash2"]), 0)
+
+    @patch(REDIS_RECENTLY_DOWN_FUNCTION, return_value=True)
+    def test_get_sorted_set_scores_returns_empty_dict_if_redis_down(self, _):
+        sorted_set_name = "dummy_sorted_set"
+        self.redis.write_multiple_unsafe({}, sorted_set_scores={
+            sorted_set_name: {self.key1: 10}})
+        self.assertEqual(self.redis.get_sorted_set_scores(sorted_set_name),
+                         {})
+
     def test_exists_returns_true_if_exists(self):
         self.redis.set(self.key1, self.val1)
         self.assertTrue(self.redis.exists(self.key1))
@@ -912,6 +1327,15 @@ class TestRedisApiWithRedisOffline(unittest.TestCase):
         self.assertIsNone(
             self.redis.hset_multiple(hash_name, {self.key: self.val}))
 
+    def test_get_time_series_returns_empty_list(self):
+        self.assertEqual(self.redis.get_time_series("dummy_series"), [])
+
+    def test_trim_time_series_returns_none(self):
+        self.assertIsNone(self.redis.trim_time_series(["dummy_series"], 10.0))
+
+    def test_save_round_returns_none(self):
+        self.assertIsNone(self.redis.save_round({self.key: self.val}))
+
     def test_set_for_returns_none(self):
         self.assertIsNone(self.redis.set_for(self.key, self.val, self.time))
 
@@ -0,0 +1,52 @@
+import unittest
+from datetime import timedelta
+from time import sleep
+
+from src.store.redis.saved_state import SavedState
+
+
+class TestSavedState(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.full_save_interval = timedelta(seconds=1)
+        self.saved_state = SavedState(self.full_save_interval)
+        self.values = {'key1': 123, 'key2': 'True', 'key3': None}
+
+    def test_changes_returns_all_values_if_nothing_saved(self):
+        self.assertEqual(self.saved_state.changes(self.values), self.values)
+
+    def test_changes_returns_nothing_if_all_values_saved(self):
+        self.saved_state.saved(self.saved_state.changes(self.values))
+        self.assertEqual(self.saved_state.changes(self.values), {})
+
+    def test_changes_returns_only_changed_and_new_values(self):
+        self.saved_state.saved(self.saved_state.changes(self.values))
+
+        self.values['key1'] = 456
+        self.values['key4'] = 789
+
+        self.assertEqual(self.saved_state.changes(self.values),
+                         {'key1': 456, 'key4': 789})
+
+    def test_changes_returns_values_again_if_not_saved(self):
+        self.saved_state.saved(self.saved_state.changes(self.values))
+
+        self.values['key1'] = 456
+        self.saved_state.changes(self.values)  # save failed
+
+        self.assertEqual(self.saved_state.changes(self.values),
+                         {'key1': 456})
+
+    def test_changes_returns_all_values_after_full_save_interval(self):
+        self.saved_state.saved(self.saved_state.changes(self.values))
+        sleep(self.full_save_interval.total_seconds() + 0.1)
+        self.assertEqual(self.saved_state.changes(self.values), self.values)
+
+    def test_changes_returns_all_values_if_full_save_failed(self):
+        self.saved_state.changes(self.values)  # save failed
+        self.assertEqual(self.saved_state.changes(self.values), self.values)
+
+    def test_changes_returns_all_values_after_clear(self):
+        self.saved_state.saved(self.saved_state.changes(self.values))
+        self.saved_state.clear()
+        self.assertEqual(self.saved_state.changes(self.values), self.values)
@@ -0,0 +1,76 @@
+import unittest
+from datetime import timedelta
+
+from src.store.redis.time_series import TimeSeriesSamples, decode_sample, \
+    downsample, encode_sample
+
+
+class TestTimeSeriesFunctions(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.samples = [(10.0, 1), (15.0, 3), (20.0, 8), (35.0, 4)]
+        self.bucket = timedelta(seconds=10)
+
+    def test_decode_sample_returns_encoded_time_and_value(self):
+        self.assertEqual(decode_sample(encode_sample(12.5, 123)), (12.5, 123))
+        self.assertEqual(decode_sample(encode_sample(12.5, 1.5).encode()),
+                         (12.5, 1.5))
+
+    def test_decode_sample_keeps_large_ints_exact(self):
+        value = 12345678901234567890123
+        self.assertEqual(decode_sample(encode_sample(1.0, value))[1], value)
+
+    def test_downsample_aggregates_samples_by_bucket(self):
+        self.assertEqual(downsample(self.samples, self.bucket),
+                         [(10.0, 2.0), (20.0, 8.0), (30.0, 4.0)])
+        self.assertEqual(downsample(self.samples, self.bucket, 'min'),
+                         [(10.0, 1), (20.0, 8), (30.0, 4)])
+        self.assertEqual(downsample(self.samples, self.bucket, 'max'),
+                         [(10.0, 3), (20.0, 8), (30.0, 4)])
+        self.assertEqual(downsample(self.samples, self.bucket, 'last'),
+                         [(10.0, 3), (20.0, 8), (30.0, 4)])
+        self.assertEqual(downsample(self.samples, self.bucket, 'count'),
+                         [(10.0, 2), (20.0, 1), (30.0, 1)])
+
+    def test_downsample_returns_nothing_if_no_samples(self):
+        self.assertEqual(downsample([], self.bucket), [])
+
+    def test_downsample_raises_value_error_if_aggregation_unknown(self):
+        self.assertRaises(ValueError, downsample, self.samples, self.bucket,
+                          'median')
+
+
+class TestTimeSeriesSamples(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.samples = TimeSeriesSamples(timedelta(seconds=100),
+                                         timedelta(seconds=600))
+        self.name = 'dummy_series'
+
+    def test_pending_returns_samples_added_until_saved(self):
+        self.samples.add(self.name, 5, 1000.0)
+        self.samples.add(self.name, 6, 1010.0)
+        pending = self.samples.pending()
+
+        self.assertEqual(pending, {self.name: {
+            encode_sample(1000.0, 5): 1000.0,
+            encode_sample(1010.0, 6): 1010.0}})
+
+        self.samples.add(self.name, 7, 1020.0)
+        self.samples.saved(pending)
+
+        self.assertEqual(self.samples.pending(), {self.name: {
+            encode_sample(1020.0, 7): 1020.0}})
+
+    def test_add_drops_samples_older_than_retention(self):
+        self.samples.add(self.name, 5, 1000.0)
+        self.samples.add(self.name, 6, 1150.0)
+
+        self.assertEqual(self.samples.pending(), {self.name: {
+            encode_sample(1150.0, 6): 1150.0}})
+
+    def test_to_trim_returns_names_and_min_time_once_per_interval(self):
+        self.samples.add(self.name, 5, 1000.0)
+
+        self.assertEqual(self.samples.to_trim(1100.0), ([self.name], 1000.0))
+        self.assertIsNone(self.samples.to_trim(1100.0))
@@ -0,0 +1,171 @@
+import logging
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from redis import ConnectionError as RedisConnectionError
+
+from src.store.redis.write_behind import WriteBehindRedisApi
+from test import TestInternalConf, TestUserConf
+
+
+class TestWriteBehindRedisApi(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.max_pending_writes = 4
+        self.flush_interval = timedelta(seconds=0.1)
+        self.redis = WriteBehindRedisApi(
+            self.logger, TestInternalConf.redis_test_database,
+            TestUserConf.redis_host, TestUserConf.redis_port,
+            password=TestUserConf.redis_password, namespace='testnamespace',
+            flush_interval=self.flush_interval,
+            max_pending_writes=self.max_pending_writes)
+
+        try:
+            self.redis.ping_unsafe()
+        except RedisConnectionError:
+            self.fail('Redis is not online.')
+
+        self.redis.delete_all_unsafe()
+
+        self.hash_name = 'dummy_hash'
+        self.key1 = 'key1'
+        self.key2 = 'key2'
+        self.time = timedelta(seconds=30)
+
+    def tearDown(self) -> None:
+        self.redis.stop_flushing()
+        self.redis.delete_all_unsafe()
+
+    def test_writes_are_queued_until_flushed(self):
+        self.assertIsNotNone(self.redis.set_multiple({self.key1: 123}))
+        self.assertIsNotNone(
+            self.redis.hset_multiple(self.hash_name, {self.key1: 'True'}))
+
+        self.assertFalse(self.redis.exists_unsafe(self.key1))
+        self.assertEqual(self.redis.no_of_pending_writes, 2)
+
+        self.assertTrue(self.redis.flush())
+
+        self.assertEqual(self.redis.get_int_unsafe(self.key1), 123)
+        self.assertTrue(self.redis.hget_bool_unsafe(self.hash_name, self.key1))
+        self.assertEqual(self.redis.no_of_pending_writes, 0)
+
+    def test_flush_sets_expiry_of_keys_given_an_expiry(self):
+        self.redis.set_multiple({self.key1: 123, self.key2: 456},
+                                {self.key1: self.time})
+        self.redis.flush()
+
+        self.assertEqual(self.redis.time_to_live_unsafe(self.key1),
+                         self.time.seconds)
+        self.assertIsNone(self.redis.time_to_live_unsafe(self.key2))
+
+    def test_repeated_writes_of_a_key_are_merged(self):
+        self.redis.set_multiple({self.key1: 123})
+        self.redis.set_multiple({self.key1: 456})
+        self.redis.hset_multiple(self.hash_name, {self.key1: 1})
+        self.redis.hset_multiple(self.hash_name, {self.key1: 2})
+
+        self.assertEqual(self.redis.no_of_pending_writes, 2)
+
+        with patch.object(self.redis, 'save_round_unsafe',
+                          wraps=self.redis.save_round_unsafe) as save:
+            self.redis.flush()
+
+        save.assert_called_once_with(
+            {self.key1: 456}, {}, {self.hash_name: {self.key1: 2}}, {})
+        self.assertEqual(self.redis.get_int_unsafe(self.key1), 456)
+
+    def test_new_keys_are_rejected_if_queue_full(self):
+        self.redis.set_multiple({'key{}'.format(i): i
+                                 for i in range(self.max_pending_writes)})
+
+        self.assertIsNone(self.redis.set_multiple({'another_key': 1}))
+        self.assertIsNone(
+            self.redis.hset_multiple(self.hash_name, {self.key1: 1}))
+        self.assertIsNotNone(self.redis.set_multiple({'key0': 100}))
+
+        self.redis.flush()
+
+        self.assertFalse(self.redis.exists_unsafe('another_key'))
+        self.assertEqual(self.redis.get_int_unsafe('key0'), 100)
+
+    def test_failed_flush_queues_writes_again_without_replacing_newer(self):
+        self.redis.set_multiple({self.key1: 123, self.key2: 456})
+
+        def fail_after_newer_value_queued(*_):
+            self.redis.set_multiple({self.key1: 789})
+            return None
+
+        with patch.object(self.redis, 'save_round_unsafe',
+                          side_effect=fail_after_newer_value_queued):
+            self.assertFalse(self.redis.flush())
+
+        self.assertEqual(self.redis.no_of_pending_writes, 2)
+        self.assertTrue(self.redis.flush())
+        self.assertEqual(self.redis.get_int_unsafe(self.key1), 789)
+        self.assertEqual(self.redis.get_int_unsafe(self.key2), 456)
+
+    def test_failed_flush_queues_writes_again_even_if_queue_full(self):
+        self.redis.set_multiple({self.key1: 123, self.key2: 456})
+
+        def fail_after_queue_filled(*_):
+            self.redis.set_multiple({'newer_key{}'.format(i): i
+                                     for i in range(self.max_pending_writes)})
+            return None
+
+        with patch.object(self.redis, 'save_round_unsafe',
+                          side_effect=fail_after_queue_filled):
+            self.assertFalse(self.redis.flush())
+
+        self.assertEqual(self.redis.no_of_pending_writes,
+                         self.max_pending_writes + 2)
+        self.assertIsNone(self.redis.set_multiple({'another_key': 1}))
+        self.assertTrue(self.redis.flush())
+        self.assertEqual(self.redis.get_int_unsafe(self.key1), 123)
+        self.assertEqual(self.redis.get_int_unsafe(self.key2), 456)
+
+    def test_sorted_set_scores_are_queued_and_merged(self):
+        self.redis.write_multiple({}, sorted_set_scores={
+            self.hash_name: {self.key1: 1, self.key2: 2}})
+        self.redis.write_multiple({}, sorted_set_scores={
+            self.hash_name: {self.key1: 3}})
+
+        self.assertEqual(self.redis.no_of_pending_writes, 2)
+        self.redis.flush()
+
+        self.assertEqual(self.redis.get_sorted_set_scores(self.hash_name),
+                         {self.key1: 3, self.key2: 2})
+
+    def test_writes_of_a_round_are_queued_together(self):
+        self.assertIsNotNone(self.redis.save_round(
+            {self.key1: 123}, {self.key1: self.time},
+            {self.hash_name: {self.key2: 456}}))
+
+        self.assertFalse(self.redis.exists_unsafe(self.key1))
+        self.assertEqual(self.redis.no_of_pending_writes, 2)
+        self.redis.flush()
+
+        self.assertEqual(self.redis.time_to_live_unsafe(self.key1),
+                         self.time.seconds)
+        self.assertEqual(
+            self.redis.hget_int_unsafe(self.hash_name, self.key2), 456)
+
+    def test_writes_are_flushed_in_the_background(self):
+        self.redis.start_flushing()
+        self.redis.set_multiple({self.key1: 123})
+
+        time.sleep(self.flush_interval.total_seconds() * 5)
+
+        self.assertEqual(self.redis.get_int_unsafe(self.key1), 123)
+
+    def test_stop_flushing_flushes_remaining_writes(self):
+        self.redis.start_flushing()
+        self.redis.stop_flushing()
+        self.redis.set_multiple({self.key1: 123})
+
+        self.redis.stop_flushing()
+
+        self.assertEqual(self.redis.get_int_unsafe(self.key1), 123)
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 from src.utils.config_parsers.user import UserConfig
@@ -10,3 +12,24 @@ class TestUserConfig(unittest.TestCase):
                    'test/test_user_config_nodes.ini',
                    'test/test_user_config_repos.ini',
                    'test/test_user_config_ui.ini')
+
+    def test_redis_max_connections_is_none_unless_set(self) -> None:
+        user_conf = UserConfig('test/test_user_config_main.ini',
+                               'test/test_user_config_nodes.ini',
+                               'test/test_user_config_repos.ini',
+                               'test/test_user_config_ui.ini')
+        self.assertIsNone(user_conf.redis_max_connections)
+
+        with open('test/test_user_config_main.ini') as f:
+            main_config = f.read().replace('max_connections=\n',
+                                           'max_connections=8\n')
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.ini', delete=False) as f:
+            f.write(main_config)
+        try:
+            user_conf = UserConfig(f.name, 'test/test_user_config_nodes.ini',
+                                   'test/test_user_config_repos.ini',
+                                   'test/test_user_config_ui.ini')
+        finally:
+            os.remove(f.name)
+        self.assertEqual(user_conf.redis_max_connections, 8)
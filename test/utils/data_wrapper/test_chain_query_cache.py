@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import threading
+import unittest
+from time import sleep
+from unittest.mock import MagicMock
+
+from src.utils.data_wrapper.chain_query_cache import ChainQueryCache, \
+    AsyncChainQueryCache
+from test.test_helpers import DummyException
+
+
+class TestChainQueryCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.ws_url_1 = 'the_ws_1'
+        self.ws_url_2 = 'the_ws_2'
+        self.block_hash_1 = 'the_block_hash_1'
+        self.block_hash_2 = 'the_block_hash_2'
+        self.session_validators = ['validator_1', 'validator_2']
+
+        self.data_wrapper = MagicMock()
+        self.data_wrapper.get_session_validators.return_value = \
+            self.session_validators
+        self.cache = ChainQueryCache(self.logger, self.data_wrapper)
+
+    def test_query_returns_result_of_data_wrapper(self):
+        self.assertEqual(self.session_validators,
+                         self.cache.get_session_validators(
+                             self.ws_url_1, self.block_hash_1))
+        self.data_wrapper.get_session_validators.assert_called_once_with(
+            self.ws_url_1)
+
+    def test_query_fetched_once_per_block_hash(self):
+        self.cache.get_session_validators(self.ws_url_1, self.block_hash_1)
+        self.cache.get_session_validators(self.ws_url_2, self.block_hash_1)
+        self.cache.get_session_validators(self.ws_url_1, self.block_hash_1)
+        self.assertEqual(1,
+                         self.data_wrapper.get_session_validators.call_count)
+
+    def test_query_fetched_again_on_new_block_hash(self):
+        self.cache.get_session_validators(self.ws_url_1, self.block_hash_1)
+        self.cache.get_session_validators(self.ws_url_1, self.block_hash_2)
+        self.assertEqual(2,
+                         self.data_wrapper.get_session_validators.call_count)
+
+    def test_different_queries_cached_separately(self):
+        self.cache.get_session_validators(self.ws_url_1, self.block_hash_1)
+        self.cache.get_council_members(self.ws_url_1, self.block_hash_1)
+        self.assertEqual(1,
+                         self.data_wrapper.get_session_validators.call_count)
+        self.assertEqual(1, self.data_wrapper.get_council_members.call_count)
+
+    def test_failed_query_raises_and_is_not_cached(self):
+        self.data_wrapper.get_active_era.side_effect = DummyException()
+        self.assertRaises(DummyException, self.cache.get_active_era,
+                          self.ws_url_1, self.block_hash_1)
+
+        self.data_wrapper.get_active_era.side_effect = None
+        self.data_wrapper.get_active_era.return_value = {'index': 1}
+        self.assertEqual({'index': 1}, self.cache.get_active_era(
+            self.ws_url_1, self.block_hash_1))
+        self.assertEqual(2, self.data_wrapper.get_active_era.call_count)
+
+    def test_concurrent_queries_at_same_block_hash_fetched_once(self):
+        def slow_current_index(_):
+            sleep(0.5)
+            return 10
+
+        self.data_wrapper.get_current_index.side_effect = slow_current_index
+        results = []
+
+        def query():
+            results.append(self.cache.get_current_index(
+                self.ws_url_1, self.block_hash_1))
+
+        threads = [threading.Thread(target=query) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual([10] * 5, results)
+        self.assertEqual(1, self.data_wrapper.get_current_index.call_count)
+
+
+class TestAsyncChainQueryCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.ws_url = 'the_ws'
+        self.block_hash_1 = 'the_block_hash_1'
+        self.block_hash_2 = 'the_block_hash_2'
+
+        self.data_wrapper = MagicMock()
+        self.data_wrapper.get_current_index.side_effect = \
+            self.slow_current_index
+        self.cache = AsyncChainQueryCache(self.logger, self.data_wrapper)
+
+    @staticmethod
+    async def slow_current_index(_):
+        await asyncio.sleep(0.1)
+        return 10
+
+    def test_concurrent_queries_at_same_block_hash_fetched_once(self):
+        async def run():
+            return await asyncio.gather(*[self.cache.get_current_index(
+                self.ws_url, self.block_hash_1) for _ in range(5)])
+
+        self.assertEqual([10] * 5, asyncio.run(run()))
+        self.assertEqual(1, self.data_wrapper.get_current_index.call_count)
+
+    def test_query_fetched_again_on_new_block_hash(self):
+        async def run():
+            await self.cache.get_current_index(self.ws_url, self.block_hash_1)
+            await self.cache.get_current_index(self.ws_url, self.block_hash_2)
+
+        asyncio.run(run())
+        self.assertEqual(2, self.data_wrapper.get_current_index.call_count)
+
+    def test_failed_query_raises_and_is_not_cached(self):
+        async def failing_current_index(_):
+            raise DummyException()
+
+        async def run():
+            self.data_wrapper.get_current_index.side_effect = \
+                failing_current_index
+            with self.assertRaises(DummyException):
+                await self.cache.get_current_index(self.ws_url,
+                                                   self.block_hash_1)
+
+            self.data_wrapper.get_current_index.side_effect = \
+                self.slow_current_index
+            return await self.cache.get_current_index(self.ws_url,
+                                                      self.block_hash_1)
+
+        self.assertEqual(10, asyncio.run(run()))
+        self.assertEqual(2, self.data_wrapper.get_current_index.call_count)
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import unittest
+from datetime import timedelta
+from time import sleep
+from unittest.mock import MagicMock
+
+from src.alerters.reactive.node import Node, NodeType
+from src.utils.data_wrapper.data_source_resolver import DataSourceResolver, \
+    AsyncDataSourceResolver
+from test import TestInternalConf
+
+
+class TestDataSourceResolver(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.cache_time = timedelta(seconds=1)
+        self.cache_time_with_error_margin = timedelta(seconds=1.5)
+
+        self.node_1 = Node(name='node_1', ws_url='ws_1',
+                           node_type=NodeType.NON_VALIDATOR_FULL_NODE,
+                           stash_account_address='', chain='', redis=None,
+                           is_archive_node=False,
+                           internal_conf=TestInternalConf)
+        self.node_2 = Node(name='node_2', ws_url='ws_2',
+                           node_type=NodeType.NON_VALIDATOR_FULL_NODE,
+                           stash_account_address='', chain='', redis=None,
+                           is_archive_node=False,
+                           internal_conf=TestInternalConf)
+
+        self.data_wrapper = MagicMock()
+        self.data_wrapper.get_web_sockets_connected_to_an_api.return_value = \
+            ['ws_1', 'ws_2']
+        self.resolver = DataSourceResolver(self.logger, self.data_wrapper,
+                                           self.cache_time)
+
+    def test_select_returns_first_node_connected_to_the_api(self):
+        self.assertEqual(self.node_1,
+                         self.resolver.select([self.node_1, self.node_2]))
+
+    def test_select_skips_nodes_not_connected_to_the_api(self):
+        self.data_wrapper.get_web_sockets_connected_to_an_api.return_value = \
+            ['ws_2']
+        self.assertEqual(self.node_2,
+                         self.resolver.select([self.node_1, self.node_2]))
+
+    def test_select_returns_none_if_no_node_connected_to_the_api(self):
+        self.data_wrapper.get_web_sockets_connected_to_an_api.return_value = []
+        self.assertIsNone(self.resolver.select([self.node_1, self.node_2]))
+
+    def test_select_queries_connections_once_within_cache_time(self):
+        self.resolver.select([self.node_1])
+        self.resolver.select([self.node_2])
+        self.resolver.select([self.node_1, self.node_2])
+        self.assertEqual(
+            1, self.data_wrapper.get_web_sockets_connected_to_an_api
+                .call_count)
+
+    def test_select_queries_connections_again_after_cache_time(self):
+        self.resolver.select([self.node_1])
+        sleep(self.cache_time_with_error_margin.total_seconds())
+        self.resolver.select([self.node_1])
+        self.assertEqual(
+            2, self.data_wrapper.get_web_sockets_connected_to_an_api
+                .call_count)
+
+    def test_ping_pings_node_once_within_cache_time(self):
+        self.resolver.ping(self.node_1)
+        self.resolver.ping(self.node_1)
+        self.resolver.ping(self.node_2)
+        self.assertEqual(2, self.data_wrapper.ping_node.call_count)
+
+    def test_ping_pings_node_again_if_previous_ping_failed(self):
+        self.data_wrapper.ping_node.side_effect = Exception()
+        self.assertRaises(Exception, self.resolver.ping, self.node_1)
+        self.data_wrapper.ping_node.side_effect = None
+        self.resolver.ping(self.node_1)
+        self.assertEqual(2, self.data_wrapper.ping_node.call_count)
+
+    def test_invalidate_clears_cached_connections_and_pings(self):
+        self.resolver.select([self.node_1])
+        self.resolver.ping(self.node_1)
+        self.resolver.invalidate()
+        self.resolver.select([self.node_1])
+        self.resolver.ping(self.node_1)
+        self.assertEqual(
+            2, self.data_wrapper.get_web_sockets_connected_to_an_api
+                .call_count)
+        self.assertEqual(2, self.data_wrapper.ping_node.call_count)
+
+
+class TestAsyncDataSourceResolver(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.cache_time = timedelta(seconds=1)
+
+        self.node_1 = Node(name='node_1', ws_url='ws_1',
+                           node_type=NodeType.NON_VALIDATOR_FULL_NODE,
+                           stash_account_address='', chain='', redis=None,
+                           is_archive_node=False,
+                           internal_conf=TestInternalConf)
+        self.node_2 = Node(name='node_2', ws_url='ws_2',
+                           node_type=NodeType.NON_VALIDATOR_FULL_NODE,
+                           stash_account_address='', chain='', redis=None,
+                           is_archive_node=False,
+                           internal_conf=TestInternalConf)
+
+        async def get_web_sockets_connected_to_an_api():
+            return ['ws_2']
+
+        async def ping_node(_):
+            return 'pong'
+
+        self.data_wrapper = MagicMock()
+        self.data_wrapper.get_web_sockets_connected_to_an_api.side_effect = \
+            get_web_sockets_connected_to_an_api
+        self.data_wrapper.ping_node.side_effect = ping_node
+        self.resolver = AsyncDataSourceResolver(
+            self.logger, self.data_wrapper, self.cache_time)
+
+    def test_select_returns_first_node_connected_to_the_api(self):
+        self.assertEqual(self.node_2, asyncio.run(
+            self.resolver.select([self.node_1, self.node_2])))
+
+    def test_select_queries_connections_once_within_cache_time(self):
+        async def run():
+            await asyncio.gather(*[self.resolver.select([self.node_1])
+                                   for _ in range(3)])
+
+        asyncio.run(run())
+        self.assertEqual(
+            1, self.data_wrapper.get_web_sockets_connected_to_an_api
+                .call_count)
+
+    def test_ping_pings_node_once_within_cache_time(self):
+        async def run():
+            await self.resolver.ping(self.node_1)
+            await self.resolver.ping(self.node_1)
+
+        asyncio.run(run())
+        self.assertEqual(1, self.data_wrapper.ping_node.call_count)
@@ -0,0 +1,65 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.executors import InlineExecutor, BoundedExecutor
+
+
+class TestInlineExecutor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.executor = InlineExecutor()
+
+    def test_submit_runs_call_in_submitting_thread(self) -> None:
+        future = self.executor.submit(threading.get_ident)
+        self.assertTrue(future.done())
+        self.assertEqual(threading.get_ident(), future.result())
+
+    def test_submit_passes_arguments(self) -> None:
+        future = self.executor.submit(pow, 2, 3)
+        self.assertEqual(8, future.result())
+
+    def test_submit_keeps_exception_in_future(self) -> None:
+        future = self.executor.submit(int, 'not an int')
+        self.assertIsInstance(future.exception(), ValueError)
+        self.assertRaises(ValueError, future.result)
+
+
+class TestBoundedExecutor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.shared_executor = ThreadPoolExecutor(4)
+        self.max_in_flight = 2
+        self.executor = BoundedExecutor(self.shared_executor,
+                                        self.max_in_flight)
+
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def tearDown(self) -> None:
+        self.shared_executor.shutdown()
+
+    def call(self) -> None:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+
+    def test_submit_runs_call_on_shared_executor(self) -> None:
+        future = self.executor.submit(threading.get_ident)
+        self.assertNotEqual(threading.get_ident(), future.result())
+
+    def test_at_most_max_in_flight_calls_run_at_a_time(self) -> None:
+        futures = [self.executor.submit(self.call) for _ in range(6)]
+        for future in futures:
+            future.result()
+        self.assertEqual(self.max_in_flight, self.max_running)
+
+    def test_failed_calls_do_not_use_up_calls_in_flight(self) -> None:
+        for _ in range(self.max_in_flight + 1):
+            self.executor.submit(int, 'not an int').exception()
+        self.assertEqual(5, self.executor.submit(int, '5').result(1))
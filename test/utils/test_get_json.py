@@ -3,7 +3,7 @@ import unittest
 from unittest.mock import patch
 
 from src.utils.exceptions import *
-from src.utils.get_json import get_polkadot_json, get_json
+from src.utils.get_json import get_polkadot_json, get_json, get_session
 
 GET_JSON_FUNCTION = 'src.utils.get_json.get_json'
 GET_FUNCTION = 'src.utils.get_json.requests.get'
@@ -38,6 +38,39 @@ class TestGetJson(unittest.TestCase):
         self.assertEqual(TestGetJson.DummyGetReturn.CONTENT_DICT,
                          get_json(ENDPOINT, LOGGER))
 
+    def test_get_json_with_session_uses_session_and_keeps_connection(self):
+        session = get_session('http://the_server_a:3000')
+        get_return = TestGetJson.DummyGetReturn()
+        with patch.object(session, 'get', return_value=get_return) as get, \
+                patch.object(get_return, 'close') as close:
+            self.assertEqual(TestGetJson.DummyGetReturn.CONTENT_DICT,
+                             get_json(ENDPOINT, LOGGER, PARAMS, session))
+            get.assert_called_once()
+            close.assert_not_called()
+
+
+class TestGetSession(unittest.TestCase):
+
+    def test_get_session_returns_same_session_for_same_server(self):
+        session_1 = get_session('http://the_server_b:3000/api/pingApi')
+        session_2 = get_session('http://the_server_b:3000/api/rpc/chain')
+        self.assertIs(session_1, session_2)
+
+    def test_get_session_returns_different_sessions_for_different_servers(
+            self):
+        session_1 = get_session('http://the_server_c:3000/api/pingApi')
+        session_2 = get_session('http://the_server_d:3000/api/pingApi')
+        self.assertIsNot(session_1, session_2)
+
+    def test_get_session_uses_given_pool_size(self):
+        server = 'http://the_server_e:3000'
+        session = get_session(server, 5)
+        self.assertEqual(5, session.get_adapter(server)._pool_maxsize)
+
+        # A later call without a pool size keeps the existing pool
+        self.assertIs(session, get_session(server + '/api/pingApi'))
+        self.assertEqual(5, session.get_adapter(server)._pool_maxsize)
+
 
 class TestGetPolkadotJson(unittest.TestCase):
 
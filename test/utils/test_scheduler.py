@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+import unittest
+
+from src.utils.scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.scheduler = Scheduler(self.logger, max_workers=2)
+        self.thread = threading.Thread(target=self.scheduler.start)
+
+    def tearDown(self) -> None:
+        self.scheduler.stop()
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def run_for(self, seconds: float) -> None:
+        self.thread.start()
+        time.sleep(seconds)
+        self.scheduler.stop()
+        self.thread.join()
+
+    def test_task_runs_once_per_period(self) -> None:
+        task = self.scheduler.schedule('task', 0.2, lambda: False)
+        self.run_for(0.5)
+        self.assertEqual(3, task.rounds)
+        self.assertEqual(0, task.overruns)
+
+    def test_tasks_with_different_periods_run_independently(self) -> None:
+        fast_task = self.scheduler.schedule('fast', 0.1, lambda: False)
+        slow_task = self.scheduler.schedule('slow', 1, lambda: False)
+        self.run_for(0.55)
+        self.assertEqual(6, fast_task.rounds)
+        self.assertEqual(1, slow_task.rounds)
+
+    def test_task_runs_again_immediately_if_round_returns_true(self) -> None:
+        task = self.scheduler.schedule('task', 10, lambda: task.rounds < 4)
+        self.run_for(0.2)
+        self.assertEqual(5, task.rounds)
+
+    def test_overrun_detected_if_round_takes_longer_than_period(self) -> None:
+        def slow_round():
+            time.sleep(0.2)
+            return False
+
+        task = self.scheduler.schedule('task', 0.1, slow_round)
+        self.run_for(0.5)
+        self.assertGreater(task.overruns, 0)
+
+    def test_task_not_scheduled_again_if_round_raises_exception(self) -> None:
+        def failing_round():
+            raise Exception('round failed')
+
+        task = self.scheduler.schedule('task', 0.1, failing_round)
+        other_task = self.scheduler.schedule('other', 0.1, lambda: False)
+        self.run_for(0.35)
+        self.assertEqual(0, task.rounds)
+        self.assertEqual(4, other_task.rounds)
+
+    def test_jitter_delays_rounds_by_at_most_jitter_seconds(self) -> None:
+        self.scheduler = Scheduler(self.logger, max_workers=2,
+                                   jitter_seconds=0.05)
+        self.thread = threading.Thread(target=self.scheduler.start)
+        task = self.scheduler.schedule('task', 0.2, lambda: False)
+        self.run_for(0.5)
+        self.assertIn(task.rounds, [2, 3])
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import unittest
+
+from aiohttp import web
+
+from src.utils.exceptions import ApiCallFailedException, \
+    ConnectionWithNodeApiLostException, NodeIsNotAnArchiveNodeException
+from src.utils.substrate_rpc import SubstrateRpcClient, \
+    BlockingSubstrateRpcClient
+
+
+class StandInNode:
+    # A local web socket server which answers JSON-RPC requests like a node.
+    # Responses to requests for the 'slow' method are only sent after the
+    # response to the next request, so they are sent out of order. The
+    # notifications of a method are sent right after its response.
+
+    def __init__(self) -> None:
+        self.responses = {}
+        self.notifications = {}
+        self.connections = 0
+        self.requests = []
+        self._held = []
+        self._websockets = []
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        daemon=True)
+        self._thread.start()
+        self._runner = web.AppRunner(self._app())
+        self._run(self._runner.setup())
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        self._run(site.start())
+        self.ws_url = '127.0.0.1:{}'.format(
+            self._runner.addresses[0][1])
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(
+            coroutine, self._loop).result()
+
+    def _app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/', self._handle)
+        return app
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        self.connections += 1
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._websockets.append(ws)
+        async for msg in ws:
+            data = json.loads(msg.data)
+            self.requests.append(data['method'])
+            response = dict(self.responses[data['method']], id=data['id'],
+                            jsonrpc='2.0')
+            if data['method'] == 'slow':
+                self._held.append(response)
+                continue
+            await ws.send_str(json.dumps(response))
+            for notification in self.notifications.get(data['method'], []):
+                await ws.send_str(json.dumps(notification))
+            for held in self._held:
+                await ws.send_str(json.dumps(held))
+            self._held.clear()
+        return ws
+
+    def drop_connections(self) -> None:
+        async def drop():
+            for ws in self._websockets:
+                await ws.close()
+        self._run(drop())
+
+    def stop(self) -> None:
+        if not self._thread.is_alive():
+            return
+        self._run(self._runner.cleanup())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+class TestSubstrateRpcClient(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.logger = logging.getLogger('dummy')
+        self.node = StandInNode()
+        self.client = BlockingSubstrateRpcClient(self.logger, timeout=2)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.node.stop()
+
+    def test_query_returns_result_of_rpc_method(self) -> None:
+        health = {"isSyncing": False, "peers": 12, "shouldHavePeers": True}
+        self.node.responses['system_health'] = {'result': health}
+        self.assertEqual(health, self.client.query(
+            'system/health', {'websocket': self.node.ws_url}))
+
+    def test_query_passes_api_server_params_to_rpc_method(self) -> None:
+        self.node.responses['chain_getBlockHash'] = {'result': '0x_hash'}
+        self.assertEqual('0x_hash', self.client.query(
+            'chain/getBlockHash',
+            {'websocket': self.node.ws_url, 'block_number': 100}))
+
+    def test_query_returns_header_number_as_int(self) -> None:
+        self.node.responses['chain_getHeader'] = {
+            'result': {'number': '0x7fda6', 'parentHash': '0x_parent'}}
+        header = self.client.query(
+            'chain/getHeader', {'websocket': self.node.ws_url, 'hash': '0x1'})
+        self.assertEqual(523686, header['number'])
+        self.assertEqual('0x_parent', header['parentHash'])
+
+    def test_query_raises_api_call_failed_exception_on_error(self) -> None:
+        self.node.responses['system_chain'] = {
+            'error': {'code': -32000, 'message': 'Something went wrong'}}
+        self.assertRaises(ApiCallFailedException, self.client.query,
+                          'system/chain', {'websocket': self.node.ws_url})
+
+    def test_query_raises_not_archive_exception_if_state_discarded(
+            self) -> None:
+        self.node.responses['chain_getBlockHash'] = {
+            'error': {'code': 4003, 'message': 'Client error: UnknownBlock: '
+                                               'State already discarded'}}
+        self.assertRaises(NodeIsNotAnArchiveNodeException, self.client.query,
+                          'chain/getBlockHash',
+                          {'websocket': self.node.ws_url, 'block_number': 1})
+
+    def test_requests_share_one_web_socket(self) -> None:
+        self.node.responses['system_chain'] = {'result': 'Kusama'}
+        for _ in range(3):
+            self.client.query('system/chain', {'websocket': self.node.ws_url})
+        self.assertEqual(1, self.node.connections)
+        self.assertEqual(3, len(self.node.requests))
+
+    def test_concurrent_requests_matched_with_out_of_order_responses(
+            self) -> None:
+        self.node.responses['slow'] = {'result': 'slow result'}
+        self.node.responses['fast'] = {'result': 'fast result'}
+        client = SubstrateRpcClient(self.logger, timeout=2)
+
+        async def requests():
+            slow = asyncio.ensure_future(
+                client.request(self.node.ws_url, 'slow', []))
+            # Make sure the slow request is sent first
+            while 'slow' not in self.node.requests:
+                await asyncio.sleep(0.01)
+            fast = await client.request(self.node.ws_url, 'fast', [])
+            results = [await slow, fast]
+            await client.close()
+            return results
+
+        self.assertEqual(['slow result', 'fast result'],
+                         asyncio.run(requests()))
+        self.assertEqual(1, self.node.connections)
+
+    def test_request_raises_connection_lost_exception_if_node_down(
+            self) -> None:
+        self.node.stop()
+        self.assertRaises(ConnectionWithNodeApiLostException,
+                          self.client.request, self.node.ws_url,
+                          'system_health', [])
+
+    def test_request_raises_connection_lost_exception_on_timeout(
+            self) -> None:
+        self.node.responses['slow'] = {'result': 'never sent'}
+        client = BlockingSubstrateRpcClient(self.logger, timeout=0.2)
+        try:
+            self.assertRaises(ConnectionWithNodeApiLostException,
+                              client.request, self.node.ws_url, 'slow', [])
+        finally:
+            client.close()
+
+    def test_subscribe_calls_callback_with_each_notification(self) -> None:
+        self.node.responses['chain_subscribeFinalizedHeads'] = {
+            'result': 'sub1'}
+        self.node.notifications['chain_subscribeFinalizedHeads'] = [
+            {'jsonrpc': '2.0', 'method': 'chain_finalizedHead',
+             'params': {'subscription': 'sub1', 'result': {'number': n}}}
+            for n in ['0x1', '0x2']] + [
+            {'jsonrpc': '2.0', 'method': 'chain_finalizedHead',
+             'params': {'subscription': 'other', 'result': {'number': '0x9'}}}]
+        received = []
+        notified = threading.Event()
+
+        def callback(header):
+            received.append(header['number'])
+            if len(received) == 2:
+                notified.set()
+
+        subscription = self.client.subscribe(
+            self.node.ws_url, 'chain_subscribeFinalizedHeads', [], callback)
+        self.assertTrue(notified.wait(2))
+        # Make sure the notification of the other subscription has been read
+        self.node.responses['system_chain'] = {'result': 'Kusama'}
+        self.client.query('system/chain', {'websocket': self.node.ws_url})
+        self.assertEqual('sub1', subscription.subscription_id)
+        self.assertEqual(['0x1', '0x2'], received)
+        self.assertTrue(subscription.active)
+
+    def test_subscription_not_active_after_connection_lost(self) -> None:
+        self.node.responses['chain_subscribeFinalizedHeads'] = {
+            'result': 'sub1'}
+        subscription = self.client.subscribe(
+            self.node.ws_url, 'chain_subscribeFinalizedHeads', [],
+            lambda result: None)
+        self.node.drop_connections()
+
+        for _ in range(100):
+            if not subscription.active:
+                break
+            time.sleep(0.01)
+        self.assertFalse(subscription.active)